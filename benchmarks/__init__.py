@@ -0,0 +1,12 @@
+"""
+채팅 서버 벤치마크
+
+- workload: 실제 사용 비율을 흉내낸 채팅 요청 구성 (거래량/수급/섹터/개별종목)
+- chat_bench: main.app을 프로세스 안에서 실행해 요청을 재생하고 지연/처리량/도구 호출/
+  세션 DB 쓰기 시간/최대 메모리를 측정, 기준값(baseline.json)과 비교
+
+키움 API는 로컬 대역 서버(server.mock_kiwoom), 모델은 시나리오 재생 모델(ADK_MODEL=scripted)을
+사용하므로 네트워크 없이 프레임워크, 세션 저장소, 도구 처리 시간만 측정합니다.
+
+    python -m benchmarks.chat_bench --requests 200 --concurrency 8
+"""
@@ -0,0 +1,494 @@
+"""
+채팅 서버 end-to-end 벤치마크
+- 키움 대역 서버(server.mock_kiwoom)를 별도 프로세스로 띄우고, 시나리오 재생 모델로 main.app을
+  프로세스 안에서 실행 (httpx ASGI transport, lifespan 포함)
+- workload의 요청을 동시 세션 수(concurrency)만큼 병렬로 재생
+- 측정 항목
+  - 요청 지연 p50/p95/p99, 처리량 (요청/초), 실패 수
+  - 도구별 호출 수 (응답 이벤트의 function_call), api-id별 키움 호출 수 (대역 서버 통계)
+  - 세션 DB 쓰기(create_session, append_event)/읽기(get_session) 시간
+  - 최대 메모리 (peak RSS, 대역 서버 프로세스 제외)
+- --baseline 파일과 비교해 기준을 벗어나면 종료 코드 1
+  - 머신과 무관한 값은 항상 비교: 도구별 호출 수(같아야 함), 키움 호출 총수(허용 범위), 실패 수
+  - 지연/처리량/DB 시간/메모리는 실행 환경(environment)이 기준값과 같을 때만 허용 범위(--tolerance)로
+    비교하고, 다르면 참고용으로만 출력
+
+    python -m benchmarks.chat_bench                      # 측정 후 baseline.json과 비교
+    python -m benchmarks.chat_bench --update-baseline    # 측정 결과를 기준값으로 저장
+"""
+
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from .workload import ChatTurn, build_sessions
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "baseline.json"
+)
+
+# 실행 환경이 같을 때만 기준값과 비교할 항목: (경로, 높을수록 나쁜지)
+COMPARED_METRICS = [
+    (("latency_ms", "p50"), True),
+    (("latency_ms", "p95"), True),
+    (("latency_ms", "p99"), True),
+    (("throughput_rps",), False),
+    (("session_db", "write_ms_mean"), True),
+    (("peak_rss_mb",), True),
+]
+
+# 요청 조건이 같아야 기준값과 비교할 수 있는 설정
+_COMPARABLE_CONFIG = (
+    "requests",
+    "concurrency",
+    "turns_per_session",
+    "seed",
+    "kiwoom_latency_ms",
+    "model_latency_ms",
+)
+
+# 지연 시간을 비교할 수 있는 실행 환경
+_COMPARABLE_ENVIRONMENT = ("python", "platform", "cpu_count")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="채팅 서버 end-to-end 벤치마크")
+    parser.add_argument("--requests", type=int, default=200, help="측정할 요청 수")
+    parser.add_argument("--concurrency", type=int, default=8, help="동시 세션 수")
+    parser.add_argument(
+        "--turns-per-session", type=int, default=4, help="세션당 이어서 보낼 요청 수"
+    )
+    parser.add_argument("--warmup", type=int, default=8, help="측정 전 워밍업 요청 수")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--kiwoom-latency-ms", type=float, default=20, help="키움 대역 서버 응답 지연"
+    )
+    parser.add_argument(
+        "--model-latency-ms", type=float, default=0, help="시나리오 재생 모델 응답 지연"
+    )
+    parser.add_argument(
+        "--db-url", help="세션 DB URL (기본값: 임시 디렉터리의 SQLite 파일)"
+    )
+    parser.add_argument("--output", help="측정 결과 JSON 저장 경로")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="기준값 JSON 경로")
+    parser.add_argument(
+        "--update-baseline", action="store_true", help="측정 결과를 기준값으로 저장"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="기준값 대비 허용 변화율 (0.2 = 20%%)",
+    )
+    return parser.parse_args(argv)
+
+
+def percentile(values: List[float], q: float) -> float:
+    """nearest-rank 백분위수"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(int(round(q / 100 * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+def _summary(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "mean": round(sum(values) / len(values), 2),
+        "p50": round(percentile(values, 50), 2),
+        "p95": round(percentile(values, 95), 2),
+        "p99": round(percentile(values, 99), 2),
+        "max": round(max(values), 2),
+    }
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_mock_kiwoom(port: int, latency_ms: float) -> subprocess.Popen:
+    """키움 대역 서버를 별도 프로세스로 실행하고 응답할 때까지 기다립니다."""
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "server.mock_kiwoom",
+            "--port",
+            str(port),
+            "--latency-ms",
+            str(latency_ms),
+        ],
+        cwd=ROOT_DIR,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("키움 대역 서버 실행에 실패했습니다.")
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/mock/stats", timeout=1)
+            return process
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("키움 대역 서버가 응답하지 않습니다.")
+
+
+class TimedCalls:
+    """세션 서비스 메서드의 호출 시간을 기록합니다 (인스턴스 속성으로 감쌈)."""
+
+    def __init__(self):
+        self.durations: Dict[str, List[float]] = {}
+
+    def wrap(self, target: Any, name: str) -> None:
+        method: Callable[..., Awaitable[Any]] = getattr(target, name)
+        durations = self.durations.setdefault(name, [])
+
+        async def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return await method(*args, **kwargs)
+            finally:
+                durations.append((time.perf_counter() - started) * 1000)
+
+        setattr(target, name, timed)
+
+    def reset(self) -> None:
+        for durations in self.durations.values():
+            durations.clear()
+
+
+def _tool_calls(messages: List[Dict[str, Any]]) -> Counter:
+    calls: Counter = Counter()
+    for message in messages:
+        for part in (message.get("content") or {}).get("parts") or []:
+            call = part.get("functionCall") or part.get("function_call")
+            if call:
+                calls[call["name"]] += 1
+    return calls
+
+
+async def _replay(
+    client: httpx.AsyncClient,
+    sessions: List[List[ChatTurn]],
+    concurrency: int,
+    user_prefix: str,
+) -> Dict[str, Any]:
+    latencies: List[float] = []
+    by_category: Dict[str, List[float]] = {}
+    tool_calls: Counter = Counter()
+    errors: Counter = Counter()
+    queue: asyncio.Queue = asyncio.Queue()
+    for index, turns in enumerate(sessions):
+        queue.put_nowait((index, turns))
+
+    async def worker():
+        while not queue.empty():
+            index, turns = queue.get_nowait()
+            session_id = None
+            for turn in turns:
+                started = time.perf_counter()
+                try:
+                    response = await client.post(
+                        "/api/v1/adk/chat",
+                        json={
+                            "user_id": f"{user_prefix}-{index % concurrency}",
+                            "message": turn.message,
+                            "session_id": session_id,
+                            "stock_code": turn.stock_code,
+                        },
+                    )
+                except Exception as e:
+                    errors[type(e).__name__] += 1
+                    continue
+                elapsed = (time.perf_counter() - started) * 1000
+                if response.status_code != 200:
+                    errors[str(response.status_code)] += 1
+                    continue
+                body = response.json()
+                session_id = body["session_id"]
+                latencies.append(elapsed)
+                by_category.setdefault(turn.category, []).append(elapsed)
+                tool_calls.update(_tool_calls(body["messages"]))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(concurrency, 1))))
+    return {
+        "wall_seconds": time.perf_counter() - started,
+        "latencies": latencies,
+        "by_category": by_category,
+        "tool_calls": tool_calls,
+        "errors": errors,
+    }
+
+
+async def run_benchmark(
+    args: argparse.Namespace, kiwoom_url: str, data_dir: str
+) -> Dict[str, Any]:
+    """main.app을 불러와 워밍업 후 요청을 재생하고 측정 결과를 반환합니다."""
+    # 환경변수는 main/stock 모듈을 불러오기 전에 설정해야 적용됨
+    os.environ["ADK_MODEL"] = "scripted"
+    os.environ["ADK_SCRIPTED_LLM_LATENCY_MS"] = str(args.model_latency_ms)
+    os.environ["KIWOOM_BASE_URL"] = kiwoom_url
+    os.environ.setdefault("KIWOOM_APPKEY", "benchmark")
+    os.environ.setdefault("KIWOOM_SECRETKEY", "benchmark")
+    os.environ["ADK_SESSION_DB_URL"] = args.db_url
+    # 일봉 저장소는 실행마다 비어 있는 상태에서 시작 (개발용 저장소 사용 안 함)
+    os.environ["KIWOOM_CHART_STORE_PATH"] = os.path.join(
+        data_dir, "kiwoom-chart.sqlite"
+    )
+    # 도구 스키마 경고 등 요청마다 반복되는 로그 제외
+    logging.getLogger("google_adk").setLevel(logging.ERROR)
+
+    import main
+
+    timed = TimedCalls()
+    for name in ("create_session", "append_event", "get_session"):
+        timed.wrap(main.session_service, name)
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with main.app.router.lifespan_context(main.app):
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://benchmark", timeout=None
+        ) as client:
+            if args.warmup > 0:
+                await _replay(
+                    client,
+                    build_sessions(args.warmup, args.turns_per_session, args.seed + 1),
+                    args.concurrency,
+                    "warmup",
+                )
+            timed.reset()
+            rss_before = _peak_rss_mb()
+            kiwoom_before = httpx.get(f"{kiwoom_url}/mock/stats").json()["calls"]
+            result = await _replay(
+                client,
+                build_sessions(args.requests, args.turns_per_session, args.seed),
+                args.concurrency,
+                "bench",
+            )
+            kiwoom_after = httpx.get(f"{kiwoom_url}/mock/stats").json()["calls"]
+
+    writes = timed.durations["create_session"] + timed.durations["append_event"]
+    kiwoom_calls = {
+        api_id: count - kiwoom_before.get(api_id, 0)
+        for api_id, count in sorted(kiwoom_after.items())
+        if count - kiwoom_before.get(api_id, 0)
+    }
+    completed = len(result["latencies"])
+    return {
+        "config": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "turns_per_session": args.turns_per_session,
+            "warmup": args.warmup,
+            "seed": args.seed,
+            "kiwoom_latency_ms": args.kiwoom_latency_ms,
+            "model_latency_ms": args.model_latency_ms,
+            "db": args.db_url.split(":", 1)[0],
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "completed": completed,
+        "errors": dict(result["errors"]),
+        "wall_seconds": round(result["wall_seconds"], 3),
+        "throughput_rps": round(completed / result["wall_seconds"], 2),
+        "latency_ms": _summary(result["latencies"]),
+        "latency_ms_by_category": {
+            category: _summary(values)
+            for category, values in sorted(result["by_category"].items())
+        },
+        "tool_calls": dict(sorted(result["tool_calls"].items())),
+        "kiwoom_calls": kiwoom_calls,
+        "session_db": {
+            "writes": len(writes),
+            "write_ms_total": round(sum(writes), 1),
+            "write_ms_mean": round(sum(writes) / len(writes), 3) if writes else 0,
+            "write_ms_p95": round(percentile(writes, 95), 3),
+            "append_event_ms": _summary(timed.durations["append_event"]),
+            "get_session_ms": _summary(timed.durations["get_session"]),
+        },
+        "peak_rss_mb": _peak_rss_mb(),
+        "rss_growth_mb": round(_peak_rss_mb() - rss_before, 1),
+    }
+
+
+def _metric(data: Dict[str, Any], path) -> Optional[float]:
+    for key in path:
+        if not isinstance(data, dict) or key not in data:
+            return None
+        data = data[key]
+    return data
+
+
+def environment_mismatch(result: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """기준값과 다른 실행 환경 항목 (있으면 지연 시간 등은 비교하지 않음)"""
+    return [
+        key
+        for key in _COMPARABLE_ENVIRONMENT
+        if baseline.get("environment", {}).get(key) != result["environment"][key]
+    ]
+
+
+def timing_changes(
+    result: Dict[str, Any], baseline: Dict[str, Any], tolerance: float
+) -> List[str]:
+    """지연/처리량/DB 시간/메모리 중 기준값 대비 허용 범위를 벗어난 항목"""
+    changes = []
+    for path, higher_is_worse in COMPARED_METRICS:
+        current, expected = _metric(result, path), _metric(baseline, path)
+        if not current or not expected:
+            continue
+        change = (current - expected) / expected
+        if (change > tolerance) if higher_is_worse else (change < -tolerance):
+            changes.append(f"{'.'.join(path)}: {expected} -> {current} ({change:+.0%})")
+    return changes
+
+
+def compare(
+    result: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerance: float,
+    timing: bool = True,
+) -> List[str]:
+    """
+    기준값 대비 기준을 벗어난 항목을 반환합니다.
+    - 도구 호출 수는 같아야 함 (같은 설정이면 요청 순서가 같으므로 호출 수도 같음)
+    - 키움 호출 총수는 허용 범위 이내 (캐시 만료/요청 병합 시점에 따라 조금씩 달라짐)
+    - 실패가 없어야 함
+    - timing이 True면 지연/처리량/DB 시간/메모리도 허용 범위 이내
+    """
+    regressions = timing_changes(result, baseline, tolerance) if timing else []
+
+    kiwoom_total = sum(result["kiwoom_calls"].values())
+    expected_total = sum(baseline.get("kiwoom_calls", {}).values())
+    if expected_total and kiwoom_total > expected_total * (1 + tolerance):
+        regressions.append(f"kiwoom_calls: {expected_total} -> {kiwoom_total}")
+    for name in sorted(set(result["tool_calls"]) | set(baseline.get("tool_calls", {}))):
+        current = result["tool_calls"].get(name, 0)
+        expected = baseline.get("tool_calls", {}).get(name, 0)
+        if current != expected:
+            regressions.append(f"tool_calls.{name}: {expected} -> {current}")
+    if result["errors"]:
+        regressions.append(f"errors: {result['errors']}")
+    return regressions
+
+
+def _print_report(result: Dict[str, Any]) -> None:
+    latency = result["latency_ms"]
+    print(
+        f"requests={result['completed']} errors={sum(result['errors'].values())} "
+        f"throughput={result['throughput_rps']} req/s"
+    )
+    print(
+        f"latency ms: p50={latency.get('p50')} p95={latency.get('p95')} "
+        f"p99={latency.get('p99')} max={latency.get('max')}"
+    )
+    for category, summary in result["latency_ms_by_category"].items():
+        print(
+            f"  {category}: n={summary['count']} p50={summary['p50']} p95={summary['p95']}"
+        )
+    db = result["session_db"]
+    print(
+        f"session db: writes={db['writes']} total={db['write_ms_total']}ms "
+        f"mean={db['write_ms_mean']}ms p95={db['write_ms_p95']}ms"
+    )
+    print(f"peak rss: {result['peak_rss_mb']} MB (+{result['rss_growth_mb']} MB)")
+    print(f"tool calls: {result['tool_calls']}")
+    print(f"kiwoom calls: {result['kiwoom_calls']}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    temp_dir = tempfile.TemporaryDirectory()
+    if not args.db_url:
+        args.db_url = f"sqlite:///{temp_dir.name}/benchmark.sqlite"
+
+    port = _free_port()
+    mock = start_mock_kiwoom(port, args.kiwoom_latency_ms)
+    try:
+        result = asyncio.run(
+            run_benchmark(args, f"http://127.0.0.1:{port}", temp_dir.name)
+        )
+    finally:
+        mock.terminate()
+        mock.wait()
+        temp_dir.cleanup()
+
+    _print_report(result)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"기준값 저장: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("기준값 파일이 없습니다. --update-baseline으로 먼저 저장하세요.")
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    mismatched = [
+        key
+        for key in _COMPARABLE_CONFIG
+        if baseline.get("config", {}).get(key) != result["config"][key]
+    ]
+    if mismatched:
+        print(f"기준값과 설정이 달라 비교하지 않습니다: {', '.join(mismatched)}")
+        return 0
+
+    # 지연 시간 등은 머신에 따라 다르므로 같은 실행 환경에서 측정한 기준값과만 비교
+    different = environment_mismatch(result, baseline)
+    if different:
+        print(
+            "기준값과 실행 환경이 달라 지연/처리량/메모리는 비교하지 않습니다: "
+            + ", ".join(different)
+        )
+        for line in timing_changes(result, baseline, args.tolerance):
+            print(f"  (참고) {line}")
+
+    regressions = compare(result, baseline, args.tolerance, timing=not different)
+    if regressions:
+        print("기준값 대비 성능 저하:")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+    print(f"기준값 대비 허용 범위 이내 (±{args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+벤치마크 요청 구성
+- 카테고리별 비율(weight)에 따라 메시지를 뽑아 세션 단위 대화를 만듦
+- 같은 seed면 항상 같은 요청 순서가 만들어져 결과를 기준값과 비교할 수 있음
+- 카테고리는 시나리오 재생 모델의 기본 시나리오(stock/utils/scripted_llm.py)와 대응
+"""
+
+from typing import Dict, List, NamedTuple, Optional
+import random
+
+# 카테고리별 비율과 메시지 (stock_codes가 있으면 프론트처럼 stock_code를 함께 전송)
+WORKLOAD_MIX: Dict[str, Dict] = {
+    "volume": {
+        "weight": 0.3,
+        "messages": [
+            "거래량 급등한 종목 알려줘",
+            "오늘 거래량 상위 종목은?",
+            "코스닥 거래량 급증 종목 보여줘",
+            "모멘텀 강한 종목 찾아줘",
+        ],
+    },
+    "supply_demand": {
+        "weight": 0.25,
+        "messages": [
+            "기관이 많이 사는 종목",
+            "외국인 순매수 상위 종목 알려줘",
+            "요즘 수급 좋은 종목은?",
+        ],
+    },
+    "sector": {
+        "weight": 0.2,
+        "messages": [
+            "반도체 섹터 분석해줘",
+            "오늘 강한 테마는?",
+            "업종별 등락 현황 알려줘",
+        ],
+    },
+    "stock_analysis": {
+        "weight": 0.25,
+        "messages": ["보유 종목 분석해줘", "이 종목 지금 사도 될까?"],
+        "stock_codes": ["005930", "000660", "373220", "005380", "000270"],
+    },
+}
+
+
+class ChatTurn(NamedTuple):
+    """벤치마크 요청 하나"""
+
+    category: str
+    message: str
+    stock_code: Optional[str] = None
+
+
+def build_sessions(
+    total_requests: int, turns_per_session: int, seed: int = 42
+) -> List[List[ChatTurn]]:
+    """
+    전체 요청을 세션별 대화로 나눠 만듭니다.
+
+    Args:
+        total_requests: 전체 요청 수
+        turns_per_session: 세션 하나에서 이어서 보낼 요청 수
+        seed: 난수 시드
+
+    Returns:
+        List: 세션별 요청 목록
+    """
+    rng = random.Random(seed)
+    categories = list(WORKLOAD_MIX)
+    weights = [WORKLOAD_MIX[name]["weight"] for name in categories]
+
+    turns = []
+    for _ in range(total_requests):
+        category = rng.choices(categories, weights)[0]
+        spec = WORKLOAD_MIX[category]
+        codes = spec.get("stock_codes")
+        turns.append(
+            ChatTurn(
+                category,
+                rng.choice(spec["messages"]),
+                rng.choice(codes) if codes else None,
+            )
+        )
+
+    size = max(turns_per_session, 1)
+    return [turns[start : start + size] for start in range(0, len(turns), size)]
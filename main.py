@@ -1,36 +1,92 @@
-from typing import List, Optional, Any
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Any, Tuple
 from dotenv import load_dotenv
+from google.adk.agents.run_config import RunConfig, StreamingMode
+from google.adk.events import Event
 from google.adk.runners import Runner
-from fastapi import FastAPI, HTTPException
+from fastapi import (
+    FastAPI,
+    Header,
+    HTTPException,
+    Query,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+)
 from fastapi.middleware.cors import CORSMiddleware
-from google.adk.sessions.database_session_service import DatabaseSessionService
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 import uvicorn
 from google.genai import types
 import vertexai
+import asyncio
+import json
 import os
+import re
 import traceback
 import urllib.parse
+from contextlib import aclosing, asynccontextmanager
 from datetime import datetime
 
-from stock.agent import root_agent
-
-
-# 환경변수 로드
+# 환경변수 로드 (모듈 로드 시 환경변수를 읽는 server/stock 모듈보다 먼저)
 load_dotenv()
 
-db_path = "sqlite:///database/adk-db.sqlite"
-session_service = DatabaseSessionService(db_path)
+from server import compaction, session_queries
+from server.session_store import create_session_service
+from stock.agent import instruction_override, root_agent
+from stock.utils.context_window import context_stats
+from stock.utils.fast_route import (
+    FAST_ROUTE_AGENTS,
+    ROOT_AGENT_NAME,
+    RoutedRunner,
+    route_message,
+)
+from stock.utils.metrics import configure_tracing, render_metrics, track_run
+from stock.utils.traces import should_record, trace_buffer
+from stock.utils.tools import kiwoom_ranking_snapshots
+from stock.utils.tools.kiwoom_cache import response_cache
+from stock.utils.tools.kiwoom_rate_limiter import rate_limiter
+from stock.utils.tools.kiwoom_ranking_query import ranking_store
+from stock.utils.tools.kiwoom_slimming import slimming_stats
+
+# 세션 저장소 (ADK_SESSION_DB_URL, 기본값: database/adk-db.sqlite)
+session_service = create_session_service()
 
 APP_NAME = "geo-project"
 PROJECT_ID = os.getenv("GOOGLE_CLOUD_PROJECT", "geo-project-467010")
 LOCATION = os.getenv("GOOGLE_CLOUD_LOCATION", "us-central1")
 STAGING_BUCKET = "gs://geo-project-adk-staging"
 
+# 스트리밍 설정: 이벤트 대기열 크기 (가득 차면 에이전트 실행을 잠시 멈춤), keep-alive 간격 (초)
+STREAM_QUEUE_SIZE = int(os.getenv("ADK_STREAM_QUEUE_SIZE", "64"))
+STREAM_HEARTBEAT_SECONDS = float(os.getenv("ADK_STREAM_HEARTBEAT_SECONDS", "15"))
+
 # vertexai 초기화
 vertexai.init(project=PROJECT_ID, location=LOCATION, staging_bucket=STAGING_BUCKET)
 
-app = FastAPI(title="ADK Agent API")
+# OpenTelemetry span 내보내기 (ADK_TRACE_EXPORTER가 설정된 경우)
+configure_tracing()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 서버 실행 중 백그라운드 작업 (종료 시 취소)
+    background_tasks = []
+    if compaction.COMPACTION_INTERVAL_HOURS > 0:
+        background_tasks.append(
+            asyncio.create_task(compaction.compaction_loop(session_service))
+        )
+    if kiwoom_ranking_snapshots.KIWOOM_SNAPSHOT_ENABLED:
+        background_tasks.append(
+            asyncio.create_task(kiwoom_ranking_snapshots.snapshot_loop())
+        )
+    try:
+        yield
+    finally:
+        for task in background_tasks:
+            task.cancel()
+
+
+app = FastAPI(title="ADK Agent API", lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -46,6 +102,15 @@ runner = Runner(
     session_service=session_service,
 )
 
+# 의도가 분명한 요청을 바로 처리할 서브 에이전트별 Runner (같은 세션 저장소 사용)
+agent_runners = {ROOT_AGENT_NAME: runner}
+for agent_name in FAST_ROUTE_AGENTS:
+    agent_runners[agent_name] = RoutedRunner(
+        agent=root_agent.find_agent(agent_name),
+        app_name=APP_NAME,
+        session_service=session_service,
+    )
+
 
 class ChatRequest(BaseModel):
     user_id: str
@@ -58,6 +123,7 @@ class ChatRequest(BaseModel):
 class ChatResponse(BaseModel):
     session_id: str
     messages: List[Any]  # Event 객체를 허용하도록 Any 타입 사용
+    trace_id: Optional[str] = None  # 실행을 기록한 경우 /api/v1/adk/traces/{trace_id}
 
     class Config:
         arbitrary_types_allowed = True  # 커스텀 타입 허용
@@ -72,70 +138,103 @@ class SessionInfo(BaseModel):
 
 class SessionsListResponse(BaseModel):
     sessions: List[SessionInfo]
+    next_cursor: Optional[str] = None  # 다음 페이지 조회용 (없으면 마지막 페이지)
 
 
 class SessionEventsResponse(BaseModel):
     session_id: str
-    events: List[Any]  # 원본 Event 객체를 그대로 반환
+    # 원본 Event 객체를 그대로 반환 (view가 full이 아니면 축약된 dict)
+    events: List[Any]
+    has_more: bool = False
+    next_before: Optional[float] = None  # 이전 이벤트 조회용 before 값
+    next_before_id: Optional[str] = None  # 이전 이벤트 조회용 before_id 값
+    next_after: Optional[float] = None  # 이후 이벤트 조회용 after 값
+    next_after_id: Optional[str] = None  # 이후 이벤트 조회용 after_id 값
 
     class Config:
         arbitrary_types_allowed = True  # 커스텀 타입 허용
 
 
-@app.post("/api/v1/adk/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
-    try:
-        # 세션 관리
-        if request.session_id:
-            try:
-                # 기존 세션 조회
-                session = await session_service.get_session(
-                    app_name=APP_NAME,
-                    user_id=request.user_id,
-                    session_id=request.session_id,
-                )
-                if not session:
-                    # 세션이 없으면 새로 생성
-                    session = await session_service.create_session(
-                        app_name=APP_NAME, user_id=request.user_id
-                    )
-            except Exception as e:
-                print(f"Session error: {str(e)}")
-                print(traceback.format_exc())
-                # 세션 조회/생성 실패 시 새로운 세션 생성
+async def _get_or_create_session(request: ChatRequest):
+    """요청의 세션을 조회하고, 없거나 조회에 실패하면 새로 생성합니다."""
+    if request.session_id:
+        try:
+            # 기존 세션 조회
+            session = await session_service.get_session(
+                app_name=APP_NAME,
+                user_id=request.user_id,
+                session_id=request.session_id,
+            )
+            if not session:
+                # 세션이 없으면 새로 생성
                 session = await session_service.create_session(
                     app_name=APP_NAME, user_id=request.user_id
                 )
-        else:
-            # 세션 ID가 없는 경우 새로운 세션 생성
+        except Exception as e:
+            print(f"Session error: {str(e)}")
+            print(traceback.format_exc())
+            # 세션 조회/생성 실패 시 새로운 세션 생성
             session = await session_service.create_session(
                 app_name=APP_NAME, user_id=request.user_id
             )
+    else:
+        # 세션 ID가 없는 경우 새로운 세션 생성
+        session = await session_service.create_session(
+            app_name=APP_NAME, user_id=request.user_id
+        )
+    return session
 
-        runner.agent.instruction = request.instruction
 
-        # 종목 코드가 있으면 메시지에 추가
-        message_text = request.message
-        if request.stock_code:
-            message_text = f"종목코드: {request.stock_code}\n{request.message}"
-        else:
-            # 메시지에서 종목코드 패턴 찾기 (6자리 숫자)
-            import re
+def _build_content(request: ChatRequest) -> types.Content:
+    """사용자 메시지를 만듭니다. 종목코드가 있으면 메시지 앞에 붙입니다."""
+    message_text = request.message
+    if request.stock_code:
+        message_text = f"종목코드: {request.stock_code}\n{request.message}"
+    else:
+        # 메시지에서 종목코드 패턴 찾기 (6자리 숫자)
+        stock_code_match = re.search(r"\b(\d{6})\b", request.message)
+        if stock_code_match:
+            stock_code = stock_code_match.group(1)
+            message_text = f"종목코드: {stock_code}\n{request.message}"
 
-            stock_code_match = re.search(r"\b(\d{6})\b", request.message)
-            if stock_code_match:
-                stock_code = stock_code_match.group(1)
-                message_text = f"종목코드: {stock_code}\n{request.message}"
+    return types.Content(role="user", parts=[types.Part(text=message_text)])
 
-        content = types.Content(role="user", parts=[types.Part(text=message_text)])
 
-        # 비동기로 실행
+def _select_runner(request: ChatRequest) -> Runner:
+    """
+    요청을 처리할 Runner를 고릅니다.
+    프론트에서 보낸 종목코드나 키워드로 의도가 분명하면 루트 에이전트 모델 호출 없이 서브 에이전트를 바로 실행합니다.
+    """
+    agent_name = route_message(request.message, request.stock_code, request.instruction)
+    return agent_runners[agent_name]
+
+
+@app.post("/api/v1/adk/chat", response_model=ChatResponse)
+async def chat(request: ChatRequest, x_adk_trace: Optional[str] = Header(None)):
+    """X-ADK-Trace: 1 헤더를 보내면 실행 waterfall을 기록하고 trace_id를 함께 반환합니다."""
+    try:
+        session = await _get_or_create_session(request)
+
+        content = _build_content(request)
+        agent_runner = _select_runner(request)
+
+        # 비동기로 실행 (지시문은 이 요청에만 적용)
         messages = []
         try:
-            async for event in runner.run_async(
-                user_id=request.user_id, session_id=session.id, new_message=content
+            with (
+                instruction_override(request.instruction),
+                track_run(
+                    "chat",
+                    session.id,
+                    request.user_id,
+                    record=should_record(x_adk_trace),
+                ) as run,
             ):
-                messages.append(event)
+                async for event in agent_runner.run_async(
+                    user_id=request.user_id, session_id=session.id, new_message=content
+                ):
+                    run.observe(event)
+                    messages.append(event)
         except Exception as e:
             print(f"Runner error: {str(e)}")
             print(traceback.format_exc())
@@ -153,7 +252,9 @@ async def chat(request: ChatRequest):
                 status_code=500, detail="No response generated from the agent"
             )
 
-        return ChatResponse(session_id=session.id, messages=messages)
+        return ChatResponse(
+            session_id=session.id, messages=messages, trace_id=run.trace_id
+        )
     except HTTPException as he:
         raise he
     except Exception as e:
@@ -169,17 +270,255 @@ async def chat(request: ChatRequest):
         )
 
 
+def _event_payloads(event: Event) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Event를 스트리밍 메시지로 변환합니다.
+    - delta: 모델이 생성 중인 부분 텍스트
+    - tool_call / tool_result: 도구 호출 진행 상황 (결과 본문은 제외)
+    - event: 완성된 Event (/chat 응답의 messages 항목과 같은 형식)
+    """
+    if event.partial:
+        text = "".join(
+            part.text
+            for part in (event.content.parts if event.content else []) or []
+            if part.text
+        )
+        return [("delta", {"author": event.author, "text": text})] if text else []
+
+    payloads = []
+    for call in event.get_function_calls():
+        payloads.append(
+            (
+                "tool_call",
+                {"author": event.author, "name": call.name, "args": call.args},
+            )
+        )
+    for response in event.get_function_responses():
+        payloads.append(
+            ("tool_result", {"author": event.author, "name": response.name})
+        )
+    payloads.append(
+        ("event", event.model_dump(mode="json", exclude_none=True, by_alias=True))
+    )
+    return payloads
+
+
+async def _stream_chat(
+    request: ChatRequest, record: bool = False
+) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """
+    에이전트 실행 이벤트를 생성되는 즉시 (종류, 데이터)로 내보냅니다.
+    record가 True면 실행 waterfall을 기록하고 done 메시지에 trace_id를 포함합니다.
+
+    에이전트는 별도 태스크에서 실행하고 크기가 제한된 대기열로 전달하므로,
+    클라이언트가 느리면 대기열이 가득 차 에이전트 실행이 잠시 멈춥니다.
+    소비자가 중단되면 (클라이언트 연결 종료) 실행 태스크를 취소해
+    진행 중인 모델 호출과 키움 API 요청도 함께 중단됩니다.
+    """
+    session = await _get_or_create_session(request)
+    yield "session", {"session_id": session.id}
+
+    content = _build_content(request)
+    agent_runner = _select_runner(request)
+    queue: asyncio.Queue = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+
+    async def produce():
+        try:
+            # 실행 태스크 안에서만 지시문을 바꾸므로 다른 요청과 섞이지 않음
+            with (
+                instruction_override(request.instruction),
+                track_run("stream", session.id, request.user_id, record) as run,
+            ):
+                async for event in agent_runner.run_async(
+                    user_id=request.user_id,
+                    session_id=session.id,
+                    new_message=content,
+                    run_config=RunConfig(streaming_mode=StreamingMode.SSE),
+                ):
+                    run.observe(event)
+                    for payload in _event_payloads(event):
+                        await queue.put(payload)
+            done = {"session_id": session.id}
+            if run.trace_id:
+                done["trace_id"] = run.trace_id
+            await queue.put(("done", done))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Runner error: {str(e)}")
+            print(traceback.format_exc())
+            await queue.put(("error", {"error": str(e), "type": type(e).__name__}))
+
+    task = asyncio.create_task(produce())
+    try:
+        while True:
+            try:
+                kind, data = await asyncio.wait_for(
+                    queue.get(), timeout=STREAM_HEARTBEAT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                # 긴 도구 호출 중 프록시가 연결을 끊지 않도록 keep-alive
+                yield "ping", {}
+                continue
+            yield kind, data
+            if kind in ("done", "error"):
+                break
+    finally:
+        if not task.done():
+            task.cancel()
+
+
+def _sse(kind: str, data: Dict[str, Any]) -> str:
+    if kind == "ping":
+        return ": ping\n\n"
+    return (
+        f"event: {kind}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+    )
+
+
+@app.post("/api/v1/adk/chat/stream")
+async def chat_stream(request: ChatRequest, x_adk_trace: Optional[str] = Header(None)):
+    """
+    /chat의 Server-Sent Events 버전.
+    session → (delta | tool_call | tool_result | event)* → done | error 순서로 전송합니다.
+    """
+    record = should_record(x_adk_trace)
+
+    async def body():
+        async for kind, data in _stream_chat(request, record):
+            yield _sse(kind, data)
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.websocket("/api/v1/adk/chat/ws")
+async def chat_websocket(websocket: WebSocket):
+    """
+    /chat의 WebSocket 버전.
+    클라이언트가 ChatRequest JSON을 보내면 {"type", "data"} 메시지를 SSE와 같은 순서로 전송합니다.
+    실행 중 {"type": "cancel"}을 보내면 실행을 중단합니다. 실행 중 보낸 다른 메시지는
+    대기열에 넣고(queued 메시지로 알림) 실행이 끝난 뒤 차례로 처리합니다.
+    연결 시 X-ADK-Trace 헤더를 보내면 이 연결의 요청을 모두 기록합니다.
+    """
+    trace_header = websocket.headers.get("x-adk-trace")
+    await websocket.accept()
+    pending: List[str] = []
+    try:
+        while True:
+            text = pending.pop(0) if pending else await websocket.receive_text()
+            if _is_cancel(text):
+                continue  # 실행 중이 아니면 무시
+            try:
+                request = ChatRequest(**json.loads(text))
+            except (ValueError, TypeError) as e:
+                await websocket.send_json({"type": "error", "data": {"error": str(e)}})
+                continue
+
+            stream = _stream_chat(request, should_record(trace_header))
+            try:
+                async with aclosing(
+                    _until_cancelled(stream, websocket.receive_text, pending)
+                ) as messages:
+                    async for kind, data in messages:
+                        await websocket.send_json({"type": kind, "data": data})
+            finally:
+                await stream.aclose()
+    except WebSocketDisconnect:
+        pass
+
+
+def _is_cancel(text: str) -> bool:
+    try:
+        message = json.loads(text)
+    except ValueError:
+        return False
+    return isinstance(message, dict) and message.get("type") == "cancel"
+
+
+async def _until_cancelled(
+    stream: AsyncIterator[Tuple[str, Dict[str, Any]]],
+    receive: Callable[[], Awaitable[str]],
+    pending: List[str],
+) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """
+    스트림을 전달하다가 클라이언트가 cancel을 보내거나 연결을 끊으면 멈춥니다.
+    그 밖의 메시지는 pending에 쌓아 두고 queued를 보냅니다 (실행은 계속).
+    """
+    incoming = asyncio.ensure_future(receive())
+    next_item: Optional[asyncio.Future] = None
+    try:
+        while True:
+            if next_item is None:
+                next_item = asyncio.ensure_future(stream.__anext__())
+            await asyncio.wait(
+                {next_item, incoming}, return_when=asyncio.FIRST_COMPLETED
+            )
+            if incoming.done():
+                text = incoming.result()  # 연결 종료면 WebSocketDisconnect 발생
+                if _is_cancel(text):
+                    # 실행 중인 __anext__가 끝난 뒤에야 스트림을 닫을 수 있음
+                    await _stop(next_item)
+                    next_item = None
+                    yield "cancelled", {}
+                    return
+                pending.append(text)
+                incoming = asyncio.ensure_future(receive())
+                yield "queued", {"pending": len(pending)}
+                continue
+            try:
+                kind, data = next_item.result()
+            except StopAsyncIteration:
+                return
+            next_item = None
+            yield kind, data
+    finally:
+        incoming.cancel()
+        if next_item is not None:
+            await _stop(next_item)
+
+
+async def _stop(future: asyncio.Future) -> None:
+    """태스크를 취소하고 실제로 끝날 때까지 기다립니다 (결과/예외는 버림)."""
+    future.cancel()
+    await asyncio.wait({future})
+    if not future.cancelled():
+        future.exception()
+
+
 @app.get("/api/v1/adk/sessions/{user_id}", response_model=SessionsListResponse)
-async def get_user_sessions(user_id: str):
-    """특정 사용자의 모든 세션 리스트를 반환합니다."""
+async def get_user_sessions(
+    user_id: str,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=200),
+    cursor: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+):
+    """
+    특정 사용자의 세션 리스트를 최근 수정순으로 반환합니다.
+    limit을 지정하면 페이지 단위로 반환하며, 다음 페이지는 응답의 next_cursor로 조회합니다.
+    """
     try:
         # URL 디코딩 처리 (google-oauth2%7C106148396882803932962 -> google-oauth2|106148396882803932962)
         decoded_user_id = urllib.parse.unquote(user_id)
 
-        # session_service의 편의 메서드를 사용하여 세션 리스트 가져오기
-        sessions = await session_service.get_user_sessions(
-            app_name=APP_NAME, user_id=decoded_user_id
+        # 세션 목록이 바뀌지 않았으면 조회 없이 304 반환
+        etag = await session_queries.sessions_etag(
+            session_service, APP_NAME, decoded_user_id, limit, cursor
         )
+        if session_queries.etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+
+        try:
+            sessions, next_cursor = await session_queries.list_sessions_page(
+                session_service, APP_NAME, decoded_user_id, limit, cursor
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
         # Session 객체들을 SessionInfo 모델로 변환
         session_infos = []
@@ -206,7 +545,9 @@ async def get_user_sessions(user_id: str):
             )
             session_infos.append(session_info)
 
-        return SessionsListResponse(sessions=session_infos)
+        return SessionsListResponse(sessions=session_infos, next_cursor=next_cursor)
+    except HTTPException as he:
+        raise he
     except Exception as e:
         print(f"Sessions list error: {str(e)}")
         print(traceback.format_exc())
@@ -220,6 +561,72 @@ async def get_user_sessions(user_id: str):
         )
 
 
+@app.get("/api/v1/adk/stats/context")
+async def get_context_stats():
+    """에이전트별 요청당 대화 기록 토큰 수 (정리 전/후 추정치, 모델 보고값)"""
+    return context_stats.get_stats()
+
+
+@app.get("/api/v1/adk/stats/tools")
+async def get_tool_stats():
+    """도구별 응답 슬림화 전/후 바이트와 절약한 토큰 추정치"""
+    return slimming_stats.get_stats()
+
+
+@app.get("/api/v1/adk/stats/cache")
+async def get_cache_stats():
+    """키움 응답 캐시 크기와 api-id별 hit/miss (SQLite 백엔드는 워커 스레드에서 조회)"""
+    return await asyncio.to_thread(response_cache.get_stats)
+
+
+@app.get("/api/v1/adk/stats/rate-limits")
+async def get_rate_limit_stats():
+    """키움 엔드포인트 그룹별 대기열 길이, 대기 시간, 재시도 통계"""
+    return rate_limiter.get_stats()
+
+
+@app.get("/api/v1/adk/stats/rankings")
+async def get_ranking_stats():
+    """순위 스냅샷 버전/경과 시간과 순위 리스트 재사용 통계"""
+    return {
+        "snapshot_enabled": kiwoom_ranking_snapshots.KIWOOM_SNAPSHOT_ENABLED,
+        "snapshot_interval_seconds": kiwoom_ranking_snapshots.snapshot_interval(),
+        "snapshots": kiwoom_ranking_snapshots.snapshot_store.get_stats(),
+        "reuse": ranking_store.get_stats(),
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """
+    Prometheus 형식 지표
+    - 키움 도구/API: 실행 시간, return_code, 응답 행 수/바이트, 캐시 적중 (api-id별)
+    - 에이전트 실행 시간, 모델/도구 단계 시간, 세션 DB 작업 시간
+    """
+    return PlainTextResponse(
+        render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+@app.get("/api/v1/adk/traces")
+async def get_traces():
+    """보관 중인 실행 trace 요약 (최근순, span 목록 제외)"""
+    return {"traces": trace_buffer.list()}
+
+
+@app.get("/api/v1/adk/traces/{trace_id}")
+async def get_trace(trace_id: str):
+    """
+    실행 한 건의 waterfall
+    - spans: 시작 시각 순 span (depth, start_ms, duration_ms, self_ms, attributes)
+    - slowest: 하위 span을 제외한 자체 시간이 긴 span
+    """
+    trace = trace_buffer.get(trace_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail="Trace not found")
+    return trace
+
+
 @app.post("/api/v1/adk/test/stock-analysis")
 async def test_stock_analysis(stock_code: str, user_id: str = "test_user"):
     """종목 분석 테스트용 엔드포인트"""
@@ -229,16 +636,16 @@ async def test_stock_analysis(stock_code: str, user_id: str = "test_user"):
             app_name=APP_NAME, user_id=user_id
         )
 
-        runner.agent.instruction = None
-
         message_text = f"종목코드: {stock_code}\n이 종목 분석해줘"
         content = types.Content(role="user", parts=[types.Part(text=message_text)])
 
         messages = []
-        async for event in runner.run_async(
-            user_id=user_id, session_id=session.id, new_message=content
-        ):
-            messages.append(event)
+        with track_run("test", session.id, user_id) as run:
+            async for event in runner.run_async(
+                user_id=user_id, session_id=session.id, new_message=content
+            ):
+                run.observe(event)
+                messages.append(event)
 
         return {
             "success": True,
@@ -264,27 +671,96 @@ async def test_stock_analysis(stock_code: str, user_id: str = "test_user"):
     "/api/v1/adk/sessions/{user_id}/{session_id}/events",
     response_model=SessionEventsResponse,
 )
-async def get_session_events(user_id: str, session_id: str):
-    """특정 세션의 모든 이벤트를 반환합니다."""
+async def get_session_events(
+    user_id: str,
+    session_id: str,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    before: Optional[float] = None,
+    after: Optional[float] = None,
+    before_id: Optional[str] = None,
+    after_id: Optional[str] = None,
+    view: str = "full",
+    if_none_match: Optional[str] = Header(None),
+):
+    """
+    특정 세션의 이벤트를 시간순으로 반환합니다.
+    - limit: 최근 이벤트부터 최대 개수 (after만 지정하면 after 이후 오래된 순)
+    - before / after: 이벤트 timestamp 기준 범위 (이전 기록 더 보기 / 새 이벤트 가져오기)
+    - before_id / after_id: 같은 timestamp의 이벤트를 이벤트 ID로 구분 (응답의 next_* 값 사용)
+    - view: full(원본) | compact(도구 응답 본문 제외) | text(텍스트만)
+    """
     try:
+        if view not in session_queries.EVENT_VIEWS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"view는 {', '.join(session_queries.EVENT_VIEWS)} 중 하나여야 합니다.",
+            )
+
         # URL 디코딩 처리
         decoded_user_id = urllib.parse.unquote(user_id)
         decoded_session_id = urllib.parse.unquote(session_id)
 
-        # 세션과 이벤트들을 가져오기
-        session = await session_service.get_session(
-            app_name=APP_NAME, user_id=decoded_user_id, session_id=decoded_session_id
+        # 세션이 바뀌지 않았으면 이벤트를 읽지 않고 304 반환
+        etag = await session_queries.session_events_etag(
+            session_service,
+            APP_NAME,
+            decoded_user_id,
+            decoded_session_id,
+            limit,
+            before,
+            after,
+            before_id,
+            after_id,
+            view,
         )
-
-        if not session:
+        if etag is None:
             raise HTTPException(
                 status_code=404,
                 detail=f"Session not found: {decoded_session_id} for user {decoded_user_id}",
             )
+        if session_queries.etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+
+        events, has_more = await session_queries.list_events_page(
+            session_service,
+            APP_NAME,
+            decoded_user_id,
+            decoded_session_id,
+            limit,
+            before,
+            after,
+            before_id,
+            after_id,
+        )
+
+        # 다음 페이지 조회용 커서 (timestamp, 이벤트 ID)
+        next_before = next_after = next_before_id = next_after_id = None
+        if has_more and events:
+            if after is not None and before is None:
+                next_after, next_after_id = events[-1].timestamp, events[-1].id
+            else:
+                next_before, next_before_id = events[0].timestamp, events[0].id
+
+        # full은 원본 Event 객체를 그대로 반환
+        if view != "full":
+            events = [
+                projected
+                for projected in (
+                    session_queries.project_event(event, view) for event in events
+                )
+                if projected is not None
+            ]
 
-        # 원본 Event 객체들을 그대로 반환
         return SessionEventsResponse(
-            session_id=decoded_session_id, events=session.events
+            session_id=decoded_session_id,
+            events=events,
+            has_more=has_more,
+            next_before=next_before,
+            next_before_id=next_before_id,
+            next_after=next_after,
+            next_after_id=next_after_id,
         )
 
     except HTTPException as he:
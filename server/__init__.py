@@ -0,0 +1,7 @@
+"""
+FastAPI 서버 (main.py) 지원 모듈
+- session_store: ADK 세션 저장소 생성 (SQLite WAL / Postgres)
+- session_queries: 세션/이벤트 페이지 조회, 보기 방식, ETag
+- compaction: 세션 이벤트 압축, 오래된 세션 보관, VACUUM
+- mock_kiwoom: 오프라인 개발/부하 테스트용 로컬 키움 REST API 대역 서버
+"""
@@ -0,0 +1,388 @@
+"""
+ADK 세션 DB 정리 작업
+- 이벤트 압축: 세션별 최근 N개를 제외한 이전 이벤트에서 큰 도구 응답(function_response)을
+  요약본으로 교체 (키움 순위/차트 원본 JSON 등). 호출 id/name은 유지
+- 보관: 오래 수정되지 않은 세션을 gzip JSON 파일로 내보내고 DB에서 삭제
+- VACUUM: 삭제/축소로 생긴 빈 공간 회수
+- 실행 전후 DB 크기와 세션 로드 시간(get_session)을 통계로 반환
+
+사용 예:
+    python -m server.compaction                 # 한 번 실행
+    python -m server.compaction --dry-run       # 변경 없이 대상만 집계
+    ADK_COMPACTION_INTERVAL_HOURS=24            # 서버 실행 중 주기적으로 실행 (main.py)
+"""
+
+from google.adk.sessions.database_session_service import (
+    DatabaseSessionService,
+    StorageEvent,
+    StorageSession,
+)
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import load_only
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime
+from urllib.parse import quote
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import time
+import traceback
+
+from stock.utils.context_window import summarize_response
+
+from .session_store import create_session_service
+
+# 세션별로 원본을 유지할 최근 이벤트 수
+COMPACT_KEEP_RECENT_EVENTS = int(os.getenv("ADK_COMPACT_KEEP_RECENT_EVENTS", "20"))
+# 이보다 큰 도구 응답만 요약 (바이트)
+COMPACT_MAX_RESPONSE_BYTES = int(os.getenv("ADK_COMPACT_MAX_RESPONSE_BYTES", "2048"))
+# 이 기간 동안 수정되지 않은 세션은 보관 파일로 이동 (일, 0이면 보관하지 않음)
+ARCHIVE_AFTER_DAYS = float(os.getenv("ADK_ARCHIVE_AFTER_DAYS", "30"))
+ARCHIVE_DIR = os.getenv("ADK_ARCHIVE_DIR", "database/archive")
+# 서버 실행 중 정리 작업 주기 (시간, 0이면 실행하지 않음)
+COMPACTION_INTERVAL_HOURS = float(os.getenv("ADK_COMPACTION_INTERVAL_HOURS", "0"))
+
+# 세션 로드 시간을 측정할 세션 수 (이벤트가 많은 순)
+_LATENCY_SAMPLE_SIZE = 5
+
+
+def _json_size(value: Any) -> int:
+    return len(json.dumps(value, ensure_ascii=False, default=str).encode())
+
+
+def _compact_content(
+    content: Dict[str, Any], max_bytes: int
+) -> Tuple[Optional[Dict[str, Any]], int]:
+    """
+    이벤트 content의 큰 도구 응답을 요약합니다.
+
+    Returns:
+        Tuple: (바뀐 content 또는 None, 줄어든 바이트 수)
+    """
+    saved = 0
+    parts = []
+    for part in content.get("parts") or []:
+        response = (part.get("function_response") or {}).get("response")
+        if isinstance(response, dict) and not response.get("_compacted"):
+            size = _json_size(response)
+            if size > max_bytes:
+                compacted = summarize_response(response, size)
+                saved += size - _json_size(compacted)
+                part = {
+                    **part,
+                    "function_response": {
+                        **part["function_response"],
+                        "response": compacted,
+                    },
+                }
+        parts.append(part)
+    if saved <= 0:
+        return None, 0
+    return {**content, "parts": parts}, saved
+
+
+def _session_keys(service: DatabaseSessionService) -> List[StorageSession]:
+    with service.database_session_factory() as sql_session:
+        return (
+            sql_session.query(StorageSession)
+            .options(
+                load_only(
+                    StorageSession.app_name,
+                    StorageSession.user_id,
+                    StorageSession.id,
+                    StorageSession.update_time,
+                )
+            )
+            .all()
+        )
+
+
+def compact_events(
+    service: DatabaseSessionService,
+    keep_recent: int = COMPACT_KEEP_RECENT_EVENTS,
+    max_bytes: int = COMPACT_MAX_RESPONSE_BYTES,
+    dry_run: bool = False,
+) -> Dict[str, int]:
+    """세션별 최근 keep_recent개 이전 이벤트의 큰 도구 응답을 요약합니다."""
+    stats = {"sessions": 0, "events_compacted": 0, "payload_bytes_saved": 0}
+
+    for storage_session in _session_keys(service):
+        stats["sessions"] += 1
+        with service.database_session_factory() as sql_session:
+            rows = (
+                sql_session.query(StorageEvent)
+                .filter(StorageEvent.app_name == storage_session.app_name)
+                .filter(StorageEvent.user_id == storage_session.user_id)
+                .filter(StorageEvent.session_id == storage_session.id)
+                .order_by(StorageEvent.timestamp.desc())
+                .offset(keep_recent)
+                .all()
+            )
+            for row in rows:
+                if not row.content:
+                    continue
+                content, saved = _compact_content(row.content, max_bytes)
+                if content is None:
+                    continue
+                stats["events_compacted"] += 1
+                stats["payload_bytes_saved"] += saved
+                if not dry_run:
+                    row.content = content
+            if not dry_run:
+                sql_session.commit()
+    return stats
+
+
+def _archive_path(archive_dir: str, storage_session: StorageSession) -> str:
+    return os.path.join(
+        archive_dir,
+        quote(storage_session.app_name, safe=""),
+        quote(storage_session.user_id, safe=""),
+        f"{storage_session.id}.json.gz",
+    )
+
+
+def archive_cold_sessions(
+    service: DatabaseSessionService,
+    older_than_days: float = ARCHIVE_AFTER_DAYS,
+    archive_dir: str = ARCHIVE_DIR,
+    dry_run: bool = False,
+) -> Dict[str, int]:
+    """
+    older_than_days일 이상 수정되지 않은 세션을 gzip JSON 파일로 보관하고 DB에서 삭제합니다.
+    보관 파일: {archive_dir}/{app_name}/{user_id}/{session_id}.json.gz
+    """
+    stats = {"sessions_archived": 0, "events_archived": 0, "archive_bytes": 0}
+    if older_than_days <= 0:
+        return stats
+
+    cutoff = time.time() - older_than_days * 86400
+    for key in _session_keys(service):
+        with service.database_session_factory() as sql_session:
+            storage_session = sql_session.get(
+                StorageSession, (key.app_name, key.user_id, key.id)
+            )
+            if storage_session is None or storage_session.update_timestamp_tz >= cutoff:
+                continue
+            event_filter = (
+                (StorageEvent.app_name == key.app_name)
+                & (StorageEvent.user_id == key.user_id)
+                & (StorageEvent.session_id == key.id)
+            )
+            events = (
+                sql_session.query(StorageEvent)
+                .filter(event_filter)
+                .order_by(StorageEvent.timestamp)
+                .all()
+            )
+            stats["sessions_archived"] += 1
+            stats["events_archived"] += len(events)
+            if dry_run:
+                continue
+
+            record = {
+                "app_name": storage_session.app_name,
+                "user_id": storage_session.user_id,
+                "session_id": storage_session.id,
+                "state": dict(storage_session.state or {}),
+                "create_time": storage_session.create_time.isoformat(),
+                "last_update_time": storage_session.update_timestamp_tz,
+                "events": [
+                    event.to_event().model_dump(mode="json", exclude_none=True)
+                    for event in events
+                ],
+            }
+            path = _archive_path(archive_dir, storage_session)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # 파일을 완전히 쓴 뒤에만 DB에서 삭제
+            with gzip.open(path + ".tmp", "wt", encoding="utf-8") as f:
+                json.dump(record, f, ensure_ascii=False)
+            os.replace(path + ".tmp", path)
+            stats["archive_bytes"] += os.path.getsize(path)
+
+            # SQLite는 외래키 CASCADE가 꺼져 있으므로 이벤트를 직접 삭제
+            sql_session.execute(delete(StorageEvent).where(event_filter))
+            sql_session.delete(storage_session)
+            sql_session.commit()
+    return stats
+
+
+def database_size(service: DatabaseSessionService) -> Optional[int]:
+    """세션 DB 크기 (바이트). SQLite는 WAL 파일 포함, 알 수 없는 백엔드는 None"""
+    engine = service.db_engine
+    if engine.dialect.name == "sqlite":
+        database = engine.url.database
+        if not database or database == ":memory:":
+            return None
+        return sum(
+            os.path.getsize(path)
+            for path in (database, database + "-wal")
+            if os.path.exists(path)
+        )
+    if engine.dialect.name == "postgresql":
+        with engine.connect() as conn:
+            return conn.execute(
+                select(func.pg_database_size(func.current_database()))
+            ).scalar()
+    return None
+
+
+def vacuum(service: DatabaseSessionService) -> Dict[str, Optional[int]]:
+    """VACUUM으로 빈 공간을 회수하고 전후 DB 크기를 반환합니다."""
+    before = database_size(service)
+    engine = service.db_engine
+    # VACUUM은 트랜잭션 안에서 실행할 수 없음
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        if engine.dialect.name == "sqlite":
+            conn.exec_driver_sql("VACUUM")
+            # WAL 모드에서는 VACUUM 결과가 WAL에 기록되므로 본 파일로 반영 후 WAL 비움
+            conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+        elif engine.dialect.name == "postgresql":
+            conn.exec_driver_sql("VACUUM ANALYZE events")
+            conn.exec_driver_sql("VACUUM ANALYZE sessions")
+    after = database_size(service)
+    return {
+        "db_bytes_before": before,
+        "db_bytes_after": after,
+        "bytes_reclaimed": (
+            before - after if before is not None and after is not None else None
+        ),
+    }
+
+
+def _latency_sample(service: DatabaseSessionService) -> List[Tuple[str, str, str]]:
+    """이벤트가 가장 많은 세션들 (세션 로드 시간 측정용)"""
+    with service.database_session_factory() as sql_session:
+        rows = sql_session.execute(
+            select(StorageEvent.app_name, StorageEvent.user_id, StorageEvent.session_id)
+            .group_by(
+                StorageEvent.app_name, StorageEvent.user_id, StorageEvent.session_id
+            )
+            .order_by(func.count().desc())
+            .limit(_LATENCY_SAMPLE_SIZE)
+        ).all()
+    return [tuple(row) for row in rows]
+
+
+def measure_session_load(
+    service: DatabaseSessionService, sample: List[Tuple[str, str, str]]
+) -> Optional[float]:
+    """sample 세션들의 평균 get_session 시간 (밀리초). 남은 세션이 없으면 None"""
+
+    async def load_all() -> List[float]:
+        elapsed = []
+        for app_name, user_id, session_id in sample:
+            started = time.perf_counter()
+            session = await service.get_session(
+                app_name=app_name, user_id=user_id, session_id=session_id
+            )
+            if session is not None:
+                elapsed.append(time.perf_counter() - started)
+        return elapsed
+
+    elapsed = asyncio.run(load_all())
+    return round(sum(elapsed) / len(elapsed) * 1000, 2) if elapsed else None
+
+
+def run_compaction(
+    service: Optional[DatabaseSessionService] = None,
+    keep_recent: int = COMPACT_KEEP_RECENT_EVENTS,
+    max_bytes: int = COMPACT_MAX_RESPONSE_BYTES,
+    archive_after_days: float = ARCHIVE_AFTER_DAYS,
+    archive_dir: str = ARCHIVE_DIR,
+    run_vacuum: bool = True,
+    dry_run: bool = False,
+) -> Dict[str, Any]:
+    """
+    이벤트 압축 → 오래된 세션 보관 → VACUUM 순서로 정리 작업을 실행합니다.
+    동기 함수이므로 이벤트 루프 안에서는 asyncio.to_thread로 호출합니다.
+
+    Returns:
+        Dict: 단계별 통계와 전후 세션 로드 시간 (session_load_ms)
+    """
+    service = service or create_session_service()
+    started = time.monotonic()
+
+    sample = _latency_sample(service)
+    load_before = measure_session_load(service, sample)
+    size_before = database_size(service)
+
+    stats: Dict[str, Any] = {
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "dry_run": dry_run,
+        "compaction": compact_events(service, keep_recent, max_bytes, dry_run),
+        "archive": archive_cold_sessions(
+            service, archive_after_days, archive_dir, dry_run
+        ),
+    }
+    if run_vacuum and not dry_run:
+        stats["vacuum"] = vacuum(service)
+    else:
+        stats["vacuum"] = {"db_bytes_before": size_before}
+
+    stats["session_load_ms"] = {
+        "sessions": len(sample),
+        "before": load_before,
+        "after": measure_session_load(service, sample),
+    }
+    stats["elapsed_seconds"] = round(time.monotonic() - started, 3)
+    return stats
+
+
+async def compaction_loop(
+    service: DatabaseSessionService,
+    interval_hours: float = COMPACTION_INTERVAL_HOURS,
+) -> None:
+    """interval_hours마다 정리 작업을 실행합니다. 서버 종료 시 태스크를 취소합니다."""
+    while True:
+        await asyncio.sleep(interval_hours * 3600)
+        try:
+            stats = await asyncio.to_thread(run_compaction, service)
+            print(f"Session compaction: {json.dumps(stats, ensure_ascii=False)}")
+        except Exception as e:
+            print(f"Session compaction error: {str(e)}")
+            print(traceback.format_exc())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="ADK 세션 DB를 압축/보관/정리합니다.")
+    parser.add_argument("--db-url", help="세션 DB URL (기본값: ADK_SESSION_DB_URL)")
+    parser.add_argument(
+        "--keep-recent",
+        type=int,
+        default=COMPACT_KEEP_RECENT_EVENTS,
+        help="세션별로 원본을 유지할 최근 이벤트 수",
+    )
+    parser.add_argument(
+        "--max-bytes",
+        type=int,
+        default=COMPACT_MAX_RESPONSE_BYTES,
+        help="이보다 큰 도구 응답을 요약 (바이트)",
+    )
+    parser.add_argument(
+        "--archive-after-days",
+        type=float,
+        default=ARCHIVE_AFTER_DAYS,
+        help="이 기간 동안 수정되지 않은 세션을 보관 (0이면 보관하지 않음)",
+    )
+    parser.add_argument("--archive-dir", default=ARCHIVE_DIR, help="보관 파일 경로")
+    parser.add_argument("--no-vacuum", action="store_true", help="VACUUM 생략")
+    parser.add_argument("--dry-run", action="store_true", help="변경 없이 대상만 집계")
+    args = parser.parse_args()
+
+    stats = run_compaction(
+        create_session_service(args.db_url),
+        keep_recent=args.keep_recent,
+        max_bytes=args.max_bytes,
+        archive_after_days=args.archive_after_days,
+        archive_dir=args.archive_dir,
+        run_vacuum=not args.no_vacuum,
+        dry_run=args.dry_run,
+    )
+    print(json.dumps(stats, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1166 @@
+"""
+로컬 키움 REST API 대역 서버 (오프라인 개발/부하 테스트용)
+- 도구가 사용하는 모든 api-id (au10001, ka*, kt00004)를 같은 경로로 제공
+  - 합성 데이터: 종목/날짜별로 고정된 시드로 생성해 같은 요청에는 같은 응답
+  - 녹화 데이터: MOCK_KIWOOM_FIXTURE_DIR/<api-id>.json 이 있으면 그 응답을 그대로 사용
+- cont-yn/next-key 연속조회 (리스트를 MOCK_KIWOOM_PAGE_SIZE 행씩 나눔)
+- 응답 지연, 5xx/429 오류 주입 (환경변수 또는 PUT /mock/config 로 실행 중 변경)
+- 발급하지 않은 토큰은 401 (토큰 재발급 경로 확인용)
+- GET /mock/stats: api-id별 호출 수
+
+사용 예:
+    python -m server.mock_kiwoom --port 9001
+    KIWOOM_BASE_URL=http://localhost:9001 python main.py
+"""
+
+from fastapi import FastAPI, Header, Request
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+from functools import lru_cache
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import secrets
+import uvicorn
+
+# 대역 서버 설정
+MOCK_KIWOOM_LATENCY_MS = float(os.getenv("MOCK_KIWOOM_LATENCY_MS", "0"))
+MOCK_KIWOOM_JITTER_MS = float(os.getenv("MOCK_KIWOOM_JITTER_MS", "0"))
+MOCK_KIWOOM_ERROR_RATE = float(os.getenv("MOCK_KIWOOM_ERROR_RATE", "0"))  # 5xx 비율
+MOCK_KIWOOM_THROTTLE_RATE = float(os.getenv("MOCK_KIWOOM_THROTTLE_RATE", "0"))  # 429
+MOCK_KIWOOM_PAGE_SIZE = int(os.getenv("MOCK_KIWOOM_PAGE_SIZE", "100"))
+MOCK_KIWOOM_FIXTURE_DIR = os.getenv("MOCK_KIWOOM_FIXTURE_DIR", "")
+MOCK_KIWOOM_SEED = os.getenv("MOCK_KIWOOM_SEED", "kiwoom")
+
+# 합성 종목 (종목코드, 종목명, 시장, 기준가, 상장주식수(천주))
+UNIVERSE: List[Tuple[str, str, str, int, int]] = [
+    ("005930", "삼성전자", "0", 71000, 5969783),
+    ("000660", "SK하이닉스", "0", 182000, 728002),
+    ("373220", "LG에너지솔루션", "0", 365000, 234000),
+    ("207940", "삼성바이오로직스", "0", 812000, 71174),
+    ("005380", "현대차", "0", 241000, 209416),
+    ("000270", "기아", "0", 98000, 397672),
+    ("068270", "셀트리온", "0", 182500, 216975),
+    ("035420", "NAVER", "0", 172000, 158437),
+    ("035720", "카카오", "0", 41250, 445209),
+    ("051910", "LG화학", "0", 312000, 70592),
+    ("006400", "삼성SDI", "0", 298000, 68765),
+    ("105560", "KB금융", "0", 82300, 393528),
+    ("055550", "신한지주", "0", 51200, 509359),
+    ("012330", "현대모비스", "0", 228500, 93491),
+    ("028260", "삼성물산", "0", 132400, 169976),
+    ("066570", "LG전자", "0", 93700, 163648),
+    ("003550", "LG", "0", 78900, 157300),
+    ("015760", "한국전력", "0", 21350, 641964),
+    ("034020", "두산에너빌리티", "0", 19870, 640561),
+    ("012450", "한화에어로스페이스", "0", 285000, 50630),
+    ("247540", "에코프로비엠", "1", 183000, 97801),
+    ("086520", "에코프로", "1", 91500, 133138),
+    ("196170", "알테오젠", "1", 312500, 53183),
+    ("028300", "HLB", "1", 78600, 131095),
+    ("263750", "펄어비스", "1", 38650, 64011),
+    ("293490", "카카오게임즈", "1", 18450, 82791),
+    ("041510", "에스엠", "1", 72300, 23830),
+    ("035900", "JYP Ent.", "1", 61400, 35497),
+    ("058470", "리노공업", "1", 198000, 15242),
+    ("357780", "솔브레인", "1", 241000, 7779),
+    ("145020", "휴젤", "1", 218000, 12390),
+    ("403870", "HPSP", "1", 32150, 82500),
+]
+
+# 합성 업종 (업종코드, 업종명, 시장, 기준 지수)
+SECTORS: List[Tuple[str, str, str, float]] = [
+    ("001", "종합(KOSPI)", "0", 2650.0),
+    ("002", "대형주", "0", 2580.0),
+    ("013", "전기전자", "0", 24300.0),
+    ("008", "화학", "0", 5120.0),
+    ("015", "운수장비", "0", 2410.0),
+    ("021", "금융업", "0", 530.0),
+    ("101", "종합(KOSDAQ)", "1", 860.0),
+    ("124", "IT H/W", "1", 1150.0),
+    ("141", "제약", "1", 9800.0),
+]
+
+# 합성 테마 (테마그룹코드, 테마명, 구성 종목코드)
+THEMES: List[Tuple[str, str, List[str]]] = [
+    ("100", "반도체", ["005930", "000660", "058470", "357780", "403870"]),
+    ("101", "2차전지", ["373220", "006400", "051910", "247540", "086520"]),
+    ("102", "바이오", ["207940", "068270", "196170", "028300", "145020"]),
+    ("103", "자동차", ["005380", "000270", "012330"]),
+    ("104", "엔터", ["041510", "035900"]),
+    ("105", "게임", ["263750", "293490", "035720"]),
+]
+
+# api-id → (경로 그룹, 리스트 키)
+API_SPECS: Dict[str, Tuple[str, Optional[str]]] = {
+    "ka10001": ("stkinfo", None),
+    "ka10101": ("stkinfo", "list"),
+    "ka90004": ("stkinfo", "stk_prm_trde_prst"),
+    "ka90013": ("stkinfo", "stk_prm_trde_trnd"),
+    "ka10081": ("chart", "stk_dt_pole_chart_qry"),
+    "ka10080": ("chart", "stk_min_pole_chart_qry"),
+    "ka10023": ("rkinfo", "trde_qty_sdnin"),
+    "ka10030": ("rkinfo", "trde_qty_upper"),
+    "ka10032": ("rkinfo", "trde_prica_upper"),
+    "ka10027": ("rkinfo", "pred_pre_flu_rt_upper"),
+    "ka10029": ("rkinfo", "exp_cntr_flu_rt_upper"),
+    "ka90009": ("rkinfo", "frgnr_orgn_trde_upper"),
+    "ka10035": ("rkinfo", "for_cont_nettrde_upper"),
+    "ka10065": ("rkinfo", "opmr_invsr_trde_upper"),
+    "ka10045": ("mrkcond", "stk_orgn_trde_trnsn"),
+    "ka10044": ("mrkcond", "daly_orgn_trde_stk"),
+    "ka10014": ("shsa", "shrts_trnsn"),
+    "ka10131": ("frgnistt", "orgn_frgnr_cont_trde_prst"),
+    "ka20001": ("sect", "inds_cur_prc_daly_rept"),
+    "ka20002": ("sect", "inds_stkpc"),
+    "ka20003": ("sect", "all_inds_idex"),
+    "ka90001": ("thme", "thema_grp"),
+    "ka90002": ("thme", "thema_comp_stk"),
+    "kt00004": ("acnt", "stk_acnt_evlt_prst"),
+}
+
+# 일봉 시작일, 분봉 생성 개수
+_SERIES_START = "20200102"
+_MINUTE_BARS = 900
+
+
+class MockConfig(BaseModel):
+    """실행 중 변경 가능한 설정 (PUT /mock/config)"""
+
+    latency_ms: float = MOCK_KIWOOM_LATENCY_MS
+    jitter_ms: float = MOCK_KIWOOM_JITTER_MS
+    error_rate: float = MOCK_KIWOOM_ERROR_RATE
+    throttle_rate: float = MOCK_KIWOOM_THROTTLE_RATE
+    page_size: int = MOCK_KIWOOM_PAGE_SIZE
+
+
+class MockConfigUpdate(BaseModel):
+    latency_ms: Optional[float] = None
+    jitter_ms: Optional[float] = None
+    error_rate: Optional[float] = None
+    throttle_rate: Optional[float] = None
+    page_size: Optional[int] = None
+
+
+config = MockConfig()
+_issued_tokens: set = set()
+_calls: Dict[str, int] = {}
+_injected: Dict[str, int] = {"errors": 0, "throttled": 0, "unauthorized": 0}
+
+
+# ---------------------------------------------------------------------------
+# 합성 데이터
+# ---------------------------------------------------------------------------
+
+
+def _rng(*parts: Any) -> random.Random:
+    """요청 값으로 고정 시드 난수 생성기를 만듭니다 (같은 입력 → 같은 데이터)."""
+    seed = hashlib.sha1("|".join(map(str, (MOCK_KIWOOM_SEED, *parts))).encode())
+    return random.Random(int(seed.hexdigest()[:16], 16))
+
+
+def _signed(value: float, digits: int = 0) -> str:
+    """키움 형식의 부호 붙은 숫자 문자열 ("+61300", "-1.25", "0")"""
+    text = f"{abs(value):.{digits}f}"
+    if round(value, digits) > 0:
+        return "+" + text
+    if round(value, digits) < 0:
+        return "-" + text
+    return text
+
+
+def _sign_code(change: float) -> str:
+    # 대비기호: 2 상승, 3 보합, 5 하락
+    return "2" if change > 0 else "5" if change < 0 else "3"
+
+
+def _today() -> str:
+    return datetime.now().strftime("%Y%m%d")
+
+
+def _business_days(base_dt: str, count: int) -> List[str]:
+    """base_dt부터 과거로 평일 count개 (최신순)"""
+    day = datetime.strptime(base_dt, "%Y%m%d")
+    days = []
+    while len(days) < count:
+        if day.weekday() < 5:
+            days.append(day.strftime("%Y%m%d"))
+        day -= timedelta(days=1)
+    return days
+
+
+def _stock(stk_cd: str) -> Tuple[str, str, str, int, int]:
+    code = (stk_cd or "005930").split("_")[0].lstrip("A")
+    for stock in UNIVERSE:
+        if stock[0] == code:
+            return stock
+    # 목록에 없는 종목도 코드로 고정된 값 생성
+    rng = _rng("stock", code)
+    return (code, f"종목{code}", "0", rng.randrange(1000, 200000, 50), 50000)
+
+
+@lru_cache(maxsize=64)
+def _full_series(code: str, today: str) -> Tuple[Dict[str, Any], ...]:
+    """
+    _SERIES_START부터 오늘까지의 일봉 (오래된 순).
+    종목별 고정 시드 랜덤워크라 기준일(base_dt)이 달라도 같은 날짜의 봉은 같음
+    """
+    _, _, _, base_price, shares = _stock(code)
+    rng = _rng("daily", code)
+    days = []
+    day = datetime.strptime(_SERIES_START, "%Y%m%d")
+    last = datetime.strptime(today, "%Y%m%d")
+    while day <= last:
+        if day.weekday() < 5:
+            days.append(day.strftime("%Y%m%d"))
+        day += timedelta(days=1)
+
+    # 수익률을 먼저 만들고 마지막 종가가 기준가 근처가 되도록 맞춤
+    returns = [rng.gauss(0.0003, 0.02) for _ in days]
+    level, levels = 1.0, []
+    for value in returns:
+        level *= 1 + value
+        levels.append(level)
+    scale = base_price * rng.uniform(0.9, 1.1) / levels[-1]
+
+    rows = []
+    prev = scale
+    for dt, level in zip(days, levels):
+        close = max(level * scale, 100)
+        open_ = prev * (1 + rng.gauss(0, 0.005))
+        high = max(open_, close) * (1 + abs(rng.gauss(0, 0.008)))
+        low = min(open_, close) * (1 - abs(rng.gauss(0, 0.008)))
+        volume = int(shares * 1000 * rng.uniform(0.001, 0.006))
+        rows.append(
+            {
+                "dt": dt,
+                "cur_prc": str(round(close)),
+                "open_pric": str(round(open_)),
+                "high_pric": str(round(high)),
+                "low_pric": str(round(low)),
+                "trde_qty": str(volume),
+                "trde_prica": str(round(volume * close / 1_000_000)),
+                "pred_pre": _signed(round(close) - round(prev)),
+                "pred_pre_sig": _sign_code(round(close) - round(prev)),
+                "trde_tern_rt": _signed(volume / (shares * 1000) * 100, 2),
+                "upd_stkpc_tp": "",
+                "upd_rt": "",
+                "bic_inds_tp": "",
+                "sm_inds_tp": "",
+                "stk_infr": "",
+                "upd_stkpc_event": "",
+                "pred_close_pric": str(round(prev)),
+            }
+        )
+        prev = close
+    return tuple(rows)
+
+
+@lru_cache(maxsize=256)
+def _daily_series(stk_cd: str, base_dt: str) -> Tuple[Dict[str, Any], ...]:
+    """기준일까지의 일봉 (최신순, 연속조회로 과거 봉을 이어서 받음)"""
+    code = _stock(stk_cd)[0]
+    rows = [row for row in _full_series(code, _today()) if row["dt"] <= base_dt]
+    return tuple(reversed(rows))
+
+
+def _quote(stk_cd: str) -> Dict[str, Any]:
+    """오늘 시세 (일봉 마지막 봉 기준)"""
+    code, name, market, _, shares = _stock(stk_cd)
+    bar = _daily_series(code, _today())[0]
+    close = int(bar["cur_prc"])
+    prev = int(bar["pred_close_pric"])
+    change = close - prev
+    return {
+        "stk_cd": code,
+        "stk_nm": name,
+        "market": market,
+        "shares": shares,
+        "close": close,
+        "prev": prev,
+        "change": change,
+        "flu_rt": change / prev * 100,
+        "volume": int(bar["trde_qty"]),
+        "amount": int(bar["trde_prica"]),
+        "bar": bar,
+    }
+
+
+def _quotes(mrkt_tp: str = "000") -> List[Dict[str, Any]]:
+    """시장구분(000 전체, 001/0 코스피, 101/1 코스닥)에 해당하는 종목 시세"""
+    market = {"001": "0", "0": "0", "101": "1", "1": "1"}.get(mrkt_tp or "000")
+    quotes = [_quote(stock[0]) for stock in UNIVERSE]
+    return [q for q in quotes if market is None or q["market"] == market]
+
+
+def _price_row(q: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "stk_cd": q["stk_cd"],
+        "stk_nm": q["stk_nm"],
+        "cur_prc": _signed(q["close"] if q["change"] >= 0 else -q["close"]),
+        "pred_pre_sig": _sign_code(q["change"]),
+        "pred_pre": _signed(q["change"]),
+        "flu_rt": _signed(q["flu_rt"], 2),
+    }
+
+
+def _ranked(quotes: List[Dict[str, Any]], key: Callable, reverse=True):
+    return sorted(quotes, key=key, reverse=reverse)
+
+
+def _stock_basic_info(body: Dict[str, Any]) -> Dict[str, Any]:
+    q = _quote(body.get("stk_cd"))
+    bar = q["bar"]
+    series = _daily_series(q["stk_cd"], _today())
+    closes = [int(row["cur_prc"]) for row in series[:250]]
+    rng = _rng("fundamental", q["stk_cd"])
+    eps = round(q["close"] / rng.uniform(6, 40))
+    bps = round(q["close"] / rng.uniform(0.6, 4))
+    return {
+        **{k: v for k, v in _price_row(q).items() if k != "pred_pre_sig"},
+        "setl_mm": "12",
+        "fav": "100",
+        "cap": str(q["shares"] // 10),
+        "flo_stk": str(q["shares"]),
+        "crd_rt": _signed(rng.uniform(0, 3), 2),
+        "oyr_hgst": _signed(max(closes)),
+        "oyr_lwst": _signed(min(closes)),
+        "mac": str(q["close"] * q["shares"] // 100_000),  # 억원
+        "mac_wght": "",
+        "for_exh_rt": _signed(rng.uniform(5, 55), 2),
+        "repl_pric": str(round(q["close"] * 0.7)),
+        "per": f"{q['close'] / eps:.2f}",
+        "eps": str(eps),
+        "roe": f"{eps / bps * 100:.1f}",
+        "pbr": f"{q['close'] / bps:.2f}",
+        "ev": f"{rng.uniform(3, 20):.2f}",
+        "bps": str(bps),
+        "sale_amt": str(rng.randrange(1000, 3_000_000)),
+        "bus_pro": str(rng.randrange(100, 500_000)),
+        "cup_nga": str(rng.randrange(50, 400_000)),
+        "250hgst": _signed(max(closes)),
+        "250lwst": _signed(min(closes)),
+        "high_pric": _signed(int(bar["high_pric"])),
+        "open_pric": _signed(int(bar["open_pric"])),
+        "low_pric": _signed(int(bar["low_pric"])),
+        "upl_pric": _signed(round(q["prev"] * 1.3)),
+        "lst_pric": _signed(-round(q["prev"] * 0.7)),
+        "base_pric": str(q["prev"]),
+        "exp_cntr_pric": "0",
+        "exp_cntr_qty": "0",
+        "250hgst_pric_dt": series[closes.index(max(closes))]["dt"],
+        "250hgst_pric_pre_rt": _signed((q["close"] / max(closes) - 1) * 100, 2),
+        "250lwst_pric_dt": series[closes.index(min(closes))]["dt"],
+        "250lwst_pric_pre_rt": _signed((q["close"] / min(closes) - 1) * 100, 2),
+        "pre_sig": _sign_code(q["change"]),
+        "trde_qty": str(q["volume"]),
+        "trde_pre": _signed(rng.uniform(-50, 80), 2),
+        "fav_unit": "1",
+        "dstr_stk": str(q["shares"]),
+        "dstr_rt": "100.00",
+    }
+
+
+def _daily_chart(body: Dict[str, Any]) -> Dict[str, Any]:
+    code = _stock(body.get("stk_cd"))[0]
+    rows = _daily_series(code, body.get("base_dt") or _today())
+    return {"stk_cd": code, "stk_dt_pole_chart_qry": list(rows)}
+
+
+def _minute_chart(body: Dict[str, Any]) -> Dict[str, Any]:
+    code, _, _, _, shares = _stock(body.get("stk_cd"))
+    scope = int(body.get("tic_scope") or 1)
+    now = datetime.now().replace(second=0, microsecond=0)
+    rng = _rng("minute", code, scope, now.strftime("%Y%m%d"))
+    price = _quote(code)["prev"]
+    rows = []
+    for index in range(_MINUTE_BARS):
+        ts = now - timedelta(minutes=scope * (_MINUTE_BARS - 1 - index))
+        prev = price
+        price = max(prev * (1 + rng.gauss(0, 0.002)), 100)
+        volume = int(shares * rng.uniform(0.001, 0.01))
+        rows.append(
+            {
+                "cntr_tm": ts.strftime("%Y%m%d%H%M%S"),
+                "cur_prc": _signed(round(price)),
+                "open_pric": _signed(round(prev)),
+                "high_pric": _signed(round(max(prev, price) * 1.001)),
+                "low_pric": _signed(round(min(prev, price) * 0.999)),
+                "trde_qty": str(volume),
+                "acc_trde_qty": str(volume * (index + 1)),
+                "pred_pre": _signed(round(price) - round(prev)),
+            }
+        )
+    return {"stk_cd": code, "stk_min_pole_chart_qry": list(reversed(rows))}
+
+
+def _volume_surge(body: Dict[str, Any]) -> Dict[str, Any]:
+    rows = []
+    for q in _quotes(body.get("mrkt_tp")):
+        rng = _rng("surge", q["stk_cd"], _today())
+        prev_qty = int(q["volume"] / rng.uniform(0.3, 4))
+        rows.append(
+            {
+                **_price_row(q),
+                "prev_trde_qty": str(prev_qty),
+                "now_trde_qty": str(q["volume"]),
+                "sdnin_qty": _signed(q["volume"] - prev_qty),
+                "sdnin_rt": _signed((q["volume"] / prev_qty - 1) * 100, 2),
+            }
+        )
+    sort_key = "sdnin_rt" if body.get("sort_tp") in ("2", "4") else "sdnin_qty"
+    reverse = body.get("sort_tp") not in ("3", "4")
+    rows.sort(key=lambda row: float(row[sort_key]), reverse=reverse)
+    return {"trde_qty_sdnin": rows}
+
+
+def _volume_upper(body: Dict[str, Any]) -> Dict[str, Any]:
+    quotes = _ranked(_quotes(body.get("mrkt_tp")), lambda q: q["volume"])
+    rows = []
+    for q in quotes:
+        rng = _rng("volume", q["stk_cd"], _today())
+        rows.append(
+            {
+                **_price_row(q),
+                "trde_qty": str(q["volume"]),
+                "pred_rt": _signed(rng.uniform(30, 400), 2),
+                "trde_tern_rt": _signed(q["volume"] / (q["shares"] * 10), 2),
+                "trde_amt": str(q["amount"]),
+                "opmr_trde_qty": str(q["volume"]),
+                "af_mkrt_trde_qty": "0",
+                "bf_mkrt_trde_qty": "0",
+            }
+        )
+    return {"trde_qty_upper": rows}
+
+
+def _amount_upper(body: Dict[str, Any]) -> Dict[str, Any]:
+    quotes = _ranked(_quotes(body.get("mrkt_tp")), lambda q: q["amount"])
+    rows = []
+    for rank, q in enumerate(quotes, 1):
+        rng = _rng("amount", q["stk_cd"], _today())
+        rows.append(
+            {
+                "stk_cd": q["stk_cd"],
+                "now_rank": str(rank),
+                "pred_rank": str(max(rank + rng.randint(-3, 3), 1)),
+                **{k: v for k, v in _price_row(q).items() if k != "stk_cd"},
+                "sel_bid": _signed(q["close"] + 50),
+                "buy_bid": _signed(q["close"]),
+                "now_trde_qty": str(q["volume"]),
+                "pred_trde_qty": str(int(q["volume"] * rng.uniform(0.5, 1.5))),
+                "trde_prica": str(q["amount"]),
+            }
+        )
+    return {"trde_prica_upper": rows}
+
+
+def _price_change_upper(body: Dict[str, Any]) -> Dict[str, Any]:
+    sort_tp = body.get("sort_tp") or "1"
+    key = {"2": lambda q: q["change"], "4": lambda q: q["change"]}.get(
+        sort_tp, lambda q: q["flu_rt"]
+    )
+    quotes = _ranked(_quotes(body.get("mrkt_tp")), key, reverse=sort_tp in "12")
+    rows = []
+    for q in quotes:
+        rng = _rng("change", q["stk_cd"], _today())
+        rows.append(
+            {
+                "stk_cls": "0",
+                **_price_row(q),
+                "sel_req": str(rng.randrange(1000, 500000)),
+                "buy_req": str(rng.randrange(1000, 500000)),
+                "now_trde_qty": str(q["volume"]),
+                "cntr_str": f"{rng.uniform(60, 180):.2f}",
+                "cnt": str(rng.randint(1, 5)),
+            }
+        )
+    return {"pred_pre_flu_rt_upper": rows}
+
+
+def _expected_change_upper(body: Dict[str, Any]) -> Dict[str, Any]:
+    rows = []
+    for q in _quotes(body.get("mrkt_tp")):
+        rng = _rng("expected", q["stk_cd"], _today())
+        rate = q["flu_rt"] + rng.gauss(0, 1)
+        price = round(q["prev"] * (1 + rate / 100))
+        rows.append(
+            {
+                "stk_cd": q["stk_cd"],
+                "stk_nm": q["stk_nm"],
+                "exp_cntr_pric": _signed(price if rate >= 0 else -price),
+                "base_pric": str(q["prev"]),
+                "pred_pre_sig": _sign_code(rate),
+                "pred_pre": _signed(price - q["prev"]),
+                "flu_rt": _signed(rate, 2),
+                "exp_cntr_qty": str(rng.randrange(100, 200000)),
+                "sel_req": str(rng.randrange(100, 50000)),
+                "sel_bid": _signed(price + 50),
+                "buy_bid": _signed(price),
+                "buy_req": str(rng.randrange(100, 50000)),
+            }
+        )
+    rows.sort(key=lambda row: float(row["flu_rt"]), reverse=body.get("sort_tp") != "4")
+    return {"exp_cntr_flu_rt_upper": rows}
+
+
+def _investor_daily(body: Dict[str, Any], list_key: str) -> Dict[str, Any]:
+    """종목별 일자 리스트 (기관매매추이 ka10045, 공매도추이 ka10014)"""
+    code = _stock(body.get("stk_cd"))[0]
+    end_dt = body.get("end_dt") or _today()
+    series = {row["dt"]: row for row in _daily_series(code, _today())}
+    rows = []
+    orgn_acc = for_acc = 0
+    for dt in _business_days(min(end_dt, _today()), 60):
+        bar = series.get(dt)
+        if bar is None or dt < (body.get("strt_dt") or ""):
+            continue
+        rng = _rng(list_key, code, dt)
+        volume = int(bar["trde_qty"])
+        close = int(bar["cur_prc"])
+        base = {
+            "dt": dt,
+            "close_pric": _signed(close),
+            "pred_pre": bar["pred_pre"],
+            "flu_rt": _signed(
+                float(bar["pred_pre"]) / int(bar["pred_close_pric"]) * 100, 2
+            ),
+            "trde_qty": str(volume),
+        }
+        if list_key == "shrts_trnsn":
+            shorts = int(volume * rng.uniform(0.005, 0.08))
+            rows.append(
+                {
+                    **base,
+                    "pred_pre_sig": bar["pred_pre_sig"],
+                    "shrts_qty": str(shorts),
+                    "ovr_shrts_qty": str(shorts * 10),
+                    "trde_wght": _signed(shorts / volume * 100, 2),
+                    "shrts_trde_prica": str(round(shorts * close / 1000)),
+                    "shrts_avg_pric": str(close),
+                }
+            )
+            continue
+        orgn = int(volume * rng.uniform(-0.1, 0.1))
+        foreign = int(volume * rng.uniform(-0.1, 0.1))
+        orgn_acc += orgn
+        for_acc += foreign
+        rows.append(
+            {
+                **base,
+                "pre_sig": bar["pred_pre_sig"],
+                "orgn_dt_acc": _signed(orgn_acc),
+                "orgn_daly_nettrde_qty": _signed(orgn),
+                "for_dt_acc": _signed(for_acc),
+                "for_daly_nettrde_qty": _signed(foreign),
+                "limit_exh_rt": _signed(rng.uniform(10, 60), 2),
+            }
+        )
+    result: Dict[str, Any] = {list_key: rows}
+    if list_key == "stk_orgn_trde_trnsn":
+        close = _quote(code)["close"]
+        result["orgn_prsm_avg_pric"] = str(round(close * 0.97))
+        result["for_prsm_avg_pric"] = str(round(close * 0.95))
+    return result
+
+
+def _net_amount(q: Dict[str, Any], who: str) -> int:
+    # 투자자별 순매수 금액 (백만원, 부호 있음)
+    return int(q["amount"] * _rng(who, q["stk_cd"], _today()).uniform(-0.15, 0.15))
+
+
+def _institution_foreign_continuous(body: Dict[str, Any]) -> Dict[str, Any]:
+    quotes = _quotes(body.get("mrkt_tp"))
+    quotes.sort(key=lambda q: _net_amount(q, "orgn") + _net_amount(q, "frgnr"))
+    if body.get("netslmt_tp") != "1":  # 2: 순매수 (기본)
+        quotes.reverse()
+    rows = []
+    for rank, q in enumerate(quotes, 1):
+        rng = _rng("continuous", q["stk_cd"], _today())
+        orgn, foreign = _net_amount(q, "orgn"), _net_amount(q, "frgnr")
+        price = max(q["close"], 1)
+        rows.append(
+            {
+                "rank": str(rank),
+                "stk_cd": q["stk_cd"],
+                "stk_nm": q["stk_nm"],
+                "prid_stkpc_flu_rt": _signed(q["flu_rt"] * rng.uniform(1, 3), 2),
+                "orgn_nettrde_amt": _signed(orgn),
+                "orgn_nettrde_qty": _signed(orgn * 1_000_000 // price),
+                "orgn_cont_netprps_dys": _signed(rng.randint(-5, 10)),
+                "frgnr_nettrde_qty": _signed(foreign * 1_000_000 // price),
+                "frgnr_nettrde_amt": _signed(foreign),
+                "frgnr_cont_netprps_dys": _signed(rng.randint(-5, 10)),
+                "nettrde_qty": _signed((orgn + foreign) * 1_000_000 // price),
+                "nettrde_amt": _signed(orgn + foreign),
+                "tot_cont_netprps_dys": _signed(rng.randint(-5, 10)),
+            }
+        )
+    return {"orgn_frgnr_cont_trde_prst": rows}
+
+
+def _foreign_institution_upper(body: Dict[str, Any]) -> Dict[str, Any]:
+    quotes = _quotes(body.get("mrkt_tp"))
+    columns = {}
+    for who, prefix in (("frgnr", "for"), ("orgn", "orgn")):
+        ranked = sorted(quotes, key=lambda q: _net_amount(q, who))
+        for side, ordered in (("netslmt", ranked), ("netprps", ranked[::-1])):
+            columns[f"{prefix}_{side}"] = ordered
+    rows = []
+    for index in range(len(quotes)):
+        row = {}
+        for column, ordered in columns.items():
+            q = ordered[index]
+            who = "frgnr" if column.startswith("for_") else "orgn"
+            amount = abs(_net_amount(q, who))
+            row[f"{column}_stk_cd"] = q["stk_cd"]
+            row[f"{column}_stk_nm"] = q["stk_nm"]
+            row[f"{column}_amt"] = _signed(amount)
+            row[f"{column}_qty"] = _signed(amount * 1_000_000 // max(q["close"], 1))
+        rows.append(row)
+    return {"frgnr_orgn_trde_upper": rows}
+
+
+def _foreign_continuous_upper(body: Dict[str, Any]) -> Dict[str, Any]:
+    rows = []
+    for q in _quotes(body.get("mrkt_tp")):
+        rng = _rng("for_cont", q["stk_cd"], _today())
+        days = [int(q["volume"] * rng.uniform(-0.05, 0.1)) for _ in range(3)]
+        rows.append(
+            {
+                **{k: v for k, v in _price_row(q).items() if k != "flu_rt"},
+                "dm1": _signed(days[0]),
+                "dm2": _signed(days[1]),
+                "dm3": _signed(days[2]),
+                "tot": _signed(sum(days)),
+                "limit_exh_rt": _signed(rng.uniform(10, 60), 2),
+                "pred_pre_1": _signed(rng.randint(-2000, 2000)),
+                "pred_pre_2": _signed(rng.randint(-2000, 2000)),
+                "pred_pre_3": _signed(rng.randint(-2000, 2000)),
+            }
+        )
+    rows.sort(key=lambda row: int(row["tot"]), reverse=body.get("trde_tp") != "1")
+    return {"for_cont_nettrde_upper": rows}
+
+
+def _daily_institution_stocks(body: Dict[str, Any]) -> Dict[str, Any]:
+    quotes = sorted(_quotes(body.get("mrkt_tp")), key=lambda q: _net_amount(q, "orgn"))
+    if body.get("trde_tp") != "1":  # 2: 순매수
+        quotes.reverse()
+    rows = [
+        {
+            "stk_cd": q["stk_cd"],
+            "stk_nm": q["stk_nm"],
+            "netprps_qty": _signed(
+                _net_amount(q, "orgn") * 1_000_000 // max(q["close"], 1)
+            ),
+            "netprps_amt": _signed(_net_amount(q, "orgn")),
+        }
+        for q in quotes
+    ]
+    return {"daly_orgn_trde_stk": rows}
+
+
+def _intraday_investor_upper(body: Dict[str, Any]) -> Dict[str, Any]:
+    rows = []
+    for q in _quotes(body.get("mrkt_tp")):
+        rng = _rng("intraday", q["stk_cd"], _today())
+        sell = int(q["volume"] * rng.uniform(0.05, 0.3))
+        buy = int(q["volume"] * rng.uniform(0.05, 0.3))
+        rows.append(
+            {
+                "stk_cd": q["stk_cd"],
+                "stk_nm": q["stk_nm"],
+                "sel_qty": _signed(-sell),
+                "buy_qty": _signed(buy),
+                "netslmt": _signed(buy - sell),
+            }
+        )
+    rows.sort(key=lambda row: int(row["netslmt"]), reverse=True)
+    return {"opmr_invsr_trde_upper": rows}
+
+
+def _program_trading(body: Dict[str, Any]) -> Dict[str, Any]:
+    rows = []
+    totals = [0] * 5
+    for q in _quotes(body.get("mrkt_tp")):
+        rng = _rng("program", q["stk_cd"], _today())
+        buy_qty = int(q["volume"] * rng.uniform(0.05, 0.2))
+        sell_qty = int(q["volume"] * rng.uniform(0.05, 0.2))
+        buy_amt = buy_qty * q["close"] // 1000
+        sell_amt = sell_qty * q["close"] // 1000
+        rows.append(
+            {
+                "stk_cd": q["stk_cd"],
+                "stk_nm": q["stk_nm"],
+                "cur_prc": _signed(q["close"]),
+                "flu_sig": _sign_code(q["change"]),
+                "pred_pre": _signed(q["change"]),
+                "buy_cntr_qty": str(buy_qty),
+                "buy_cntr_amt": str(buy_amt),
+                "sel_cntr_qty": str(sell_qty),
+                "sel_cntr_amt": str(sell_amt),
+                "netprps_prica": _signed(buy_amt - sell_amt),
+                "all_trde_rt": _signed((buy_qty + sell_qty) / q["volume"] * 100, 2),
+            }
+        )
+        for index, value in enumerate(
+            (buy_qty, buy_amt, sell_qty, sell_amt, buy_amt - sell_amt)
+        ):
+            totals[index] += value
+    result = {f"tot_{index + 1}": str(value) for index, value in enumerate(totals)}
+    result["tot_6"] = "0"
+    result["stk_prm_trde_prst"] = rows
+    return result
+
+
+def _program_trading_daily(body: Dict[str, Any]) -> Dict[str, Any]:
+    code = _stock(body.get("stk_cd"))[0]
+    rows = []
+    for bar in _daily_series(code, _today())[:60]:
+        if body.get("strt_dt") and bar["dt"] < body["strt_dt"]:
+            break
+        if body.get("end_dt") and bar["dt"] > body["end_dt"]:
+            continue
+        rng = _rng("program_daily", code, bar["dt"])
+        volume = int(bar["trde_qty"])
+        close = int(bar["cur_prc"])
+        buy_qty = int(volume * rng.uniform(0.05, 0.2))
+        sell_qty = int(volume * rng.uniform(0.05, 0.2))
+        rows.append(
+            {
+                "dt": bar["dt"],
+                "cur_prc": _signed(close),
+                "flu_sig": bar["pred_pre_sig"],
+                "pred_pre": bar["pred_pre"],
+                "buy_cntr_qty": str(buy_qty),
+                "buy_cntr_amt": str(buy_qty * close // 1000),
+                "sel_cntr_qty": str(sell_qty),
+                "sel_cntr_amt": str(sell_qty * close // 1000),
+                "netprps_prica": _signed((buy_qty - sell_qty) * close // 1000),
+                "all_trde_rt": _signed((buy_qty + sell_qty) / volume * 100, 2),
+            }
+        )
+    return {"stk_prm_trde_trnd": rows}
+
+
+def _sector_code_list(body: Dict[str, Any]) -> Dict[str, Any]:
+    market = body.get("mrkt_tp") or "0"
+    rows = [
+        {"marketCode": sector_market, "code": code, "name": name, "group": code}
+        for code, name, sector_market, _ in SECTORS
+        if sector_market == market
+    ]
+    return {"list": rows}
+
+
+def _sector_index(inds_cd: str) -> Dict[str, Any]:
+    code, name, market, base = next(
+        (sector for sector in SECTORS if sector[0] == inds_cd), SECTORS[0]
+    )
+    rng = _rng("sector", code, _today())
+    rate = rng.gauss(0, 1.2)
+    index = base * (1 + rate / 100)
+    return {
+        "code": code,
+        "name": name,
+        "market": market,
+        "index": index,
+        "change": index - base,
+        "rate": rate,
+        "rng": rng,
+    }
+
+
+def _sector_current_price(body: Dict[str, Any]) -> Dict[str, Any]:
+    s = _sector_index(body.get("inds_cd"))
+    rng = s["rng"]
+    rising = rng.randint(100, 600)
+    fall = rng.randint(100, 600)
+    days = []
+    level = s["index"]
+    for dt in _business_days(_today(), 20):
+        change = level * rng.gauss(0, 0.01)
+        days.append(
+            {
+                "dt_n": dt,
+                "cur_prc_n": _signed(level, 2),
+                "pred_pre_sig_n": _sign_code(change),
+                "pred_pre_n": _signed(change, 2),
+                "flu_rt_n": _signed(change / level * 100, 2),
+                "acc_trde_qty_n": str(rng.randrange(100_000, 900_000)),
+            }
+        )
+        level -= change
+    return {
+        "cur_prc": _signed(s["index"], 2),
+        "pred_pre_sig": _sign_code(s["change"]),
+        "pred_pre": _signed(s["change"], 2),
+        "flu_rt": _signed(s["rate"], 2),
+        "trde_qty": str(rng.randrange(100_000, 900_000)),
+        "trde_prica": str(rng.randrange(1_000_000, 9_000_000)),
+        "trde_frmatn_stk_num": str(rising + fall),
+        "trde_frmatn_rt": _signed(rng.uniform(90, 100), 2),
+        "open_pric": _signed(s["index"] - s["change"], 2),
+        "high_pric": _signed(max(s["index"], s["index"] - s["change"]) * 1.005, 2),
+        "low_pric": _signed(min(s["index"], s["index"] - s["change"]) * 0.995, 2),
+        "upl": str(rng.randint(0, 5)),
+        "rising": str(rising),
+        "stdns": str(rng.randint(20, 80)),
+        "fall": str(fall),
+        "lst": str(rng.randint(0, 3)),
+        "52wk_hgst_pric": _signed(s["index"] * 1.2, 2),
+        "52wk_lwst_pric": _signed(s["index"] * 0.8, 2),
+        "inds_cur_prc_daly_rept": days,
+    }
+
+
+def _sector_stock_prices(body: Dict[str, Any]) -> Dict[str, Any]:
+    market = {"0": "0", "1": "1"}.get(body.get("mrkt_tp"), "0")
+    rows = []
+    for q in _quotes(market):
+        bar = q["bar"]
+        rows.append(
+            {
+                **_price_row(q),
+                "now_trde_qty": str(q["volume"]),
+                "sel_bid": _signed(q["close"] + 50),
+                "buy_bid": _signed(q["close"]),
+                "open_pric": _signed(int(bar["open_pric"])),
+                "high_pric": _signed(int(bar["high_pric"])),
+                "low_pric": _signed(int(bar["low_pric"])),
+            }
+        )
+    return {"inds_stkpc": rows}
+
+
+def _all_sector_index(body: Dict[str, Any]) -> Dict[str, Any]:
+    rows = []
+    for code, _, _, _ in SECTORS:
+        s = _sector_index(code)
+        rng = s["rng"]
+        rows.append(
+            {
+                "stk_cd": code,
+                "stk_nm": s["name"],
+                "cur_prc": _signed(s["index"], 2),
+                "pre_sig": _sign_code(s["change"]),
+                "pred_pre": _signed(s["change"], 2),
+                "flu_rt": _signed(s["rate"], 2),
+                "trde_qty": str(rng.randrange(100_000, 900_000)),
+                "wght": f"{rng.uniform(0.5, 30):.2f}",
+                "trde_prica": str(rng.randrange(1_000_000, 9_000_000)),
+                "upl": str(rng.randint(0, 5)),
+                "rising": str(rng.randint(10, 300)),
+                "stdns": str(rng.randint(5, 40)),
+                "fall": str(rng.randint(10, 300)),
+                "lst": str(rng.randint(0, 3)),
+                "flo_stk_num": str(rng.randint(20, 900)),
+            }
+        )
+    return {"all_inds_idex": rows}
+
+
+def _theme_rate(stocks: List[str]) -> float:
+    return sum(_quote(code)["flu_rt"] for code in stocks) / len(stocks)
+
+
+def _theme_groups(body: Dict[str, Any]) -> Dict[str, Any]:
+    rows = []
+    for code, name, stocks in THEMES:
+        rate = _theme_rate(stocks)
+        quotes = [_quote(stock) for stock in stocks]
+        rows.append(
+            {
+                "thema_grp_cd": code,
+                "thema_nm": name,
+                "stk_num": str(len(stocks)),
+                "flu_sig": _sign_code(rate),
+                "flu_rt": _signed(rate, 2),
+                "rising_stk_num": str(sum(q["change"] > 0 for q in quotes)),
+                "fall_stk_num": str(sum(q["change"] < 0 for q in quotes)),
+                "dt_prft_rt": _signed(rate * 3, 2),
+                "main_stk": quotes[0]["stk_nm"],
+            }
+        )
+    rows.sort(
+        key=lambda row: float(row["flu_rt"]), reverse=body.get("flu_pl_amt_tp") != "3"
+    )
+    return {"thema_grp": rows}
+
+
+def _theme_stocks(body: Dict[str, Any]) -> Dict[str, Any]:
+    code, _, stocks = next(
+        (theme for theme in THEMES if theme[0] == body.get("thema_grp_cd")), THEMES[0]
+    )
+    rate = _theme_rate(stocks)
+    rows = []
+    for stock in stocks:
+        q = _quote(stock)
+        rng = _rng("theme", code, stock, _today())
+        rows.append(
+            {
+                **{k: v for k, v in _price_row(q).items() if k != "pred_pre_sig"},
+                "flu_sig": _sign_code(q["change"]),
+                "acc_trde_qty": str(q["volume"]),
+                "sel_bid": _signed(q["close"] + 50),
+                "sel_req": str(rng.randrange(100, 50000)),
+                "buy_bid": _signed(q["close"]),
+                "buy_req": str(rng.randrange(100, 50000)),
+                "dt_prft_rt_n": _signed(q["flu_rt"] * 3, 2),
+            }
+        )
+    return {
+        "flu_rt": _signed(rate, 2),
+        "dt_prft_rt": _signed(rate * 3, 2),
+        "thema_comp_stk": rows,
+    }
+
+
+def _account_evaluation(body: Dict[str, Any]) -> Dict[str, Any]:
+    holdings = []
+    total_purchase = total_eval = 0
+    for stock in UNIVERSE[:5]:
+        q = _quote(stock[0])
+        rng = _rng("account", stock[0])
+        qty = rng.randint(1, 100)
+        avg = round(q["close"] * rng.uniform(0.8, 1.2))
+        purchase, evaluation = avg * qty, q["close"] * qty
+        total_purchase += purchase
+        total_eval += evaluation
+        holdings.append(
+            {
+                "stk_cd": "A" + q["stk_cd"],
+                "stk_nm": q["stk_nm"],
+                "rmnd_qty": str(qty),
+                "avg_prc": str(avg),
+                "cur_prc": str(q["close"]),
+                "evlt_amt": str(evaluation),
+                "pl_amt": _signed(evaluation - purchase),
+                "pl_rt": _signed((evaluation / purchase - 1) * 100, 4),
+                "loan_dt": "",
+                "pur_amt": str(purchase),
+                "setl_remn": str(qty),
+                "pred_buyq": "0",
+                "pred_sellq": "0",
+                "tdy_buyq": "0",
+                "tdy_sellq": "0",
+            }
+        )
+    deposit = 10_000_000
+    profit = total_eval - total_purchase
+    return {
+        "acnt_nm": "모의투자",
+        "brch_nm": "키움은행",
+        "entr": str(deposit),
+        "d2_entra": str(deposit),
+        "tot_est_amt": str(total_eval),
+        "aset_evlt_amt": str(total_eval + deposit),
+        "tot_pur_amt": str(total_purchase),
+        "prsm_dpst_aset_amt": str(total_eval + deposit),
+        "tot_grnt_sella": "0",
+        "tdy_lspft_amt": "0",
+        "invt_bsamt": str(total_purchase),
+        "lspft_amt": str(total_purchase),
+        "tdy_lspft": "0",
+        "lspft2": _signed(profit),
+        "lspft": _signed(profit),
+        "tdy_lspft_rt": "0.00",
+        "lspft_ratio": _signed(profit / total_purchase * 100, 2),
+        "lspft_rt": _signed(profit / total_purchase * 100, 2),
+        "stk_acnt_evlt_prst": holdings,
+    }
+
+
+BUILDERS: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    "ka10001": _stock_basic_info,
+    "ka10101": _sector_code_list,
+    "ka90004": _program_trading,
+    "ka90013": _program_trading_daily,
+    "ka10081": _daily_chart,
+    "ka10080": _minute_chart,
+    "ka10023": _volume_surge,
+    "ka10030": _volume_upper,
+    "ka10032": _amount_upper,
+    "ka10027": _price_change_upper,
+    "ka10029": _expected_change_upper,
+    "ka90009": _foreign_institution_upper,
+    "ka10035": _foreign_continuous_upper,
+    "ka10065": _intraday_investor_upper,
+    "ka10045": lambda body: _investor_daily(body, "stk_orgn_trde_trnsn"),
+    "ka10044": _daily_institution_stocks,
+    "ka10014": lambda body: _investor_daily(body, "shrts_trnsn"),
+    "ka10131": _institution_foreign_continuous,
+    "ka20001": _sector_current_price,
+    "ka20002": _sector_stock_prices,
+    "ka20003": _all_sector_index,
+    "ka90001": _theme_groups,
+    "ka90002": _theme_stocks,
+    "kt00004": _account_evaluation,
+}
+
+
+# ---------------------------------------------------------------------------
+# 요청 처리
+# ---------------------------------------------------------------------------
+
+
+def _fixture(api_id: str) -> Optional[Dict[str, Any]]:
+    """녹화된 응답 (MOCK_KIWOOM_FIXTURE_DIR/<api-id>.json)"""
+    if not MOCK_KIWOOM_FIXTURE_DIR:
+        return None
+    path = os.path.join(MOCK_KIWOOM_FIXTURE_DIR, f"{api_id}.json")
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _paginate(
+    result: Dict[str, Any], list_key: Optional[str], next_key: Optional[str]
+) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """리스트를 page_size 행씩 나누고 연속조회 헤더를 만듭니다."""
+    rows = result.get(list_key) if list_key else None
+    if not isinstance(rows, list):
+        return result, {"cont-yn": "N", "next-key": ""}
+    start = int(next_key) if next_key and next_key.isdigit() else 0
+    end = start + max(config.page_size, 1)
+    page = {**result, list_key: rows[start:end]}
+    if end < len(rows):
+        return page, {"cont-yn": "Y", "next-key": str(end)}
+    return page, {"cont-yn": "N", "next-key": ""}
+
+
+def _error(status_code: int, return_code: int, message: str, api_id: str):
+    return JSONResponse(
+        {"return_code": return_code, "return_msg": message},
+        status_code=status_code,
+        headers={"api-id": api_id or ""},
+    )
+
+
+async def _simulate(api_id: str) -> Optional[JSONResponse]:
+    """지연과 오류를 주입합니다. 오류를 내야 하면 응답을 반환합니다."""
+    _calls[api_id] = _calls.get(api_id, 0) + 1
+    delay = config.latency_ms + random.uniform(0, config.jitter_ms)
+    if delay > 0:
+        await asyncio.sleep(delay / 1000)
+    if config.throttle_rate and random.random() < config.throttle_rate:
+        _injected["throttled"] += 1
+        return _error(429, 5, "허용된 요청 개수를 초과하였습니다", api_id)
+    if config.error_rate and random.random() < config.error_rate:
+        _injected["errors"] += 1
+        return _error(500, 1, "일시적인 서버 오류입니다", api_id)
+    return None
+
+
+app = FastAPI(title="Mock Kiwoom REST API")
+
+
+@app.post("/oauth2/token")
+async def issue_token(request: Request):
+    """접근토큰 발급 (au10001)"""
+    failure = await _simulate("au10001")
+    if failure:
+        return failure
+    body = await request.json()
+    if not body.get("appkey") or not body.get("secretkey"):
+        return _error(400, 2, "appkey/secretkey가 필요합니다", "au10001")
+    token = secrets.token_urlsafe(32)
+    _issued_tokens.add(token)
+    expires = datetime.now() + timedelta(days=1)
+    return {
+        "expires_dt": expires.strftime("%Y%m%d%H%M%S"),
+        "token_type": "bearer",
+        "token": token,
+        "return_code": 0,
+        "return_msg": "정상적으로 처리되었습니다",
+    }
+
+
+@app.post("/api/dostk/{group}")
+async def dostk(
+    group: str,
+    request: Request,
+    api_id: str = Header("", alias="api-id"),
+    authorization: str = Header(""),
+    cont_yn: str = Header("", alias="cont-yn"),
+    next_key: str = Header("", alias="next-key"),
+):
+    """조회 API (api-id 헤더로 구분)"""
+    spec = API_SPECS.get(api_id)
+    if spec is None:
+        return _error(404, 2, f"지원하지 않는 api-id: {api_id}", api_id)
+    if spec[0] != group:
+        return _error(404, 2, f"{api_id}는 /api/dostk/{spec[0]} 경로입니다", api_id)
+    failure = await _simulate(api_id)
+    if failure:
+        return failure
+    token = authorization.removeprefix("Bearer ").strip()
+    if token not in _issued_tokens:
+        _injected["unauthorized"] += 1
+        return _error(401, 3, "Token이 유효하지 않습니다", api_id)
+
+    body = await request.json()
+    result = _fixture(api_id) or BUILDERS[api_id](body)
+    page, paging = _paginate(result, spec[1], next_key if cont_yn == "Y" else None)
+    return JSONResponse(
+        {**page, "return_code": 0, "return_msg": "정상적으로 처리되었습니다"},
+        headers={"api-id": api_id, **paging},
+    )
+
+
+@app.get("/mock/stats")
+async def get_stats():
+    """api-id별 호출 수와 주입한 오류 수"""
+    return {"calls": dict(_calls), "injected": dict(_injected)}
+
+
+@app.get("/mock/config")
+async def get_config():
+    return config
+
+
+@app.put("/mock/config")
+async def update_config(update: MockConfigUpdate):
+    """지연/오류 비율/페이지 크기를 실행 중 변경합니다."""
+    for field, value in update.model_dump(exclude_none=True).items():
+        setattr(config, field, value)
+    return config
+
+
+@app.post("/mock/reset")
+async def reset():
+    """호출 수와 발급한 토큰을 초기화합니다."""
+    _calls.clear()
+    _issued_tokens.clear()
+    for key in _injected:
+        _injected[key] = 0
+    return {"reset": True}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="로컬 키움 REST API 대역 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9001)
+    parser.add_argument("--latency-ms", type=float, help="응답 지연 (밀리초)")
+    parser.add_argument("--error-rate", type=float, help="5xx 오류 비율 (0~1)")
+    parser.add_argument("--throttle-rate", type=float, help="429 응답 비율 (0~1)")
+    args = parser.parse_args()
+
+    if args.latency_ms is not None:
+        config.latency_ms = args.latency_ms
+    if args.error_rate is not None:
+        config.error_rate = args.error_rate
+    if args.throttle_rate is not None:
+        config.throttle_rate = args.throttle_rate
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,344 @@
+"""
+세션/이벤트 페이지 조회
+- DatabaseSessionService 테이블을 직접 조회해 요청한 범위만 읽음
+  - 세션 목록: 상태/이벤트 없이 최근 수정순으로 커서 페이지 조회
+  - 이벤트: (타임스탬프, 이벤트 ID) 기준 페이지 조회 (before/after + before_id/after_id)
+    같은 타임스탬프의 이벤트가 페이지 경계에 걸쳐도 빠지거나 중복되지 않음
+- 이벤트 보기 방식 (view)
+  - full: 원본 Event
+  - compact: 도구 응답 본문(function_response.response) 제외
+  - text: 텍스트가 있는 이벤트만 id/author/timestamp/text로 축약
+- ETag: 조회 조건과 함께 바뀌지 않았으면 이벤트를 읽지 않고 304 응답
+  - 세션 목록: 세션 수와 최근 수정 시각
+  - 이벤트: 세션 수정 시각, 이벤트 수와 최신 이벤트 시각 (상태 변경 없는 이벤트 추가도 반영)
+- DB 조회는 스레드에서 실행해 이벤트 루프를 막지 않음
+"""
+
+from google.adk.events import Event
+from google.adk.sessions import Session
+from google.adk.sessions.database_session_service import (
+    DatabaseSessionService,
+    StorageEvent,
+    StorageSession,
+)
+from sqlalchemy import and_, func, literal, or_, select
+from sqlalchemy.orm import load_only
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime
+import asyncio
+import base64
+import hashlib
+import json
+
+EVENT_VIEWS = ("full", "compact", "text")
+
+
+def make_etag(*parts: Any) -> str:
+    """조회 결과를 결정하는 값들로 ETag를 만듭니다."""
+    digest = hashlib.sha1("|".join(map(str, parts)).encode()).hexdigest()
+    return f'"{digest[:20]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더가 현재 ETag와 일치하는지 확인합니다."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def encode_cursor(update_time: datetime, session_id: str) -> str:
+    raw = json.dumps([update_time.isoformat(), session_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """세션 목록 커서를 (수정 시각, 세션 ID)로 바꿉니다. 형식이 잘못되면 ValueError."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        update_time, session_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(update_time), session_id
+    except Exception as e:
+        raise ValueError(f"잘못된 cursor: {cursor}") from e
+
+
+def _comparable_time(expression: Any, dialect: str) -> Any:
+    """
+    시각 비교용 SQL 식을 반환합니다.
+    SQLite는 시각을 문자열로 저장하는데, DB 기본값(CURRENT_TIMESTAMP)에는 소수 초가 없고
+    SQLAlchemy 바인딩 값에는 있어 문자열 비교가 틀어지므로 julianday로 비교합니다.
+    """
+    return func.julianday(expression) if dialect == "sqlite" else expression
+
+
+def _event_bound(timestamp: float, event_id: Optional[str], older: bool) -> Any:
+    """(타임스탬프, 이벤트 ID) 커서보다 이전(older) 또는 이후 이벤트 조건"""
+    # 이벤트 저장 시와 같은 방식으로 타임스탬프를 변환 (ADK: datetime.fromtimestamp)
+    value = datetime.fromtimestamp(timestamp)
+    column = StorageEvent.timestamp
+    if event_id is None:
+        return column < value if older else column > value
+    return or_(
+        column < value if older else column > value,
+        and_(
+            column == value,
+            StorageEvent.id < event_id if older else StorageEvent.id > event_id,
+        ),
+    )
+
+
+def _sessions_etag(
+    service: DatabaseSessionService, app_name: str, user_id: str, *params: Any
+) -> str:
+    with service.database_session_factory() as sql_session:
+        count, last_update = sql_session.execute(
+            select(func.count(), func.max(StorageSession.update_time)).where(
+                StorageSession.app_name == app_name,
+                StorageSession.user_id == user_id,
+            )
+        ).one()
+    return make_etag("sessions", app_name, user_id, count, last_update, *params)
+
+
+def _list_sessions_page(
+    service: DatabaseSessionService,
+    app_name: str,
+    user_id: str,
+    limit: Optional[int],
+    cursor: Optional[str],
+) -> Tuple[List[Session], Optional[str]]:
+    with service.database_session_factory() as sql_session:
+        query = (
+            sql_session.query(StorageSession)
+            .options(
+                load_only(
+                    StorageSession.app_name,
+                    StorageSession.user_id,
+                    StorageSession.id,
+                    StorageSession.update_time,
+                )
+            )
+            .filter(StorageSession.app_name == app_name)
+            .filter(StorageSession.user_id == user_id)
+        )
+        column = StorageSession.update_time
+        dialect = service.db_engine.dialect.name
+        if cursor:
+            update_time, session_id = decode_cursor(cursor)
+            value = _comparable_time(literal(update_time, column.type), dialect)
+            query = query.filter(
+                or_(
+                    _comparable_time(column, dialect) < value,
+                    and_(
+                        _comparable_time(column, dialect) == value,
+                        StorageSession.id < session_id,
+                    ),
+                )
+            )
+        query = query.order_by(
+            _comparable_time(column, dialect).desc(), StorageSession.id.desc()
+        )
+        if limit:
+            # 다음 페이지 존재 여부 확인용으로 1개 더 조회
+            query = query.limit(limit + 1)
+        rows = query.all()
+
+        next_cursor = None
+        if limit and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].update_time, rows[-1].id)
+        sessions = [row.to_session(state={}) for row in rows]
+    return sessions, next_cursor
+
+
+def _session_events_etag(
+    service: DatabaseSessionService,
+    app_name: str,
+    user_id: str,
+    session_id: str,
+    *params: Any,
+) -> Optional[str]:
+    with service.database_session_factory() as sql_session:
+        update_time = sql_session.execute(
+            select(StorageSession.update_time).where(
+                StorageSession.app_name == app_name,
+                StorageSession.user_id == user_id,
+                StorageSession.id == session_id,
+            )
+        ).scalar_one_or_none()
+        if update_time is None:
+            return None
+        # 세션 update_time은 상태 변경이 있는 이벤트에서만 바뀌므로 이벤트 수/최신 시각도 포함
+        count, last_timestamp = sql_session.execute(
+            select(func.count(), func.max(StorageEvent.timestamp)).where(
+                StorageEvent.app_name == app_name,
+                StorageEvent.user_id == user_id,
+                StorageEvent.session_id == session_id,
+            )
+        ).one()
+    return make_etag(
+        "events",
+        app_name,
+        user_id,
+        session_id,
+        update_time,
+        count,
+        last_timestamp,
+        *params,
+    )
+
+
+def _list_events_page(
+    service: DatabaseSessionService,
+    app_name: str,
+    user_id: str,
+    session_id: str,
+    limit: Optional[int],
+    before: Optional[float],
+    after: Optional[float],
+    before_id: Optional[str] = None,
+    after_id: Optional[str] = None,
+) -> Tuple[List[Event], bool]:
+    with service.database_session_factory() as sql_session:
+        query = (
+            sql_session.query(StorageEvent)
+            .filter(StorageEvent.app_name == app_name)
+            .filter(StorageEvent.user_id == user_id)
+            .filter(StorageEvent.session_id == session_id)
+        )
+        if before is not None:
+            query = query.filter(_event_bound(before, before_id, older=True))
+        if after is not None:
+            query = query.filter(_event_bound(after, after_id, older=False))
+
+        # after만 지정하면 그 이후 오래된 순으로, 아니면 최신 이벤트부터 limit개
+        forward = after is not None and before is None
+        if forward:
+            query = query.order_by(StorageEvent.timestamp.asc(), StorageEvent.id.asc())
+        else:
+            query = query.order_by(
+                StorageEvent.timestamp.desc(), StorageEvent.id.desc()
+            )
+        if limit:
+            query = query.limit(limit + 1)
+        rows = query.all()
+
+        has_more = bool(limit) and len(rows) > limit
+        if has_more:
+            rows = rows[:limit]
+        if not forward:
+            rows.reverse()
+        events = [row.to_event() for row in rows]
+    return events, has_more
+
+
+def _event_text(event: Event) -> str:
+    parts = event.content.parts if event.content and event.content.parts else []
+    return "".join(part.text for part in parts if part.text and not part.thought)
+
+
+def project_event(event: Event, view: str) -> Optional[Dict[str, Any]]:
+    """
+    이벤트를 보기 방식에 맞게 변환합니다.
+
+    Returns:
+        Dict: 변환된 이벤트 (text 보기에서 텍스트가 없는 이벤트는 None)
+    """
+    if view == "text":
+        text = _event_text(event)
+        if not text:
+            return None
+        return {
+            "id": event.id,
+            "author": event.author,
+            "timestamp": event.timestamp,
+            "text": text,
+        }
+
+    data = event.model_dump(mode="json", exclude_none=True, by_alias=True)
+    if view == "compact":
+        for part in (data.get("content") or {}).get("parts", []):
+            response = part.get("functionResponse")
+            if response:
+                response.pop("response", None)
+    return data
+
+
+async def sessions_etag(
+    service: DatabaseSessionService, app_name: str, user_id: str, *params: Any
+) -> str:
+    """사용자 세션 목록의 ETag (세션 수와 마지막 수정 시각 기준)"""
+    return await asyncio.to_thread(_sessions_etag, service, app_name, user_id, *params)
+
+
+async def list_sessions_page(
+    service: DatabaseSessionService,
+    app_name: str,
+    user_id: str,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> Tuple[List[Session], Optional[str]]:
+    """
+    사용자의 세션을 최근 수정순으로 조회합니다 (상태/이벤트 제외).
+
+    Args:
+        limit: 최대 세션 수 (None이면 전체)
+        cursor: 이전 페이지 응답의 next_cursor
+
+    Returns:
+        Tuple: (세션 목록, 다음 페이지 커서 또는 None)
+    """
+    return await asyncio.to_thread(
+        _list_sessions_page, service, app_name, user_id, limit, cursor
+    )
+
+
+async def session_events_etag(
+    service: DatabaseSessionService,
+    app_name: str,
+    user_id: str,
+    session_id: str,
+    *params: Any,
+) -> Optional[str]:
+    """세션 이벤트 조회의 ETag (세션이 없으면 None)"""
+    return await asyncio.to_thread(
+        _session_events_etag, service, app_name, user_id, session_id, *params
+    )
+
+
+async def list_events_page(
+    service: DatabaseSessionService,
+    app_name: str,
+    user_id: str,
+    session_id: str,
+    limit: Optional[int] = None,
+    before: Optional[float] = None,
+    after: Optional[float] = None,
+    before_id: Optional[str] = None,
+    after_id: Optional[str] = None,
+) -> Tuple[List[Event], bool]:
+    """
+    세션 이벤트를 (타임스탬프, 이벤트 ID) 범위로 조회합니다. 결과는 항상 시간순입니다.
+
+    Args:
+        limit: 최대 이벤트 수 (None이면 전체)
+        before: 이 타임스탬프보다 이전 이벤트만 (이전 기록 더 보기)
+        after: 이 타임스탬프보다 이후 이벤트만 (새 이벤트 가져오기)
+        before_id: before와 같은 타임스탬프면 이 ID보다 작은 이벤트도 포함
+        after_id: after와 같은 타임스탬프면 이 ID보다 큰 이벤트도 포함
+
+    Returns:
+        Tuple: (이벤트 목록, 범위 안에 이벤트가 더 있는지 여부)
+    """
+    return await asyncio.to_thread(
+        _list_events_page,
+        service,
+        app_name,
+        user_id,
+        session_id,
+        limit,
+        before,
+        after,
+        before_id,
+        after_id,
+    )
@@ -1,28 +1,78 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional, Union
+import os
+
 from google.adk.agents import Agent
+from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.models import BaseLlm
 
 from stock.prompt import ROOT_AGENT_INSTR
-from stock.sub_agents.stock_analyzer.agent import stock_analyzer_agent
-from stock.sub_agents.sector_analyzer.agent import sector_analyzer_agent
-from stock.sub_agents.supply_demand_analyzer.agent import supply_demand_analyzer_agent
-from stock.sub_agents.volume_analyzer.agent import volume_analyzer_agent
-from stock.utils.tools.kiwoom_auth_tools import kiwoom_get_access_token_tool
+from stock.utils import scripted_llm  # "scripted" 모델 이름 등록
+from stock.utils.context_window import record_usage, trim_context
+from stock.sub_agents.stock_analyzer import agent as stock_analyzer
+from stock.sub_agents.sector_analyzer import agent as sector_analyzer
+from stock.sub_agents.supply_demand_analyzer import agent as supply_demand_analyzer
+from stock.sub_agents.volume_analyzer import agent as volume_analyzer
+
+# 에이전트 모델 (루트/서브 에이전트 공통)
+# "scripted" 또는 "scripted:<시나리오.json>"이면 시나리오 재생 모델 사용 (stock/utils/scripted_llm.py)
+ADK_MODEL = os.getenv("ADK_MODEL", "gemini-2.5-flash")
+
+# 요청별 루트 에이전트 지시문 (None이면 기본 ROOT_AGENT_INSTR 사용)
+_instruction_override: ContextVar[Optional[str]] = ContextVar(
+    "root_instruction_override", default=None
+)
+
+
+@contextmanager
+def instruction_override(instruction: Optional[str]):
+    """
+    블록 안에서 실행되는 에이전트 호출에만 루트 에이전트 지시문을 바꿉니다.
+    공유 에이전트를 수정하지 않으므로 동시에 처리되는 다른 요청에 영향을 주지 않습니다.
 
+    사용 예:
+        with instruction_override(request.instruction):
+            async for event in runner.run_async(...):
+                ...
+    """
+    token = _instruction_override.set(instruction)
+    try:
+        yield
+    finally:
+        _instruction_override.reset(token)
 
-def create_stock_agent():
+
+def root_instruction(ctx: ReadonlyContext) -> str:
+    """현재 요청의 지시문을 반환합니다. 지정되지 않았으면 기본 지시문을 사용합니다."""
+    instruction = _instruction_override.get()
+    return ROOT_AGENT_INSTR if instruction is None else instruction
+
+
+def create_stock_agent(model: Union[str, BaseLlm] = ADK_MODEL):
+    """
+    루트 에이전트와 서브 에이전트 트리를 만듭니다.
+    에이전트는 부모를 하나만 가질 수 있으므로 호출마다 서브 에이전트를 새로 만듭니다.
+
+    Args:
+        model: 모든 에이전트가 사용할 모델 이름 또는 BaseLlm 인스턴스
+    """
     return Agent(
-        model="gemini-2.5-flash",
+        model=model,
         name="stock_agent",
         description="A Stock AI using the services of multiple sub-agents",
-        instruction=ROOT_AGENT_INSTR,
+        instruction=root_instruction,
+        # 긴 세션의 이전 도구 결과 요약 및 토큰 예산 적용
+        before_model_callback=trim_context,
+        after_model_callback=record_usage,
         sub_agents=[
-            stock_analyzer_agent,
-            sector_analyzer_agent,
-            supply_demand_analyzer_agent,
-            volume_analyzer_agent,
-        ],
-        tools=[
-            kiwoom_get_access_token_tool,  # 🔑 키움 API 토큰 발급 (마스터에서 먼저 실행)
+            stock_analyzer.create_agent(model),
+            sector_analyzer.create_agent(model),
+            supply_demand_analyzer.create_agent(model),
+            volume_analyzer.create_agent(model),
         ],
+        # 키움 API 토큰은 kiwoom_client가 캐시된 토큰을 자동 주입하므로 토큰 발급 도구 불필요
+        tools=[],
     )
 
 
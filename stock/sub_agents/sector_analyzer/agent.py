@@ -1,15 +1,25 @@
+from typing import Union
+
 from google.adk.agents import Agent
+from google.adk.models import BaseLlm
 from .prompt import SECTOR_ANALYZER_INSTR
-from stock.utils.tools.kiwoom_sector_tools import KIWOOM_SECTOR_TOOLS
-from stock.utils.tools.kiwoom_theme_tools import KIWOOM_THEME_TOOLS
+from stock.utils.context_window import record_usage, trim_context
+from stock.utils.tools.kiwoom_slimming import slim_tool_response
+from stock.utils.tools.aio.kiwoom_sector_tools import KIWOOM_SECTOR_TOOLS
+from stock.utils.tools.aio.kiwoom_theme_tools import KIWOOM_THEME_TOOLS
 
 
-def create_agent():
+def create_agent(model: Union[str, BaseLlm] = "gemini-2.5-flash"):
     return Agent(
-        model="gemini-2.5-flash",
+        model=model,
         name="sector_analyzer_agent",
         description="A Sector Analyzer Agent for analyzing industry and theme performance",
         instruction=SECTOR_ANALYZER_INSTR,
+        # 긴 세션의 이전 도구 결과 요약 및 토큰 예산 적용
+        before_model_callback=trim_context,
+        after_model_callback=record_usage,
+        # 도구 결과에서 사용하지 않는 키움 필드 제거
+        after_tool_callback=slim_tool_response,
         tools=[
             *KIWOOM_SECTOR_TOOLS,  # 섹터 관련 모든 도구들
             *KIWOOM_THEME_TOOLS,  # 테마 관련 모든 도구들
@@ -5,9 +5,8 @@ SECTOR_ANALYZER_INSTR = """
 전체 시장 흐름 파악, 유망 업종 발굴, 인기 테마 분석을 통해 투자 인사이트를 제공합니다.
 
 ## 🔑 인증 토큰 사용
-- 메인 에이전트로부터 받은 토큰을 사용하여 API를 호출하세요
-- 토큰이 제공되면 모든 도구 호출 시 authorization 매개변수에 토큰을 전달하세요
-- 토큰이 없으면 "인증 토큰이 필요합니다"라고 응답하세요
+- 인증 토큰은 서버에서 자동으로 주입됩니다
+- 도구 호출 시 authorization/token 매개변수는 생략하세요
 
 ## 🎯 주요 역할
 - **시장 전체 흐름 파악**: 오늘 시장이 강세인지 약세인지 판단
@@ -1,27 +1,43 @@
+from typing import Union
+
 from google.adk.agents import Agent
+from google.adk.models import BaseLlm
 from .prompt import STOCK_ANALYZER_INSTR
-from stock.utils.tools.kiwoom_account_tools import kiwoom_account_evaluation_tool
-from stock.utils.tools.kiwoom_chart_tools import kiwoom_stock_daily_chart_tool
-from stock.utils.tools.kiwoom_market_tools import (
+from stock.utils.context_window import record_usage, trim_context
+from stock.utils.tools.kiwoom_slimming import slim_tool_response
+from stock.utils.tools.aio.kiwoom_account_tools import kiwoom_account_evaluation_tool
+from stock.utils.tools.aio.kiwoom_chart_tools import kiwoom_stock_daily_chart_tool
+from stock.utils.tools.aio.kiwoom_market_tools import (
     kiwoom_stock_institution_trading_trend_tool,
     kiwoom_short_selling_trend_tool,
 )
-from stock.utils.tools.kiwoom_stock_info_tools import (
+from stock.utils.tools.aio.kiwoom_stock_info_tools import (
     kiwoom_stock_basic_info_tool,
     kiwoom_stock_daily_program_trading_trend_tool,
 )
-from stock.utils.tools.kiwoom_sector_tools import kiwoom_sector_current_price_tool
+from stock.utils.tools.aio.kiwoom_sector_tools import kiwoom_sector_current_price_tool
+from stock.utils.tools.aio.kiwoom_snapshot_tools import kiwoom_stock_snapshot_tool
+from stock.utils.tools.aio.kiwoom_indicator_tools import (
+    kiwoom_technical_indicators_tool,
+)
 
 
 # 보유 주식 분석 클릭시 해당 에이전트 실행
 # 프론트에서 해당 종목 코드 전달 필요함.
-def create_agent():
+def create_agent(model: Union[str, BaseLlm] = "gemini-2.5-flash"):
     return Agent(
-        model="gemini-2.5-flash",
+        model=model,
         name="stock_analyzer_agent",
         description="A Stock Analyzer Agent for stock analysis",
         instruction=STOCK_ANALYZER_INSTR,
+        # 긴 세션의 이전 도구 결과 요약 및 토큰 예산 적용
+        before_model_callback=trim_context,
+        after_model_callback=record_usage,
+        # 도구 결과에서 사용하지 않는 키움 필드 제거
+        after_tool_callback=slim_tool_response,
         tools=[
+            kiwoom_stock_snapshot_tool,  # 종목 스냅샷 (아래 7개 API 동시 조회)
+            kiwoom_technical_indicators_tool,  # 기술적 지표 (SMA/EMA, RSI, MACD, 볼린저, ATR, OBV)
             kiwoom_account_evaluation_tool,  # 계좌평가현황요청 (kt00004)
             kiwoom_stock_basic_info_tool,  # 주식기본정보요청 (ka10001)
             kiwoom_stock_daily_chart_tool,  # 주식일봉차트조회요청 (ka10081)
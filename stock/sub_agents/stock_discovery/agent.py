@@ -1,13 +1,16 @@
+from typing import Union
+
 from google.adk.agents import Agent
+from google.adk.models import BaseLlm
 from google.adk.tools import AgentTool
 
 from stock.utils.tools.google_search_agent import google_search_agent
 from .prompt import STOCK_DISCOVERY_INSTR
 
 
-def create_agent():
+def create_agent(model: Union[str, BaseLlm] = "gemini-2.5-pro"):
     return Agent(
-        model="gemini-2.5-pro",
+        model=model,
         name="stock_discovery_agent",
         description="A Stock Discovery Agent for discovering new promising stocks using Google search",
         instruction=STOCK_DISCOVERY_INSTR,
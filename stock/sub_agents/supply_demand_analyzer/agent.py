@@ -1,14 +1,24 @@
+from typing import Union
+
 from google.adk.agents import Agent
+from google.adk.models import BaseLlm
 from .prompt import SUPPLY_DEMAND_ANALYZER_INSTR
-from stock.utils.tools.kiwoom_supply_demand_tools import KIWOOM_SUPPLY_DEMAND_TOOLS
+from stock.utils.context_window import record_usage, trim_context
+from stock.utils.tools.kiwoom_slimming import slim_tool_response
+from stock.utils.tools.aio.kiwoom_supply_demand_tools import KIWOOM_SUPPLY_DEMAND_TOOLS
 
 
-def create_agent():
+def create_agent(model: Union[str, BaseLlm] = "gemini-2.5-flash"):
     return Agent(
-        model="gemini-2.5-flash",
+        model=model,
         name="supply_demand_analyzer_agent",
         description="A Supply Demand Analyzer Agent for analyzing institutional and foreign trading trends",
         instruction=SUPPLY_DEMAND_ANALYZER_INSTR,
+        # 긴 세션의 이전 도구 결과 요약 및 토큰 예산 적용
+        before_model_callback=trim_context,
+        after_model_callback=record_usage,
+        # 도구 결과에서 사용하지 않는 키움 필드 제거
+        after_tool_callback=slim_tool_response,
         tools=[
             *KIWOOM_SUPPLY_DEMAND_TOOLS,  # 수급 관련 모든 도구들 (외국인기관매매상위요청 포함)
         ],
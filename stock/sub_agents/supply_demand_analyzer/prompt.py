@@ -6,9 +6,8 @@ SUPPLY_DEMAND_ANALYZER_INSTR = """
 항상 동일한 절차를 따를 필요는 없으며, 질문 성격에 맞춰 유연하게 필요한 도구만 선택합니다.
 
 ## 🔑 인증 토큰 사용
-- 메인 에이전트로부터 받은 토큰을 사용하여 API를 호출하세요
-- 토큰이 제공되면 모든 도구 호출 시 authorization 매개변수에 토큰을 전달하세요
-- 토큰이 없으면 "인증 토큰이 필요합니다"라고 응답하세요
+- 인증 토큰은 서버에서 자동으로 주입됩니다
+- 도구 호출 시 authorization/token 매개변수는 생략하세요
 
 ## 🎯 역할 및 목표
 - 기관/외국인 수급 데이터를 활용한 종목 분석 및 추천
@@ -1,10 +1,13 @@
+from typing import Union
+
 from google.adk.agents import Agent
+from google.adk.models import BaseLlm
 from .prompt import TRADING_RECOMMENDATION_INSTR
 
 
-def create_agent():
+def create_agent(model: Union[str, BaseLlm] = "gemini-2.5-flash"):
     return Agent(
-        model="gemini-2.5-flash",
+        model=model,
         name="trading_recommander_agent",
         description="A Trading Recommander Agent for trading recommander",
         instruction=TRADING_RECOMMENDATION_INSTR,
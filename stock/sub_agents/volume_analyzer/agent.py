@@ -1,20 +1,32 @@
+from typing import Union
+
 from google.adk.agents import Agent
+from google.adk.models import BaseLlm
 from .prompt import VOLUME_ANALYZER_INSTR
+from stock.utils.context_window import record_usage, trim_context
+from stock.utils.tools.kiwoom_slimming import slim_tool_response
 
-# from stock.utils.tools.kiwoom_chart_tools import KIWOOM_CHART_TOOLS
-from stock.utils.tools.kiwoom_ranking_tools import KIWOOM_RANKING_TOOLS
-# from stock.utils.tools.kiwoom_market_tools import KIWOOM_MARKET_TOOLS
+# from stock.utils.tools.aio.kiwoom_chart_tools import KIWOOM_CHART_TOOLS
+from stock.utils.tools.aio.kiwoom_ranking_tools import KIWOOM_RANKING_TOOLS
+from stock.utils.tools.aio.kiwoom_indicator_tools import KIWOOM_INDICATOR_TOOLS
+# from stock.utils.tools.aio.kiwoom_market_tools import KIWOOM_MARKET_TOOLS
 
 
-def create_agent():
+def create_agent(model: Union[str, BaseLlm] = "gemini-2.5-flash"):
     return Agent(
-        model="gemini-2.5-flash",
+        model=model,
         name="volume_analyzer_agent",
         description="A Volume Analyzer Agent for analyzing trading volume and value trends",
         instruction=VOLUME_ANALYZER_INSTR,
+        # 긴 세션의 이전 도구 결과 요약 및 토큰 예산 적용
+        before_model_callback=trim_context,
+        after_model_callback=record_usage,
+        # 도구 결과에서 사용하지 않는 키움 필드 제거
+        after_tool_callback=slim_tool_response,
         tools=[
             # *KIWOOM_CHART_TOOLS,  # 차트 관련 도구들 (일봉, 분봉 등)
             *KIWOOM_RANKING_TOOLS,  # 순위정보 관련 도구들 (거래량급증, 거래량상위, 거래대금상위, 등락률상위, 예상체결등락률상위)
+            *KIWOOM_INDICATOR_TOOLS,  # 기술적 지표 (이동평균, RSI, MACD, 거래량 z-score 등)
             # *KIWOOM_MARKET_TOOLS,  # 시세정보 관련 도구들 (기관매매추이, 공매도추이 등)
         ],
     )
@@ -0,0 +1,252 @@
+"""
+에이전트 컨텍스트 윈도우 관리
+- Runner는 매 요청마다 세션 전체 기록을 모델에 보내므로, 대화가 길어질수록
+  이전 순위표/차트 원본이 계속 다시 전송됨
+- before_model_callback (trim_context)
+  - 최근 N개 턴은 그대로 유지
+  - 이전 턴의 도구 응답은 요약본으로 교체하고, 긴 텍스트는 자름
+  - 요청당 토큰 예산을 넘으면 가장 오래된 턴부터 제외 (현재 턴은 항상 유지)
+- after_model_callback (record_usage): 모델이 보고한 실제 입력 토큰 수 기록
+- context_stats.get_stats(): 에이전트별 요청당 토큰 수 (정리 전/후 추정치, 실제값)
+"""
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+from google.genai import types
+from typing import Any, Dict, List, Optional
+import json
+import math
+import os
+import threading
+
+# 원본을 유지할 최근 턴 수 (턴: 사용자 메시지부터 다음 사용자 메시지 전까지)
+CONTEXT_KEEP_TURNS = int(os.getenv("ADK_CONTEXT_KEEP_TURNS", "3"))
+# 요청당 대화 기록 토큰 예산 (추정치, 시스템 지시문 제외)
+CONTEXT_TOKEN_BUDGET = int(os.getenv("ADK_CONTEXT_TOKEN_BUDGET", "32000"))
+# 이전 턴의 텍스트 최대 길이 (자)
+CONTEXT_MAX_OLD_TEXT_CHARS = int(os.getenv("ADK_CONTEXT_MAX_OLD_TEXT_CHARS", "1500"))
+
+# 요약본에 남길 문자열 최대 길이
+_SUMMARY_TEXT_LENGTH = 200
+# 다른 에이전트 기록을 전달할 때 ADK가 붙이는 머리말
+_FOREIGN_CONTEXT_PREFIX = "For context:"
+
+
+def estimate_tokens(value: Any) -> int:
+    """
+    토큰 수를 추정합니다 (UTF-8 바이트 / 3).
+    영문/JSON은 약간 많게, 한글은 비슷하게 추정되어 예산 계산에는 보수적입니다.
+    """
+    if not isinstance(value, str):
+        value = json.dumps(value, ensure_ascii=False, default=str)
+    return math.ceil(len(value.encode()) / 3)
+
+
+def _summarize_value(value: Any, depth: int) -> Any:
+    if isinstance(value, str):
+        if len(value) <= _SUMMARY_TEXT_LENGTH:
+            return value
+        return value[:_SUMMARY_TEXT_LENGTH] + f"...({len(value)}자)"
+    if isinstance(value, list):
+        summary: Dict[str, Any] = {"count": len(value)}
+        if value and depth > 0:
+            summary["first"] = _summarize_value(value[0], depth - 1)
+        return summary
+    if isinstance(value, dict):
+        if depth <= 0:
+            return {"keys": list(value)[:10]}
+        return {k: _summarize_value(v, depth - 1) for k, v in value.items()}
+    return value
+
+
+def summarize_response(response: Dict[str, Any], original_bytes: int) -> Dict[str, Any]:
+    """
+    도구 응답을 요약합니다.
+    스칼라 값은 유지하고 (긴 문자열은 자름), 리스트는 건수와 첫 항목만 남깁니다.
+    """
+    summary = _summarize_value(response, depth=2)
+    if not isinstance(summary, dict):
+        summary = {"value": summary}
+    return {"_compacted": True, "original_bytes": original_bytes, **summary}
+
+
+def _content_tokens(content: types.Content) -> int:
+    return estimate_tokens(content.model_dump(mode="json", exclude_none=True))
+
+
+def _is_user_turn_start(content: types.Content) -> bool:
+    """사용자가 직접 보낸 메시지인지 (도구 응답, 다른 에이전트 기록 제외)"""
+    if content.role != "user" or not content.parts:
+        return False
+    first = content.parts[0]
+    return bool(first.text) and not first.text.startswith(_FOREIGN_CONTEXT_PREFIX)
+
+
+def split_turns(contents: List[types.Content]) -> List[List[types.Content]]:
+    """대화 기록을 턴 단위로 나눕니다."""
+    turns: List[List[types.Content]] = []
+    for content in contents:
+        if not turns or _is_user_turn_start(content):
+            turns.append([])
+        turns[-1].append(content)
+    return turns
+
+
+def _compact_part(part: types.Part) -> types.Part:
+    """이전 턴의 파트를 축약합니다 (도구 응답 요약, 긴 텍스트 자르기)."""
+    response = part.function_response
+    if response and isinstance(response.response, dict):
+        if response.response.get("_compacted"):
+            return part
+        size = len(
+            json.dumps(response.response, ensure_ascii=False, default=str).encode()
+        )
+        return types.Part(
+            function_response=types.FunctionResponse(
+                id=response.id,
+                name=response.name,
+                response=summarize_response(response.response, size),
+            )
+        )
+    if part.text and len(part.text) > CONTEXT_MAX_OLD_TEXT_CHARS:
+        omitted = len(part.text) - CONTEXT_MAX_OLD_TEXT_CHARS
+        return part.model_copy(
+            update={
+                "text": part.text[:CONTEXT_MAX_OLD_TEXT_CHARS]
+                + f"...({omitted}자 생략)"
+            }
+        )
+    return part
+
+
+def _compact_turn(turn: List[types.Content]) -> List[types.Content]:
+    return [
+        types.Content(
+            role=content.role,
+            parts=[_compact_part(part) for part in content.parts or []],
+        )
+        for content in turn
+    ]
+
+
+def bound_contents(
+    contents: List[types.Content],
+    keep_turns: int = CONTEXT_KEEP_TURNS,
+    token_budget: int = CONTEXT_TOKEN_BUDGET,
+) -> List[types.Content]:
+    """
+    대화 기록을 최근 keep_turns개 턴 원본 + 이전 턴 요약으로 줄이고,
+    token_budget을 넘으면 오래된 턴부터 제외합니다.
+
+    Args:
+        contents: 모델에 보낼 대화 기록
+        keep_turns: 원본을 유지할 최근 턴 수
+        token_budget: 대화 기록 토큰 예산 (추정치)
+
+    Returns:
+        List[types.Content]: 정리된 대화 기록 (원본 객체는 수정하지 않음)
+    """
+    turns = split_turns(contents)
+    recent_start = max(len(turns) - max(keep_turns, 1), 0)
+    turns = [
+        _compact_turn(turn) if index < recent_start else turn
+        for index, turn in enumerate(turns)
+    ]
+
+    turn_tokens = [sum(_content_tokens(content) for content in turn) for turn in turns]
+    total = sum(turn_tokens)
+    # 현재 턴(마지막)은 예산을 넘어도 유지
+    while total > token_budget and len(turns) > 1:
+        turns.pop(0)
+        total -= turn_tokens.pop(0)
+
+    # 오래된 턴을 모두 제외해도 넘으면 현재 턴 이전의 최근 턴도 요약
+    if total > token_budget and len(turns) > 1:
+        turns = [_compact_turn(turn) for turn in turns[:-1]] + [turns[-1]]
+
+    return [content for turn in turns for content in turn]
+
+
+class ContextStats:
+    """에이전트별 요청당 대화 기록 토큰 수 통계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, Any]] = {}
+
+    def _agent(self, agent_name: str) -> Dict[str, Any]:
+        return self._stats.setdefault(
+            agent_name,
+            {
+                "requests": 0,
+                "estimated_tokens_before": 0,
+                "estimated_tokens_after": 0,
+                "reported_requests": 0,
+                "prompt_tokens": 0,
+                "last": {},
+            },
+        )
+
+    def record_trim(self, agent_name: str, before: int, after: int) -> None:
+        with self._lock:
+            stats = self._agent(agent_name)
+            stats["requests"] += 1
+            stats["estimated_tokens_before"] += before
+            stats["estimated_tokens_after"] += after
+            stats["last"] = {
+                "estimated_tokens_before": before,
+                "estimated_tokens_after": after,
+            }
+
+    def record_prompt_tokens(self, agent_name: str, prompt_tokens: int) -> None:
+        with self._lock:
+            stats = self._agent(agent_name)
+            stats["reported_requests"] += 1
+            stats["prompt_tokens"] += prompt_tokens
+            stats["last"]["prompt_tokens"] = prompt_tokens
+
+    def get_stats(self) -> Dict[str, Any]:
+        """에이전트별 누적/평균 토큰 수와 마지막 요청 값을 반환합니다."""
+        with self._lock:
+            result = {}
+            for agent_name, stats in self._stats.items():
+                requests = stats["requests"] or 1
+                reported = stats["reported_requests"] or 1
+                result[agent_name] = {
+                    **stats,
+                    "last": dict(stats["last"]),
+                    "avg_estimated_tokens_before": round(
+                        stats["estimated_tokens_before"] / requests
+                    ),
+                    "avg_estimated_tokens_after": round(
+                        stats["estimated_tokens_after"] / requests
+                    ),
+                    "avg_prompt_tokens": round(stats["prompt_tokens"] / reported),
+                }
+            return result
+
+
+context_stats = ContextStats()
+
+
+def trim_context(
+    callback_context: CallbackContext, llm_request: LlmRequest
+) -> Optional[LlmResponse]:
+    """before_model_callback: 모델 호출 전 대화 기록을 정리합니다."""
+    before = sum(_content_tokens(content) for content in llm_request.contents)
+    llm_request.contents = bound_contents(llm_request.contents)
+    after = sum(_content_tokens(content) for content in llm_request.contents)
+    context_stats.record_trim(callback_context.agent_name, before, after)
+    return None
+
+
+def record_usage(
+    callback_context: CallbackContext, llm_response: LlmResponse
+) -> Optional[LlmResponse]:
+    """after_model_callback: 모델이 보고한 실제 입력 토큰 수를 기록합니다."""
+    usage = llm_response.usage_metadata
+    if usage and usage.prompt_token_count and not llm_response.partial:
+        context_stats.record_prompt_tokens(
+            callback_context.agent_name, usage.prompt_token_count
+        )
+    return None
@@ -0,0 +1,91 @@
+"""
+질문 의도 사전 라우팅 (루트 에이전트 모델 호출 생략)
+- 루트 에이전트는 질문을 보고 서브 에이전트로 넘기기만 하므로, 의도가 분명한 질문은
+  루트 모델 호출 없이 바로 서브 에이전트를 실행 (main.py가 서브 에이전트별 Runner 사용)
+- 규칙 (루트 에이전트 지시문 stock/prompt.py의 질문 매핑과 같음)
+  - 프론트에서 종목코드(stock_code)를 보냈으면 stock_analyzer_agent
+  - 메시지 안의 6자리 숫자는 종목코드인지 조건값(거래대금 등)인지 알 수 없으므로 루트 에이전트
+  - 키워드가 한 분야에만 해당하면 해당 에이전트
+    (거래량/급등 → volume, 기관/외국인/수급 → supply_demand, 섹터/업종/테마 → sector)
+  - 여러 분야에 걸치거나 해당 없으면 루트 에이전트 (모델이 판단)
+- 서브 에이전트는 같은 에이전트 트리에 속하므로 범위 밖 질문은 그대로 다른 에이전트로 넘길 수 있음
+"""
+
+from typing import List, Optional, Tuple
+import os
+import re
+
+from google.adk.agents import BaseAgent
+from google.adk.runners import Runner
+from google.adk.sessions import Session
+
+from stock.utils.metrics import registry
+
+# 사전 라우팅 사용 여부
+ADK_FAST_ROUTE = os.getenv("ADK_FAST_ROUTE", "true").lower() == "true"
+
+ROOT_AGENT_NAME = "stock_agent"
+STOCK_ANALYZER_AGENT = "stock_analyzer_agent"
+
+# 메시지 안의 종목코드 후보 (main.py의 _build_content와 같은 규칙)
+_STOCK_CODE_PATTERN = re.compile(r"\b\d{6}\b")
+
+# 키워드 의도별 에이전트
+KEYWORD_ROUTES: List[Tuple[str, re.Pattern]] = [
+    ("volume_analyzer_agent", re.compile(r"거래량|거래대금|급등|급증|급락|모멘텀")),
+    (
+        "supply_demand_analyzer_agent",
+        re.compile(r"기관|외국인|외인|수급|순매수|순매도"),
+    ),
+    ("sector_analyzer_agent", re.compile(r"섹터|업종|테마")),
+]
+
+# 사전 라우팅 대상 에이전트
+FAST_ROUTE_AGENTS = [STOCK_ANALYZER_AGENT] + [name for name, _ in KEYWORD_ROUTES]
+
+FAST_ROUTES = registry.counter(
+    "adk_fast_route_total",
+    "요청을 처음 처리한 에이전트 (stock_agent: 루트 에이전트가 판단)",
+    ["agent"],
+)
+
+
+def route_message(
+    message: str,
+    stock_code: Optional[str] = None,
+    instruction: Optional[str] = None,
+) -> str:
+    """
+    요청을 처음 처리할 에이전트 이름을 반환합니다.
+
+    Args:
+        message: 사용자 메시지 원문 ("종목코드:" 머리말을 붙이기 전)
+        stock_code: 프론트에서 보낸 종목코드
+        instruction: 요청별 루트 에이전트 지시문 (지정되면 루트 에이전트가 처리)
+
+    Returns:
+        str: 에이전트 이름 (사전 라우팅하지 않으면 stock_agent)
+    """
+    agent_name = ROOT_AGENT_NAME
+    if ADK_FAST_ROUTE and instruction is None:
+        if stock_code:
+            agent_name = STOCK_ANALYZER_AGENT
+        elif not _STOCK_CODE_PATTERN.search(message):
+            matched = [
+                name for name, pattern in KEYWORD_ROUTES if pattern.search(message)
+            ]
+            if len(matched) == 1:
+                agent_name = matched[0]
+    FAST_ROUTES.inc(agent_name)
+    return agent_name
+
+
+class RoutedRunner(Runner):
+    """
+    사전 라우팅한 서브 에이전트로 항상 실행을 시작하는 Runner.
+    기본 Runner는 세션 기록에서 마지막으로 응답한 에이전트를 찾아 이어서 실행하지만,
+    라우팅한 요청은 이미 처리할 에이전트가 정해져 있으므로 찾지 않습니다.
+    """
+
+    def _find_agent_to_run(self, session: Session, root_agent: BaseAgent) -> BaseAgent:
+        return root_agent
@@ -0,0 +1,340 @@
+"""
+서버 계측 (Prometheus 지표 + OpenTelemetry span)
+- 프로세스 전역 지표 저장소(registry)에 카운터/게이지/히스토그램을 등록하고
+  render_metrics()로 Prometheus 텍스트 형식을 만듦 (/metrics 엔드포인트)
+- 에이전트 실행 루프 계측 (track_run)
+  - 실행 시간, 동시 실행 수, 성공/실패/취소 건수
+  - 이벤트 간격으로 추정한 단계별 시간: 모델 응답(kind=model), 도구 실행(kind=tool)
+  - 실행 중 session_id를 컨텍스트에 저장해 도구/키움 호출 span에 함께 기록
+- 세션 DB 작업 시간 (server.session_store가 기록)
+- 키움 API/도구 지표는 stock/utils/tools/kiwoom_metrics.py
+- span은 ADK와 같은 OpenTelemetry API를 사용하므로 ADK의 에이전트/도구 span 아래에 이어짐
+  ADK_TRACE_EXPORTER를 지정해야 내보냄 (console, gcp). 지정하지 않으면 기록 요청된 실행의
+  span만 기록해 요청별 waterfall로 보관 (stock/utils/traces.py)
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+import asyncio
+import bisect
+import os
+import threading
+import time
+
+from opentelemetry import trace
+
+from stock.utils.traces import RecordingSampler, recording, trace_buffer
+
+# span 내보내기 대상 ("", console, gcp)
+ADK_TRACE_EXPORTER = os.getenv("ADK_TRACE_EXPORTER", "").lower()
+
+# 지연 시간 히스토그램 구간 (초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+tracer = trace.get_tracer("stock")
+
+# 현재 실행 중인 채팅 세션 (도구/키움 호출 span에 기록)
+_session_id: ContextVar[Optional[str]] = ContextVar("session_id", default=None)
+
+
+def current_session_id() -> Optional[str]:
+    """현재 에이전트 실행의 session_id (실행 중이 아니면 None)"""
+    return _session_id.get()
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(pairs: Sequence[Tuple[str, str]]) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, label_values: Sequence[object]) -> Tuple[str, ...]:
+        if len(label_values) != len(self.labels):
+            raise ValueError(f"{self.name}: 라벨 {self.labels}의 값이 필요합니다.")
+        return tuple("" if value is None else str(value) for value in label_values)
+
+    def _lines(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        header = [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        return header + self._lines()
+
+
+class Counter(_Metric):
+    """증가만 하는 값 (요청 수 등)"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        super().__init__(name, help_text, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: object, amount: float = 1) -> None:
+        key = self._key(label_values)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _lines(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(list(zip(self.labels, key)))} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Gauge(Counter):
+    """증감하는 현재 값 (동시 실행 수 등)"""
+
+    kind = "gauge"
+
+    def dec(self, *label_values: object, amount: float = 1) -> None:
+        self.inc(*label_values, amount=-amount)
+
+
+class Histogram(_Metric):
+    """구간별 누적 건수와 합계 (지연 시간, 응답 크기 등)"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+        # 라벨별 [구간별 건수..., +Inf 건수], 합계
+        self._values: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *label_values: object) -> None:
+        key = self._key(label_values)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.setdefault(
+                key, ([0] * (len(self.buckets) + 1), [0.0])
+            )
+            counts[index] += 1
+            total[0] += value
+
+    def _lines(self) -> List[str]:
+        with self._lock:
+            items = sorted(
+                (key, list(counts), total[0])
+                for key, (counts, total) in self._values.items()
+            )
+        lines = []
+        for key, counts, total in items:
+            pairs = list(zip(self.labels, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                labels = _format_labels(pairs + [("le", _format_value(bound))])
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(
+                f"{self.name}_sum{_format_labels(pairs)} {_format_value(total)}"
+            )
+            lines.append(f"{self.name}_count{_format_labels(pairs)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """프로세스 전역 지표 저장소. 같은 이름으로 다시 등록하면 기존 지표를 반환합니다."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labels))
+
+    def gauge(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help_text, labels))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, help_text, labels, buckets))
+
+    def render(self) -> str:
+        """Prometheus 텍스트 형식 (text/plain; version=0.0.4)"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# 프로세스 전역 지표 저장소
+registry = MetricsRegistry()
+
+
+def render_metrics() -> str:
+    return registry.render()
+
+
+RUN_SECONDS = registry.histogram(
+    "adk_run_seconds", "에이전트 실행 시간 (요청당)", ["endpoint"]
+)
+RUNS = registry.counter("adk_runs_total", "에이전트 실행 건수", ["endpoint", "status"])
+RUNS_IN_PROGRESS = registry.gauge(
+    "adk_runs_in_progress", "실행 중인 에이전트 수", ["endpoint"]
+)
+STEP_SECONDS = registry.histogram(
+    "adk_step_seconds",
+    "이전 이벤트부터 걸린 시간 (kind=model: 모델 응답, kind=tool: 도구 실행)",
+    ["agent", "kind"],
+)
+SESSION_DB_SECONDS = registry.histogram(
+    "adk_session_db_seconds", "세션 DB 작업 시간", ["operation"]
+)
+
+
+class RunTracker:
+    """track_run이 반환하는 실행 기록기. 에이전트 이벤트마다 observe를 호출합니다."""
+
+    def __init__(self, span: trace.Span, trace_id: Optional[str] = None):
+        self.span = span
+        # 실행을 기록 중이면 GET /api/v1/adk/traces/{trace_id}로 조회할 id
+        self.trace_id = trace_id
+        self.events = 0
+        self._last = time.perf_counter()
+
+    def observe(self, event) -> None:
+        """이벤트 간격을 단계 시간으로 기록합니다 (부분 스트리밍 응답 제외)."""
+        if event.partial:
+            return
+        now = time.perf_counter()
+        if event.get_function_responses():
+            kind = "tool"
+        elif event.author != "user":
+            kind = "model"
+        else:
+            kind = ""
+        if kind:
+            STEP_SECONDS.observe(now - self._last, event.author, kind)
+        self._last = now
+        self.events += 1
+
+
+@contextmanager
+def track_run(
+    endpoint: str,
+    session_id: str,
+    user_id: Optional[str] = None,
+    record: bool = False,
+) -> Iterator[RunTracker]:
+    """
+    에이전트 실행 루프를 계측합니다.
+    record가 True면 실행의 span을 모아 trace_buffer에 waterfall로 보관합니다.
+
+    사용 예:
+        with track_run("chat", session.id, request.user_id) as run:
+            async for event in runner.run_async(...):
+                run.observe(event)
+    """
+    token = _session_id.set(session_id)
+    started = time.perf_counter()
+    status = "error"
+    trace_id = None
+    RUNS_IN_PROGRESS.inc(endpoint)
+    try:
+        with (
+            recording(record),
+            tracer.start_as_current_span(f"adk_run {endpoint}") as span,
+        ):
+            span.set_attribute("session.id", session_id)
+            if user_id:
+                span.set_attribute("user.id", user_id)
+            if record and span.is_recording():
+                trace_id = span.get_span_context().trace_id
+            run = RunTracker(span, trace_buffer.start(trace_id) if trace_id else None)
+            try:
+                yield run
+                status = "ok"
+            except (asyncio.CancelledError, GeneratorExit):
+                # 클라이언트 연결 종료로 실행 태스크가 취소된 경우
+                status = "cancelled"
+                raise
+            finally:
+                span.set_attribute("adk.events", run.events)
+                span.set_attribute("adk.status", status)
+    finally:
+        if trace_id:
+            trace_buffer.finish(
+                trace_id,
+                endpoint=endpoint,
+                session_id=session_id,
+                user_id=user_id,
+                status=status,
+            )
+        RUNS_IN_PROGRESS.dec(endpoint)
+        RUNS.inc(endpoint, status)
+        RUN_SECONDS.observe(time.perf_counter() - started, endpoint)
+        _session_id.reset(token)
+
+
+def configure_tracing() -> None:
+    """
+    span 기록을 설정합니다.
+    요청별 trace 보관소(trace_buffer)는 항상 연결하고,
+    ADK_TRACE_EXPORTER 설정에 맞게 span 내보내기를 추가합니다.
+    - console: 표준 출력
+    - gcp: Cloud Trace (GOOGLE_CLOUD_PROJECT)
+    """
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+
+    exporter = None
+    if ADK_TRACE_EXPORTER == "console":
+        exporter = ConsoleSpanExporter()
+    elif ADK_TRACE_EXPORTER == "gcp":
+        from opentelemetry.exporter.cloud_trace import CloudTraceSpanExporter
+
+        exporter = CloudTraceSpanExporter(project_id=os.getenv("GOOGLE_CLOUD_PROJECT"))
+    elif ADK_TRACE_EXPORTER:
+        print(f"Unknown ADK_TRACE_EXPORTER: {ADK_TRACE_EXPORTER}")
+
+    # 내보내지 않으면 기록 중인 실행의 span만 샘플링
+    provider = TracerProvider(sampler=RecordingSampler(export_all=exporter is not None))
+    provider.add_span_processor(trace_buffer)
+    if exporter is not None:
+        provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
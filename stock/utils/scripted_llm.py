@@ -0,0 +1,332 @@
+"""
+시나리오 재생 모델 (오프라인 개발/벤치마크용 LLM 대역)
+- 실제 모델 대신 질문별로 미리 정해 둔(또는 녹화한) 도구 호출 순서를 그대로 재생
+- 네트워크/과금 없이 stock_agent → 서브 에이전트 → 도구 전체 흐름을 실행해
+  프레임워크, 세션 저장소, 도구 지연만 측정할 수 있음
+- ADK 모델 레지스트리에 등록되어 모델 이름으로 선택
+  - "scripted": 기본 시나리오 (거래량/수급/섹터/개별종목)
+  - "scripted:<경로.json>": JSON 파일의 시나리오
+  - 예: ADK_MODEL=scripted python main.py, create_stock_agent(model="scripted")
+- 시나리오 형식
+  {"name": "volume", "match": ["거래량", "급등"], "agent": "volume_analyzer_agent",
+   "steps": [{"calls": [{"name": "도구명", "args": {...}}]}, {"text": "최종 답변"}]}
+  - match: 사용자 메시지에 검색할 정규식 (앞에서부터 처음 맞는 시나리오 사용, 비어 있으면 항상 맞음)
+  - agent: 답변할 에이전트. 다른 에이전트는 transfer_to_agent로 이 에이전트에 넘김
+  - steps: 모델 호출 순서대로의 응답. 인자 문자열의 {stock_code}는 메시지의 종목코드로 바뀜
+"""
+
+from functools import lru_cache
+from typing import Any, AsyncGenerator, Dict, List, Optional
+import asyncio
+import json
+import os
+import re
+
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.adk.models.registry import LLMRegistry
+from google.genai import types
+
+from stock.utils.context_window import estimate_tokens, split_turns, _is_user_turn_start
+
+# 모델 응답 지연 (밀리초). 실제 모델 왕복 시간을 흉내낼 때 사용
+ADK_SCRIPTED_LLM_LATENCY_MS = float(os.getenv("ADK_SCRIPTED_LLM_LATENCY_MS", "0"))
+
+# 메시지에 종목코드가 없을 때 사용할 코드
+DEFAULT_STOCK_CODE = "005930"
+
+_AGENT_NAME_PATTERN = re.compile(r'Your internal name is "([^"]+)"')
+_STOCK_CODE_PATTERN = re.compile(r"(?<!\d)(\d{6})(?!\d)")
+_TRANSFER_TOOL = "transfer_to_agent"
+# 스트리밍 응답을 나눌 조각 수
+_STREAM_CHUNKS = 3
+
+# 기본 시나리오: 루트 에이전트의 질문 매핑(stock/prompt.py)과 같은 순서
+DEFAULT_SCENARIOS: List[Dict[str, Any]] = [
+    {
+        "name": "stock_analysis",
+        "match": [r"종목코드", r"(?<!\d)\d{6}(?!\d)"],
+        "agent": "stock_analyzer_agent",
+        "steps": [
+            {
+                "calls": [
+                    {"name": "get_stock_snapshot", "args": {"stk_cd": "{stock_code}"}},
+                    {
+                        "name": "get_technical_indicators",
+                        "args": {"stk_cd": "{stock_code}"},
+                    },
+                ]
+            },
+            {"text": "{stock_code} 종목의 시세, 수급, 기술적 지표를 분석했습니다."},
+        ],
+    },
+    {
+        "name": "volume",
+        "match": [r"거래량", r"급등", r"급증", r"모멘텀"],
+        "agent": "volume_analyzer_agent",
+        "steps": [
+            {
+                "calls": [
+                    {
+                        "name": "get_trading_volume_surge",
+                        "args": {
+                            "mrkt_tp": "000",
+                            "sort_tp": "1",
+                            "tm_tp": "2",
+                            "trde_qty_tp": "5",
+                            "stk_cnd": "0",
+                            "pric_tp": "0",
+                            "stex_tp": "3",
+                        },
+                    },
+                    {
+                        "name": "get_daily_trading_volume_ranking",
+                        "args": {
+                            "mrkt_tp": "000",
+                            "sort_tp": "1",
+                            "mang_stk_incls": "0",
+                            "crd_tp": "0",
+                            "trde_qty_tp": "0",
+                            "pric_tp": "0",
+                            "trde_prica_tp": "0",
+                            "mrkt_open_tp": "0",
+                            "stex_tp": "3",
+                        },
+                    },
+                ]
+            },
+            {"text": "거래량 급증 종목과 당일 거래량 상위 종목을 정리했습니다."},
+        ],
+    },
+    {
+        "name": "supply_demand",
+        "match": [r"기관", r"외국인", r"수급"],
+        "agent": "supply_demand_analyzer_agent",
+        "steps": [
+            {
+                "calls": [
+                    {
+                        "name": "get_foreign_institution_trading_ranking",
+                        "args": {
+                            "mrkt_tp": "001",
+                            "amt_qty_tp": "1",
+                            "qry_dt_tp": "0",
+                            "stex_tp": "3",
+                        },
+                    }
+                ]
+            },
+            {"text": "외국인/기관 순매수 상위 종목을 정리했습니다."},
+        ],
+    },
+    {
+        "name": "sector",
+        "match": [r"섹터", r"업종", r"테마"],
+        "agent": "sector_analyzer_agent",
+        "steps": [
+            {
+                "calls": [
+                    {"name": "get_all_sector_index", "args": {"inds_cd": "001"}},
+                    {
+                        "name": "get_theme_group_info",
+                        "args": {
+                            "qry_tp": "0",
+                            "date_tp": "1",
+                            "flu_pl_amt_tp": "3",
+                            "stex_tp": "3",
+                        },
+                    },
+                ]
+            },
+            {"text": "업종 지수와 테마별 등락률을 정리했습니다."},
+        ],
+    },
+    {
+        "name": "default",
+        "match": [],
+        "agent": "stock_agent",
+        "steps": [
+            {"text": "거래량, 수급, 섹터, 개별 종목 중 궁금한 내용을 알려주세요."}
+        ],
+    },
+]
+
+
+@lru_cache(maxsize=8)
+def load_scenarios(path: str) -> List[Dict[str, Any]]:
+    """JSON 파일의 시나리오 목록을 읽습니다 (리스트 또는 {"scenarios": [...]})."""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return data["scenarios"] if isinstance(data, dict) else data
+
+
+def _fill(value: Any, stock_code: str) -> Any:
+    if isinstance(value, str):
+        return value.replace("{stock_code}", stock_code)
+    if isinstance(value, list):
+        return [_fill(item, stock_code) for item in value]
+    if isinstance(value, dict):
+        return {key: _fill(item, stock_code) for key, item in value.items()}
+    return value
+
+
+def _text(content: types.Content) -> str:
+    return "".join(part.text or "" for part in content.parts or [])
+
+
+class ScriptedLlm(BaseLlm):
+    """질문에 맞는 시나리오의 도구 호출/답변을 순서대로 재생하는 모델."""
+
+    scenarios: Optional[List[Dict[str, Any]]] = None
+
+    @classmethod
+    def supported_models(cls) -> List[str]:
+        return [r"scripted(:.+)?"]
+
+    def _scenarios(self) -> List[Dict[str, Any]]:
+        if self.scenarios is not None:
+            return self.scenarios
+        _, _, path = self.model.partition(":")
+        return load_scenarios(path) if path else DEFAULT_SCENARIOS
+
+    def _match(self, message: str) -> Dict[str, Any]:
+        for scenario in self._scenarios():
+            patterns = scenario.get("match") or []
+            if not patterns or any(re.search(p, message) for p in patterns):
+                return scenario
+        return {"name": "none", "agent": "", "steps": []}
+
+    def _next_content(self, llm_request: LlmRequest) -> types.Content:
+        instruction = str(llm_request.config.system_instruction or "")
+        found = _AGENT_NAME_PATTERN.search(instruction)
+        agent_name = found.group(1) if found else ""
+
+        # 현재 턴: 사용자 메시지 이후의 기록. 모델 응답 수 = 이 에이전트가 진행한 단계 수
+        turn = split_turns(llm_request.contents)[-1] if llm_request.contents else []
+        message = _text(turn[0]) if turn and _is_user_turn_start(turn[0]) else ""
+        step_index = sum(1 for content in turn if content.role == "model")
+        codes = _STOCK_CODE_PATTERN.findall(message)
+        stock_code = codes[0] if codes else DEFAULT_STOCK_CODE
+
+        scenario = self._match(message)
+        target = scenario.get("agent") or agent_name
+        if target != agent_name:
+            if step_index == 0 and _TRANSFER_TOOL in llm_request.tools_dict:
+                return types.Content(
+                    role="model",
+                    parts=[
+                        types.Part.from_function_call(
+                            name=_TRANSFER_TOOL, args={"agent_name": target}
+                        )
+                    ],
+                )
+            steps = []
+        else:
+            steps = scenario.get("steps") or []
+
+        if step_index < len(steps):
+            step = _fill(steps[step_index], stock_code)
+            calls = [
+                call
+                for call in step.get("calls") or []
+                if call["name"] in llm_request.tools_dict
+            ]
+            if calls:
+                return types.Content(
+                    role="model",
+                    parts=[
+                        types.Part.from_function_call(
+                            name=call["name"], args=call.get("args") or {}
+                        )
+                        for call in calls
+                    ],
+                )
+            if step.get("text"):
+                return types.Content(
+                    role="model", parts=[types.Part.from_text(text=step["text"])]
+                )
+
+        # 단계를 모두 재생했으면 마지막 텍스트 단계로 마무리
+        texts = [step["text"] for step in steps if step.get("text")]
+        text = texts[-1] if texts else f"[{scenario['name']}] 응답을 마쳤습니다."
+        return types.Content(
+            role="model", parts=[types.Part.from_text(text=_fill(text, stock_code))]
+        )
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        if ADK_SCRIPTED_LLM_LATENCY_MS > 0:
+            await asyncio.sleep(ADK_SCRIPTED_LLM_LATENCY_MS / 1000)
+
+        content = self._next_content(llm_request)
+        prompt_tokens = sum(
+            estimate_tokens(c.model_dump(mode="json", exclude_none=True))
+            for c in llm_request.contents
+        )
+        output_tokens = estimate_tokens(
+            content.model_dump(mode="json", exclude_none=True)
+        )
+        usage = types.GenerateContentResponseUsageMetadata(
+            prompt_token_count=prompt_tokens,
+            candidates_token_count=output_tokens,
+            total_token_count=prompt_tokens + output_tokens,
+        )
+
+        text = _text(content)
+        if stream and text:
+            # 실제 모델처럼 부분 응답을 보낸 뒤 전체 응답으로 마무리
+            size = max(len(text) // _STREAM_CHUNKS, 1)
+            for start in range(0, len(text), size):
+                yield LlmResponse(
+                    content=types.Content(
+                        role="model",
+                        parts=[types.Part.from_text(text=text[start : start + size])],
+                    ),
+                    partial=True,
+                )
+        yield LlmResponse(content=content, usage_metadata=usage, turn_complete=True)
+
+
+def scenario_from_events(
+    events: List[Any], name: str, match: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    실제 모델로 실행한 세션 이벤트에서 시나리오를 만듭니다 (마지막 사용자 메시지 이후).
+    답변한 에이전트의 도구 호출 순서와 최종 텍스트를 녹화합니다.
+
+    Args:
+        events: 세션 이벤트 목록 (ADK Event)
+        name: 시나리오 이름
+        match: 사용자 메시지 정규식 목록
+
+    Returns:
+        Dict: 시나리오 (load_scenarios 형식의 항목)
+    """
+    start = 0
+    for index, event in enumerate(events):
+        if event.author == "user":
+            start = index + 1
+
+    agent = ""
+    steps: List[Dict[str, Any]] = []
+    for event in events[start:]:
+        calls = [
+            {"name": call.name, "args": call.args or {}}
+            for call in event.get_function_calls()
+            if call.name != _TRANSFER_TOOL
+        ]
+        if any(call.name == _TRANSFER_TOOL for call in event.get_function_calls()):
+            # 넘겨받은 에이전트가 처음부터 다시 진행
+            agent, steps = "", []
+            continue
+        text = _text(event.content) if event.content and not event.partial else ""
+        if calls:
+            agent = event.author
+            steps.append({"calls": calls})
+        elif text and not event.get_function_responses():
+            agent = event.author
+            steps.append({"text": text})
+    return {"name": name, "match": match or [], "agent": agent, "steps": steps}
+
+
+LLMRegistry.register(ScriptedLlm)
@@ -11,6 +11,8 @@ from .kiwoom_sector_tools import KIWOOM_SECTOR_TOOLS
 from .kiwoom_theme_tools import KIWOOM_THEME_TOOLS
 from .kiwoom_ranking_tools import KIWOOM_RANKING_TOOLS
 from .kiwoom_supply_demand_tools import KIWOOM_SUPPLY_DEMAND_TOOLS
+from .kiwoom_snapshot_tools import KIWOOM_SNAPSHOT_TOOLS
+from .kiwoom_indicator_tools import KIWOOM_INDICATOR_TOOLS
 from .kiwoom_order_tools import KIWOOM_ORDER_TOOLS
 
 # 모든 키움증권 도구들 통합 (레거시 호환성용)
@@ -24,5 +26,7 @@ ALL_KIWOOM_TOOLS = (
     + KIWOOM_THEME_TOOLS
     + KIWOOM_RANKING_TOOLS
     + KIWOOM_SUPPLY_DEMAND_TOOLS
+    + KIWOOM_SNAPSHOT_TOOLS
+    + KIWOOM_INDICATOR_TOOLS
     + KIWOOM_ORDER_TOOLS
 )
@@ -0,0 +1,34 @@
+"""
+키움증권 도구들 통합 모듈 (비동기 버전)
+- 동기 도구와 함수 이름, 인자, 반환 딕셔너리가 동일
+- httpx 기반으로 이벤트 루프를 블로킹하지 않음
+"""
+
+from .kiwoom_auth_tools import KIWOOM_AUTH_TOOLS
+from .kiwoom_account_tools import KIWOOM_ACCOUNT_TOOLS
+from .kiwoom_stock_info_tools import KIWOOM_STOCK_INFO_TOOLS
+from .kiwoom_chart_tools import KIWOOM_CHART_TOOLS
+from .kiwoom_market_tools import KIWOOM_MARKET_TOOLS
+from .kiwoom_sector_tools import KIWOOM_SECTOR_TOOLS
+from .kiwoom_theme_tools import KIWOOM_THEME_TOOLS
+from .kiwoom_ranking_tools import KIWOOM_RANKING_TOOLS
+from .kiwoom_supply_demand_tools import KIWOOM_SUPPLY_DEMAND_TOOLS
+from .kiwoom_snapshot_tools import KIWOOM_SNAPSHOT_TOOLS
+from .kiwoom_indicator_tools import KIWOOM_INDICATOR_TOOLS
+from ..kiwoom_order_tools import KIWOOM_ORDER_TOOLS  # 주문 도구는 아직 미구현
+
+# 모든 키움증권 비동기 도구들 통합
+ALL_KIWOOM_TOOLS = (
+    KIWOOM_AUTH_TOOLS
+    + KIWOOM_ACCOUNT_TOOLS
+    + KIWOOM_STOCK_INFO_TOOLS
+    + KIWOOM_CHART_TOOLS
+    + KIWOOM_MARKET_TOOLS
+    + KIWOOM_SECTOR_TOOLS
+    + KIWOOM_THEME_TOOLS
+    + KIWOOM_RANKING_TOOLS
+    + KIWOOM_SUPPLY_DEMAND_TOOLS
+    + KIWOOM_SNAPSHOT_TOOLS
+    + KIWOOM_INDICATOR_TOOLS
+    + KIWOOM_ORDER_TOOLS
+)
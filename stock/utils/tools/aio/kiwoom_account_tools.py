@@ -0,0 +1,83 @@
+"""
+키움증권 계좌 정보 관련 도구들 (비동기 버전)
+- 계좌평가현황요청 (kt00004)
+"""
+
+from google.adk.tools import FunctionTool
+from typing import Dict, Any, Optional
+import requests
+
+from .. import kiwoom_client, kiwoom_paginator
+from ..kiwoom_client import BASE_URL
+from ..kiwoom_account_tools import _format_account_evaluation
+from ..kiwoom_metrics import instrument_tool
+
+
+@instrument_tool
+async def get_account_evaluation(
+    qry_tp: str = "0",
+    dmst_stex_tp: str = "KRX",
+    cont_yn: Optional[str] = None,
+    next_key: Optional[str] = None,
+    token: Optional[str] = None,
+    fetch_all: bool = False,
+) -> Dict[str, Any]:
+    """
+    계좌평가현황을 조회합니다.
+
+    Args:
+        qry_tp: 상장폐지조회구분 (0:전체, 1:상장폐지종목제외)
+        dmst_stex_tp: 국내거래소구분 (KRX:한국거래소, NXT:넥스트트레이드)
+        cont_yn: 연속조회여부 (Y/N)
+        next_key: 연속조회키
+        token: 키움증권 접근토큰 (선택사항, 생략 시 캐시된 토큰 자동 사용)
+        fetch_all: True면 연속조회를 자동으로 따라가 전체 목록을 한 번에 반환 (선택사항)
+
+    Returns:
+        계좌평가현황 정보 딕셔너리
+    """
+    try:
+        url = f"{BASE_URL}/api/dostk/acnt"
+
+        headers = {
+            "api-id": "kt00004",
+            "Content-Type": "application/json;charset=UTF-8",
+        }
+        if token:
+            headers["authorization"] = f"Bearer {token}"
+
+        # 연속조회 헤더 추가
+        if cont_yn:
+            headers["cont-yn"] = cont_yn
+        if next_key:
+            headers["next-key"] = next_key
+
+        data = {"qry_tp": qry_tp, "dmst_stex_tp": dmst_stex_tp}
+
+        if fetch_all:
+            # 보유 종목이 여러 페이지면 모두 합쳐서 정리
+            result = await kiwoom_paginator.afetch_all(
+                url, headers, data, "stk_acnt_evlt_prst"
+            )
+            return _format_account_evaluation(
+                result, {"cont-yn": result["cont_yn"], "next-key": result["next_key"]}
+            )
+
+        response = await kiwoom_client.apost(url, headers=headers, json=data)
+        response.raise_for_status()
+
+        result = response.json()
+
+        return _format_account_evaluation(result, response.headers)
+
+    except requests.exceptions.RequestException as e:
+        return {"error": f"API 요청 실패: {str(e)}"}
+    except Exception as e:
+        return {"error": f"계좌평가현황 조회 실패: {str(e)}"}
+
+
+# 도구 생성
+kiwoom_account_evaluation_tool = FunctionTool(get_account_evaluation)
+
+# 도구들
+KIWOOM_ACCOUNT_TOOLS = [kiwoom_account_evaluation_tool]
@@ -0,0 +1,87 @@
+"""
+키움증권 API 인증 관련 도구들 (비동기 버전)
+- 접근토큰 발급 (au10001)
+- 토큰 갱신
+"""
+
+from google.adk.tools import FunctionTool
+from typing import Dict, Any
+import asyncio
+import requests
+
+from .. import kiwoom_client
+from ..kiwoom_client import BASE_URL
+from ..kiwoom_auth_tools import KIWOOM_APPKEY, KIWOOM_SECRETKEY, token_manager
+from ..kiwoom_metrics import instrument_tool
+
+
+@instrument_tool
+async def get_access_token() -> Dict[str, Any]:
+    """
+    키움증권 OAuth 접근토큰을 발급받습니다.
+    프로세스 전역 캐시에 유효한 토큰이 있으면 재발급 없이 반환합니다.
+    키움 도구들은 토큰을 자동으로 주입하므로 이 도구를 따로 호출할 필요는 없습니다.
+    환경변수 KIWOOM_APPKEY, KIWOOM_SECRETKEY가 설정되어 있어야 합니다.
+
+    Returns:
+        토큰 정보 딕셔너리 (token, token_type, expires_dt 포함)
+    """
+    # 토큰 매니저는 스레드 락으로 single-flight를 보장하므로 스레드에서 실행
+    return await asyncio.to_thread(token_manager.get_token_info)
+
+
+@instrument_tool
+async def refresh_access_token(current_token: str) -> Dict[str, Any]:
+    """
+    기존 토큰을 사용하여 새로운 접근토큰을 발급받습니다.
+
+    Args:
+        current_token: 현재 사용 중인 토큰
+
+    Returns:
+        새로운 토큰 정보 딕셔너리
+    """
+    try:
+        if not current_token:
+            return {"error": "현재 토큰이 제공되지 않았습니다."}
+
+        url = f"{BASE_URL}/oauth2/token"
+
+        headers = {
+            "api-id": "au10001",
+            "authorization": f"Bearer {current_token}",
+            "Content-Type": "application/json;charset=UTF-8",
+        }
+
+        data = {
+            "grant_type": "client_credentials",
+            "appkey": KIWOOM_APPKEY,
+            "secretkey": KIWOOM_SECRETKEY,
+        }
+
+        response = await kiwoom_client.apost(url, headers=headers, json=data)
+        response.raise_for_status()
+
+        result = response.json()
+
+        return {
+            "success": True,
+            "token": result.get("token"),
+            "token_type": result.get("token_type"),
+            "expires_dt": result.get("expires_dt"),
+            "return_code": result.get("return_code"),
+            "return_msg": result.get("return_msg"),
+        }
+
+    except requests.exceptions.RequestException as e:
+        return {"error": f"토큰 갱신 API 요청 실패: {str(e)}"}
+    except Exception as e:
+        return {"error": f"토큰 갱신 실패: {str(e)}"}
+
+
+# 도구 생성
+kiwoom_get_access_token_tool = FunctionTool(get_access_token)
+kiwoom_refresh_token_tool = FunctionTool(refresh_access_token)
+
+# 도구들
+KIWOOM_AUTH_TOOLS = [kiwoom_get_access_token_tool, kiwoom_refresh_token_tool]
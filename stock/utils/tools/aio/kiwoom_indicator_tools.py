@@ -0,0 +1,66 @@
+"""
+기술적 지표 계산 도구 (비동기 버전)
+- 차트와 업종지수 (ka20001)를 동시에 조회한 뒤 지표는 동기 버전과 같은 엔진으로 계산
+"""
+
+from google.adk.tools import FunctionTool
+from typing import Any, Dict, Optional
+import asyncio
+import requests
+
+from .. import kiwoom_chart_store
+from ..kiwoom_indicator_tools import _chart_range, _summarize
+from .kiwoom_sector_tools import get_sector_current_price
+from ..kiwoom_metrics import instrument_tool
+
+
+@instrument_tool
+async def get_technical_indicators(
+    stk_cd: str,
+    interval: str = "1d",
+    lookback: int = 120,
+    sector_mrkt_tp: Optional[str] = None,
+    sector_inds_cd: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    종목의 기술적 지표를 계산해 요약 수치만 반환합니다.
+    (SMA 5/20/60/120, EMA 12/26, RSI 14, MACD 12/26/9, 볼린저밴드 20/2,
+    ATR 14, OBV, 거래량 z-score, 업종 대비 상대강도)
+
+    Args:
+        stk_cd: 종목코드 (예: "005930")
+        interval: 차트 주기 ("1d": 일봉, "1m"/"5m"/"30m"/"60m" 등: 분봉)
+        lookback: 계산에 사용할 최근 봉 개수 (기본값 120)
+        sector_mrkt_tp: 비교할 업종의 시장구분 (0:코스피, 1:코스닥, 2:코스피200, 선택사항)
+        sector_inds_cd: 비교할 업종코드 (예: 001:종합(KOSPI), 선택사항. 지정 시 상대강도 계산)
+
+    Returns:
+        Dict: price, moving_average, momentum, volatility, volume,
+              relative_strength_vs_sector, signals
+    """
+    chart_task = kiwoom_chart_store.aread_through(
+        stk_cd, interval, **_chart_range(interval, lookback)
+    )
+    try:
+        if sector_inds_cd:
+            chart, sector = await asyncio.gather(
+                chart_task,
+                get_sector_current_price(sector_mrkt_tp or "0", sector_inds_cd),
+            )
+        else:
+            chart, sector = await chart_task, None
+    except requests.exceptions.RequestException as e:
+        return {
+            "error": f"API 요청 실패: {str(e)}",
+            "return_code": -1,
+            "return_msg": "API 요청 중 오류가 발생했습니다.",
+        }
+
+    return _summarize(stk_cd, interval, chart, sector)
+
+
+# 도구 생성
+kiwoom_technical_indicators_tool = FunctionTool(get_technical_indicators)
+
+# 도구들
+KIWOOM_INDICATOR_TOOLS = [kiwoom_technical_indicators_tool]
@@ -0,0 +1,78 @@
+"""
+키움증권 종목 스냅샷 도구 (비동기 버전)
+- 한 종목 분석에 필요한 API들을 asyncio.gather로 동시에 호출해 하나의 결과로 합침
+  - 주식기본정보 (ka10001), 주식일봉차트 (ka10081), 종목별기관매매추이 (ka10045)
+  - 종목일별프로그램매매추이 (ka90013), 공매도추이 (ka10014)
+  - 업종현재가 (ka20001), 계좌평가현황 (kt00004)
+- 일부 API가 실패해도 나머지 결과는 반환하고, 실패한 소스는 errors에 기록
+"""
+
+from google.adk.tools import FunctionTool
+from typing import Any, Awaitable, Callable, Dict
+import asyncio
+import time
+
+from .kiwoom_account_tools import get_account_evaluation
+from .kiwoom_chart_tools import get_stock_daily_chart
+from .kiwoom_market_tools import (
+    get_short_selling_trend,
+    get_stock_institution_trading_trend,
+)
+from .kiwoom_sector_tools import get_sector_current_price
+from .kiwoom_stock_info_tools import (
+    get_stock_basic_info,
+    get_stock_daily_program_trading_trend,
+)
+from ..kiwoom_snapshot_tools import _merge_snapshot, _snapshot_args
+from ..kiwoom_metrics import instrument_tool
+
+# 스냅샷 소스 이름별 도구 함수
+SNAPSHOT_SOURCES: Dict[str, Callable[..., Awaitable[Dict[str, Any]]]] = {
+    "basic_info": get_stock_basic_info,
+    "daily_chart": get_stock_daily_chart,
+    "institution_trend": get_stock_institution_trading_trend,
+    "program_trading_trend": get_stock_daily_program_trading_trend,
+    "short_selling_trend": get_short_selling_trend,
+    "sector": get_sector_current_price,
+    "holding": get_account_evaluation,
+}
+
+
+@instrument_tool
+async def get_stock_snapshot(
+    stk_cd: str,
+    sector_mrkt_tp: str = "0",
+    sector_inds_cd: str = "001",
+) -> Dict[str, Any]:
+    """
+    한 종목 분석에 필요한 데이터를 동시에 조회해 한 번에 반환합니다.
+    (주식기본정보, 최근 60일 일봉, 기관매매추이, 프로그램매매추이, 공매도추이,
+    업종현재가, 계좌 보유 내역)
+
+    Args:
+        stk_cd: 종목코드 (예: 005930)
+        sector_mrkt_tp: 비교할 업종의 시장구분 (0:코스피, 1:코스닥, 2:코스피200)
+        sector_inds_cd: 비교할 업종코드 (기본값 001:종합(KOSPI))
+
+    Returns:
+        Dict: basic_info, daily_chart, institution_trend, program_trading_trend,
+              short_selling_trend, sector, holding 및 소스별 오류(errors)
+    """
+    started = time.monotonic()
+
+    calls = _snapshot_args(stk_cd, sector_mrkt_tp, sector_inds_cd)
+    outputs = await asyncio.gather(
+        *(SNAPSHOT_SOURCES[name](*args) for name, args in calls.items()),
+        return_exceptions=True,
+    )
+    results = dict(zip(calls.keys(), outputs))
+
+    elapsed = time.monotonic() - started
+    return _merge_snapshot(stk_cd, results, elapsed)
+
+
+# 도구 생성
+kiwoom_stock_snapshot_tool = FunctionTool(get_stock_snapshot)
+
+# 도구들
+KIWOOM_SNAPSHOT_TOOLS = [kiwoom_stock_snapshot_tool]
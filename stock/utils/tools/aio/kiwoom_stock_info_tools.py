@@ -0,0 +1,224 @@
+"""
+키움증권 종목 정보 조회 관련 도구들 (비동기 버전)
+- 주식기본정보요청 (ka10001)
+- 종목별프로그램매매현황요청 (ka90004)
+"""
+
+from google.adk.tools import FunctionTool
+from typing import Dict, Any, Optional
+import requests
+
+from .. import kiwoom_client
+from ..kiwoom_client import BASE_URL
+from ..kiwoom_stock_info_tools import (
+    _format_stock_basic_info,
+    _format_program_trading_status,
+    _format_daily_program_trading_trend,
+)
+from ..kiwoom_metrics import instrument_tool
+
+
+@instrument_tool
+async def get_stock_basic_info(
+    stk_cd: str,
+    cont_yn: Optional[str] = None,
+    next_key: Optional[str] = None,
+    token: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    주식기본정보를 조회합니다.
+
+    Args:
+        stk_cd: 종목코드 (예: "005930" for 삼성전자)
+        cont_yn: 연속조회여부 (Y/N)
+        next_key: 연속조회키
+        token: 키움증권 접근토큰 (선택사항, 생략 시 캐시된 토큰 자동 사용)
+
+    Returns:
+        주식기본정보 딕셔너리
+    """
+    try:
+        if not stk_cd:
+            return {"error": "종목코드가 필요합니다."}
+
+        url = f"{BASE_URL}/api/dostk/stkinfo"
+
+        headers = {
+            "api-id": "ka10001",
+            "Content-Type": "application/json;charset=UTF-8",
+        }
+        if token:
+            headers["authorization"] = f"Bearer {token}"
+
+        # 연속조회 헤더 추가
+        if cont_yn:
+            headers["cont-yn"] = cont_yn
+        if next_key:
+            headers["next-key"] = next_key
+
+        data = {"stk_cd": stk_cd}
+
+        response = await kiwoom_client.apost(url, headers=headers, json=data)
+        response.raise_for_status()
+
+        result = response.json()
+
+        return _format_stock_basic_info(result, response.headers)
+
+    except requests.exceptions.RequestException as e:
+        return {"error": f"API 요청 실패: {str(e)}"}
+    except Exception as e:
+        return {"error": f"주식기본정보 조회 실패: {str(e)}"}
+
+
+@instrument_tool
+async def get_stock_program_trading_status(
+    dt: str,
+    mrkt_tp: str,
+    stex_tp: str,
+    cont_yn: Optional[str] = None,
+    next_key: Optional[str] = None,
+    token: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    종목별프로그램매매현황을 조회합니다.
+
+    Args:
+        dt: 일자 (YYYYMMDD 형식, 예: "20241125")
+        mrkt_tp: 시장구분 (P00101:코스피, P10102:코스닥)
+        stex_tp: 거래소구분 (1:KRX, 2:NXT, 3:통합)
+        cont_yn: 연속조회여부 (Y/N)
+        next_key: 연속조회키
+        token: 키움증권 접근토큰 (선택사항, 생략 시 캐시된 토큰 자동 사용)
+
+    Returns:
+        종목별프로그램매매현황 딕셔너리
+    """
+    try:
+        if not dt:
+            return {"error": "일자가 필요합니다."}
+
+        if not mrkt_tp:
+            return {"error": "시장구분이 필요합니다."}
+
+        if not stex_tp:
+            return {"error": "거래소구분이 필요합니다."}
+
+        url = f"{BASE_URL}/api/dostk/stkinfo"
+
+        headers = {
+            "api-id": "ka90004",
+            "Content-Type": "application/json;charset=UTF-8",
+        }
+        if token:
+            headers["authorization"] = f"Bearer {token}"
+
+        # 연속조회 헤더 추가
+        if cont_yn:
+            headers["cont-yn"] = cont_yn
+        if next_key:
+            headers["next-key"] = next_key
+
+        data = {
+            "dt": dt,
+            "mrkt_tp": mrkt_tp,
+            "stex_tp": stex_tp,
+        }
+
+        response = await kiwoom_client.apost(url, headers=headers, json=data)
+        response.raise_for_status()
+
+        result = response.json()
+
+        return _format_program_trading_status(
+            result, response.headers, dt, mrkt_tp, stex_tp
+        )
+
+    except requests.exceptions.RequestException as e:
+        return {"error": f"API 요청 실패: {str(e)}"}
+    except Exception as e:
+        return {"error": f"종목별프로그램매매현황 조회 실패: {str(e)}"}
+
+
+@instrument_tool
+async def get_stock_daily_program_trading_trend(
+    stk_cd: str,
+    strt_dt: str,
+    end_dt: str,
+    cont_yn: Optional[str] = None,
+    next_key: Optional[str] = None,
+    token: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    종목일별프로그램매매추이를 조회합니다.
+
+    Args:
+        stk_cd: 종목코드 (예: "005930" for 삼성전자)
+        strt_dt: 시작일자 (YYYYMMDD 형식, 예: "20241101")
+        end_dt: 종료일자 (YYYYMMDD 형식, 예: "20241125")
+        cont_yn: 연속조회여부 (Y/N)
+        next_key: 연속조회키
+        token: 키움증권 접근토큰 (선택사항, 생략 시 캐시된 토큰 자동 사용)
+
+    Returns:
+        종목일별프로그램매매추이 딕셔너리
+    """
+    try:
+        if not stk_cd:
+            return {"error": "종목코드가 필요합니다."}
+
+        if not strt_dt:
+            return {"error": "시작일자가 필요합니다."}
+
+        if not end_dt:
+            return {"error": "종료일자가 필요합니다."}
+
+        url = f"{BASE_URL}/api/dostk/stkinfo"
+
+        headers = {
+            "api-id": "ka90013",
+            "Content-Type": "application/json;charset=UTF-8",
+        }
+        if token:
+            headers["authorization"] = f"Bearer {token}"
+
+        # 연속조회 헤더 추가
+        if cont_yn:
+            headers["cont-yn"] = cont_yn
+        if next_key:
+            headers["next-key"] = next_key
+
+        data = {
+            "stk_cd": stk_cd,
+            "strt_dt": strt_dt,
+            "end_dt": end_dt,
+        }
+
+        response = await kiwoom_client.apost(url, headers=headers, json=data)
+        response.raise_for_status()
+
+        result = response.json()
+
+        return _format_daily_program_trading_trend(
+            result, response.headers, stk_cd, strt_dt, end_dt
+        )
+
+    except requests.exceptions.RequestException as e:
+        return {"error": f"API 요청 실패: {str(e)}"}
+    except Exception as e:
+        return {"error": f"종목일별프로그램매매추이 조회 실패: {str(e)}"}
+
+
+# 도구 생성
+kiwoom_stock_basic_info_tool = FunctionTool(get_stock_basic_info)
+kiwoom_stock_program_trading_tool = FunctionTool(get_stock_program_trading_status)
+kiwoom_stock_daily_program_trading_trend_tool = FunctionTool(
+    get_stock_daily_program_trading_trend
+)
+
+# 도구들
+KIWOOM_STOCK_INFO_TOOLS = [
+    kiwoom_stock_basic_info_tool,
+    kiwoom_stock_program_trading_tool,
+    kiwoom_stock_daily_program_trading_trend_tool,
+]
@@ -4,48 +4,106 @@
 """
 
 from google.adk.tools import FunctionTool
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Mapping, Optional
 import requests
-import os
 
-# 환경변수에서 키움증권 설정 가져오기
-KIWOOM_IS_MOCK = os.getenv("KIWOOM_IS_MOCK", "true").lower() == "true"
+from . import kiwoom_client, kiwoom_paginator
+from .kiwoom_client import BASE_URL
+from .kiwoom_metrics import instrument_tool
 
-# 도메인 설정
-BASE_URL = "https://mockapi.kiwoom.com" if KIWOOM_IS_MOCK else "https://api.kiwoom.com"
+
+def _format_account_evaluation(
+    result: Dict[str, Any],
+    response_headers: Mapping[str, str],
+) -> Dict[str, Any]:
+    """kt00004 응답을 계좌평가현황 딕셔너리로 정리합니다."""
+    # 응답 데이터 정리
+    account_info = {
+        "success": True,
+        "account_name": result.get("acnt_nm"),
+        "branch_name": result.get("brch_nm"),
+        "deposit": result.get("entr"),
+        "d2_estimated_deposit": result.get("d2_entra"),
+        "total_estimated_amount": result.get("tot_est_amt"),
+        "asset_evaluation_amount": result.get("aset_evlt_amt"),
+        "total_purchase_amount": result.get("tot_pur_amt"),
+        "estimated_deposit_asset": result.get("prsm_dpst_aset_amt"),
+        "total_guarantee_sell_amount": result.get("tot_grnt_sella"),
+        "today_investment_principal": result.get("tdy_lspft_amt"),
+        "monthly_investment_principal": result.get("invt_bsamt"),
+        "cumulative_investment_principal": result.get("lspft_amt"),
+        "today_profit_loss": result.get("tdy_lspft"),
+        "monthly_profit_loss": result.get("lspft2"),
+        "cumulative_profit_loss": result.get("lspft"),
+        "today_profit_loss_rate": result.get("tdy_lspft_rt"),
+        "monthly_profit_loss_rate": result.get("lspft_ratio"),
+        "cumulative_profit_loss_rate": result.get("lspft_rt"),
+        "stocks": [],
+    }
+
+    # 종목별 계좌평가현황 처리
+    stocks_data = result.get("stk_acnt_evlt_prst", [])
+    for stock in stocks_data:
+        stock_info = {
+            "stock_code": stock.get("stk_cd"),
+            "stock_name": stock.get("stk_nm"),
+            "remaining_quantity": stock.get("rmnd_qty"),
+            "average_price": stock.get("avg_prc"),
+            "current_price": stock.get("cur_prc"),
+            "evaluation_amount": stock.get("evlt_amt"),
+            "profit_loss_amount": stock.get("pl_amt"),
+            "profit_loss_rate": stock.get("pl_rt"),
+            "loan_date": stock.get("loan_dt"),
+            "purchase_amount": stock.get("pur_amt"),
+            "settlement_balance": stock.get("setl_remn"),
+            "previous_buy_quantity": stock.get("pred_buyq"),
+            "previous_sell_quantity": stock.get("pred_sellq"),
+            "today_buy_quantity": stock.get("tdy_buyq"),
+            "today_sell_quantity": stock.get("tdy_sellq"),
+        }
+        account_info["stocks"].append(stock_info)
+
+    # 연속조회 정보 추가
+    account_info["cont_yn"] = response_headers.get("cont-yn")
+    account_info["next_key"] = response_headers.get("next-key")
+    account_info["return_code"] = result.get("return_code")
+    account_info["return_msg"] = result.get("return_msg")
+
+    return account_info
 
 
+@instrument_tool
 def get_account_evaluation(
-    token: str,
     qry_tp: str = "0",
     dmst_stex_tp: str = "KRX",
     cont_yn: Optional[str] = None,
     next_key: Optional[str] = None,
+    token: Optional[str] = None,
+    fetch_all: bool = False,
 ) -> Dict[str, Any]:
     """
     계좌평가현황을 조회합니다.
 
     Args:
-        token: 키움증권 접근토큰
         qry_tp: 상장폐지조회구분 (0:전체, 1:상장폐지종목제외)
         dmst_stex_tp: 국내거래소구분 (KRX:한국거래소, NXT:넥스트트레이드)
         cont_yn: 연속조회여부 (Y/N)
         next_key: 연속조회키
+        token: 키움증권 접근토큰 (선택사항, 생략 시 캐시된 토큰 자동 사용)
+        fetch_all: True면 연속조회를 자동으로 따라가 전체 목록을 한 번에 반환 (선택사항)
 
     Returns:
         계좌평가현황 정보 딕셔너리
     """
     try:
-        if not token:
-            return {"error": "키움증권 접근토큰이 필요합니다."}
-
         url = f"{BASE_URL}/api/dostk/acnt"
 
         headers = {
             "api-id": "kt00004",
-            "authorization": f"Bearer {token}",
             "Content-Type": "application/json;charset=UTF-8",
         }
+        if token:
+            headers["authorization"] = f"Bearer {token}"
 
         # 연속조회 헤더 추가
         if cont_yn:
@@ -55,64 +113,21 @@ def get_account_evaluation(
 
         data = {"qry_tp": qry_tp, "dmst_stex_tp": dmst_stex_tp}
 
-        response = requests.post(url, headers=headers, json=data)
+        if fetch_all:
+            # 보유 종목이 여러 페이지면 모두 합쳐서 정리
+            result = kiwoom_paginator.fetch_all(
+                url, headers, data, "stk_acnt_evlt_prst"
+            )
+            return _format_account_evaluation(
+                result, {"cont-yn": result["cont_yn"], "next-key": result["next_key"]}
+            )
+
+        response = kiwoom_client.post(url, headers=headers, json=data)
         response.raise_for_status()
 
         result = response.json()
 
-        # 응답 데이터 정리
-        account_info = {
-            "success": True,
-            "account_name": result.get("acnt_nm"),
-            "branch_name": result.get("brch_nm"),
-            "deposit": result.get("entr"),
-            "d2_estimated_deposit": result.get("d2_entra"),
-            "total_estimated_amount": result.get("tot_est_amt"),
-            "asset_evaluation_amount": result.get("aset_evlt_amt"),
-            "total_purchase_amount": result.get("tot_pur_amt"),
-            "estimated_deposit_asset": result.get("prsm_dpst_aset_amt"),
-            "total_guarantee_sell_amount": result.get("tot_grnt_sella"),
-            "today_investment_principal": result.get("tdy_lspft_amt"),
-            "monthly_investment_principal": result.get("invt_bsamt"),
-            "cumulative_investment_principal": result.get("lspft_amt"),
-            "today_profit_loss": result.get("tdy_lspft"),
-            "monthly_profit_loss": result.get("lspft2"),
-            "cumulative_profit_loss": result.get("lspft"),
-            "today_profit_loss_rate": result.get("tdy_lspft_rt"),
-            "monthly_profit_loss_rate": result.get("lspft_ratio"),
-            "cumulative_profit_loss_rate": result.get("lspft_rt"),
-            "stocks": [],
-        }
-
-        # 종목별 계좌평가현황 처리
-        stocks_data = result.get("stk_acnt_evlt_prst", [])
-        for stock in stocks_data:
-            stock_info = {
-                "stock_code": stock.get("stk_cd"),
-                "stock_name": stock.get("stk_nm"),
-                "remaining_quantity": stock.get("rmnd_qty"),
-                "average_price": stock.get("avg_prc"),
-                "current_price": stock.get("cur_prc"),
-                "evaluation_amount": stock.get("evlt_amt"),
-                "profit_loss_amount": stock.get("pl_amt"),
-                "profit_loss_rate": stock.get("pl_rt"),
-                "loan_date": stock.get("loan_dt"),
-                "purchase_amount": stock.get("pur_amt"),
-                "settlement_balance": stock.get("setl_remn"),
-                "previous_buy_quantity": stock.get("pred_buyq"),
-                "previous_sell_quantity": stock.get("pred_sellq"),
-                "today_buy_quantity": stock.get("tdy_buyq"),
-                "today_sell_quantity": stock.get("tdy_sellq"),
-            }
-            account_info["stocks"].append(stock_info)
-
-        # 연속조회 정보 추가
-        account_info["cont_yn"] = response.headers.get("cont-yn")
-        account_info["next_key"] = response.headers.get("next-key")
-        account_info["return_code"] = result.get("return_code")
-        account_info["return_msg"] = result.get("return_msg")
-
-        return account_info
+        return _format_account_evaluation(result, response.headers)
 
     except requests.exceptions.RequestException as e:
         return {"error": f"API 요청 실패: {str(e)}"}
@@ -2,34 +2,50 @@
 키움증권 API 인증 관련 도구들
 - 접근토큰 발급 (au10001)
 - 토큰 갱신
+- 프로세스 전역 토큰 캐시 (appkey별, expires_dt 기준 선제 갱신)
 """
 
 from google.adk.tools import FunctionTool
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from datetime import datetime, timedelta
+import threading
 import requests
 import os
 
+from . import kiwoom_client
+from .kiwoom_client import BASE_URL
+from .kiwoom_metrics import instrument_tool
+
 # 환경변수에서 키움증권 API 키 가져오기
 KIWOOM_APPKEY = os.getenv("KIWOOM_APPKEY")
 KIWOOM_SECRETKEY = os.getenv("KIWOOM_SECRETKEY")
-# 모의투자 기본값
-KIWOOM_IS_MOCK = os.getenv("KIWOOM_IS_MOCK", "true").lower() == "true"
 
-# 도메인 설정
-BASE_URL = "https://mockapi.kiwoom.com" if KIWOOM_IS_MOCK else "https://api.kiwoom.com"
+# 만료 몇 초 전에 미리 토큰을 갱신할지
+KIWOOM_TOKEN_REFRESH_MARGIN = int(os.getenv("KIWOOM_TOKEN_REFRESH_MARGIN", "300"))
 
+# expires_dt가 응답에 없을 때 가정하는 토큰 유효시간 (초)
+KIWOOM_TOKEN_DEFAULT_TTL = int(os.getenv("KIWOOM_TOKEN_DEFAULT_TTL", "3600"))
 
-def get_access_token() -> Dict[str, Any]:
+
+def _issue_access_token(
+    appkey: Optional[str] = None, secretkey: Optional[str] = None
+) -> Dict[str, Any]:
     """
-    키움증권 OAuth 접근토큰을 발급받습니다.
-    이 도구는 키움증권 API를 사용하기 전에 반드시 먼저 실행해야 합니다.
-    환경변수 KIWOOM_APPKEY, KIWOOM_SECRETKEY가 설정되어 있어야 합니다.
+    키움증권 OAuth 접근토큰을 새로 발급받습니다 (au10001).
+    캐시를 거치지 않으므로 KiwoomTokenManager에서만 호출합니다.
+
+    Args:
+        appkey: 앱키 (None이면 환경변수 KIWOOM_APPKEY)
+        secretkey: 시크릿키 (None이면 환경변수 KIWOOM_SECRETKEY)
 
     Returns:
         토큰 정보 딕셔너리 (token, token_type, expires_dt 포함)
     """
+    appkey = appkey or KIWOOM_APPKEY
+    secretkey = secretkey or KIWOOM_SECRETKEY
+
     try:
-        if not KIWOOM_APPKEY or not KIWOOM_SECRETKEY:
+        if not appkey or not secretkey:
             return {
                 "error": "키움증권 API 키가 설정되지 않았습니다. KIWOOM_APPKEY, KIWOOM_SECRETKEY 환경변수를 설정해주세요."
             }
@@ -43,11 +59,11 @@ def get_access_token() -> Dict[str, Any]:
 
         data = {
             "grant_type": "client_credentials",
-            "appkey": KIWOOM_APPKEY,
-            "secretkey": KIWOOM_SECRETKEY,
+            "appkey": appkey,
+            "secretkey": secretkey,
         }
 
-        response = requests.post(url, headers=headers, json=data)
+        response = kiwoom_client.post(url, headers=headers, json=data)
         response.raise_for_status()
 
         result = response.json()
@@ -68,6 +84,7 @@ def get_access_token() -> Dict[str, Any]:
         return {"error": f"토큰 발급 실패: {str(e)}"}
 
 
+@instrument_tool
 def refresh_access_token(current_token: str) -> Dict[str, Any]:
     """
     기존 토큰을 사용하여 새로운 접근토큰을 발급받습니다.
@@ -96,7 +113,7 @@ def refresh_access_token(current_token: str) -> Dict[str, Any]:
             "secretkey": KIWOOM_SECRETKEY,
         }
 
-        response = requests.post(url, headers=headers, json=data)
+        response = kiwoom_client.post(url, headers=headers, json=data)
         response.raise_for_status()
 
         result = response.json()
@@ -116,6 +133,133 @@ def refresh_access_token(current_token: str) -> Dict[str, Any]:
         return {"error": f"토큰 갱신 실패: {str(e)}"}
 
 
+def _parse_expires_dt(expires_dt: Optional[str]) -> datetime:
+    """expires_dt (YYYYMMDDHHMMSS)를 datetime으로 변환합니다."""
+    if expires_dt:
+        try:
+            return datetime.strptime(expires_dt, "%Y%m%d%H%M%S")
+        except ValueError:
+            pass
+    return datetime.now() + timedelta(seconds=KIWOOM_TOKEN_DEFAULT_TTL)
+
+
+class KiwoomTokenManager:
+    """
+    appkey별 키움증권 접근토큰 캐시.
+    - expires_dt를 기준으로 만료 KIWOOM_TOKEN_REFRESH_MARGIN초 전에 선제 갱신
+    - appkey별 락으로 동시 요청 시 발급 API를 한 번만 호출 (single-flight)
+    - 갱신은 refresh_access_token을 먼저 시도하고 실패하면 새로 발급
+    """
+
+    def __init__(self, refresh_margin: int = KIWOOM_TOKEN_REFRESH_MARGIN):
+        self.refresh_margin = refresh_margin
+        self._tokens: Dict[str, Dict[str, Any]] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock_for(self, appkey: str) -> threading.Lock:
+        with self._locks_guard:
+            if appkey not in self._locks:
+                self._locks[appkey] = threading.Lock()
+            return self._locks[appkey]
+
+    def _is_fresh(self, token_info: Optional[Dict[str, Any]]) -> bool:
+        if not token_info:
+            return False
+        remaining = token_info["expires_at"] - datetime.now()
+        return remaining.total_seconds() > self.refresh_margin
+
+    def get_token_info(self, appkey: Optional[str] = None) -> Dict[str, Any]:
+        """
+        캐시된 토큰 정보를 반환하고, 만료가 임박했으면 갱신합니다.
+
+        Args:
+            appkey: 앱키 (None이면 환경변수 KIWOOM_APPKEY)
+
+        Returns:
+            토큰 정보 딕셔너리 (get_access_token과 동일한 형태) 또는 error
+        """
+        appkey = appkey or KIWOOM_APPKEY
+        if not appkey:
+            return _issue_access_token()
+
+        token_info = self._tokens.get(appkey)
+        if self._is_fresh(token_info):
+            return {**token_info["result"], "cached": True}
+
+        with self._lock_for(appkey):
+            # 락을 기다리는 동안 다른 요청이 이미 갱신했을 수 있음
+            token_info = self._tokens.get(appkey)
+            if self._is_fresh(token_info):
+                return {**token_info["result"], "cached": True}
+
+            result = None
+            if token_info and appkey == KIWOOM_APPKEY:
+                result = refresh_access_token(token_info["result"]["token"])
+                if "error" in result or not result.get("token"):
+                    result = None
+
+            if result is None:
+                result = _issue_access_token(appkey=appkey)
+
+            if "error" in result or not result.get("token"):
+                return result
+
+            self._tokens[appkey] = {
+                "result": result,
+                "expires_at": _parse_expires_dt(result.get("expires_dt")),
+            }
+            return {**result, "cached": False}
+
+    def peek_token(self, appkey: Optional[str] = None) -> Optional[str]:
+        """
+        네트워크 호출 없이 캐시에 유효한 토큰이 있을 때만 반환합니다.
+
+        Returns:
+            토큰 문자열 (캐시에 없거나 만료 임박이면 None)
+        """
+        token_info = self._tokens.get(appkey or KIWOOM_APPKEY)
+        if self._is_fresh(token_info):
+            return token_info["result"]["token"]
+        return None
+
+    def get_token(self, appkey: Optional[str] = None) -> Optional[str]:
+        """
+        Bearer 헤더에 바로 사용할 토큰 문자열을 반환합니다.
+
+        Returns:
+            토큰 문자열 (발급 실패 시 None)
+        """
+        return self.get_token_info(appkey).get("token")
+
+    def invalidate(self, appkey: Optional[str] = None) -> None:
+        """캐시된 토큰을 폐기합니다 (401 응답 등)."""
+        self._tokens.pop(appkey or KIWOOM_APPKEY, None)
+
+
+# 프로세스 전역 토큰 매니저
+token_manager = KiwoomTokenManager()
+
+
+def get_bearer_token() -> Optional[str]:
+    """도구들이 사용할 캐시된 접근토큰을 반환합니다."""
+    return token_manager.get_token()
+
+
+@instrument_tool
+def get_access_token() -> Dict[str, Any]:
+    """
+    키움증권 OAuth 접근토큰을 발급받습니다.
+    프로세스 전역 캐시에 유효한 토큰이 있으면 재발급 없이 반환합니다.
+    키움 도구들은 토큰을 자동으로 주입하므로 이 도구를 따로 호출할 필요는 없습니다.
+    환경변수 KIWOOM_APPKEY, KIWOOM_SECRETKEY가 설정되어 있어야 합니다.
+
+    Returns:
+        토큰 정보 딕셔너리 (token, token_type, expires_dt 포함)
+    """
+    return token_manager.get_token_info()
+
+
 # 도구 생성
 kiwoom_get_access_token_tool = FunctionTool(get_access_token)
 kiwoom_refresh_token_tool = FunctionTool(refresh_access_token)
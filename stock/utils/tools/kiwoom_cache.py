@@ -0,0 +1,370 @@
+"""
+키움증권 조회 API 응답 캐시
+- 키: (api-id, 정규화된 요청 바디, cont-yn, next-key)
+- api-id별 TTL 정책 (장중/장마감 후 구분)
+- LRU 크기 제한, api-id별 hit/miss 카운터
+- 메모리 백엔드 (기본) / SQLite 백엔드 (여러 uvicorn 워커가 공유)
+  - SQLite 조회는 읽기만 하고, LRU 접근 시각은 모아 두었다가 저장 시 한 번에 기록
+  - 비동기 조회/저장(aget/aset)은 SQLite 백엔드면 워커 스레드에서 실행
+"""
+
+from typing import Dict, Any, Optional, Tuple
+from collections import OrderedDict
+from datetime import datetime, time as dtime
+from zoneinfo import ZoneInfo
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# 캐시 설정
+KIWOOM_CACHE_ENABLED = os.getenv("KIWOOM_CACHE_ENABLED", "true").lower() == "true"
+KIWOOM_CACHE_BACKEND = os.getenv("KIWOOM_CACHE_BACKEND", "memory")  # memory | sqlite
+KIWOOM_CACHE_PATH = os.getenv("KIWOOM_CACHE_PATH", "database/kiwoom-cache.sqlite")
+KIWOOM_CACHE_MAX_ENTRIES = int(os.getenv("KIWOOM_CACHE_MAX_ENTRIES", "2000"))
+
+# SQLite 백엔드의 LRU 접근 시각 기록 주기 (모아 둔 건수 / 초)
+_TOUCH_FLUSH_SIZE = 100
+_TOUCH_FLUSH_SECONDS = 30
+
+KST = ZoneInfo("Asia/Seoul")
+MARKET_OPEN = dtime(8, 0)  # 장전 시간외 포함
+MARKET_CLOSE = dtime(18, 0)  # 장후 시간외 포함
+
+# api-id별 TTL 정책 (초): (장중, 장마감 후)
+# 목록에 없는 api-id (계좌 kt00004, 토큰 au10001 등)는 캐시하지 않음
+CACHE_POLICIES: Dict[str, Tuple[int, int]] = {
+    # 종목정보
+    "ka10001": (10, 3600),  # 주식기본정보
+    "ka10101": (86400, 86400),  # 업종코드 리스트
+    "ka90004": (30, 3600),  # 종목별프로그램매매현황
+    "ka90013": (60, 3600),  # 종목일별프로그램매매추이
+    # 차트
+    "ka10081": (30, 3600),  # 주식일봉차트
+    "ka10080": (10, 3600),  # 주식분봉차트
+    # 순위정보
+    "ka10023": (5, 600),  # 거래량급증
+    "ka10030": (5, 600),  # 당일거래량상위
+    "ka10032": (5, 600),  # 거래대금상위
+    "ka10027": (5, 600),  # 전일대비등락률상위
+    "ka10029": (5, 600),  # 예상체결등락률상위
+    # 업종
+    "ka20001": (10, 600),  # 업종현재가
+    "ka20002": (10, 600),  # 업종별주가
+    "ka20003": (10, 600),  # 전업종지수
+    # 테마
+    "ka90001": (60, 1800),  # 테마그룹별
+    "ka90002": (30, 1800),  # 테마구성종목
+    # 시세/수급
+    "ka10045": (60, 3600),  # 종목별기관매매추이
+    "ka10014": (60, 3600),  # 공매도추이
+    "ka10131": (30, 1800),  # 기관외국인연속매매현황
+    "ka90009": (30, 1800),  # 외국인기관매매상위
+    "ka10035": (30, 1800),  # 외인연속순매매상위
+    "ka10044": (60, 3600),  # 일별기관매매종목
+    "ka10065": (10, 1800),  # 장중투자자별매매상위
+}
+
+
+def is_market_hours(now: Optional[datetime] = None) -> bool:
+    """한국 시간 기준 평일 장 운영 시간(시간외 포함)인지 확인합니다."""
+    now = now or datetime.now(KST)
+    return now.weekday() < 5 and MARKET_OPEN <= now.time() < MARKET_CLOSE
+
+
+def get_ttl(api_id: Optional[str]) -> int:
+    """
+    api-id의 현재 시점 TTL을 반환합니다.
+
+    Returns:
+        TTL (초). 0이면 캐시하지 않음
+    """
+    policy = CACHE_POLICIES.get(api_id or "")
+    if policy is None:
+        return 0
+    return policy[0] if is_market_hours() else policy[1]
+
+
+def make_key(headers: Dict[str, str], payload: Dict[str, Any]) -> str:
+    """
+    요청을 캐시 키로 정규화합니다. authorization 헤더는 키에서 제외합니다.
+
+    Args:
+        headers: 요청 헤더
+        payload: 요청 바디
+
+    Returns:
+        캐시 키 문자열
+    """
+    normalized = {k: v for k, v in (payload or {}).items() if v not in (None, "")}
+    return json.dumps(
+        [
+            headers.get("api-id"),
+            normalized,
+            headers.get("cont-yn") or "",
+            headers.get("next-key") or "",
+        ],
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+
+
+class MemoryCacheBackend:
+    """프로세스 내 LRU 캐시."""
+
+    # 디스크 I/O 없음 (이벤트 루프에서 바로 호출)
+    blocking = False
+
+    def __init__(self, max_entries: int = KIWOOM_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Dict[str, Any], ttl: int) -> None:
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCacheBackend:
+    """
+    여러 워커 프로세스가 공유하는 SQLite 파일 캐시.
+    조회할 때마다 쓰기 잠금을 잡지 않도록 LRU 접근 시각은 모아 두었다가
+    저장(set) 시 또는 일정 건수/시간이 지나면 한 번에 기록합니다.
+    """
+
+    # 디스크 I/O (비동기 호출 시 워커 스레드에서 실행)
+    blocking = True
+
+    def __init__(
+        self, path: str = KIWOOM_CACHE_PATH, max_entries: int = KIWOOM_CACHE_MAX_ENTRIES
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._touched: Dict[str, float] = {}
+        self._touched_lock = threading.Lock()
+        self._last_flush = time.time()
+
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS kiwoom_cache ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " expires_at REAL NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS kiwoom_cache_last_access"
+            " ON kiwoom_cache (last_access)"
+        )
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 커넥션은 스레드 간 공유하지 않음
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        conn = self._conn()
+        now = time.time()
+        row = conn.execute(
+            "SELECT value, expires_at FROM kiwoom_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or row[1] <= now:
+            # 만료 항목은 다음 저장 시 정리
+            return None
+        with self._touched_lock:
+            self._touched[key] = now
+            flush = (
+                len(self._touched) >= _TOUCH_FLUSH_SIZE
+                or now - self._last_flush >= _TOUCH_FLUSH_SECONDS
+            )
+        if flush:
+            self._flush_touched(conn)
+            conn.commit()
+        return json.loads(row[0])
+
+    def _flush_touched(self, conn: sqlite3.Connection) -> None:
+        """모아 둔 LRU 접근 시각을 기록합니다 (커밋은 호출한 쪽에서)."""
+        with self._touched_lock:
+            touched, self._touched = self._touched, {}
+            self._last_flush = time.time()
+        if touched:
+            conn.executemany(
+                "UPDATE kiwoom_cache SET last_access = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in touched.items()],
+            )
+
+    def set(self, key: str, value: Dict[str, Any], ttl: int) -> None:
+        conn = self._conn()
+        now = time.time()
+        conn.execute(
+            "INSERT OR REPLACE INTO kiwoom_cache (key, value, expires_at, last_access)"
+            " VALUES (?, ?, ?, ?)",
+            (key, json.dumps(value, ensure_ascii=False), now + ttl, now),
+        )
+        self._flush_touched(conn)
+        # 만료 항목 정리 후 LRU 크기 제한
+        conn.execute("DELETE FROM kiwoom_cache WHERE expires_at <= ?", (now,))
+        conn.execute(
+            "DELETE FROM kiwoom_cache WHERE key IN ("
+            " SELECT key FROM kiwoom_cache ORDER BY last_access DESC"
+            " LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+        conn.commit()
+
+    def clear(self) -> None:
+        with self._touched_lock:
+            self._touched.clear()
+        conn = self._conn()
+        conn.execute("DELETE FROM kiwoom_cache")
+        conn.commit()
+
+    def __len__(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM kiwoom_cache").fetchone()[0]
+
+
+class ResponseCache:
+    """api-id별 TTL 정책을 적용하는 응답 캐시."""
+
+    def __init__(self, backend=None, enabled: bool = KIWOOM_CACHE_ENABLED):
+        self.backend = backend if backend is not None else _create_backend()
+        self.enabled = enabled
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, api_id: Optional[str], field: str) -> None:
+        with self._stats_lock:
+            stats = self._stats.setdefault(api_id or "", {"hits": 0, "misses": 0})
+            stats[field] += 1
+
+    def get(
+        self, headers: Dict[str, str], payload: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        캐시된 응답을 조회합니다.
+
+        Returns:
+            {"status_code", "headers", "body"} 딕셔너리 또는 None
+        """
+        api_id = headers.get("api-id")
+        if not self.enabled or get_ttl(api_id) <= 0:
+            return None
+
+        value = self.backend.get(make_key(headers, payload))
+        self._count(api_id, "hits" if value is not None else "misses")
+        return value
+
+    def set(
+        self,
+        headers: Dict[str, str],
+        payload: Dict[str, Any],
+        status_code: int,
+        response_headers: Dict[str, str],
+        body: str,
+    ) -> None:
+        """정상 응답 (HTTP 200, return_code 0)만 캐시에 저장합니다."""
+        ttl = get_ttl(headers.get("api-id"))
+        if not self.enabled or ttl <= 0 or status_code != 200:
+            return
+
+        try:
+            if json.loads(body).get("return_code") not in (0, "0", None):
+                return
+        except (ValueError, AttributeError):
+            return
+
+        value = {
+            "status_code": status_code,
+            "headers": {
+                k: v
+                for k, v in response_headers.items()
+                if k.lower() in ("cont-yn", "next-key", "api-id", "content-type")
+            },
+            "body": body,
+        }
+        self.backend.set(make_key(headers, payload), value, ttl)
+
+    async def aget(
+        self, headers: Dict[str, str], payload: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """get의 비동기 버전. 디스크 백엔드면 워커 스레드에서 조회합니다."""
+        if not self.enabled or not self.backend.blocking:
+            return self.get(headers, payload)
+        return await asyncio.to_thread(self.get, headers, payload)
+
+    async def aset(
+        self,
+        headers: Dict[str, str],
+        payload: Dict[str, Any],
+        status_code: int,
+        response_headers: Dict[str, str],
+        body: str,
+    ) -> None:
+        """set의 비동기 버전. 디스크 백엔드면 워커 스레드에서 저장합니다."""
+        if not self.enabled or not self.backend.blocking:
+            return self.set(headers, payload, status_code, response_headers, body)
+        await asyncio.to_thread(
+            self.set, headers, payload, status_code, response_headers, body
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """api-id별 hit/miss 카운터와 캐시 크기를 반환합니다."""
+        with self._stats_lock:
+            per_api = {k: dict(v) for k, v in self._stats.items()}
+        hits = sum(v["hits"] for v in per_api.values())
+        misses = sum(v["misses"] for v in per_api.values())
+        return {
+            "backend": type(self.backend).__name__,
+            "entries": len(self.backend),
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            "per_api_id": per_api,
+        }
+
+    def clear(self) -> None:
+        self.backend.clear()
+        with self._stats_lock:
+            self._stats.clear()
+
+
+def _create_backend():
+    if KIWOOM_CACHE_BACKEND == "sqlite":
+        return SQLiteCacheBackend()
+    return MemoryCacheBackend()
+
+
+# 프로세스 전역 응답 캐시
+response_cache = ResponseCache()
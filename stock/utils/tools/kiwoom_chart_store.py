@@ -0,0 +1,463 @@
+"""
+키움증권 차트(OHLCV) 로컬 저장소
+- (종목코드, 주기, 수정주가구분)별 봉 데이터를 SQLite에 영구 저장
+- 차트 도구는 저장소를 먼저 읽고, 마지막 저장 봉 이후의 누락분만 키움에서 받아옴 (read-through)
+- 과거 구간이 부족하면 저장된 가장 오래된 봉 이전만 추가로 받아옴 (일봉)
+- 최신 누락분이 연속조회 제한보다 길어 마지막 저장 봉까지 닿지 못하면, 중간이 비지 않도록
+  받은 구간 이전의 저장 봉을 지우고 과거 이력은 다시 받음
+- 비동기 버전은 SQLite 작업을 워커 스레드에서 실행해 이벤트 루프를 막지 않음
+- 결과는 문자열 딕셔너리 리스트 대신 컬럼 배열 (dt, open, high, low, close, volume, amount)
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from datetime import datetime, timedelta
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+
+from . import kiwoom_paginator
+from .kiwoom_cache import get_ttl
+from .kiwoom_client import BASE_URL
+
+# 저장소 설정
+KIWOOM_CHART_STORE_ENABLED = (
+    os.getenv("KIWOOM_CHART_STORE_ENABLED", "true").lower() == "true"
+)
+KIWOOM_CHART_STORE_PATH = os.getenv(
+    "KIWOOM_CHART_STORE_PATH", "database/kiwoom-chart.sqlite"
+)
+
+# 시작일을 지정하지 않았을 때 확보할 과거 구간 (일봉 60개 ≒ 달력 100일)
+DEFAULT_DAILY_LOOKBACK_DAYS = 100
+
+BAR_COLUMNS = ["dt", "open", "high", "low", "close", "volume", "amount"]
+
+# 주기별 (api-id, 응답 리스트 키, 시각 필드)
+_DAILY_API = ("ka10081", "stk_dt_pole_chart_qry", "dt")
+_MINUTE_API = ("ka10080", "stk_min_pole_chart_qry", "cntr_tm")
+
+ChartKey = Tuple[str, str, str]  # (stk_cd, interval, upd_stkpc_tp)
+
+
+def _chart_api(interval: str) -> Tuple[str, str, str]:
+    return _DAILY_API if interval == "1d" else _MINUTE_API
+
+
+def _to_number(value: Any) -> Optional[int]:
+    """키움 가격/수량 문자열 ("+70100", "-500", "")을 정수로 바꿉니다. 부호는 등락 방향이므로 제거합니다."""
+    if value in (None, ""):
+        return None
+    try:
+        return abs(int(str(value).replace(",", "")))
+    except ValueError:
+        return None
+
+
+def _to_bars(rows: Iterable[Dict[str, Any]], ts_field: str) -> List[Tuple]:
+    bars = []
+    for row in rows:
+        ts = row.get(ts_field)
+        if not ts:
+            continue
+        bars.append(
+            (
+                ts,
+                _to_number(row.get("open_pric")),
+                _to_number(row.get("high_pric")),
+                _to_number(row.get("low_pric")),
+                _to_number(row.get("cur_prc")),
+                _to_number(row.get("trde_qty")),
+                _to_number(row.get("trde_prica")),
+            )
+        )
+    return bars
+
+
+class ChartStore:
+    """SQLite 기반 OHLCV 저장소."""
+
+    def __init__(self, path: str = KIWOOM_CHART_STORE_PATH):
+        self.path = path
+        self._local = threading.local()
+
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS ohlcv ("
+            " stk_cd TEXT NOT NULL,"
+            " interval TEXT NOT NULL,"
+            " upd_stkpc_tp TEXT NOT NULL,"
+            " ts TEXT NOT NULL,"
+            " open INTEGER, high INTEGER, low INTEGER, close INTEGER,"
+            " volume INTEGER, amount INTEGER,"
+            " PRIMARY KEY (stk_cd, interval, upd_stkpc_tp, ts)) WITHOUT ROWID"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS ohlcv_meta ("
+            " stk_cd TEXT NOT NULL,"
+            " interval TEXT NOT NULL,"
+            " upd_stkpc_tp TEXT NOT NULL,"
+            " complete INTEGER NOT NULL DEFAULT 0,"
+            " checked_at REAL NOT NULL DEFAULT 0,"
+            " PRIMARY KEY (stk_cd, interval, upd_stkpc_tp))"
+        )
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 커넥션은 스레드 간 공유하지 않음
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def upsert(self, key: ChartKey, bars: List[Tuple]) -> None:
+        """봉 데이터를 저장합니다. 같은 시각의 봉은 최신 값으로 덮어씁니다."""
+        if not bars:
+            return
+        conn = self._conn()
+        conn.executemany(
+            "INSERT OR REPLACE INTO ohlcv"
+            " (stk_cd, interval, upd_stkpc_tp, ts, open, high, low, close, volume, amount)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [key + bar for bar in bars],
+        )
+        conn.commit()
+
+    def delete_before(self, key: ChartKey, ts: str) -> None:
+        """ts보다 오래된 봉을 삭제합니다."""
+        conn = self._conn()
+        conn.execute(
+            "DELETE FROM ohlcv"
+            " WHERE stk_cd = ? AND interval = ? AND upd_stkpc_tp = ? AND ts < ?",
+            key + (ts,),
+        )
+        conn.commit()
+
+    def bounds(self, key: ChartKey) -> Tuple[Optional[str], Optional[str]]:
+        """저장된 가장 오래된 봉과 가장 최근 봉의 시각."""
+        return (
+            self._conn()
+            .execute(
+                "SELECT MIN(ts), MAX(ts) FROM ohlcv"
+                " WHERE stk_cd = ? AND interval = ? AND upd_stkpc_tp = ?",
+                key,
+            )
+            .fetchone()
+        )
+
+    def meta(self, key: ChartKey) -> Tuple[bool, float]:
+        """(전체 과거 이력을 모두 받았는지, 마지막으로 최신분을 확인한 시각)"""
+        row = (
+            self._conn()
+            .execute(
+                "SELECT complete, checked_at FROM ohlcv_meta"
+                " WHERE stk_cd = ? AND interval = ? AND upd_stkpc_tp = ?",
+                key,
+            )
+            .fetchone()
+        )
+        return (bool(row[0]), row[1]) if row else (False, 0.0)
+
+    def update_meta(
+        self,
+        key: ChartKey,
+        complete: Optional[bool] = None,
+        checked_at: Optional[float] = None,
+    ) -> None:
+        old_complete, old_checked_at = self.meta(key)
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO ohlcv_meta"
+            " (stk_cd, interval, upd_stkpc_tp, complete, checked_at)"
+            " VALUES (?, ?, ?, ?, ?)",
+            key
+            + (
+                int(old_complete if complete is None else complete),
+                old_checked_at if checked_at is None else checked_at,
+            ),
+        )
+        conn.commit()
+
+    def query(
+        self,
+        key: ChartKey,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Dict[str, List[Any]]:
+        """
+        저장된 봉을 시각 오름차순 컬럼 배열로 반환합니다.
+
+        Args:
+            key: (종목코드, 주기, 수정주가구분)
+            start: 시작 시각 (YYYYMMDD 또는 YYYYMMDDHHMMSS, 포함)
+            end: 종료 일자 (YYYYMMDD, 해당 일 포함)
+            limit: 최근 봉 최대 개수
+
+        Returns:
+            Dict: 컬럼 이름별 값 리스트
+        """
+        rows = (
+            self._conn()
+            .execute(
+                "SELECT ts, open, high, low, close, volume, amount FROM ohlcv"
+                " WHERE stk_cd = ? AND interval = ? AND upd_stkpc_tp = ?"
+                " AND ts >= ? AND ts <= ?"
+                " ORDER BY ts DESC LIMIT ?",
+                key + (start or "", (end or "99999999") + "999999", limit or -1),
+            )
+            .fetchall()
+        )
+        rows.reverse()
+        return {
+            column: [row[i] for row in rows] for i, column in enumerate(BAR_COLUMNS)
+        }
+
+    def clear(self) -> None:
+        conn = self._conn()
+        conn.execute("DELETE FROM ohlcv")
+        conn.execute("DELETE FROM ohlcv_meta")
+        conn.commit()
+
+
+_store: Optional[ChartStore] = None
+_store_lock = threading.Lock()
+
+
+def get_chart_store() -> ChartStore:
+    """프로세스 전역 ChartStore를 반환합니다 (최초 호출 시 DB 파일 생성)."""
+    global _store
+
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ChartStore()
+    return _store
+
+
+def _request(
+    key: ChartKey, base_dt: Optional[str]
+) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+    """차트 조회 요청 (url, headers, payload)을 만듭니다."""
+    stk_cd, interval, upd_stkpc_tp = key
+    api_id = _chart_api(interval)[0]
+    headers = {"api-id": api_id, "Content-Type": "application/json;charset=UTF-8"}
+    payload = {"stk_cd": stk_cd, "upd_stkpc_tp": upd_stkpc_tp}
+    if interval == "1d":
+        payload["base_dt"] = base_dt or datetime.now().strftime("%Y%m%d")
+    else:
+        payload["tic_scope"] = interval.rstrip("m")
+    return f"{BASE_URL}/api/dostk/chart", headers, payload
+
+
+def _plan(
+    store: ChartStore, key: ChartKey, start: Optional[str], end: str
+) -> List[Tuple[Optional[str], Optional[str], str]]:
+    """
+    키움에서 받아와야 할 구간을 계산합니다.
+
+    Returns:
+        (기준일자, 멈출 시각, 종류) 리스트. 종류는 "tail"(최신 누락분) 또는 "backfill"(과거 누락분)
+    """
+    first_ts, last_ts = store.bounds(key)
+    complete, checked_at = store.meta(key)
+    api_id = _chart_api(key[1])[0]
+    steps = []
+
+    if last_ts is None:
+        # 처음 조회: 최신부터 시작 시각까지
+        return [(None, start, "tail")]
+
+    # 최신 봉 이후 구간: 오늘을 포함하는 조회이고 TTL이 지났으면 누락분만
+    if end >= last_ts[:8] and time.time() - checked_at > get_ttl(api_id):
+        steps.append((None, last_ts, "tail"))
+
+    # 과거 구간: 일봉은 base_dt로 저장된 가장 오래된 봉 이전부터 받아올 수 있음
+    if start and start < first_ts and not complete and key[1] == "1d":
+        steps.append((first_ts, start, "backfill"))
+
+    return steps
+
+
+def _page_error(page: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    if page.get("return_code") in (0, "0", None):
+        return None
+    return {
+        "error": f"차트 조회 실패: {page.get('return_msg')}",
+        "return_code": page.get("return_code"),
+        "return_msg": page.get("return_msg"),
+    }
+
+
+def _store_page(
+    store: ChartStore, key: ChartKey, page: Dict[str, Any], stop_at: Optional[str]
+) -> Tuple[bool, Optional[str]]:
+    """
+    페이지를 저장하고 (더 받을 필요가 없는지, 페이지의 가장 오래된 봉 시각)을 반환합니다.
+    stop_at이 None이면 첫 페이지만, 아니면 stop_at 이전 봉까지 받습니다.
+    """
+    _, list_key, ts_field = _chart_api(key[1])
+    bars = _to_bars(page.get(list_key) or [], ts_field)
+    store.upsert(key, bars)
+    if not bars:
+        return True, None
+    oldest = min(bar[0] for bar in bars)
+    return stop_at is None or oldest <= stop_at, oldest
+
+
+def _finish_step(
+    store: ChartStore,
+    key: ChartKey,
+    kind: str,
+    reached: bool,
+    last_page: Dict[str, Any],
+    oldest: Optional[str],
+) -> None:
+    """받은 구간에 맞춰 메타 정보를 갱신합니다."""
+    more = last_page.get("cont_yn") == "Y"
+    if kind == "tail":
+        if not reached and more and oldest:
+            # 연속조회 제한으로 이전 최신 봉까지 닿지 못함: 사이 구간이 비므로
+            # 받은 구간 이전 봉은 지우고 과거 이력은 다시 받도록 표시
+            store.delete_before(key, oldest)
+            store.update_meta(key, complete=False)
+        store.update_meta(key, checked_at=time.time())
+    if not reached and not more:
+        # 연속조회가 끝났으면 더 받을 과거 이력이 없음
+        store.update_meta(key, complete=True)
+
+
+def _result(
+    store: ChartStore,
+    key: ChartKey,
+    start: Optional[str],
+    end: str,
+    limit: Optional[int],
+    fetched_pages: int,
+) -> Dict[str, Any]:
+    bars = store.query(key, start, end, limit)
+    return {
+        "stock_code": key[0],
+        "interval": key[1],
+        "upd_stkpc_tp": key[2],
+        "count": len(bars["dt"]),
+        "first_dt": bars["dt"][0] if bars["dt"] else None,
+        "last_dt": bars["dt"][-1] if bars["dt"] else None,
+        "bars": bars,
+        "fetched_pages": fetched_pages,
+        "return_code": 0,
+        "return_msg": "정상적으로 처리되었습니다",
+    }
+
+
+def _normalize_range(
+    interval: str, start: Optional[str], end: Optional[str], limit: Optional[int]
+) -> Tuple[Optional[str], str]:
+    end = end or datetime.now().strftime("%Y%m%d")
+    if start is None and interval == "1d" and limit:
+        start = (
+            datetime.strptime(end, "%Y%m%d")
+            - timedelta(days=DEFAULT_DAILY_LOOKBACK_DAYS)
+        ).strftime("%Y%m%d")
+    return start, end
+
+
+def read_through(
+    stk_cd: str,
+    interval: str = "1d",
+    upd_stkpc_tp: str = "1",
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    저장소를 거쳐 차트를 조회합니다. 저장소에 없는 구간만 키움에서 받아 저장합니다.
+
+    Args:
+        stk_cd: 종목코드
+        interval: 주기 ("1d": 일봉, "1m"/"3m"/.../"60m": 분봉)
+        upd_stkpc_tp: 수정주가구분 (0 or 1)
+        start: 시작 일자 (YYYYMMDD, 포함). None이면 최근 limit개
+        end: 종료 일자 (YYYYMMDD, 포함). None이면 오늘
+        limit: 최근 봉 최대 개수
+
+    Returns:
+        Dict: 컬럼 배열 형식의 차트 데이터 (bars) 또는 오류 딕셔너리
+
+    Raises:
+        requests.exceptions.RequestException: HTTP 요청 실패
+    """
+    store = get_chart_store()
+    key = (stk_cd, interval, upd_stkpc_tp)
+    start, end = _normalize_range(interval, start, end, limit)
+    fetched_pages = 0
+
+    for base_dt, stop_at, kind in _plan(store, key, start, end):
+        url, headers, payload = _request(key, base_dt)
+        _, list_key, _ = _chart_api(interval)
+        reached = False
+        oldest = None
+        page = {}
+        for page in kiwoom_paginator.iter_pages(
+            url, headers, payload, list_key, max_rows=10**9, prefetch=False
+        ):
+            fetched_pages += 1
+            error = _page_error(page)
+            if error is not None:
+                return error
+            reached, oldest = _store_page(store, key, page, stop_at)
+            if reached:
+                break
+
+        _finish_step(store, key, kind, reached, page, oldest)
+
+    return _result(store, key, start, end, limit, fetched_pages)
+
+
+async def aread_through(
+    stk_cd: str,
+    interval: str = "1d",
+    upd_stkpc_tp: str = "1",
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> Dict[str, Any]:
+    """read_through의 비동기 버전. SQLite 작업은 asyncio.to_thread로 워커 스레드에서 실행합니다."""
+    store = await asyncio.to_thread(get_chart_store)
+    key = (stk_cd, interval, upd_stkpc_tp)
+    start, end = _normalize_range(interval, start, end, limit)
+    fetched_pages = 0
+
+    steps = await asyncio.to_thread(_plan, store, key, start, end)
+    for base_dt, stop_at, kind in steps:
+        url, headers, payload = _request(key, base_dt)
+        _, list_key, _ = _chart_api(interval)
+        reached = False
+        oldest = None
+        page = {}
+        pages = kiwoom_paginator.aiter_pages(
+            url, headers, payload, list_key, max_rows=10**9, prefetch=False
+        )
+        async for page in pages:
+            fetched_pages += 1
+            error = _page_error(page)
+            if error is not None:
+                await pages.aclose()
+                return error
+            reached, oldest = await asyncio.to_thread(
+                _store_page, store, key, page, stop_at
+            )
+            if reached:
+                break
+        await pages.aclose()
+
+        await asyncio.to_thread(_finish_step, store, key, kind, reached, page, oldest)
+
+    return await asyncio.to_thread(
+        _result, store, key, start, end, limit, fetched_pages
+    )
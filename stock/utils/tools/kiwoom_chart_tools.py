@@ -9,46 +9,103 @@
 
 from google.adk.tools import FunctionTool
 from typing import Dict, Any, Optional
+from datetime import datetime
 import requests
-import os
 
-# 모의투자 기본값
-KIWOOM_IS_MOCK = os.getenv("KIWOOM_IS_MOCK", "true").lower() == "true"
+from . import kiwoom_chart_store, kiwoom_client
+from .kiwoom_client import BASE_URL
+from .kiwoom_paginator import with_paging
+from .kiwoom_metrics import instrument_tool
 
-# 도메인 설정
-BASE_URL = "https://mockapi.kiwoom.com" if KIWOOM_IS_MOCK else "https://api.kiwoom.com"
 
+def _limit_daily_chart(
+    result: Dict[str, Any], stk_cd: str, base_dt: str
+) -> Dict[str, Any]:
+    """
+    일봉 응답을 최근 60일로 제한하고 조회 메타데이터를 추가합니다.
+
+    Args:
+        result: ka10081 응답 데이터
+        stk_cd: 종목코드
+        base_dt: 기준일자 (YYYYMMDD)
+
+    Returns:
+        Dict: 최근 60일로 제한된 응답 데이터
+    """
+    # 응답에서 최근 60일 데이터만 제한
+    if "error" not in result and "stk_dt_pole_chart_qry" in result:
+        chart_data = result["stk_dt_pole_chart_qry"]
+        if len(chart_data) > 60:
+            result["stk_dt_pole_chart_qry"] = chart_data[:60]  # 최근 60일만 유지
+
+    # 메타데이터 추가
+    if "error" not in result:
+        result["query_info"] = {
+            "stock_code": stk_cd,
+            "start_date": base_dt,
+            "end_date": datetime.now().strftime("%Y%m%d"),
+            "data_count": len(result.get("stk_dt_pole_chart_qry", [])),
+            "limited_to_60_days": True,
+        }
 
+    return result
+
+
+@instrument_tool
 def get_stock_daily_chart(
     stk_cd: str,
     base_dt: Optional[str] = None,
     upd_stkpc_tp: str = "1",
+    strt_dt: Optional[str] = None,
     cont_yn: Optional[str] = None,
     next_key: Optional[str] = None,
     authorization: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     키움증권 주식일봉차트조회요청 API (ka10081)
-    base_dt가 제공되지 않으면 오늘 날짜를 기준으로 조회하고, 최근 60일 데이터만 반환합니다.
+    base_dt가 제공되지 않으면 오늘 날짜를 기준으로 조회합니다.
+    strt_dt가 없으면 최근 60일, 있으면 strt_dt ~ base_dt 구간을 반환합니다.
+    로컬 차트 저장소를 먼저 읽고, 저장되지 않은 구간만 키움에서 받아옵니다.
 
     Args:
         stk_cd: 종목코드 (예: "005930")
         base_dt: 기준일자 (YYYYMMDD 형식, 예: "20241108"). None이면 오늘 날짜 기준으로 조회
         upd_stkpc_tp: 수정주가구분 (0 or 1, 기본값: "1")
+        strt_dt: 시작일자 (YYYYMMDD 형식, 선택사항)
         cont_yn: 연속조회여부 (선택사항)
         next_key: 연속조회키 (선택사항)
         authorization: 접근토큰 (선택사항)
 
     Returns:
-        Dict: API 응답 데이터 (최근 60일로 제한)
+        Dict: 날짜 오름차순 컬럼 배열 차트 데이터
+              (bars: dt, open, high, low, close, volume, amount).
+              cont_yn/next_key를 지정하면 API 원본 응답 (최근 60일로 제한)
     """
-    from datetime import datetime, timedelta
-
     # base_dt가 제공되지 않으면 오늘 날짜를 기준으로 조회
     if base_dt is None:
         today = datetime.now()
         base_dt = today.strftime("%Y%m%d")
 
+    # 연속조회를 직접 지정하지 않았으면 로컬 저장소를 거쳐 조회
+    if kiwoom_chart_store.KIWOOM_CHART_STORE_ENABLED and not (
+        cont_yn or next_key or authorization
+    ):
+        try:
+            return kiwoom_chart_store.read_through(
+                stk_cd,
+                "1d",
+                upd_stkpc_tp,
+                start=strt_dt,
+                end=base_dt,
+                limit=None if strt_dt else 60,
+            )
+        except requests.exceptions.RequestException as e:
+            return {
+                "error": f"API 요청 실패: {str(e)}",
+                "return_code": -1,
+                "return_msg": "API 요청 중 오류가 발생했습니다.",
+            }
+
     url = f"{BASE_URL}/api/dostk/chart"
 
     headers = {"api-id": "ka10081", "Content-Type": "application/json;charset=UTF-8"}
@@ -65,27 +122,11 @@ def get_stock_daily_chart(
     payload = {"stk_cd": stk_cd, "base_dt": base_dt, "upd_stkpc_tp": upd_stkpc_tp}
 
     try:
-        response = requests.post(url, headers=headers, json=payload)
+        response = kiwoom_client.post(url, headers=headers, json=payload)
         response.raise_for_status()
-        result = response.json()
-
-        # 응답에서 최근 60일 데이터만 제한
-        if "error" not in result and "stk_dt_pole_chart_qry" in result:
-            chart_data = result["stk_dt_pole_chart_qry"]
-            if len(chart_data) > 60:
-                result["stk_dt_pole_chart_qry"] = chart_data[:60]  # 최근 60일만 유지
-
-        # 메타데이터 추가
-        if "error" not in result:
-            result["query_info"] = {
-                "stock_code": stk_cd,
-                "start_date": base_dt,
-                "end_date": datetime.now().strftime("%Y%m%d"),
-                "data_count": len(result.get("stk_dt_pole_chart_qry", [])),
-                "limited_to_60_days": True,
-            }
+        result = with_paging(response.json(), response.headers)
 
-        return result
+        return _limit_daily_chart(result, stk_cd, base_dt)
     except requests.exceptions.RequestException as e:
         return {
             "error": f"API 요청 실패: {str(e)}",
@@ -94,28 +135,54 @@ def get_stock_daily_chart(
         }
 
 
+@instrument_tool
 def get_stock_minute_chart(
     stk_cd: str,
     tic_scope: str,
     upd_stkpc_tp: str = "1",
+    strt_dt: Optional[str] = None,
     cont_yn: Optional[str] = None,
     next_key: Optional[str] = None,
     authorization: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     키움증권 주식분봉차트조회요청 API (ka10080)
+    strt_dt가 없으면 최근 120개 봉, 있으면 strt_dt 이후 봉을 반환합니다.
+    로컬 차트 저장소를 먼저 읽고, 마지막 저장 봉 이후만 키움에서 받아옵니다.
 
     Args:
         stk_cd: 종목코드 (예: "005930")
         tic_scope: 틱범위 (1:1분, 3:3분, 5:5분, 10:10분, 15:15분, 30:30분, 45:45분, 60:60분)
         upd_stkpc_tp: 수정주가구분 (0 or 1, 기본값: "1")
+        strt_dt: 시작일자 (YYYYMMDD 또는 YYYYMMDDHHMMSS 형식, 선택사항)
         cont_yn: 연속조회여부 (선택사항)
         next_key: 연속조회키 (선택사항)
         authorization: 접근토큰 (선택사항)
 
     Returns:
-        Dict: API 응답 데이터
+        Dict: 시각 오름차순 컬럼 배열 차트 데이터
+              (bars: dt, open, high, low, close, volume, amount).
+              cont_yn/next_key를 지정하면 API 원본 응답
     """
+    # 연속조회를 직접 지정하지 않았으면 로컬 저장소를 거쳐 조회
+    if kiwoom_chart_store.KIWOOM_CHART_STORE_ENABLED and not (
+        cont_yn or next_key or authorization
+    ):
+        try:
+            return kiwoom_chart_store.read_through(
+                stk_cd,
+                f"{tic_scope}m",
+                upd_stkpc_tp,
+                start=strt_dt,
+                limit=None if strt_dt else 120,
+            )
+        except requests.exceptions.RequestException as e:
+            return {
+                "error": f"API 요청 실패: {str(e)}",
+                "return_code": -1,
+                "return_msg": "API 요청 중 오류가 발생했습니다.",
+            }
+
     url = f"{BASE_URL}/api/dostk/chart"
 
     headers = {"api-id": "ka10080", "Content-Type": "application/json;charset=UTF-8"}
@@ -132,9 +199,9 @@ def get_stock_minute_chart(
     payload = {"stk_cd": stk_cd, "tic_scope": tic_scope, "upd_stkpc_tp": upd_stkpc_tp}
 
     try:
-        response = requests.post(url, headers=headers, json=payload)
+        response = kiwoom_client.post(url, headers=headers, json=payload)
         response.raise_for_status()
-        return response.json()
+        return with_paging(response.json(), response.headers)
     except requests.exceptions.RequestException as e:
         return {
             "error": f"API 요청 실패: {str(e)}",
@@ -0,0 +1,446 @@
+"""
+키움증권 REST API 공용 HTTP 클라이언트
+- keep-alive 커넥션 풀 공유 (api.kiwoom.com / mockapi.kiwoom.com)
+- 풀 크기, 타임아웃 환경변수로 설정
+- authorization 헤더가 없으면 캐시된 접근토큰 자동 주입
+- 조회 API 응답은 kiwoom_cache의 TTL 캐시를 거침
+- 캐시 미스인 동일 요청이 동시에 들어오면 업스트림 호출을 한 번으로 병합
+- 업스트림 호출은 kiwoom_rate_limiter의 엔드포인트 그룹별 요청 제한과 우선순위를 따름
+- 429/5xx/네트워크 오류는 지수 백오프 + 지터로 재시도
+- api-id별 요청 출처(캐시/실제 호출/병합), 실제 호출 시간, 응답 크기를 kiwoom_metrics에 기록
+- 모든 kiwoom_*_tools 모듈은 requests.post 대신 이 모듈의 post를 사용
+- 비동기 도구(aio 패키지)는 httpx 기반 apost를 사용 (이벤트 루프 블로킹 방지)
+"""
+
+from typing import Dict, Any, Optional, Tuple, Union
+import asyncio
+import json as jsonlib
+import threading
+import time
+import weakref
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+import os
+
+from .kiwoom_cache import make_key, response_cache
+from .kiwoom_metrics import api_call, record_request
+from .kiwoom_rate_limiter import (
+    KIWOOM_MAX_RETRIES,
+    RETRY_STATUS_CODES,
+    backoff_delay,
+    endpoint_group,
+    rate_limiter,
+)
+from .kiwoom_singleflight import async_singleflight, singleflight
+
+# 모의투자 기본값
+KIWOOM_IS_MOCK = os.getenv("KIWOOM_IS_MOCK", "true").lower() == "true"
+
+# 도메인 설정 (KIWOOM_BASE_URL이 있으면 우선, 예: 로컬 대역 서버 http://localhost:9001)
+BASE_URL = os.getenv("KIWOOM_BASE_URL") or (
+    "https://mockapi.kiwoom.com" if KIWOOM_IS_MOCK else "https://api.kiwoom.com"
+)
+
+# 커넥션 풀 설정 (워커 스레드 수보다 크게 잡아야 커넥션 재사용이 보장됨)
+KIWOOM_POOL_SIZE = int(os.getenv("KIWOOM_POOL_SIZE", "20"))
+
+# 타임아웃 설정 (초) - 연결 타임아웃, 응답 읽기 타임아웃
+KIWOOM_CONNECT_TIMEOUT = float(os.getenv("KIWOOM_CONNECT_TIMEOUT", "3.05"))
+KIWOOM_READ_TIMEOUT = float(os.getenv("KIWOOM_READ_TIMEOUT", "10"))
+
+# 동시 요청 병합에서 제외할 api-id (토큰 발급은 KiwoomTokenManager가 병합)
+NO_COALESCE_API_IDS = {"au10001"}
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+# 이벤트 루프별 httpx.AsyncClient (AsyncClient는 생성된 루프에서만 사용 가능)
+_async_clients: (
+    "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]"
+) = weakref.WeakKeyDictionary()
+
+
+class KiwoomResponse:
+    """
+    requests.Response와 같은 방식으로 다루는 응답 객체.
+    동기/비동기/캐시 응답 모두 이 타입으로 반환하므로 도구 함수들은 구분 없이
+    raise_for_status(), json(), headers를 사용할 수 있습니다.
+    """
+
+    def __init__(
+        self, status_code: int, headers: Dict[str, str], content: bytes, url: str
+    ):
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers)
+        self.content = content
+        self.url = url
+
+    @classmethod
+    def from_cache(cls, cached: Dict[str, Any], url: str) -> "KiwoomResponse":
+        return cls(
+            cached["status_code"], cached["headers"], cached["body"].encode(), url
+        )
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return jsonlib.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        if 400 <= self.status_code < 600:
+            raise requests.exceptions.HTTPError(
+                f"{self.status_code} Error for url: {self.url}", response=self
+            )
+
+
+def get_session() -> requests.Session:
+    """
+    프로세스 전역에서 공유하는 requests.Session을 반환합니다.
+    최초 호출 시 keep-alive 커넥션 풀을 가진 세션을 생성합니다.
+
+    Returns:
+        공유 requests.Session
+    """
+    global _session
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=2,  # 실서버/모의서버 호스트별 풀
+                    pool_maxsize=KIWOOM_POOL_SIZE,
+                    pool_block=False,
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+
+    return _session
+
+
+def post(
+    url: str,
+    headers: Dict[str, str],
+    json: Dict[str, Any],
+    timeout: Optional[Union[float, Tuple[float, float]]] = None,
+) -> KiwoomResponse:
+    """
+    공유 커넥션 풀을 통해 키움증권 API에 POST 요청을 보냅니다.
+    조회 API는 api-id별 TTL 정책에 따라 응답 캐시를 먼저 확인합니다.
+
+    Args:
+        url: 요청 URL
+        headers: 요청 헤더 (api-id, authorization, cont-yn, next-key 등)
+        json: 요청 바디
+        timeout: 타임아웃 (초 또는 (연결, 읽기) 튜플). None이면 환경변수 기본값 사용
+
+    Returns:
+        KiwoomResponse
+    """
+    api_id = headers.get("api-id")
+    cached = response_cache.get(headers, json)
+    if cached is not None:
+        record_request(api_id, "cache")
+        return KiwoomResponse.from_cache(cached, url)
+
+    fetched = []
+
+    def fetch() -> KiwoomResponse:
+        fetched.append(True)
+        record_request(api_id, "upstream")
+        with api_call(api_id) as call:
+            call.response = _send(url, headers, json, timeout)
+        response = call.response
+        response_cache.set(
+            headers, json, response.status_code, response.headers, response.text
+        )
+        return response
+
+    if api_id in NO_COALESCE_API_IDS:
+        return fetch()
+
+    # 동일한 요청이 진행 중이면 그 결과를 공유
+    response = singleflight.do(_flight_key(url, headers, json), fetch, api_id)
+    if not fetched:
+        record_request(api_id, "coalesced")
+    return response
+
+
+async def apost(
+    url: str,
+    headers: Dict[str, str],
+    json: Dict[str, Any],
+    timeout: Optional[Union[float, Tuple[float, float]]] = None,
+) -> KiwoomResponse:
+    """
+    post의 비동기 버전. httpx.AsyncClient 커넥션 풀을 사용합니다.
+    httpx 예외는 requests 예외로 변환하므로 도구 함수의 예외 처리를 그대로 쓸 수 있습니다.
+
+    Args:
+        url: 요청 URL
+        headers: 요청 헤더 (api-id, authorization, cont-yn, next-key 등)
+        json: 요청 바디
+        timeout: 타임아웃 (초 또는 (연결, 읽기) 튜플). None이면 환경변수 기본값 사용
+
+    Returns:
+        KiwoomResponse
+    """
+    api_id = headers.get("api-id")
+    cached = await response_cache.aget(headers, json)
+    if cached is not None:
+        record_request(api_id, "cache")
+        return KiwoomResponse.from_cache(cached, url)
+
+    fetched = []
+
+    async def fetch() -> KiwoomResponse:
+        fetched.append(True)
+        record_request(api_id, "upstream")
+        with api_call(api_id) as call:
+            call.response = await _asend(url, headers, json, timeout)
+        response = call.response
+        await response_cache.aset(
+            headers, json, response.status_code, response.headers, response.text
+        )
+        return response
+
+    if api_id in NO_COALESCE_API_IDS:
+        return await fetch()
+
+    # 동일한 요청이 진행 중이면 그 결과를 공유
+    response = await async_singleflight.do(
+        _flight_key(url, headers, json), fetch, api_id
+    )
+    if not fetched:
+        record_request(api_id, "coalesced")
+    return response
+
+
+def _flight_key(url: str, headers: Dict[str, str], json: Dict[str, Any]) -> str:
+    return f"{url}|{make_key(headers, json)}"
+
+
+def _send(
+    url: str,
+    headers: Dict[str, str],
+    json: Dict[str, Any],
+    timeout: Optional[Union[float, Tuple[float, float]]],
+) -> KiwoomResponse:
+    """토큰을 주입해 실제 HTTP 요청을 보내고, 401이면 토큰을 재발급해 한 번 재시도합니다."""
+    if timeout is None:
+        timeout = (KIWOOM_CONNECT_TIMEOUT, KIWOOM_READ_TIMEOUT)
+
+    headers, injected = _with_authorization(headers)
+    response = _http_post(url, headers, json, timeout)
+
+    # 캐시된 토큰이 서버에서 폐기된 경우 한 번만 재발급 후 재시도
+    if injected and response.status_code == 401:
+        from .kiwoom_auth_tools import token_manager
+
+        token_manager.invalidate()
+        headers, injected = _with_authorization(headers, force=True)
+        response = _http_post(url, headers, json, timeout)
+
+    return response
+
+
+def _http_post(
+    url: str,
+    headers: Dict[str, str],
+    json: Dict[str, Any],
+    timeout: Union[float, Tuple[float, float]],
+) -> KiwoomResponse:
+    """요청 제한을 통과한 뒤 POST를 보내고, 일시적 오류는 백오프 후 재시도합니다."""
+    group = endpoint_group(url)
+
+    for attempt in range(KIWOOM_MAX_RETRIES + 1):
+        rate_limiter.acquire(group)
+        try:
+            response = get_session().post(
+                url, headers=headers, json=json, timeout=timeout
+            )
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            if attempt == KIWOOM_MAX_RETRIES:
+                raise
+            rate_limiter.record_retry(group, throttled=False)
+            time.sleep(backoff_delay(attempt))
+            continue
+
+        if (
+            response.status_code not in RETRY_STATUS_CODES
+            or attempt == KIWOOM_MAX_RETRIES
+        ):
+            break
+        rate_limiter.record_retry(group, throttled=response.status_code == 429)
+        time.sleep(backoff_delay(attempt, response.headers.get("retry-after")))
+
+    return KiwoomResponse(
+        response.status_code, dict(response.headers), response.content, url
+    )
+
+
+async def _asend(
+    url: str,
+    headers: Dict[str, str],
+    json: Dict[str, Any],
+    timeout: Optional[Union[float, Tuple[float, float]]],
+) -> KiwoomResponse:
+    """_send의 비동기 버전."""
+    headers, injected = await _awith_authorization(headers)
+    response = await _ahttp_post(url, headers, json, timeout)
+
+    # 캐시된 토큰이 서버에서 폐기된 경우 한 번만 재발급 후 재시도
+    if injected and response.status_code == 401:
+        from .kiwoom_auth_tools import token_manager
+
+        token_manager.invalidate()
+        headers, injected = await _awith_authorization(headers, force=True)
+        response = await _ahttp_post(url, headers, json, timeout)
+
+    return response
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    현재 이벤트 루프에서 공유하는 httpx.AsyncClient를 반환합니다.
+
+    Returns:
+        공유 httpx.AsyncClient
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=KIWOOM_POOL_SIZE,
+                max_keepalive_connections=KIWOOM_POOL_SIZE,
+            ),
+            timeout=httpx.Timeout(KIWOOM_READ_TIMEOUT, connect=KIWOOM_CONNECT_TIMEOUT),
+        )
+        _async_clients[loop] = client
+
+    return client
+
+
+async def _ahttp_post(
+    url: str,
+    headers: Dict[str, str],
+    json: Dict[str, Any],
+    timeout: Optional[Union[float, Tuple[float, float]]],
+) -> KiwoomResponse:
+    """_http_post의 비동기 버전. 대기와 백오프 모두 이벤트 루프를 블로킹하지 않습니다."""
+    group = endpoint_group(url)
+
+    for attempt in range(KIWOOM_MAX_RETRIES + 1):
+        await rate_limiter.aacquire(group)
+        try:
+            response = await _ahttp_post_once(url, headers, json, timeout)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            if attempt == KIWOOM_MAX_RETRIES:
+                raise
+            rate_limiter.record_retry(group, throttled=False)
+            await asyncio.sleep(backoff_delay(attempt))
+            continue
+
+        if (
+            response.status_code not in RETRY_STATUS_CODES
+            or attempt == KIWOOM_MAX_RETRIES
+        ):
+            break
+        rate_limiter.record_retry(group, throttled=response.status_code == 429)
+        await asyncio.sleep(backoff_delay(attempt, response.headers.get("retry-after")))
+
+    return response
+
+
+async def _ahttp_post_once(
+    url: str,
+    headers: Dict[str, str],
+    json: Dict[str, Any],
+    timeout: Optional[Union[float, Tuple[float, float]]],
+) -> KiwoomResponse:
+    if isinstance(timeout, tuple):
+        timeout = httpx.Timeout(timeout[1], connect=timeout[0])
+
+    kwargs = {"timeout": timeout} if timeout is not None else {}
+
+    try:
+        response = await get_async_client().post(
+            url, headers=headers, json=json, **kwargs
+        )
+    except httpx.TimeoutException as e:
+        raise requests.exceptions.Timeout(str(e)) from e
+    except httpx.HTTPError as e:
+        raise requests.exceptions.ConnectionError(str(e)) from e
+
+    return KiwoomResponse(
+        response.status_code, dict(response.headers), response.content, str(url)
+    )
+
+
+async def _awith_authorization(
+    headers: Dict[str, str], force: bool = False
+) -> Tuple[Dict[str, str], bool]:
+    """_with_authorization의 비동기 버전. 토큰 발급이 필요할 때만 스레드에서 실행합니다."""
+    if headers.get("api-id") == "au10001":
+        return headers, False
+    if "authorization" in headers and not force:
+        return headers, False
+
+    from .kiwoom_auth_tools import token_manager
+
+    token = token_manager.peek_token()
+    if not token:
+        token = await asyncio.to_thread(token_manager.get_token)
+    if not token:
+        return headers, False
+
+    return {**headers, "authorization": f"Bearer {token}"}, True
+
+
+def _with_authorization(
+    headers: Dict[str, str], force: bool = False
+) -> Tuple[Dict[str, str], bool]:
+    """
+    authorization 헤더가 없으면 토큰 매니저의 캐시된 토큰을 주입합니다.
+    토큰 발급 요청 (au10001)에는 주입하지 않습니다.
+
+    Returns:
+        (헤더, 토큰 주입 여부)
+    """
+    if headers.get("api-id") == "au10001":
+        return headers, False
+    if "authorization" in headers and not force:
+        return headers, False
+
+    # kiwoom_auth_tools가 이 모듈을 사용하므로 순환 import를 피해 지연 import
+    from .kiwoom_auth_tools import get_bearer_token
+
+    token = get_bearer_token()
+    if not token:
+        return headers, False
+
+    return {**headers, "authorization": f"Bearer {token}"}, True
+
+
+def close() -> None:
+    """공유 세션을 닫고 커넥션 풀을 정리합니다."""
+    global _session
+
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+async def aclose() -> None:
+    """현재 이벤트 루프의 httpx.AsyncClient를 닫습니다."""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
@@ -0,0 +1,407 @@
+"""
+기술적 지표 계산 도구
+- 차트 도구 결과 (컬럼 배열 bars 또는 API 원본 행 리스트)를 한 번만 float 배열로 변환
+- SMA/EMA, RSI, MACD, 볼린저밴드, ATR, OBV, 거래량 z-score,
+  업종지수 (ka20001) 대비 상대강도를 한 번에 벡터 연산으로 계산
+- LLM에는 원본 시계열 대신 요약 수치와 신호만 반환
+"""
+
+from google.adk.tools import FunctionTool
+from typing import Any, Dict, List, Optional
+from datetime import datetime, timedelta
+import math
+
+import numpy as np
+import pandas as pd
+import requests
+
+from . import kiwoom_chart_store
+from .kiwoom_chart_store import _to_number
+from .kiwoom_sector_tools import get_sector_current_price
+from .kiwoom_slimming import to_number
+from .kiwoom_metrics import instrument_tool
+
+# 지표 기간
+SMA_PERIODS = (5, 20, 60, 120)
+EMA_PERIODS = (12, 26)
+RSI_PERIOD = 14
+MACD_PERIODS = (12, 26, 9)
+BOLLINGER_PERIOD = 20
+BOLLINGER_K = 2.0
+ATR_PERIOD = 14
+VOLUME_PERIOD = 20
+RETURN_PERIODS = (5, 20, 60)
+
+# 차트 API 원본 응답의 행 리스트 키와 시각 필드
+_RAW_ROW_KEYS = {"stk_dt_pole_chart_qry": "dt", "stk_min_pole_chart_qry": "cntr_tm"}
+
+
+def parse_chart(chart: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """
+    차트 도구 결과를 시각 오름차순 float 배열로 변환합니다.
+
+    Args:
+        chart: 차트 저장소 결과 (bars 컬럼 배열) 또는 ka10081/ka10080 원본 응답
+
+    Returns:
+        Dict: dt(문자열 배열), open, high, low, close, volume (float64 배열)
+    """
+    if "bars" in chart:
+        bars = chart["bars"]
+        columns = {
+            name: np.asarray(bars.get(name, []), dtype=np.float64)
+            for name in ("open", "high", "low", "close", "volume")
+        }
+        columns["dt"] = np.asarray(bars.get("dt", []))
+        return columns
+
+    # API 원본 응답은 최신 행이 먼저 오므로 뒤집음
+    for list_key, ts_field in _RAW_ROW_KEYS.items():
+        if list_key in chart:
+            rows = list(reversed(chart[list_key] or []))
+            break
+    else:
+        rows, ts_field = [], "dt"
+
+    def column(field: str) -> np.ndarray:
+        return np.asarray(
+            [_to_number(row.get(field)) for row in rows], dtype=np.float64
+        )
+
+    return {
+        "dt": np.asarray([row.get(ts_field) for row in rows]),
+        "open": column("open_pric"),
+        "high": column("high_pric"),
+        "low": column("low_pric"),
+        "close": column("cur_prc"),
+        "volume": column("trde_qty"),
+    }
+
+
+def _round(value: Any, digits: int = 2) -> Optional[float]:
+    if value is None:
+        return None
+    value = float(value)
+    if math.isnan(value) or math.isinf(value):
+        return None
+    return round(value, digits)
+
+
+def _sma(values: np.ndarray, period: int) -> np.ndarray:
+    """단순이동평균 (누적합 기반). 기간이 부족한 앞부분은 NaN."""
+    out = np.full(values.shape, np.nan)
+    if len(values) >= period:
+        csum = np.cumsum(np.insert(values, 0, 0.0))
+        out[period - 1 :] = (csum[period:] - csum[:-period]) / period
+    return out
+
+
+def _ema(values: pd.Series, period: int) -> pd.Series:
+    return values.ewm(span=period, adjust=False, min_periods=period).mean()
+
+
+def _wilder(values: pd.Series, period: int) -> pd.Series:
+    """Wilder 평활 (RSI, ATR 계산용)."""
+    return values.ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
+
+
+def compute_indicators(
+    arrays: Dict[str, np.ndarray],
+    sector_change_rate: Optional[float] = None,
+    sector_return: Optional[Dict[int, float]] = None,
+) -> Dict[str, Any]:
+    """
+    모든 지표를 한 번에 계산해 마지막 값 기준 요약을 반환합니다.
+
+    Args:
+        arrays: parse_chart 결과
+        sector_change_rate: 업종지수 당일 등락률 (%)
+        sector_return: 업종지수 기간별 수익률 {기간: %}
+
+    Returns:
+        Dict: 가격, 이동평균, 모멘텀, 변동성, 거래량 지표와 신호 목록
+    """
+    close = arrays["close"]
+    n = len(close)
+    if n == 0:
+        return {"bars": 0, "error": "차트 데이터가 없습니다."}
+
+    high, low, volume = arrays["high"], arrays["low"], arrays["volume"]
+    close_s = pd.Series(close)
+    prev_close = np.concatenate(([np.nan], close[:-1]))
+
+    # 이동평균
+    sma = {period: _sma(close, period) for period in SMA_PERIODS}
+    ema = {period: _ema(close_s, period).to_numpy() for period in EMA_PERIODS}
+
+    # RSI (Wilder)
+    delta = close_s.diff()
+    avg_gain = _wilder(delta.clip(lower=0), RSI_PERIOD)
+    avg_loss = _wilder(-delta.clip(upper=0), RSI_PERIOD)
+    rsi = (100 - 100 / (1 + avg_gain / avg_loss.replace(0, np.nan))).to_numpy()
+    if n > RSI_PERIOD and avg_loss.iloc[-1] == 0:
+        rsi[-1] = 100.0
+
+    # MACD
+    fast, slow, signal_period = MACD_PERIODS
+    macd_line = _ema(close_s, fast) - _ema(close_s, slow)
+    macd_signal = macd_line.ewm(
+        span=signal_period, adjust=False, min_periods=signal_period
+    ).mean()
+    macd_hist = (macd_line - macd_signal).to_numpy()
+
+    # 볼린저밴드
+    bb_mid = _sma(close, BOLLINGER_PERIOD)
+    bb_std = close_s.rolling(BOLLINGER_PERIOD).std(ddof=0).to_numpy()
+    bb_upper = bb_mid + BOLLINGER_K * bb_std
+    bb_lower = bb_mid - BOLLINGER_K * bb_std
+
+    # ATR (Wilder)
+    true_range = np.nanmax(
+        np.vstack([high - low, np.abs(high - prev_close), np.abs(low - prev_close)]),
+        axis=0,
+    )
+    atr = _wilder(pd.Series(true_range), ATR_PERIOD).to_numpy()
+
+    # OBV
+    direction = np.sign(np.nan_to_num(np.diff(close, prepend=close[0])))
+    obv = np.cumsum(direction * np.nan_to_num(volume))
+
+    # 거래량 z-score (당일 제외 직전 VOLUME_PERIOD개 기준)
+    volume_mean = volume_std = np.nan
+    if n > VOLUME_PERIOD:
+        window = volume[-VOLUME_PERIOD - 1 : -1]
+        volume_mean, volume_std = window.mean(), window.std()
+    volume_z = (volume[-1] - volume_mean) / volume_std if volume_std else np.nan
+
+    # 기간 수익률
+    returns = {
+        period: (close[-1] / close[-period - 1] - 1) * 100
+        for period in RETURN_PERIODS
+        if n > period
+    }
+
+    last = close[-1]
+    result: Dict[str, Any] = {
+        "bars": n,
+        "first_dt": str(arrays["dt"][0]),
+        "last_dt": str(arrays["dt"][-1]),
+        "price": {
+            "close": _round(last),
+            "change_rate": _round((last / prev_close[-1] - 1) * 100) if n > 1 else None,
+            "returns": {f"{p}": _round(r) for p, r in returns.items()},
+            "high_in_period": _round(np.nanmax(high)),
+            "low_in_period": _round(np.nanmin(low)),
+        },
+        "moving_average": {
+            **{f"sma{p}": _round(values[-1]) for p, values in sma.items()},
+            **{f"ema{p}": _round(values[-1]) for p, values in ema.items()},
+        },
+        "momentum": {
+            "rsi14": _round(rsi[-1]),
+            "macd": _round(macd_line.iloc[-1]),
+            "macd_signal": _round(macd_signal.iloc[-1]),
+            "macd_hist": _round(macd_hist[-1]),
+        },
+        "volatility": {
+            "bollinger_upper": _round(bb_upper[-1]),
+            "bollinger_mid": _round(bb_mid[-1]),
+            "bollinger_lower": _round(bb_lower[-1]),
+            "bollinger_percent_b": _round(
+                (
+                    (last - bb_lower[-1]) / (bb_upper[-1] - bb_lower[-1])
+                    if bb_upper[-1] != bb_lower[-1]
+                    else np.nan
+                ),
+                3,
+            ),
+            "bollinger_bandwidth": _round(
+                (bb_upper[-1] - bb_lower[-1]) / bb_mid[-1] * 100
+            ),
+            "atr14": _round(atr[-1]),
+            "atr14_pct": _round(atr[-1] / last * 100),
+        },
+        "volume": {
+            "last": _round(volume[-1], 0),
+            "avg20": _round(volume_mean, 0),
+            "ratio_to_avg20": _round(
+                volume[-1] / volume_mean if volume_mean else np.nan
+            ),
+            "zscore20": _round(volume_z),
+            "obv": _round(obv[-1], 0),
+            "obv_change20": _round(obv[-1] - obv[-21], 0) if n > 20 else None,
+        },
+    }
+
+    # 업종 대비 상대강도
+    if sector_change_rate is not None or sector_return:
+        relative = {}
+        if (
+            sector_change_rate is not None
+            and result["price"]["change_rate"] is not None
+        ):
+            relative["today"] = _round(
+                result["price"]["change_rate"] - sector_change_rate
+            )
+        for period, sector_r in (sector_return or {}).items():
+            if period in returns:
+                relative[f"{period}"] = _round(returns[period] - sector_r)
+        result["relative_strength_vs_sector"] = relative
+
+    result["signals"] = _signals(
+        sma, macd_hist, rsi, last, bb_upper, bb_lower, volume_z
+    )
+    return result
+
+
+def _crossed_up(fast: np.ndarray, slow: np.ndarray) -> bool:
+    return len(fast) > 1 and fast[-2] <= slow[-2] and fast[-1] > slow[-1]
+
+
+def _crossed_down(fast: np.ndarray, slow: np.ndarray) -> bool:
+    return len(fast) > 1 and fast[-2] >= slow[-2] and fast[-1] < slow[-1]
+
+
+def _signals(
+    sma: Dict[int, np.ndarray],
+    macd_hist: np.ndarray,
+    rsi: np.ndarray,
+    last: float,
+    bb_upper: np.ndarray,
+    bb_lower: np.ndarray,
+    volume_z: float,
+) -> List[str]:
+    """마지막 봉 기준으로 해석이 쉬운 신호 목록을 만듭니다."""
+    signals = []
+    if _crossed_up(sma[5], sma[20]):
+        signals.append("골든크로스 (5일선이 20일선 상향 돌파)")
+    if _crossed_down(sma[5], sma[20]):
+        signals.append("데드크로스 (5일선이 20일선 하향 돌파)")
+    if not np.isnan(sma[20][-1]) and not np.isnan(sma[60][-1]):
+        if last > sma[20][-1] > sma[60][-1]:
+            signals.append("정배열 (종가 > 20일선 > 60일선)")
+        elif last < sma[20][-1] < sma[60][-1]:
+            signals.append("역배열 (종가 < 20일선 < 60일선)")
+    if len(macd_hist) > 1 and macd_hist[-2] <= 0 < macd_hist[-1]:
+        signals.append("MACD 시그널 상향 돌파")
+    if len(macd_hist) > 1 and macd_hist[-2] >= 0 > macd_hist[-1]:
+        signals.append("MACD 시그널 하향 돌파")
+    if rsi[-1] >= 70:
+        signals.append("RSI 과매수 (70 이상)")
+    elif rsi[-1] <= 30:
+        signals.append("RSI 과매도 (30 이하)")
+    if last > bb_upper[-1]:
+        signals.append("볼린저밴드 상단 돌파")
+    elif last < bb_lower[-1]:
+        signals.append("볼린저밴드 하단 이탈")
+    if volume_z >= 2:
+        signals.append("거래량 급증 (20일 평균 대비 z-score 2 이상)")
+    return signals
+
+
+def _index_level(value: Any) -> Optional[float]:
+    # 업종지수는 소수 ("+2626.51")이므로 정수 전용 _to_number 대신 사용
+    number = to_number(value, absolute=True)
+    return number if isinstance(number, (int, float)) else None
+
+
+def _sector_returns(sector: Dict[str, Any]) -> Dict[int, float]:
+    """ka20001 일별 업종지수 (inds_cur_prc_daly_rept)로 기간별 수익률을 계산합니다."""
+    rows = sector.get("inds_cur_prc_daly_rept") or []
+    closes = np.asarray(
+        [_index_level(row.get("cur_prc_n")) for row in rows], dtype=np.float64
+    )[::-1]
+    closes = closes[~np.isnan(closes)]
+    return {
+        period: (closes[-1] / closes[-period - 1] - 1) * 100
+        for period in RETURN_PERIODS
+        if len(closes) > period
+    }
+
+
+def _sector_change_rate(sector: Dict[str, Any]) -> Optional[float]:
+    try:
+        return float(str(sector.get("flu_rt")).replace(",", ""))
+    except ValueError:
+        return None
+
+
+def _chart_range(interval: str, lookback: int) -> Dict[str, Any]:
+    """lookback개 봉을 확보하기 위한 차트 저장소 조회 범위."""
+    if interval != "1d":
+        return {"limit": lookback}
+    # 거래일 기준 lookback개 ≒ 달력일 1.5배
+    start = datetime.now() - timedelta(days=int(lookback * 1.5) + 10)
+    return {"start": start.strftime("%Y%m%d"), "limit": lookback}
+
+
+@instrument_tool
+def get_technical_indicators(
+    stk_cd: str,
+    interval: str = "1d",
+    lookback: int = 120,
+    sector_mrkt_tp: Optional[str] = None,
+    sector_inds_cd: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    종목의 기술적 지표를 계산해 요약 수치만 반환합니다.
+    (SMA 5/20/60/120, EMA 12/26, RSI 14, MACD 12/26/9, 볼린저밴드 20/2,
+    ATR 14, OBV, 거래량 z-score, 업종 대비 상대강도)
+
+    Args:
+        stk_cd: 종목코드 (예: "005930")
+        interval: 차트 주기 ("1d": 일봉, "1m"/"5m"/"30m"/"60m" 등: 분봉)
+        lookback: 계산에 사용할 최근 봉 개수 (기본값 120)
+        sector_mrkt_tp: 비교할 업종의 시장구분 (0:코스피, 1:코스닥, 2:코스피200, 선택사항)
+        sector_inds_cd: 비교할 업종코드 (예: 001:종합(KOSPI), 선택사항. 지정 시 상대강도 계산)
+
+    Returns:
+        Dict: price, moving_average, momentum, volatility, volume,
+              relative_strength_vs_sector, signals
+    """
+    try:
+        chart = kiwoom_chart_store.read_through(
+            stk_cd, interval, **_chart_range(interval, lookback)
+        )
+        sector = (
+            get_sector_current_price(sector_mrkt_tp or "0", sector_inds_cd)
+            if sector_inds_cd
+            else None
+        )
+    except requests.exceptions.RequestException as e:
+        return {
+            "error": f"API 요청 실패: {str(e)}",
+            "return_code": -1,
+            "return_msg": "API 요청 중 오류가 발생했습니다.",
+        }
+
+    return _summarize(stk_cd, interval, chart, sector)
+
+
+def _summarize(
+    stk_cd: str,
+    interval: str,
+    chart: Dict[str, Any],
+    sector: Optional[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """차트/업종 조회 결과로 지표 요약을 만듭니다. 동기/비동기 버전이 공유합니다."""
+    if "error" in chart:
+        return chart
+
+    sector_change_rate = sector_return = None
+    if sector is not None and "error" not in sector:
+        sector_change_rate = _sector_change_rate(sector)
+        sector_return = _sector_returns(sector)
+
+    result = compute_indicators(parse_chart(chart), sector_change_rate, sector_return)
+    result = {"stock_code": stk_cd, "interval": interval, **result}
+    if sector is not None and "error" in sector:
+        result["sector_error"] = sector["error"]
+    return result
+
+
+# 도구 생성
+kiwoom_technical_indicators_tool = FunctionTool(get_technical_indicators)
+
+# 도구들
+KIWOOM_INDICATOR_TOOLS = [kiwoom_technical_indicators_tool]
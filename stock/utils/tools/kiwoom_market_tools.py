@@ -8,15 +8,14 @@
 from google.adk.tools import FunctionTool
 from typing import Dict, Any, Optional
 import requests
-import os
 
-# 모의투자 기본값
-KIWOOM_IS_MOCK = os.getenv("KIWOOM_IS_MOCK", "true").lower() == "true"
-
-# 도메인 설정
-BASE_URL = "https://mockapi.kiwoom.com" if KIWOOM_IS_MOCK else "https://api.kiwoom.com"
+from . import kiwoom_client
+from .kiwoom_client import BASE_URL
+from .kiwoom_paginator import with_paging
+from .kiwoom_metrics import instrument_tool
 
 
+@instrument_tool
 def get_stock_institution_trading_trend(
     stk_cd: str,
     strt_dt: str,
@@ -65,9 +64,9 @@ def get_stock_institution_trading_trend(
     }
 
     try:
-        response = requests.post(url, headers=headers, json=payload)
+        response = kiwoom_client.post(url, headers=headers, json=payload)
         response.raise_for_status()
-        return response.json()
+        return with_paging(response.json(), response.headers)
     except requests.exceptions.RequestException as e:
         return {
             "error": f"API 요청 실패: {str(e)}",
@@ -76,6 +75,7 @@ def get_stock_institution_trading_trend(
         }
 
 
+@instrument_tool
 def get_short_selling_trend(
     stk_cd: str,
     strt_dt: str,
@@ -121,9 +121,9 @@ def get_short_selling_trend(
     }
 
     try:
-        response = requests.post(url, headers=headers, json=payload)
+        response = kiwoom_client.post(url, headers=headers, json=payload)
         response.raise_for_status()
-        return response.json()
+        return with_paging(response.json(), response.headers)
     except requests.exceptions.RequestException as e:
         return {
             "error": f"API 요청 실패: {str(e)}",
@@ -0,0 +1,158 @@
+"""
+키움 API/도구 계측
+- instrument_tool: 모든 키움 도구 함수(동기/비동기)에 적용하는 데코레이터
+  - 도구별 실행 시간, return_code 분포, 응답 리스트 행 수
+  - 현재 채팅 session_id가 붙은 "kiwoom_tool <도구명>" span
+  - 다른 도구를 호출하는 도구(스냅샷 등)는 안쪽 도구 호출도 각각 기록됨
+- kiwoom_client가 api-id별로 기록
+  - 요청 출처: cache (응답 캐시), upstream (실제 호출), coalesced (진행 중인 동일 요청 결과 공유)
+  - 실제 호출 시간 (요청 제한 대기, 재시도, 토큰 재발급 포함), HTTP 상태 코드, 응답 바이트
+  - 토큰 발급(au10001)도 같은 경로로 기록되어 OAuth 호출 시간을 따로 볼 수 있음
+"""
+
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+import functools
+import inspect
+import time
+
+from stock.utils.metrics import current_session_id, registry, tracer
+
+# 응답 크기 히스토그램 구간 (바이트)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+# 응답 행 수 히스토그램 구간
+ROWS_BUCKETS = (0, 1, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+TOOL_SECONDS = registry.histogram(
+    "kiwoom_tool_seconds", "키움 도구 실행 시간", ["tool"]
+)
+TOOL_CALLS = registry.counter(
+    "kiwoom_tool_calls_total", "키움 도구 호출 건수", ["tool", "return_code"]
+)
+TOOL_ROWS = registry.histogram(
+    "kiwoom_tool_rows", "키움 도구 응답의 리스트 행 수", ["tool"], ROWS_BUCKETS
+)
+API_REQUESTS = registry.counter(
+    "kiwoom_api_requests_total",
+    "키움 API 요청 건수 (source: cache, upstream, coalesced)",
+    ["api_id", "source"],
+)
+API_SECONDS = registry.histogram(
+    "kiwoom_api_upstream_seconds", "키움 API 실제 호출 시간", ["api_id"]
+)
+API_STATUS = registry.counter(
+    "kiwoom_api_http_status_total", "키움 API 응답 HTTP 상태 코드", ["api_id", "status"]
+)
+API_BYTES = registry.histogram(
+    "kiwoom_api_response_bytes", "키움 API 응답 크기", ["api_id"], BYTES_BUCKETS
+)
+
+
+def _return_code(result: Any) -> str:
+    if not isinstance(result, dict):
+        return "none"
+    if "return_code" in result:
+        return str(result["return_code"])
+    return "-1" if "error" in result else "none"
+
+
+def _rows(result: Any) -> Optional[int]:
+    if not isinstance(result, dict):
+        return None
+    lists = [value for value in result.values() if isinstance(value, list)]
+    return sum(len(value) for value in lists) if lists else None
+
+
+@contextmanager
+def _tool_call(name: str) -> Iterator[Dict[str, Any]]:
+    outcome: Dict[str, Any] = {"return_code": "exception", "rows": None}
+    started = time.perf_counter()
+    with tracer.start_as_current_span(f"kiwoom_tool {name}") as span:
+        span.set_attribute("kiwoom.tool", name)
+        session_id = current_session_id()
+        if session_id:
+            span.set_attribute("session.id", session_id)
+        try:
+            yield outcome
+        finally:
+            TOOL_SECONDS.observe(time.perf_counter() - started, name)
+            TOOL_CALLS.inc(name, outcome["return_code"])
+            span.set_attribute("kiwoom.return_code", outcome["return_code"])
+            if outcome["rows"] is not None:
+                TOOL_ROWS.observe(outcome["rows"], name)
+                span.set_attribute("kiwoom.rows", outcome["rows"])
+
+
+def _record(outcome: Dict[str, Any], result: Any) -> None:
+    outcome["return_code"] = _return_code(result)
+    outcome["rows"] = _rows(result)
+
+
+def instrument_tool(func: Callable) -> Callable:
+    """
+    키움 도구 함수 계측 데코레이터.
+    functools.wraps로 시그니처와 docstring을 유지하므로 FunctionTool 선언은 그대로입니다.
+    """
+    name = func.__name__
+
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            with _tool_call(name) as outcome:
+                result = await func(*args, **kwargs)
+                _record(outcome, result)
+                return result
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with _tool_call(name) as outcome:
+            result = func(*args, **kwargs)
+            _record(outcome, result)
+            return result
+
+    return wrapper
+
+
+def record_request(api_id: Optional[str], source: str) -> None:
+    """api-id별 요청 출처를 기록합니다 (cache, upstream, coalesced)."""
+    API_REQUESTS.inc(api_id or "unknown", source)
+
+
+class ApiCall:
+    """api_call이 반환하는 실제 호출 기록기. 응답을 받으면 response에 넣습니다."""
+
+    def __init__(self):
+        self.response = None
+
+
+@contextmanager
+def api_call(api_id: Optional[str]) -> Iterator[ApiCall]:
+    """
+    키움 API 실제 호출 한 건을 계측합니다 (시간, 상태 코드, 응답 바이트, span).
+
+    사용 예:
+        with api_call(api_id) as call:
+            call.response = _send(url, headers, json, timeout)
+    """
+    api_id = api_id or "unknown"
+    call = ApiCall()
+    started = time.perf_counter()
+    with tracer.start_as_current_span(f"kiwoom_api {api_id}") as span:
+        span.set_attribute("kiwoom.api_id", api_id)
+        session_id = current_session_id()
+        if session_id:
+            span.set_attribute("session.id", session_id)
+        try:
+            yield call
+        finally:
+            API_SECONDS.observe(time.perf_counter() - started, api_id)
+            response = call.response
+            status = str(response.status_code) if response is not None else "error"
+            API_STATUS.inc(api_id, status)
+            span.set_attribute("http.status_code", status)
+            if response is not None:
+                API_BYTES.observe(len(response.content), api_id)
+                span.set_attribute("kiwoom.response_bytes", len(response.content))
@@ -0,0 +1,260 @@
+"""
+키움증권 연속조회 (cont-yn / next-key) 페이지네이터
+- 응답 헤더의 cont-yn=Y, next-key를 따라 다음 페이지를 자동 요청
+- 페이지를 제너레이터로 하나씩 반환 (동기 / 비동기)
+- 최대 페이지 수, 최대 행 수 제한
+- 현재 페이지를 처리하는 동안 다음 페이지를 미리 요청 (prefetch)
+"""
+
+from typing import Any, AsyncIterator, Dict, Iterator, Mapping, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+import asyncio
+import contextvars
+import os
+
+from . import kiwoom_client
+
+# 연속조회 기본 제한
+KIWOOM_MAX_PAGES = int(os.getenv("KIWOOM_MAX_PAGES", "10"))
+KIWOOM_MAX_ROWS = int(os.getenv("KIWOOM_MAX_ROWS", "500"))
+
+# 동기 prefetch용 스레드 풀
+_prefetch_executor = ThreadPoolExecutor(
+    max_workers=4, thread_name_prefix="kiwoom-prefetch"
+)
+
+
+def with_paging(
+    result: Dict[str, Any], response_headers: Mapping[str, str]
+) -> Dict[str, Any]:
+    """
+    응답 헤더의 연속조회 정보(cont-yn, next-key)를 결과에 추가합니다.
+
+    Args:
+        result: API 응답 데이터
+        response_headers: 응답 헤더
+
+    Returns:
+        Dict: cont_yn, next_key가 추가된 응답 데이터
+    """
+    if isinstance(result, dict):
+        result["cont_yn"] = response_headers.get("cont-yn")
+        result["next_key"] = response_headers.get("next-key")
+    return result
+
+
+def _page_headers(headers: Dict[str, str], next_key: Optional[str]) -> Dict[str, str]:
+    if not next_key:
+        return headers
+    return {**headers, "cont-yn": "Y", "next-key": next_key}
+
+
+def _has_next(page: Dict[str, Any]) -> bool:
+    return (
+        page.get("cont_yn") == "Y"
+        and bool(page.get("next_key"))
+        and page.get("return_code") in (0, "0", None)
+    )
+
+
+def _fetch_page(
+    url: str, headers: Dict[str, str], payload: Dict[str, Any]
+) -> Dict[str, Any]:
+    response = kiwoom_client.post(url, headers=headers, json=payload)
+    response.raise_for_status()
+    return with_paging(response.json(), response.headers)
+
+
+async def _afetch_page(
+    url: str, headers: Dict[str, str], payload: Dict[str, Any]
+) -> Dict[str, Any]:
+    response = await kiwoom_client.apost(url, headers=headers, json=payload)
+    response.raise_for_status()
+    return with_paging(response.json(), response.headers)
+
+
+def iter_pages(
+    url: str,
+    headers: Dict[str, str],
+    payload: Dict[str, Any],
+    list_key: Optional[str] = None,
+    max_pages: int = KIWOOM_MAX_PAGES,
+    max_rows: int = KIWOOM_MAX_ROWS,
+    prefetch: bool = True,
+) -> Iterator[Dict[str, Any]]:
+    """
+    연속조회 페이지를 차례로 요청해 하나씩 반환합니다.
+
+    Args:
+        url: 요청 URL
+        headers: 첫 페이지 요청 헤더 (cont-yn/next-key가 있으면 그 위치부터 조회)
+        payload: 요청 바디
+        list_key: 행 수를 셀 리스트 키 (예: "inds_stkpc"). None이면 max_rows 미적용
+        max_pages: 최대 페이지 수
+        max_rows: 최대 행 수 (초과분은 마지막 페이지에서 잘라냄)
+        prefetch: 현재 페이지를 반환하는 동안 다음 페이지를 미리 요청할지 여부
+
+    Yields:
+        Dict: 페이지 응답 데이터 (cont_yn, next_key 포함. max_rows로 행을 잘라냈으면 truncated=True)
+
+    Raises:
+        requests.exceptions.RequestException: HTTP 요청 실패
+    """
+    page = _fetch_page(url, headers, payload)
+    rows = 0
+    pending: Optional[Future] = None
+
+    try:
+        for page_no in range(1, max_pages + 1):
+            has_next = _has_next(page) and page_no < max_pages
+
+            # 행 수 제한을 먼저 적용해 버려질 다음 페이지를 미리 요청하지 않음
+            if list_key and isinstance(page.get(list_key), list):
+                remaining = max_rows - rows
+                if len(page[list_key]) > remaining:
+                    page[list_key] = page[list_key][:remaining]
+                    page["truncated"] = True
+                if len(page[list_key]) >= remaining:
+                    has_next = False
+                rows += len(page[list_key])
+
+            if has_next and prefetch:
+                # 요청 우선순위 등 컨텍스트를 prefetch 스레드로 전달
+                ctx = contextvars.copy_context()
+                pending = _prefetch_executor.submit(
+                    ctx.run,
+                    _fetch_page,
+                    url,
+                    _page_headers(headers, page["next_key"]),
+                    payload,
+                )
+
+            next_key = page.get("next_key")
+            yield page
+
+            if not has_next:
+                return
+            if pending is not None:
+                page = pending.result()
+                pending = None
+            else:
+                page = _fetch_page(url, _page_headers(headers, next_key), payload)
+    finally:
+        # 소비자가 중간에 멈추면 아직 시작하지 않은 prefetch는 취소
+        if pending is not None:
+            pending.cancel()
+
+
+async def aiter_pages(
+    url: str,
+    headers: Dict[str, str],
+    payload: Dict[str, Any],
+    list_key: Optional[str] = None,
+    max_pages: int = KIWOOM_MAX_PAGES,
+    max_rows: int = KIWOOM_MAX_ROWS,
+    prefetch: bool = True,
+) -> AsyncIterator[Dict[str, Any]]:
+    """iter_pages의 비동기 버전. prefetch는 별도 태스크로 실행합니다."""
+    page = await _afetch_page(url, headers, payload)
+    rows = 0
+    pending: Optional[asyncio.Task] = None
+
+    try:
+        for page_no in range(1, max_pages + 1):
+            has_next = _has_next(page) and page_no < max_pages
+
+            # 행 수 제한을 먼저 적용해 버려질 다음 페이지를 미리 요청하지 않음
+            if list_key and isinstance(page.get(list_key), list):
+                remaining = max_rows - rows
+                if len(page[list_key]) > remaining:
+                    page[list_key] = page[list_key][:remaining]
+                    page["truncated"] = True
+                if len(page[list_key]) >= remaining:
+                    has_next = False
+                rows += len(page[list_key])
+
+            if has_next and prefetch:
+                pending = asyncio.create_task(
+                    _afetch_page(url, _page_headers(headers, page["next_key"]), payload)
+                )
+
+            next_key = page.get("next_key")
+            yield page
+
+            if not has_next:
+                return
+            if pending is not None:
+                page = await pending
+                pending = None
+            else:
+                page = await _afetch_page(
+                    url, _page_headers(headers, next_key), payload
+                )
+    finally:
+        # 소비자가 중간에 멈추면 미리 요청한 페이지는 취소
+        if pending is not None and not pending.done():
+            pending.cancel()
+
+
+def _merge_pages(first: Optional[Dict[str, Any]], page: Dict[str, Any], list_key: str):
+    if first is None:
+        first = page
+        first.setdefault(list_key, [])
+        first["pages"] = 1
+    else:
+        first[list_key].extend(page.get(list_key) or [])
+        first["pages"] += 1
+    first["cont_yn"] = page.get("cont_yn")
+    first["next_key"] = page.get("next_key")
+    if page.get("truncated"):
+        first["truncated"] = True
+    return first
+
+
+def fetch_all(
+    url: str,
+    headers: Dict[str, str],
+    payload: Dict[str, Any],
+    list_key: str,
+    max_pages: int = KIWOOM_MAX_PAGES,
+    max_rows: int = KIWOOM_MAX_ROWS,
+) -> Dict[str, Any]:
+    """
+    모든 연속조회 페이지를 받아 list_key 리스트를 하나로 합칩니다.
+
+    Args:
+        url: 요청 URL
+        headers: 요청 헤더
+        payload: 요청 바디
+        list_key: 합칠 리스트 키
+        max_pages: 최대 페이지 수
+        max_rows: 최대 행 수
+
+    Returns:
+        Dict: 첫 페이지 응답에 전체 행을 합친 데이터.
+              pages(받은 페이지 수), truncated(제한으로 남은 페이지나 잘라낸 행이 있는지),
+              cont_yn/next_key(마지막 페이지 기준, 이어서 조회할 때 사용) 포함
+    """
+    merged = None
+    for page in iter_pages(url, headers, payload, list_key, max_pages, max_rows):
+        merged = _merge_pages(merged, page, list_key)
+    merged["total_count"] = len(merged[list_key])
+    merged["truncated"] = bool(merged.get("truncated")) or merged.get("cont_yn") == "Y"
+    return merged
+
+
+async def afetch_all(
+    url: str,
+    headers: Dict[str, str],
+    payload: Dict[str, Any],
+    list_key: str,
+    max_pages: int = KIWOOM_MAX_PAGES,
+    max_rows: int = KIWOOM_MAX_ROWS,
+) -> Dict[str, Any]:
+    """fetch_all의 비동기 버전."""
+    merged = None
+    async for page in aiter_pages(url, headers, payload, list_key, max_pages, max_rows):
+        merged = _merge_pages(merged, page, list_key)
+    merged["total_count"] = len(merged[list_key])
+    merged["truncated"] = bool(merged.get("truncated")) or merged.get("cont_yn") == "Y"
+    return merged
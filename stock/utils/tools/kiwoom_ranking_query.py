@@ -0,0 +1,258 @@
+"""
+키움증권 순위 조회 계층
+- 순위 API는 상위 N개 제한/가격·거래량 필터를 지원하지 않아 연속조회로 전체 리스트를 내려받음
+  (KIWOOM_MAX_PAGES/KIWOOM_MAX_ROWS 제한에 걸리면 truncated=True)
+- 내려받은 전체 리스트를 요청(api-id + 바디) 단위로 잠시 보관하고,
+  top_n/필터/제외 조건이 다른 후속 질문은 같은 리스트로 답함 (키움 재호출 없음)
+- 스냅샷 스케줄러(kiwoom_ranking_snapshots)가 같은 조건을 갱신 중이면 최신 스냅샷을 먼저 사용
+- 응답에는 필터 전 전체 건수(total_count), 필터 통과 건수(matched_count),
+  적용한 조건(filters), 데이터 수집 시각(fetched_at, age_seconds)을 포함
+"""
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+from collections import OrderedDict
+from datetime import datetime
+import os
+import threading
+import time
+
+from . import kiwoom_client
+from .kiwoom_cache import KST, make_key
+from .kiwoom_paginator import afetch_all, fetch_all, with_paging
+from .kiwoom_ranking_snapshots import RANKING_LIST_KEYS, get_snapshot
+from .kiwoom_slimming import to_number
+
+# 전체 순위 리스트 재사용 시간 (초). 0이면 재사용하지 않음 (응답 캐시 TTL만 적용)
+KIWOOM_RANKING_REUSE_SECONDS = float(os.getenv("KIWOOM_RANKING_REUSE_SECONDS", "60"))
+# 보관할 최대 순위 리스트 수
+KIWOOM_RANKING_MAX_ENTRIES = int(os.getenv("KIWOOM_RANKING_MAX_ENTRIES", "64"))
+
+DEFAULT_TOP_N = 10
+MAX_TOP_N = 100
+
+# 필터별 비교 필드 (API마다 필드명이 달라 앞에서부터 있는 필드를 사용)
+PRICE_FIELDS = ("cur_prc", "exp_cntr_pric")
+VOLUME_FIELDS = ("now_trde_qty", "trde_qty", "exp_cntr_qty")
+AMOUNT_FIELDS = ("trde_prica", "trde_amt")
+
+
+class RankingStore:
+    """요청별 전체 순위 리스트 보관소 (LRU)."""
+
+    def __init__(self, max_entries: int = KIWOOM_RANKING_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0}
+
+    def get(self, key: str, max_age: float) -> Optional[Tuple[float, Dict[str, Any]]]:
+        """max_age초 이내에 받은 리스트를 (수집 시각, 응답) 으로 반환합니다."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.time() - entry[0] > max_age:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry
+
+    def put(self, key: str, result: Dict[str, Any]) -> float:
+        fetched_at = time.time()
+        with self._lock:
+            self._entries[key] = (fetched_at, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return fetched_at
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._entries), **self._stats}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._stats = {"hits": 0, "misses": 0}
+
+
+# 프로세스 전역 순위 리스트 보관소
+ranking_store = RankingStore()
+
+
+def _reusable(headers: Mapping[str, str]) -> bool:
+    # 연속조회 페이지는 첫 페이지와 내용이 달라 재사용하지 않음
+    return (
+        KIWOOM_RANKING_REUSE_SECONDS > 0
+        and not headers.get("cont-yn")
+        and not headers.get("next-key")
+    )
+
+
+def _store_result(
+    key: str, headers: Mapping[str, str], result: Dict[str, Any]
+) -> Tuple[float, Dict[str, Any]]:
+    if _reusable(headers) and result.get("return_code") in (0, "0", None):
+        return ranking_store.put(key, result), result
+    return time.time(), result
+
+
+def fetch_ranking(
+    url: str, headers: Dict[str, str], payload: Dict[str, Any]
+) -> Tuple[float, Dict[str, Any]]:
+    """
+    순위 API의 전체 리스트를 가져옵니다 (연속조회 페이지를 모두 합침).
+    같은 조건의 최신 스냅샷이 있거나 재사용 시간 안에 같은 요청이 있었으면 그 결과를 씁니다.
+    HTTP 오류는 requests 예외로 전달합니다.
+
+    Returns:
+        Tuple: (수집 시각 epoch 초, 응답 데이터). 응답 데이터는 수정하지 마세요.
+    """
+    snapshot = get_snapshot(headers, payload)
+    if snapshot is not None:
+        return snapshot.fetched_at, snapshot.result
+
+    key = make_key(headers, payload)
+    if _reusable(headers):
+        entry = ranking_store.get(key, KIWOOM_RANKING_REUSE_SECONDS)
+        if entry is not None:
+            return entry
+
+    list_key = RANKING_LIST_KEYS.get(headers.get("api-id", ""))
+    if list_key:
+        result = fetch_all(url, headers, payload, list_key)
+    else:
+        response = kiwoom_client.post(url, headers=headers, json=payload)
+        response.raise_for_status()
+        result = with_paging(response.json(), response.headers)
+    return _store_result(key, headers, result)
+
+
+async def afetch_ranking(
+    url: str, headers: Dict[str, str], payload: Dict[str, Any]
+) -> Tuple[float, Dict[str, Any]]:
+    """fetch_ranking의 비동기 버전"""
+    snapshot = get_snapshot(headers, payload)
+    if snapshot is not None:
+        return snapshot.fetched_at, snapshot.result
+
+    key = make_key(headers, payload)
+    if _reusable(headers):
+        entry = ranking_store.get(key, KIWOOM_RANKING_REUSE_SECONDS)
+        if entry is not None:
+            return entry
+
+    list_key = RANKING_LIST_KEYS.get(headers.get("api-id", ""))
+    if list_key:
+        result = await afetch_all(url, headers, payload, list_key)
+    else:
+        response = await kiwoom_client.apost(url, headers=headers, json=payload)
+        response.raise_for_status()
+        result = with_paging(response.json(), response.headers)
+    return _store_result(key, headers, result)
+
+
+def _field_value(row: Dict[str, Any], fields: Iterable[str]) -> Optional[float]:
+    for field in fields:
+        if field in row:
+            value = to_number(row[field], absolute=True)
+            return value if isinstance(value, (int, float)) else None
+    return None
+
+
+def _normalize_code(code: Any) -> str:
+    # "A005930", "005930_AL" → "005930"
+    return str(code or "").strip().lstrip("A").split("_")[0]
+
+
+def query_ranking(
+    result: Dict[str, Any],
+    list_key: str,
+    top_n: int = DEFAULT_TOP_N,
+    min_price: Optional[float] = None,
+    min_volume: Optional[float] = None,
+    min_amount: Optional[float] = None,
+    exclude_codes: Optional[List[str]] = None,
+    exclude_name_keywords: Optional[List[str]] = None,
+    fetched_at: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    전체 순위 리스트에 필터/제외 조건을 적용하고 상위 top_n개를 반환합니다.
+    원본 응답은 수정하지 않습니다.
+
+    Args:
+        result: 순위 API 응답 데이터 (전체 리스트)
+        list_key: 순위 리스트 키 (예: "trde_qty_sdnin")
+        top_n: 반환할 최대 개수 (1~100)
+        min_price: 최소 현재가 (원)
+        min_volume: 최소 거래량 (주)
+        min_amount: 최소 거래대금 (API 응답 단위, 백만원)
+        exclude_codes: 제외할 종목코드 목록
+        exclude_name_keywords: 종목명에 포함되면 제외할 키워드 목록 (예: ["스팩", "ETN"])
+        fetched_at: 데이터 수집 시각 (epoch 초)
+
+    Returns:
+        Dict: 필터 적용 후 상위 top_n개 응답 데이터
+            (total_count: 필터 전 건수, matched_count: 필터 통과 건수,
+             truncated: 연속조회 제한으로 전체 리스트 중 일부만 받았는지)
+    """
+    rows = result.get(list_key)
+    if not isinstance(rows, list):
+        return result
+
+    top_n = min(max(int(top_n or DEFAULT_TOP_N), 1), MAX_TOP_N)
+    minimums = {
+        "min_price": (min_price, PRICE_FIELDS),
+        "min_volume": (min_volume, VOLUME_FIELDS),
+        "min_amount": (min_amount, AMOUNT_FIELDS),
+    }
+    filters: Dict[str, Any] = {}
+    ignored: List[str] = []
+    checks = []
+    for name, (minimum, fields) in minimums.items():
+        if minimum is None:
+            continue
+        # 이 API 응답에 없는 필드로는 거르지 않음 (전부 제외되는 것 방지)
+        if not any(field in row for row in rows for field in fields):
+            ignored.append(name)
+            continue
+        filters[name] = minimum
+        checks.append((minimum, fields))
+
+    codes = {_normalize_code(code) for code in exclude_codes or [] if code}
+    keywords = [keyword for keyword in exclude_name_keywords or [] if keyword]
+    if codes:
+        filters["exclude_codes"] = sorted(codes)
+    if keywords:
+        filters["exclude_name_keywords"] = keywords
+
+    def matches(row: Dict[str, Any]) -> bool:
+        if codes and _normalize_code(row.get("stk_cd")) in codes:
+            return False
+        name = str(row.get("stk_nm") or "")
+        if any(keyword in name for keyword in keywords):
+            return False
+        for minimum, fields in checks:
+            value = _field_value(row, fields)
+            if value is None or value < minimum:
+                return False
+        return True
+
+    matched = [row for row in rows if matches(row)]
+    queried = {
+        **result,
+        list_key: matched[:top_n],
+        "total_count": len(rows),
+        "matched_count": len(matched),
+        "limited_to": top_n,
+        "truncated": bool(result.get("truncated")),
+    }
+    if filters:
+        queried["filters"] = filters
+    if ignored:
+        queried["ignored_filters"] = ignored
+    if fetched_at is not None:
+        queried["fetched_at"] = datetime.fromtimestamp(fetched_at, KST).isoformat(
+            timespec="seconds"
+        )
+        queried["age_seconds"] = round(max(time.time() - fetched_at, 0.0), 1)
+    return queried
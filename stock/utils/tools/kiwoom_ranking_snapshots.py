@@ -0,0 +1,258 @@
+"""
+키움증권 순위 스냅샷 스케줄러
+- 서버 실행 중 백그라운드 태스크가 순위 API 5종(ka10023/ka10030/ka10032/ka10027/ka10029)을
+  시장별(전체/코스피/코스닥) 기본 조회 조건으로 주기적으로 갱신
+  - 장중에는 짧게, 장마감 후에는 길게 (kiwoom_cache.is_market_hours 기준)
+  - 백그라운드 우선순위로 요청해 사용자 요청보다 레이트 리미터 순서가 뒤로 밀림
+- 연속조회 페이지를 모두 합친 전체 리스트를 요청(api-id + 바디)별 버전이 붙은 스냅샷으로 메모리에 보관
+- 순위 도구는 같은 조건의 요청이면 키움 호출 없이 최신 스냅샷으로 답하고
+  (kiwoom_ranking_query.fetch_ranking), 스냅샷이 오래되었으면 직접 호출
+- 사용자 수와 관계없이 순위 API 호출량이 갱신 주기로 고정됨
+"""
+
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+import asyncio
+import os
+import threading
+import time
+import traceback
+
+from . import kiwoom_client
+from .kiwoom_cache import is_market_hours, make_key
+from .kiwoom_paginator import afetch_all
+from .kiwoom_rate_limiter import PRIORITY_BACKGROUND, request_priority
+
+# 스냅샷 스케줄러 설정
+KIWOOM_SNAPSHOT_ENABLED = (
+    os.getenv("KIWOOM_SNAPSHOT_ENABLED", "false").lower() == "true"
+)
+# 갱신 주기 (초): 장중 / 장마감 후
+KIWOOM_SNAPSHOT_INTERVAL_SECONDS = float(
+    os.getenv("KIWOOM_SNAPSHOT_INTERVAL_SECONDS", "10")
+)
+KIWOOM_SNAPSHOT_OFF_HOURS_INTERVAL_SECONDS = float(
+    os.getenv("KIWOOM_SNAPSHOT_OFF_HOURS_INTERVAL_SECONDS", "600")
+)
+
+# 갱신 주기의 몇 배까지 지난 스냅샷을 쓸지 (갱신이 실패해도 잠시는 스냅샷으로 응답)
+_STALE_FACTOR = 3
+
+# 스냅샷 대상 시장 (mrkt_tp)
+SNAPSHOT_MARKETS: Dict[str, str] = {"000": "all", "001": "kospi", "101": "kosdaq"}
+
+# api-id별 순위 리스트 키
+RANKING_LIST_KEYS: Dict[str, str] = {
+    "ka10023": "trde_qty_sdnin",  # 거래량급증
+    "ka10030": "trde_qty_upper",  # 당일거래량상위
+    "ka10032": "trde_prica_upper",  # 거래대금상위
+    "ka10027": "pred_pre_flu_rt_upper",  # 전일대비등락률상위
+    "ka10029": "exp_cntr_flu_rt_upper",  # 예상체결등락률상위
+}
+
+# api-id별 기본 조회 조건 (mrkt_tp 제외). 이 조건으로 호출한 순위 도구만 스냅샷으로 답함
+SNAPSHOT_PAYLOADS: Dict[str, Dict[str, str]] = {
+    # 거래량급증: 급증량, 전일 대비, 5천주 이상, 전체 종목/가격, 통합
+    "ka10023": {
+        "sort_tp": "1",
+        "tm_tp": "2",
+        "trde_qty_tp": "5",
+        "stk_cnd": "0",
+        "pric_tp": "0",
+        "stex_tp": "3",
+    },
+    # 당일거래량상위: 거래량순, 조건 없음, 통합
+    "ka10030": {
+        "sort_tp": "1",
+        "mang_stk_incls": "0",
+        "crd_tp": "0",
+        "trde_qty_tp": "0",
+        "pric_tp": "0",
+        "trde_prica_tp": "0",
+        "mrkt_open_tp": "0",
+        "stex_tp": "3",
+    },
+    # 거래대금상위: 관리종목 포함, 통합
+    "ka10032": {"mang_stk_incls": "1", "stex_tp": "3"},
+    # 전일대비등락률상위: 상승률, 조건 없음, 상하한 포함, 통합
+    "ka10027": {
+        "sort_tp": "1",
+        "trde_qty_cnd": "0000",
+        "stk_cnd": "0",
+        "crd_cnd": "0",
+        "updown_incls": "1",
+        "pric_cnd": "0",
+        "trde_prica_cnd": "0",
+        "stex_tp": "3",
+    },
+    # 예상체결등락률상위: 상승률, 조건 없음, 통합
+    "ka10029": {
+        "sort_tp": "1",
+        "trde_qty_cnd": "0",
+        "stk_cnd": "0",
+        "crd_cnd": "0",
+        "pric_cnd": "0",
+        "stex_tp": "3",
+    },
+}
+
+_RANKING_PATH = "/api/dostk/rkinfo"
+
+
+class Snapshot(NamedTuple):
+    """순위 스냅샷: 버전 (갱신마다 1씩 증가), 수집 시각 (epoch 초), 응답 데이터"""
+
+    version: int
+    fetched_at: float
+    result: Dict[str, Any]
+
+
+class SnapshotStore:
+    """요청별 최신 순위 스냅샷 보관소."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshots: Dict[str, Snapshot] = {}
+        self._labels: Dict[str, str] = {}
+        self._stats = {"hits": 0, "misses": 0, "refreshes": 0, "failures": 0}
+
+    def get(self, key: str, max_age: float) -> Optional[Snapshot]:
+        """max_age초 이내에 갱신된 스냅샷을 반환합니다."""
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+            if snapshot is None or time.time() - snapshot.fetched_at > max_age:
+                self._stats["misses"] += 1
+                return None
+            self._stats["hits"] += 1
+            return snapshot
+
+    def put(self, key: str, result: Dict[str, Any], label: str) -> Snapshot:
+        with self._lock:
+            previous = self._snapshots.get(key)
+            version = previous.version + 1 if previous else 1
+            snapshot = Snapshot(
+                version, time.time(), {**result, "snapshot_version": version}
+            )
+            self._snapshots[key] = snapshot
+            self._labels[key] = label
+            self._stats["refreshes"] += 1
+            return snapshot
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._stats["failures"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """스냅샷별 버전/경과 시간과 hit/miss 카운터를 반환합니다."""
+        now = time.time()
+        with self._lock:
+            return {
+                **self._stats,
+                "snapshots": {
+                    self._labels[key]: {
+                        "version": snapshot.version,
+                        "age_seconds": round(now - snapshot.fetched_at, 1),
+                    }
+                    for key, snapshot in self._snapshots.items()
+                },
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._snapshots.clear()
+            self._labels.clear()
+            self._stats = {"hits": 0, "misses": 0, "refreshes": 0, "failures": 0}
+
+
+# 프로세스 전역 스냅샷 보관소
+snapshot_store = SnapshotStore()
+
+
+def snapshot_interval() -> float:
+    """현재 시점의 갱신 주기 (초)"""
+    if is_market_hours():
+        return KIWOOM_SNAPSHOT_INTERVAL_SECONDS
+    return KIWOOM_SNAPSHOT_OFF_HOURS_INTERVAL_SECONDS
+
+
+def get_snapshot(
+    headers: Dict[str, str], payload: Dict[str, Any]
+) -> Optional[Snapshot]:
+    """
+    요청과 같은 조건의 최신 스냅샷을 반환합니다.
+    스케줄러가 꺼져 있거나, 연속조회 요청이거나, 스냅샷이 오래되었으면 None.
+    """
+    if not KIWOOM_SNAPSHOT_ENABLED:
+        return None
+    # 연속조회 페이지는 스냅샷(첫 페이지)과 내용이 다름
+    if headers.get("cont-yn") or headers.get("next-key"):
+        return None
+    return snapshot_store.get(
+        make_key(headers, payload), snapshot_interval() * _STALE_FACTOR
+    )
+
+
+def _snapshot_request(
+    api_id: str, mrkt_tp: str
+) -> Tuple[Dict[str, str], Dict[str, Any]]:
+    headers = {"api-id": api_id, "Content-Type": "application/json;charset=UTF-8"}
+    payload = {"mrkt_tp": mrkt_tp, **SNAPSHOT_PAYLOADS[api_id]}
+    return headers, payload
+
+
+async def _refresh_one(api_id: str, mrkt_tp: str) -> Snapshot:
+    headers, payload = _snapshot_request(api_id, mrkt_tp)
+    result = await afetch_all(
+        f"{kiwoom_client.BASE_URL}{_RANKING_PATH}",
+        headers,
+        payload,
+        RANKING_LIST_KEYS[api_id],
+    )
+    if result.get("return_code") not in (0, "0", None):
+        raise ValueError(f"{api_id} {mrkt_tp}: {result.get('return_msg')}")
+    label = f"{api_id}:{SNAPSHOT_MARKETS[mrkt_tp]}"
+    return snapshot_store.put(make_key(headers, payload), result, label)
+
+
+async def refresh_snapshots() -> Dict[str, Any]:
+    """
+    모든 순위 스냅샷을 한 번 갱신합니다.
+
+    Returns:
+        Dict: 갱신/실패 건수, 실패 내역, 소요 시간
+    """
+    started = time.perf_counter()
+    targets = [
+        (api_id, mrkt_tp)
+        for api_id in SNAPSHOT_PAYLOADS
+        for mrkt_tp in SNAPSHOT_MARKETS
+    ]
+    with request_priority(PRIORITY_BACKGROUND):
+        results = await asyncio.gather(
+            *(_refresh_one(api_id, mrkt_tp) for api_id, mrkt_tp in targets),
+            return_exceptions=True,
+        )
+
+    errors = {}
+    for (api_id, mrkt_tp), result in zip(targets, results):
+        if isinstance(result, Exception):
+            snapshot_store.record_failure()
+            errors[f"{api_id}:{SNAPSHOT_MARKETS[mrkt_tp]}"] = str(result)
+    return {
+        "refreshed": len(targets) - len(errors),
+        "failed": len(errors),
+        "errors": errors,
+        "elapsed_seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+async def snapshot_loop() -> None:
+    """장 운영 시간에 맞춘 주기로 스냅샷을 갱신합니다. 서버 종료 시 태스크를 취소합니다."""
+    while True:
+        try:
+            stats = await refresh_snapshots()
+            if stats["failed"]:
+                print(f"Ranking snapshot errors: {stats['errors']}")
+        except Exception as e:
+            print(f"Ranking snapshot error: {str(e)}")
+            print(traceback.format_exc())
+        await asyncio.sleep(snapshot_interval())
@@ -7,17 +7,15 @@
 """
 
 from google.adk.tools import FunctionTool
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import requests
-import os
 
-# 모의투자 기본값
-KIWOOM_IS_MOCK = os.getenv("KIWOOM_IS_MOCK", "true").lower() == "true"
-
-# 도메인 설정
-BASE_URL = "https://mockapi.kiwoom.com" if KIWOOM_IS_MOCK else "https://api.kiwoom.com"
+from .kiwoom_client import BASE_URL
+from .kiwoom_ranking_query import DEFAULT_TOP_N, fetch_ranking, query_ranking
+from .kiwoom_metrics import instrument_tool
 
 
+@instrument_tool
 def get_trading_volume_surge(
     mrkt_tp: str,
     sort_tp: str,
@@ -30,6 +28,12 @@ def get_trading_volume_surge(
     cont_yn: Optional[str] = None,
     next_key: Optional[str] = None,
     authorization: Optional[str] = None,
+    top_n: int = DEFAULT_TOP_N,
+    min_price: Optional[int] = None,
+    min_volume: Optional[int] = None,
+    min_amount: Optional[int] = None,
+    exclude_codes: Optional[List[str]] = None,
+    exclude_name_keywords: Optional[List[str]] = None,
 ) -> Dict[str, Any]:
     """
     키움증권 거래량급증요청 API (ka10023)
@@ -46,9 +50,16 @@ def get_trading_volume_surge(
         cont_yn: 연속조회여부 (선택사항)
         next_key: 연속조회키 (선택사항)
         authorization: 접근토큰
+        top_n: 반환할 상위 종목 수 (기본 10, 최대 100)
+        min_price: 최소 현재가 (원, 선택사항)
+        min_volume: 최소 거래량 (주, 선택사항)
+        min_amount: 최소 거래대금 (백만원, 선택사항)
+        exclude_codes: 제외할 종목코드 목록 (선택사항)
+        exclude_name_keywords: 종목명에 포함되면 제외할 키워드 목록 (예: ["스팩", "ETN"], 선택사항)
 
     Returns:
-        Dict: API 응답 데이터
+        Dict: 조건을 적용한 상위 top_n개 순위 데이터
+            (total_count: 필터 전 전체 건수, matched_count: 조건 통과 건수)
     """
     url = f"{BASE_URL}/api/dostk/rkinfo"
 
@@ -81,17 +92,20 @@ def get_trading_volume_surge(
         payload["tm"] = tm
 
     try:
-        response = requests.post(url, headers=headers, json=payload)
-        response.raise_for_status()
-        result = response.json()
-
-        # 상위 10개만 반환 (API는 limit을 지원하지 않으므로 클라이언트에서 제한)
-        if "trde_qty_sdnin" in result and isinstance(result["trde_qty_sdnin"], list):
-            result["trde_qty_sdnin"] = result["trde_qty_sdnin"][:10]
-            result["limited_to"] = 10
-            result["total_count"] = len(result["trde_qty_sdnin"])
-
-        return result
+        fetched_at, result = fetch_ranking(url, headers, payload)
+
+        # API는 limit/필터를 지원하지 않으므로 받은 전체 리스트에서 조건 적용
+        return query_ranking(
+            result,
+            "trde_qty_sdnin",
+            top_n=top_n,
+            min_price=min_price,
+            min_volume=min_volume,
+            min_amount=min_amount,
+            exclude_codes=exclude_codes,
+            exclude_name_keywords=exclude_name_keywords,
+            fetched_at=fetched_at,
+        )
     except requests.exceptions.RequestException as e:
         return {
             "error": f"API 요청 실패: {str(e)}",
@@ -100,6 +114,7 @@ def get_trading_volume_surge(
         }
 
 
+@instrument_tool
 def get_daily_trading_volume_ranking(
     mrkt_tp: str,
     sort_tp: str,
@@ -113,6 +128,12 @@ def get_daily_trading_volume_ranking(
     cont_yn: Optional[str] = None,
     next_key: Optional[str] = None,
     authorization: Optional[str] = None,
+    top_n: int = DEFAULT_TOP_N,
+    min_price: Optional[int] = None,
+    min_volume: Optional[int] = None,
+    min_amount: Optional[int] = None,
+    exclude_codes: Optional[List[str]] = None,
+    exclude_name_keywords: Optional[List[str]] = None,
 ) -> Dict[str, Any]:
     """
     키움증권 당일거래량상위요청 API (ka10030)
@@ -130,9 +151,16 @@ def get_daily_trading_volume_ranking(
         cont_yn: 연속조회여부 (선택사항)
         next_key: 연속조회키 (선택사항)
         authorization: 접근토큰
+        top_n: 반환할 상위 종목 수 (기본 10, 최대 100)
+        min_price: 최소 현재가 (원, 선택사항)
+        min_volume: 최소 거래량 (주, 선택사항)
+        min_amount: 최소 거래대금 (백만원, 선택사항)
+        exclude_codes: 제외할 종목코드 목록 (선택사항)
+        exclude_name_keywords: 종목명에 포함되면 제외할 키워드 목록 (예: ["스팩", "ETN"], 선택사항)
 
     Returns:
-        Dict: API 응답 데이터
+        Dict: 조건을 적용한 상위 top_n개 순위 데이터
+            (total_count: 필터 전 전체 건수, matched_count: 조건 통과 건수)
     """
     url = f"{BASE_URL}/api/dostk/rkinfo"
 
@@ -160,17 +188,20 @@ def get_daily_trading_volume_ranking(
     }
 
     try:
-        response = requests.post(url, headers=headers, json=payload)
-        response.raise_for_status()
-        result = response.json()
-
-        # 상위 10개만 반환 (API는 limit을 지원하지 않으므로 클라이언트에서 제한)
-        if "trde_qty_upper" in result and isinstance(result["trde_qty_upper"], list):
-            result["trde_qty_upper"] = result["trde_qty_upper"][:10]
-            result["limited_to"] = 10
-            result["total_count"] = len(result["trde_qty_upper"])
-
-        return result
+        fetched_at, result = fetch_ranking(url, headers, payload)
+
+        # API는 limit/필터를 지원하지 않으므로 받은 전체 리스트에서 조건 적용
+        return query_ranking(
+            result,
+            "trde_qty_upper",
+            top_n=top_n,
+            min_price=min_price,
+            min_volume=min_volume,
+            min_amount=min_amount,
+            exclude_codes=exclude_codes,
+            exclude_name_keywords=exclude_name_keywords,
+            fetched_at=fetched_at,
+        )
     except requests.exceptions.RequestException as e:
         return {
             "error": f"API 요청 실패: {str(e)}",
@@ -179,6 +210,7 @@ def get_daily_trading_volume_ranking(
         }
 
 
+@instrument_tool
 def get_trading_amount_ranking(
     mrkt_tp: str,
     mang_stk_incls: str,
@@ -186,6 +218,12 @@ def get_trading_amount_ranking(
     cont_yn: Optional[str] = None,
     next_key: Optional[str] = None,
     authorization: Optional[str] = None,
+    top_n: int = DEFAULT_TOP_N,
+    min_price: Optional[int] = None,
+    min_volume: Optional[int] = None,
+    min_amount: Optional[int] = None,
+    exclude_codes: Optional[List[str]] = None,
+    exclude_name_keywords: Optional[List[str]] = None,
 ) -> Dict[str, Any]:
     """
     키움증권 거래대금상위요청 API (ka10032)
@@ -197,9 +235,16 @@ def get_trading_amount_ranking(
         cont_yn: 연속조회여부 (선택사항)
         next_key: 연속조회키 (선택사항)
         authorization: 접근토큰
+        top_n: 반환할 상위 종목 수 (기본 10, 최대 100)
+        min_price: 최소 현재가 (원, 선택사항)
+        min_volume: 최소 거래량 (주, 선택사항)
+        min_amount: 최소 거래대금 (백만원, 선택사항)
+        exclude_codes: 제외할 종목코드 목록 (선택사항)
+        exclude_name_keywords: 종목명에 포함되면 제외할 키워드 목록 (예: ["스팩", "ETN"], 선택사항)
 
     Returns:
-        Dict: API 응답 데이터
+        Dict: 조건을 적용한 상위 top_n개 순위 데이터
+            (total_count: 필터 전 전체 건수, matched_count: 조건 통과 건수)
     """
     url = f"{BASE_URL}/api/dostk/rkinfo"
 
@@ -221,19 +266,20 @@ def get_trading_amount_ranking(
     }
 
     try:
-        response = requests.post(url, headers=headers, json=payload)
-        response.raise_for_status()
-        result = response.json()
-
-        # 상위 10개만 반환 (API는 limit을 지원하지 않으므로 클라이언트에서 제한)
-        if "trde_prica_upper" in result and isinstance(
-            result["trde_prica_upper"], list
-        ):
-            result["trde_prica_upper"] = result["trde_prica_upper"][:10]
-            result["limited_to"] = 10
-            result["total_count"] = len(result["trde_prica_upper"])
-
-        return result
+        fetched_at, result = fetch_ranking(url, headers, payload)
+
+        # API는 limit/필터를 지원하지 않으므로 받은 전체 리스트에서 조건 적용
+        return query_ranking(
+            result,
+            "trde_prica_upper",
+            top_n=top_n,
+            min_price=min_price,
+            min_volume=min_volume,
+            min_amount=min_amount,
+            exclude_codes=exclude_codes,
+            exclude_name_keywords=exclude_name_keywords,
+            fetched_at=fetched_at,
+        )
     except requests.exceptions.RequestException as e:
         return {
             "error": f"API 요청 실패: {str(e)}",
@@ -242,6 +288,7 @@ def get_trading_amount_ranking(
         }
 
 
+@instrument_tool
 def get_daily_price_change_ranking(
     mrkt_tp: str,
     sort_tp: str,
@@ -255,6 +302,12 @@ def get_daily_price_change_ranking(
     cont_yn: Optional[str] = None,
     next_key: Optional[str] = None,
     authorization: Optional[str] = None,
+    top_n: int = DEFAULT_TOP_N,
+    min_price: Optional[int] = None,
+    min_volume: Optional[int] = None,
+    min_amount: Optional[int] = None,
+    exclude_codes: Optional[List[str]] = None,
+    exclude_name_keywords: Optional[List[str]] = None,
 ) -> Dict[str, Any]:
     """
     키움증권 전일대비등락률상위요청 API (ka10027)
@@ -272,8 +325,15 @@ def get_daily_price_change_ranking(
         cont_yn: 연속조회여부 (선택사항)
         next_key: 연속조회키 (선택사항)
         authorization: 접근토큰
+        top_n: 반환할 상위 종목 수 (기본 10, 최대 100)
+        min_price: 최소 현재가 (원, 선택사항)
+        min_volume: 최소 거래량 (주, 선택사항)
+        min_amount: 최소 거래대금 (백만원, 선택사항)
+        exclude_codes: 제외할 종목코드 목록 (선택사항)
+        exclude_name_keywords: 종목명에 포함되면 제외할 키워드 목록 (예: ["스팩", "ETN"], 선택사항)
     Returns:
-        Dict: API 응답 데이터
+        Dict: 조건을 적용한 상위 top_n개 순위 데이터
+            (total_count: 필터 전 전체 건수, matched_count: 조건 통과 건수)
     """
     url = f"{BASE_URL}/api/dostk/rkinfo"
 
@@ -301,19 +361,20 @@ def get_daily_price_change_ranking(
     }
 
     try:
-        response = requests.post(url, headers=headers, json=payload)
-        response.raise_for_status()
-        result = response.json()
-
-        # 상위 10개만 반환 (API는 limit을 지원하지 않으므로 클라이언트에서 제한)
-        if "pred_pre_flu_rt_upper" in result and isinstance(
-            result["pred_pre_flu_rt_upper"], list
-        ):
-            result["pred_pre_flu_rt_upper"] = result["pred_pre_flu_rt_upper"][:10]
-            result["limited_to"] = 10
-            result["total_count"] = len(result["pred_pre_flu_rt_upper"])
-
-        return result
+        fetched_at, result = fetch_ranking(url, headers, payload)
+
+        # API는 limit/필터를 지원하지 않으므로 받은 전체 리스트에서 조건 적용
+        return query_ranking(
+            result,
+            "pred_pre_flu_rt_upper",
+            top_n=top_n,
+            min_price=min_price,
+            min_volume=min_volume,
+            min_amount=min_amount,
+            exclude_codes=exclude_codes,
+            exclude_name_keywords=exclude_name_keywords,
+            fetched_at=fetched_at,
+        )
     except requests.exceptions.RequestException as e:
         return {
             "error": f"API 요청 실패: {str(e)}",
@@ -322,6 +383,7 @@ def get_daily_price_change_ranking(
         }
 
 
+@instrument_tool
 def get_expected_price_change_ranking(
     mrkt_tp: str,
     sort_tp: str,
@@ -333,6 +395,12 @@ def get_expected_price_change_ranking(
     cont_yn: Optional[str] = None,
     next_key: Optional[str] = None,
     authorization: Optional[str] = None,
+    top_n: int = DEFAULT_TOP_N,
+    min_price: Optional[int] = None,
+    min_volume: Optional[int] = None,
+    min_amount: Optional[int] = None,
+    exclude_codes: Optional[List[str]] = None,
+    exclude_name_keywords: Optional[List[str]] = None,
 ) -> Dict[str, Any]:
     """
     키움증권 예상체결등락률상위요청 API (ka10029)
@@ -348,9 +416,16 @@ def get_expected_price_change_ranking(
         cont_yn: 연속조회여부 (선택사항)
         next_key: 연속조회키 (선택사항)
         authorization: 접근토큰 (선택사항)
+        top_n: 반환할 상위 종목 수 (기본 10, 최대 100)
+        min_price: 최소 현재가 (원, 선택사항)
+        min_volume: 최소 거래량 (주, 선택사항)
+        min_amount: 최소 거래대금 (백만원, 선택사항)
+        exclude_codes: 제외할 종목코드 목록 (선택사항)
+        exclude_name_keywords: 종목명에 포함되면 제외할 키워드 목록 (예: ["스팩", "ETN"], 선택사항)
 
     Returns:
-        Dict: API 응답 데이터
+        Dict: 조건을 적용한 상위 top_n개 순위 데이터
+            (total_count: 필터 전 전체 건수, matched_count: 조건 통과 건수)
     """
     url = f"{BASE_URL}/api/dostk/rkinfo"
 
@@ -376,19 +451,20 @@ def get_expected_price_change_ranking(
     }
 
     try:
-        response = requests.post(url, headers=headers, json=payload)
-        response.raise_for_status()
-        result = response.json()
-
-        # 상위 10개만 반환 (API는 limit을 지원하지 않으므로 클라이언트에서 제한)
-        if "exp_cntr_flu_rt_upper" in result and isinstance(
-            result["exp_cntr_flu_rt_upper"], list
-        ):
-            result["exp_cntr_flu_rt_upper"] = result["exp_cntr_flu_rt_upper"][:10]
-            result["limited_to"] = 10
-            result["total_count"] = len(result["exp_cntr_flu_rt_upper"])
-
-        return result
+        fetched_at, result = fetch_ranking(url, headers, payload)
+
+        # API는 limit/필터를 지원하지 않으므로 받은 전체 리스트에서 조건 적용
+        return query_ranking(
+            result,
+            "exp_cntr_flu_rt_upper",
+            top_n=top_n,
+            min_price=min_price,
+            min_volume=min_volume,
+            min_amount=min_amount,
+            exclude_codes=exclude_codes,
+            exclude_name_keywords=exclude_name_keywords,
+            fetched_at=fetched_at,
+        )
     except requests.exceptions.RequestException as e:
         return {
             "error": f"API 요청 실패: {str(e)}",
@@ -0,0 +1,302 @@
+"""
+키움증권 API 클라이언트 측 요청 제한 (rate limiter)
+- 엔드포인트 그룹별 토큰 버킷 (chart, rkinfo, frgnistt, stkinfo, acnt 등) + 전체 버킷
+- 우선순위 대기열: 사용자 대화(INTERACTIVE) 요청이 백그라운드 프리페치(BACKGROUND)보다 먼저 처리
+  - 다른 그룹의 높은 우선순위 요청에는 그 요청이 전체 버킷만 기다리는 경우에만 양보
+    (자기 그룹 버킷이 비어 대기 중인 요청 때문에 다른 그룹이 멈추지 않음)
+- 429/5xx/네트워크 오류 시 지수 백오프 + 지터 재시도 간격 계산
+- 대기열 길이, 대기 시간, 재시도 횟수 통계 (get_stats, /metrics의 kiwoom_rate_limit_* 지표)
+"""
+
+from typing import Dict, Any, List, Optional, Tuple
+from contextlib import contextmanager
+from contextvars import ContextVar
+from urllib.parse import urlparse
+import asyncio
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+
+from stock.utils.metrics import registry
+
+# 우선순위 (값이 작을수록 먼저 처리)
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+# 초당 요청 수 설정
+KIWOOM_RATE_LIMIT = float(os.getenv("KIWOOM_RATE_LIMIT", "20"))  # 전체
+KIWOOM_GROUP_RATE_LIMIT = float(
+    os.getenv("KIWOOM_GROUP_RATE_LIMIT", "5")
+)  # 그룹 기본값
+# 그룹별 개별 설정 (예: "chart=3,rkinfo=5,acnt=2")
+KIWOOM_GROUP_RATE_LIMITS = os.getenv("KIWOOM_GROUP_RATE_LIMITS", "")
+
+# 재시도 설정
+KIWOOM_MAX_RETRIES = int(os.getenv("KIWOOM_MAX_RETRIES", "3"))
+KIWOOM_BACKOFF_BASE = float(os.getenv("KIWOOM_BACKOFF_BASE", "0.2"))
+KIWOOM_BACKOFF_MAX = float(os.getenv("KIWOOM_BACKOFF_MAX", "5"))
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# 대기 중 버킷 상태를 다시 확인하는 최대 간격 (초)
+_POLL_INTERVAL = 0.05
+
+QUEUE_DEPTH = registry.gauge(
+    "kiwoom_rate_limit_queue_depth", "요청 제한 대기열 길이", ["group"]
+)
+WAIT_SECONDS = registry.histogram(
+    "kiwoom_rate_limit_wait_seconds", "요청 제한 대기 시간", ["group"]
+)
+RETRIES = registry.counter(
+    "kiwoom_rate_limit_retries_total",
+    "재시도 횟수 (throttled: 429 응답 여부)",
+    ["group", "throttled"],
+)
+
+_request_priority: ContextVar[int] = ContextVar(
+    "kiwoom_request_priority", default=PRIORITY_INTERACTIVE
+)
+
+
+@contextmanager
+def request_priority(priority: int):
+    """
+    블록 안에서 발생하는 키움 요청의 우선순위를 지정합니다.
+
+    사용 예:
+        with request_priority(PRIORITY_BACKGROUND):
+            prefetch_rankings()
+    """
+    token = _request_priority.set(priority)
+    try:
+        yield
+    finally:
+        _request_priority.reset(token)
+
+
+def endpoint_group(url: str) -> str:
+    """URL 경로의 마지막 구간을 엔드포인트 그룹으로 사용합니다 (/api/dostk/chart → chart)."""
+    return urlparse(url).path.rstrip("/").rsplit("/", 1)[-1] or "default"
+
+
+def backoff_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    """
+    재시도 대기 시간을 계산합니다 (full jitter 지수 백오프).
+
+    Args:
+        attempt: 0부터 시작하는 재시도 횟수
+        retry_after: 서버가 보낸 Retry-After 헤더 (초)
+
+    Returns:
+        대기 시간 (초)
+    """
+    if retry_after:
+        try:
+            return min(float(retry_after), KIWOOM_BACKOFF_MAX)
+        except ValueError:
+            pass
+    cap = min(KIWOOM_BACKOFF_MAX, KIWOOM_BACKOFF_BASE * (2**attempt))
+    return random.uniform(0, cap)
+
+
+def _parse_group_rates(spec: str) -> Dict[str, float]:
+    rates = {}
+    for item in spec.split(","):
+        if "=" in item:
+            group, rate = item.split("=", 1)
+            rates[group.strip()] = float(rate)
+    return rates
+
+
+class TokenBucket:
+    """초당 rate개씩 채워지는 토큰 버킷."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def wait_time(self, now: float) -> float:
+        """토큰 1개를 쓰기까지 기다려야 하는 시간 (0이면 즉시 사용 가능)."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def consume(self) -> None:
+        self.tokens -= 1
+
+
+class RateLimiter:
+    """엔드포인트 그룹별 + 전체 토큰 버킷과 우선순위 대기열."""
+
+    def __init__(
+        self,
+        global_rate: float = KIWOOM_RATE_LIMIT,
+        group_rate: float = KIWOOM_GROUP_RATE_LIMIT,
+        group_rates: Optional[Dict[str, float]] = None,
+    ):
+        self.group_rate = group_rate
+        self.group_rates = (
+            group_rates
+            if group_rates is not None
+            else _parse_group_rates(KIWOOM_GROUP_RATE_LIMITS)
+        )
+        self._global = TokenBucket(global_rate)
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._waiting: List[Tuple[int, int, str]] = []  # (priority, seq, group) 힙
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def _bucket(self, group: str) -> TokenBucket:
+        if group not in self._buckets:
+            self._buckets[group] = TokenBucket(
+                self.group_rates.get(group, self.group_rate)
+            )
+        return self._buckets[group]
+
+    def _group_stats(self, group: str) -> Dict[str, float]:
+        if group not in self._stats:
+            self._stats[group] = {
+                "acquired": 0,
+                "waited": 0,
+                "wait_seconds": 0.0,
+                "max_wait_seconds": 0.0,
+                "retries": 0,
+                "throttled": 0,
+            }
+        return self._stats[group]
+
+    def _enqueue(self, group: str, priority: Optional[int]) -> Tuple[int, int, str]:
+        if priority is None:
+            priority = _request_priority.get()
+        ticket = (priority, next(self._seq), group)
+        with self._lock:
+            heapq.heappush(self._waiting, ticket)
+        QUEUE_DEPTH.inc(group)
+        return ticket
+
+    def _try_acquire(self, ticket: Tuple[int, int, str]) -> float:
+        """
+        대기열 순서가 되었고 버킷에 토큰이 있으면 토큰을 소비합니다.
+
+        Returns:
+            0이면 획득 성공, 아니면 다시 시도하기까지 기다릴 시간 (초)
+        """
+        priority, _, group = ticket
+        with self._lock:
+            now = time.monotonic()
+            # 같은 그룹에서 우선순위가 높거나 먼저 온 요청, 또는 전체 버킷만 기다리는
+            # 다른 그룹의 높은 우선순위 요청이 있으면 양보
+            for other in self._waiting:
+                if other == ticket or other[0] > priority:
+                    continue
+                if other[2] == group:
+                    if other < ticket:
+                        return _POLL_INTERVAL
+                elif other[0] < priority and self._bucket(other[2]).wait_time(now) == 0:
+                    return _POLL_INTERVAL
+
+            bucket = self._bucket(group)
+            wait = max(bucket.wait_time(now), self._global.wait_time(now))
+            if wait > 0:
+                return min(wait, _POLL_INTERVAL)
+
+            bucket.consume()
+            self._global.consume()
+            self._waiting.remove(ticket)
+            heapq.heapify(self._waiting)
+        QUEUE_DEPTH.dec(group)
+        return 0.0
+
+    def _cancel(self, ticket: Tuple[int, int, str]) -> None:
+        with self._lock:
+            if ticket not in self._waiting:
+                return
+            self._waiting.remove(ticket)
+            heapq.heapify(self._waiting)
+        QUEUE_DEPTH.dec(ticket[2])
+
+    def _record(self, group: str, waited: float) -> None:
+        with self._lock:
+            stats = self._group_stats(group)
+            stats["acquired"] += 1
+            if waited > 0.001:
+                stats["waited"] += 1
+                stats["wait_seconds"] += waited
+                stats["max_wait_seconds"] = max(stats["max_wait_seconds"], waited)
+        WAIT_SECONDS.observe(waited, group)
+
+    def record_retry(self, group: str, throttled: bool) -> None:
+        """재시도 (throttled=True면 429 응답) 횟수를 기록합니다."""
+        with self._lock:
+            stats = self._group_stats(group)
+            stats["retries"] += 1
+            if throttled:
+                stats["throttled"] += 1
+        RETRIES.inc(group, str(throttled).lower())
+
+    def acquire(self, group: str, priority: Optional[int] = None) -> float:
+        """
+        요청 토큰을 얻을 때까지 현재 스레드를 대기시킵니다.
+
+        Args:
+            group: 엔드포인트 그룹
+            priority: 우선순위 (None이면 request_priority 컨텍스트 값)
+
+        Returns:
+            대기한 시간 (초)
+        """
+        ticket = self._enqueue(group, priority)
+        started = time.monotonic()
+        try:
+            while (wait := self._try_acquire(ticket)) > 0:
+                time.sleep(wait)
+        except BaseException:
+            self._cancel(ticket)
+            raise
+        waited = time.monotonic() - started
+        self._record(group, waited)
+        return waited
+
+    async def aacquire(self, group: str, priority: Optional[int] = None) -> float:
+        """acquire의 비동기 버전. 대기 중에도 이벤트 루프를 블로킹하지 않습니다."""
+        ticket = self._enqueue(group, priority)
+        started = time.monotonic()
+        try:
+            while (wait := self._try_acquire(ticket)) > 0:
+                await asyncio.sleep(wait)
+        except BaseException:
+            self._cancel(ticket)
+            raise
+        waited = time.monotonic() - started
+        self._record(group, waited)
+        return waited
+
+    def get_stats(self) -> Dict[str, Any]:
+        """그룹별 대기열 길이, 대기 시간, 재시도 통계를 반환합니다."""
+        with self._lock:
+            queue_depth: Dict[str, int] = {}
+            for _, _, group in self._waiting:
+                queue_depth[group] = queue_depth.get(group, 0) + 1
+            groups = {}
+            for group, stats in self._stats.items():
+                groups[group] = {
+                    **stats,
+                    "queue_depth": queue_depth.get(group, 0),
+                    "avg_wait_seconds": (
+                        stats["wait_seconds"] / stats["acquired"]
+                        if stats["acquired"]
+                        else 0.0
+                    ),
+                }
+            return {"queue_depth": len(self._waiting), "groups": groups}
+
+
+# 프로세스 전역 rate limiter
+rate_limiter = RateLimiter()
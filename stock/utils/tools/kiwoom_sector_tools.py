@@ -15,15 +15,14 @@
 from google.adk.tools import FunctionTool
 from typing import Dict, Any, Optional
 import requests
-import os
 
-# 모의투자 기본값
-KIWOOM_IS_MOCK = os.getenv("KIWOOM_IS_MOCK", "true").lower() == "true"
-
-# 도메인 설정
-BASE_URL = "https://mockapi.kiwoom.com" if KIWOOM_IS_MOCK else "https://api.kiwoom.com"
+from . import kiwoom_client, kiwoom_paginator
+from .kiwoom_client import BASE_URL
+from .kiwoom_paginator import with_paging
+from .kiwoom_metrics import instrument_tool
 
 
+@instrument_tool
 def get_sector_code_list(
     mrkt_tp: str,
     cont_yn: Optional[str] = None,
@@ -60,9 +59,9 @@ def get_sector_code_list(
     }
 
     try:
-        response = requests.post(url, headers=headers, json=payload)
+        response = kiwoom_client.post(url, headers=headers, json=payload)
         response.raise_for_status()
-        return response.json()
+        return with_paging(response.json(), response.headers)
     except requests.exceptions.RequestException as e:
         return {
             "error": f"API 요청 실패: {str(e)}",
@@ -71,6 +70,7 @@ def get_sector_code_list(
         }
 
 
+@instrument_tool
 def get_sector_current_price(
     mrkt_tp: str,
     inds_cd: str,
@@ -110,9 +110,9 @@ def get_sector_current_price(
     }
 
     try:
-        response = requests.post(url, headers=headers, json=payload)
+        response = kiwoom_client.post(url, headers=headers, json=payload)
         response.raise_for_status()
-        return response.json()
+        return with_paging(response.json(), response.headers)
     except requests.exceptions.RequestException as e:
         return {
             "error": f"API 요청 실패: {str(e)}",
@@ -121,6 +121,7 @@ def get_sector_current_price(
         }
 
 
+@instrument_tool
 def get_sector_stock_prices(
     mrkt_tp: str,
     inds_cd: str,
@@ -128,6 +129,7 @@ def get_sector_stock_prices(
     cont_yn: Optional[str] = None,
     next_key: Optional[str] = None,
     authorization: Optional[str] = None,
+    fetch_all: bool = False,
 ) -> Dict[str, Any]:
     """
     키움증권 업종별주가요청 API (ka20002)
@@ -139,6 +141,7 @@ def get_sector_stock_prices(
         cont_yn: 연속조회여부 (선택사항)
         next_key: 연속조회키 (선택사항)
         authorization: 접근토큰 (선택사항)
+        fetch_all: True면 연속조회를 자동으로 따라가 전체 목록을 한 번에 반환 (선택사항)
 
     Returns:
         Dict: API 응답 데이터
@@ -163,9 +166,12 @@ def get_sector_stock_prices(
     }
 
     try:
-        response = requests.post(url, headers=headers, json=payload)
+        if fetch_all:
+            return kiwoom_paginator.fetch_all(url, headers, payload, "inds_stkpc")
+
+        response = kiwoom_client.post(url, headers=headers, json=payload)
         response.raise_for_status()
-        return response.json()
+        return with_paging(response.json(), response.headers)
     except requests.exceptions.RequestException as e:
         return {
             "error": f"API 요청 실패: {str(e)}",
@@ -174,6 +180,7 @@ def get_sector_stock_prices(
         }
 
 
+@instrument_tool
 def get_all_sector_index(
     inds_cd: str,
     cont_yn: Optional[str] = None,
@@ -210,9 +217,9 @@ def get_all_sector_index(
     }
 
     try:
-        response = requests.post(url, headers=headers, json=payload)
+        response = kiwoom_client.post(url, headers=headers, json=payload)
         response.raise_for_status()
-        return response.json()
+        return with_paging(response.json(), response.headers)
     except requests.exceptions.RequestException as e:
         return {
             "error": f"API 요청 실패: {str(e)}",
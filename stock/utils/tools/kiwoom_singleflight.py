@@ -0,0 +1,147 @@
+"""
+동일한 키움증권 요청의 동시 호출 병합 (single-flight)
+- 같은 (api-id, 요청 바디, cont-yn, next-key) 요청이 동시에 들어오면 업스트림 호출은 한 번만 수행
+- 먼저 들어온 요청이 호출하고 나머지는 그 결과(또는 예외)를 그대로 공유
+- 동기(스레드) / 비동기(asyncio) 버전 제공
+- 비동기 버전은 기다리는 요청 수를 세어, 마지막 요청까지 취소되면 업스트림 호출도 취소
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+import asyncio
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class _Stats:
+    """api-id별 업스트림 호출 수와 병합된 호출 수."""
+
+    def __init__(self):
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def count(self, api_id: Optional[str], field: str) -> None:
+        with self._lock:
+            counts = self._counts.setdefault(
+                api_id or "", {"upstream": 0, "coalesced": 0}
+            )
+            counts[field] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {k: dict(v) for k, v in self._counts.items()}
+
+
+class SingleFlight:
+    """스레드 간 동일 요청 병합."""
+
+    def __init__(self, stats: Optional[_Stats] = None):
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self.stats = stats or _Stats()
+
+    def do(self, key: str, fn: Callable[[], Any], api_id: Optional[str] = None) -> Any:
+        """
+        key에 대해 진행 중인 호출이 있으면 그 결과를 기다리고, 없으면 fn을 실행합니다.
+
+        Args:
+            key: 요청 키
+            fn: 실제 업스트림 호출
+            api_id: 통계용 api-id
+
+        Returns:
+            fn의 반환값 (병합된 호출은 같은 객체를 공유)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            self.stats.count(api_id, "coalesced")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        self.stats.count(api_id, "upstream")
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+
+class _Flight:
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class AsyncSingleFlight:
+    """코루틴 간 동일 요청 병합."""
+
+    def __init__(self, stats: Optional[_Stats] = None):
+        self._flights: Dict[Tuple[int, str], _Flight] = {}
+        self.stats = stats or _Stats()
+
+    async def do(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+        api_id: Optional[str] = None,
+    ) -> Any:
+        """
+        SingleFlight.do의 비동기 버전.
+        업스트림 호출은 별도 태스크로 실행하므로 기다리던 요청 하나가 취소되어도
+        같은 결과를 기다리는 다른 요청에는 영향이 없습니다.
+        기다리던 요청이 모두 취소되면 업스트림 호출 태스크도 취소합니다.
+        """
+        loop = asyncio.get_running_loop()
+        task_key = (id(loop), key)
+
+        flight = self._flights.get(task_key)
+        if flight is None:
+            self.stats.count(api_id, "upstream")
+            flight = _Flight(loop.create_task(fn()))
+            self._flights[task_key] = flight
+            flight.task.add_done_callback(lambda t: self._forget(task_key, flight))
+        else:
+            self.stats.count(api_id, "coalesced")
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # 결과를 기다리는 요청이 없으므로 호출 중단 (새 요청은 새로 호출)
+                self._forget(task_key, flight)
+                flight.task.cancel()
+
+    def _forget(self, task_key: Tuple[int, str], flight: _Flight) -> None:
+        if self._flights.get(task_key) is flight:
+            del self._flights[task_key]
+
+
+# 프로세스 전역 single-flight (동기/비동기가 통계를 공유)
+_stats = _Stats()
+singleflight = SingleFlight(_stats)
+async_singleflight = AsyncSingleFlight(_stats)
+
+
+def get_stats() -> Dict[str, Dict[str, int]]:
+    """api-id별 업스트림 호출 수와 병합된 호출 수를 반환합니다."""
+    return _stats.snapshot()
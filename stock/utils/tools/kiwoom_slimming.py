@@ -0,0 +1,601 @@
+"""
+키움 도구 응답 슬림화
+- api-id별 필드 스키마(유지/이름 변경/숫자 변환)를 선언하고, 에이전트의 after_tool_callback에서
+  모든 도구 결과에 일괄 적용해 모델에 전달되는 입력 토큰을 줄임
+  - 스키마에 없는 필드 제거
+  - "+61300", "-1.25" 같은 부호 붙은 숫자 문자열을 숫자로 변환
+    (가격 필드는 부호가 등락 표시이므로 절대값, 대비/등락률은 부호 유지)
+- 리스트 항목(또는 스냅샷 보유 종목처럼 단일 항목)에 스키마 필드가 하나도 없으면
+  (응답 형식 변경 등) 원본 항목을 그대로 유지
+- 도구별 슬림화 전/후 바이트와 절약한 토큰 추정치 기록 (slimming_stats.get_stats())
+"""
+
+from google.adk.tools import BaseTool, ToolContext
+from typing import Any, Dict, NamedTuple, Optional
+import json
+import threading
+
+from stock.utils.context_window import estimate_tokens
+
+
+class FieldRule(NamedTuple):
+    """필드 처리 규칙: rename이 있으면 이름 변경, convert가 있으면 숫자 변환 (number | price)"""
+
+    rename: Optional[str] = None
+    convert: Optional[str] = None
+
+
+KEEP = FieldRule()
+# 부호 유지 숫자 (전일대비, 등락률, 순매수 등)
+NUMBER = FieldRule(convert="number")
+# 가격 (부호는 등락 표시이므로 절대값)
+PRICE = FieldRule(convert="price")
+
+
+def rename(name: str, convert: Optional[str] = None) -> FieldRule:
+    return FieldRule(rename=name, convert=convert)
+
+
+# 항상 유지하는 최상위 필드 (응답 상태, 연속조회/페이지 정보, 순위 조회 조건)
+META_FIELDS = (
+    "success",
+    "error",
+    "return_code",
+    "return_msg",
+    "cont_yn",
+    "next_key",
+    "pages",
+    "total_count",
+    "truncated",
+    "limited_to",
+    "matched_count",
+    "filters",
+    "ignored_filters",
+    "fetched_at",
+    "age_seconds",
+    "snapshot_version",
+)
+
+# 최상위 필드 규칙 키 (나머지 키는 리스트/단일 항목 필드명 → 항목 필드 규칙)
+TOP_LEVEL = ""
+
+_PRICE_ROW = {
+    "stk_cd": KEEP,
+    "stk_nm": KEEP,
+    "cur_prc": PRICE,
+    "pred_pre": NUMBER,
+    "flu_rt": NUMBER,
+}
+
+# 외국인기관매매상위 (ka90009): 순매도/순매수 × 외국인/기관 열마다 종목코드/명/금액/수량
+_FOREIGN_INSTITUTION_RANK_ROW = {
+    f"{side}_{field}": KEEP if field in ("stk_cd", "stk_nm") else NUMBER
+    for side in ("for_netslmt", "for_netprps", "orgn_netslmt", "orgn_netprps")
+    for field in ("stk_cd", "stk_nm", "amt", "qty")
+}
+
+# 프로그램매매 항목 (_format_program_trading_status / _format_daily_program_trading_trend)
+_PROGRAM_TRADING_ROW = {
+    "current_price": PRICE,
+    "previous_contrast": NUMBER,
+    "buy_contract_quantity": NUMBER,
+    "buy_contract_amount": NUMBER,
+    "sell_contract_quantity": NUMBER,
+    "sell_contract_amount": NUMBER,
+    "net_buy_amount": NUMBER,
+    "total_trading_ratio": NUMBER,
+}
+
+# 계좌평가 보유 종목 (_format_account_evaluation 결과의 stocks 항목)
+_ACCOUNT_STOCK = {
+    "stock_code": KEEP,
+    "stock_name": KEEP,
+    "remaining_quantity": NUMBER,
+    "average_price": PRICE,
+    "current_price": PRICE,
+    "purchase_amount": NUMBER,
+    "evaluation_amount": NUMBER,
+    "profit_loss_amount": NUMBER,
+    "profit_loss_rate": NUMBER,
+    "today_buy_quantity": NUMBER,
+    "today_sell_quantity": NUMBER,
+}
+
+SLIM_SCHEMAS: Dict[str, Dict[str, Dict[str, FieldRule]]] = {
+    # 주식기본정보 (_format_stock_basic_info 결과)
+    "ka10001": {
+        TOP_LEVEL: {
+            "stock_code": KEEP,
+            "stock_name": KEEP,
+            "current_price": PRICE,
+            "previous_contrast": NUMBER,
+            "fluctuation_rate": NUMBER,
+            "trading_quantity": NUMBER,
+            "open_price": PRICE,
+            "high_price": PRICE,
+            "low_price": PRICE,
+            "market_cap": NUMBER,
+            "listed_shares": NUMBER,
+            "foreign_exhaustion_rate": NUMBER,
+            "credit_ratio": NUMBER,
+            "per": NUMBER,
+            "eps": NUMBER,
+            "roe": NUMBER,
+            "pbr": NUMBER,
+            "bps": NUMBER,
+            "sales_amount": NUMBER,
+            "business_profit": NUMBER,
+            "current_net_income": NUMBER,
+            "high_250": PRICE,
+            "low_250": PRICE,
+            "high_250_ratio": NUMBER,
+            "low_250_ratio": NUMBER,
+            "year_high": PRICE,
+            "year_low": PRICE,
+        },
+    },
+    # 업종코드 리스트
+    "ka10101": {"list": {"code": KEEP, "name": KEEP}},
+    # 업종현재가
+    "ka20001": {
+        TOP_LEVEL: {
+            "cur_prc": PRICE,
+            "pred_pre": NUMBER,
+            "flu_rt": NUMBER,
+            "trde_qty": NUMBER,
+            "trde_prica": NUMBER,
+            "open_pric": PRICE,
+            "high_pric": PRICE,
+            "low_pric": PRICE,
+            "rising": NUMBER,
+            "stdns": NUMBER,
+            "fall": NUMBER,
+        },
+        "inds_cur_prc_daly_rept": {
+            "dt_n": rename("dt"),
+            "cur_prc_n": rename("cur_prc", "price"),
+            "flu_rt_n": rename("flu_rt", "number"),
+            "acc_trde_qty_n": rename("trde_qty", "number"),
+        },
+    },
+    # 업종별주가
+    "ka20002": {
+        "inds_stkpc": {
+            **_PRICE_ROW,
+            "now_trde_qty": rename("trde_qty", "number"),
+            "open_pric": PRICE,
+            "high_pric": PRICE,
+            "low_pric": PRICE,
+        },
+    },
+    # 전업종지수
+    "ka20003": {
+        "all_inds_idex": {
+            "stk_cd": rename("inds_cd"),
+            "stk_nm": rename("inds_nm"),
+            "cur_prc": PRICE,
+            "pred_pre": NUMBER,
+            "flu_rt": NUMBER,
+            "trde_qty": NUMBER,
+            "trde_prica": NUMBER,
+            "wght": NUMBER,
+            "rising": NUMBER,
+            "fall": NUMBER,
+        },
+    },
+    # 거래량급증
+    "ka10023": {
+        "trde_qty_sdnin": {
+            **_PRICE_ROW,
+            "now_trde_qty": rename("trde_qty", "number"),
+            "sdnin_qty": NUMBER,
+            "sdnin_rt": NUMBER,
+        },
+    },
+    # 당일거래량상위
+    "ka10030": {
+        "trde_qty_upper": {
+            **_PRICE_ROW,
+            "trde_qty": NUMBER,
+            "pred_rt": NUMBER,
+            "trde_tern_rt": NUMBER,
+            "trde_amt": NUMBER,
+        },
+    },
+    # 거래대금상위
+    "ka10032": {
+        "trde_prica_upper": {
+            **_PRICE_ROW,
+            "now_rank": NUMBER,
+            "pred_rank": NUMBER,
+            "now_trde_qty": rename("trde_qty", "number"),
+            "trde_prica": NUMBER,
+        },
+    },
+    # 전일대비등락률상위
+    "ka10027": {
+        "pred_pre_flu_rt_upper": {
+            **_PRICE_ROW,
+            "now_trde_qty": rename("trde_qty", "number"),
+            "cntr_str": NUMBER,
+        },
+    },
+    # 예상체결등락률상위
+    "ka10029": {
+        "exp_cntr_flu_rt_upper": {
+            "stk_cd": KEEP,
+            "stk_nm": KEEP,
+            "exp_cntr_pric": PRICE,
+            "base_pric": PRICE,
+            "pred_pre": NUMBER,
+            "flu_rt": NUMBER,
+            "exp_cntr_qty": NUMBER,
+        },
+    },
+    # 종목별기관매매추이
+    "ka10045": {
+        "stk_orgn_trde_trnsn": {
+            "dt": KEEP,
+            "close_pric": PRICE,
+            "pred_pre": NUMBER,
+            "flu_rt": NUMBER,
+            "trde_qty": NUMBER,
+            "orgn_daly_nettrde_qty": NUMBER,
+            "orgn_dt_acc": NUMBER,
+            "for_daly_nettrde_qty": NUMBER,
+            "for_dt_acc": NUMBER,
+            "limit_exh_rt": NUMBER,
+        },
+    },
+    # 공매도추이
+    "ka10014": {
+        "shrts_trnsn": {
+            "dt": KEEP,
+            "close_pric": PRICE,
+            "pred_pre": NUMBER,
+            "flu_rt": NUMBER,
+            "trde_qty": NUMBER,
+            "shrts_qty": NUMBER,
+            "trde_wght": NUMBER,
+            "shrts_trde_prica": NUMBER,
+            "shrts_avg_pric": PRICE,
+        },
+    },
+    # 기관외국인연속매매현황
+    "ka10131": {
+        "orgn_frgnr_cont_trde_prst": {
+            "rank": NUMBER,
+            "stk_cd": KEEP,
+            "stk_nm": KEEP,
+            "prid_stkpc_flu_rt": NUMBER,
+            "orgn_nettrde_amt": NUMBER,
+            "orgn_nettrde_qty": NUMBER,
+            "orgn_cont_netprps_dys": NUMBER,
+            "frgnr_nettrde_amt": NUMBER,
+            "frgnr_nettrde_qty": NUMBER,
+            "frgnr_cont_netprps_dys": NUMBER,
+            "nettrde_amt": NUMBER,
+            "nettrde_qty": NUMBER,
+            "tot_cont_netprps_dys": NUMBER,
+        },
+    },
+    # 외국인기관매매상위
+    "ka90009": {"frgnr_orgn_trde_upper": _FOREIGN_INSTITUTION_RANK_ROW},
+    # 외인연속순매매상위
+    "ka10035": {
+        "for_cont_nettrde_upper": {
+            "stk_cd": KEEP,
+            "stk_nm": KEEP,
+            "cur_prc": PRICE,
+            "pred_pre": NUMBER,
+            "dm1": NUMBER,
+            "dm2": NUMBER,
+            "dm3": NUMBER,
+            "tot": NUMBER,
+            "limit_exh_rt": NUMBER,
+        },
+    },
+    # 일별기관매매종목
+    "ka10044": {
+        "daly_orgn_trde_stk": {
+            "stk_cd": KEEP,
+            "stk_nm": KEEP,
+            "netprps_qty": NUMBER,
+            "netprps_amt": NUMBER,
+        },
+    },
+    # 장중투자자별매매상위
+    "ka10065": {
+        "opmr_invsr_trde_upper": {
+            "rank": NUMBER,
+            "stk_cd": KEEP,
+            "stk_nm": KEEP,
+            "sel_qty": NUMBER,
+            "buy_qty": NUMBER,
+            "netslmt": NUMBER,
+        },
+    },
+    # 종목별프로그램매매현황 (_format_program_trading_status 결과)
+    "ka90004": {
+        TOP_LEVEL: {
+            "date": KEEP,
+            "market_type": KEEP,
+            "exchange_type": KEEP,
+            "total_buy_quantity": NUMBER,
+            "total_buy_amount": NUMBER,
+            "total_sell_quantity": NUMBER,
+            "total_sell_amount": NUMBER,
+            "total_net_buy_amount": NUMBER,
+        },
+        "stock_program_trading_list": {
+            "stock_code": KEEP,
+            "stock_name": KEEP,
+            **_PROGRAM_TRADING_ROW,
+        },
+    },
+    # 종목일별프로그램매매추이 (_format_daily_program_trading_trend 결과)
+    "ka90013": {
+        TOP_LEVEL: {"stock_code": KEEP, "start_date": KEEP, "end_date": KEEP},
+        "program_trading_list": {"date": KEEP, **_PROGRAM_TRADING_ROW},
+    },
+    # 계좌평가현황 (_format_account_evaluation 결과, 스냅샷 holding은 보유 종목 하나만 stock에)
+    "kt00004": {
+        TOP_LEVEL: {
+            "account_name": KEEP,
+            "is_holding": KEEP,
+            "deposit": NUMBER,
+            "d2_estimated_deposit": NUMBER,
+            "total_estimated_amount": NUMBER,
+            "asset_evaluation_amount": NUMBER,
+            "total_purchase_amount": NUMBER,
+            "estimated_deposit_asset": NUMBER,
+            "today_profit_loss": NUMBER,
+            "today_profit_loss_rate": NUMBER,
+            "monthly_profit_loss": NUMBER,
+            "monthly_profit_loss_rate": NUMBER,
+            "cumulative_profit_loss": NUMBER,
+            "cumulative_profit_loss_rate": NUMBER,
+        },
+        "stocks": _ACCOUNT_STOCK,
+        "stock": _ACCOUNT_STOCK,
+    },
+    # 일봉차트 원본 응답 (연속조회 지정 시, 저장소 경로의 컬럼 배열 bars는 그대로 유지)
+    "ka10081": {
+        "stk_dt_pole_chart_qry": {
+            "dt": KEEP,
+            "cur_prc": PRICE,
+            "open_pric": PRICE,
+            "high_pric": PRICE,
+            "low_pric": PRICE,
+            "pred_pre": NUMBER,
+            "trde_qty": NUMBER,
+            "trde_prica": NUMBER,
+            "trde_tern_rt": NUMBER,
+        },
+    },
+    # 분봉차트 원본 응답
+    "ka10080": {
+        "stk_min_pole_chart_qry": {
+            "cntr_tm": KEEP,
+            "cur_prc": PRICE,
+            "open_pric": PRICE,
+            "high_pric": PRICE,
+            "low_pric": PRICE,
+            "pred_pre": NUMBER,
+            "trde_qty": NUMBER,
+        },
+    },
+    # 테마그룹별
+    "ka90001": {
+        "thema_grp": {
+            "thema_grp_cd": KEEP,
+            "thema_nm": KEEP,
+            "stk_num": NUMBER,
+            "flu_rt": NUMBER,
+            "rising_stk_num": NUMBER,
+            "fall_stk_num": NUMBER,
+            "dt_prft_rt": NUMBER,
+            "main_stk": KEEP,
+        },
+    },
+    # 테마구성종목
+    "ka90002": {
+        TOP_LEVEL: {"flu_rt": NUMBER, "dt_prft_rt": NUMBER},
+        "thema_comp_stk": {
+            **_PRICE_ROW,
+            "acc_trde_qty": rename("trde_qty", "number"),
+            "dt_prft_rt_n": rename("dt_prft_rt", "number"),
+        },
+    },
+}
+
+# 도구 이름 → api-id
+TOOL_API_IDS: Dict[str, str] = {
+    "get_stock_basic_info": "ka10001",
+    "get_sector_code_list": "ka10101",
+    "get_sector_current_price": "ka20001",
+    "get_sector_stock_prices": "ka20002",
+    "get_all_sector_index": "ka20003",
+    "get_trading_volume_surge": "ka10023",
+    "get_daily_trading_volume_ranking": "ka10030",
+    "get_trading_amount_ranking": "ka10032",
+    "get_daily_price_change_ranking": "ka10027",
+    "get_expected_price_change_ranking": "ka10029",
+    "get_stock_institution_trading_trend": "ka10045",
+    "get_short_selling_trend": "ka10014",
+    "get_theme_group_info": "ka90001",
+    "get_theme_component_stocks": "ka90002",
+    "get_institution_foreign_continuous_trading_status": "ka10131",
+    "get_foreign_institution_trading_ranking": "ka90009",
+    "get_foreign_continuous_net_trading_ranking": "ka10035",
+    "get_daily_institution_trading_stocks": "ka10044",
+    "get_intraday_investor_trading_ranking": "ka10065",
+    "get_stock_program_trading_status": "ka90004",
+    "get_stock_daily_program_trading_trend": "ka90013",
+    "get_account_evaluation": "kt00004",
+    "get_stock_daily_chart": "ka10081",
+    "get_stock_minute_chart": "ka10080",
+}
+
+# 여러 API 결과를 합치는 도구: 도구 이름 → {결과 키: api-id}
+COMPOSITE_TOOL_API_IDS: Dict[str, Dict[str, str]] = {
+    "get_stock_snapshot": {
+        "basic_info": "ka10001",
+        "daily_chart": "ka10081",
+        "institution_trend": "ka10045",
+        "program_trading_trend": "ka90013",
+        "short_selling_trend": "ka10014",
+        "sector": "ka20001",
+        "holding": "kt00004",
+    },
+}
+
+
+def to_number(value: Any, absolute: bool = False) -> Any:
+    """
+    부호 붙은 숫자 문자열을 숫자로 변환합니다 ("+61300" → 61300, "-1.25" → -1.25).
+    숫자가 아니면 원래 값을 반환합니다.
+    """
+    if not isinstance(value, str):
+        return value
+    text = value.strip().replace(",", "")
+    if not text:
+        return value
+    try:
+        number = float(text)
+    except ValueError:
+        return value
+    if absolute:
+        number = abs(number)
+    return int(number) if number.is_integer() and "." not in text else number
+
+
+def _apply_rules(
+    data: Dict[str, Any], rules: Dict[str, FieldRule]
+) -> Optional[Dict[str, Any]]:
+    """규칙에 있는 필드만 남깁니다. 일치하는 필드가 없으면 None"""
+    slim = {}
+    for field, rule in rules.items():
+        if field not in data:
+            continue
+        value = data[field]
+        if rule.convert:
+            value = to_number(value, absolute=rule.convert == "price")
+        slim[rule.rename or field] = value
+    return slim or None
+
+
+def slim_response(api_id: str, response: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    api-id 스키마에 맞게 응답을 줄입니다. 스키마가 없거나 오류 응답이면 그대로 반환합니다.
+
+    Args:
+        api_id: 키움 API ID (예: ka20002)
+        response: 도구 결과
+
+    Returns:
+        Dict: 슬림화된 결과
+    """
+    schema = SLIM_SCHEMAS.get(api_id)
+    if not schema or not isinstance(response, dict) or "error" in response:
+        return response
+
+    top_rules = schema.get(TOP_LEVEL)
+    if top_rules is None:
+        # 최상위 규칙이 없으면 리스트 외 필드는 유지
+        slim = {k: v for k, v in response.items() if k not in schema}
+    else:
+        slim = {k: response[k] for k in META_FIELDS if k in response}
+        slim.update(_apply_rules(response, top_rules) or {})
+
+    for key, rules in schema.items():
+        if key == TOP_LEVEL or key not in response:
+            continue
+        value = response[key]
+        if isinstance(value, list):
+            slim[key] = [
+                (_apply_rules(row, rules) or row) if isinstance(row, dict) else row
+                for row in value
+            ]
+        elif isinstance(value, dict):
+            slim[key] = _apply_rules(value, rules) or value
+        else:
+            # 보유 종목이 없을 때의 stock=None 등은 그대로 유지
+            slim[key] = value
+    return slim
+
+
+def _json_bytes(value: Any) -> int:
+    return len(json.dumps(value, ensure_ascii=False, default=str).encode())
+
+
+class SlimmingStats:
+    """도구별 슬림화 전/후 응답 크기 통계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def record(self, tool_name: str, before: Any, after: Any) -> None:
+        bytes_before, bytes_after = _json_bytes(before), _json_bytes(after)
+        tokens_saved = estimate_tokens(before) - estimate_tokens(after)
+        with self._lock:
+            stats = self._stats.setdefault(
+                tool_name,
+                {"calls": 0, "bytes_before": 0, "bytes_after": 0, "tokens_saved": 0},
+            )
+            stats["calls"] += 1
+            stats["bytes_before"] += bytes_before
+            stats["bytes_after"] += bytes_after
+            stats["tokens_saved"] += tokens_saved
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """도구별 호출 수, 전/후 바이트, 절약한 토큰 추정치와 절감률을 반환합니다."""
+        with self._lock:
+            return {
+                tool_name: {
+                    **stats,
+                    "bytes_saved": stats["bytes_before"] - stats["bytes_after"],
+                    "saved_ratio": (
+                        round(1 - stats["bytes_after"] / stats["bytes_before"], 3)
+                        if stats["bytes_before"]
+                        else 0.0
+                    ),
+                }
+                for tool_name, stats in self._stats.items()
+            }
+
+
+slimming_stats = SlimmingStats()
+
+
+def slim_tool_result(tool_name: str, response: Dict[str, Any]) -> Dict[str, Any]:
+    """도구 이름에 맞는 스키마로 결과를 줄입니다 (스냅샷 등 합성 도구는 소스별 적용)."""
+    if tool_name in TOOL_API_IDS:
+        return slim_response(TOOL_API_IDS[tool_name], response)
+
+    sources = COMPOSITE_TOOL_API_IDS.get(tool_name)
+    if sources and isinstance(response, dict):
+        return {
+            key: (
+                slim_response(sources[key], value)
+                if key in sources and isinstance(value, dict)
+                else value
+            )
+            for key, value in response.items()
+        }
+    return response
+
+
+def slim_tool_response(
+    tool: BaseTool,
+    args: Dict[str, Any],
+    tool_context: ToolContext,
+    tool_response: Dict[str, Any],
+) -> Optional[Dict[str, Any]]:
+    """after_tool_callback: 도구 결과를 모델에 전달하기 전에 슬림화합니다."""
+    if tool.name not in TOOL_API_IDS and tool.name not in COMPOSITE_TOOL_API_IDS:
+        return None
+    slim = slim_tool_result(tool.name, tool_response)
+    slimming_stats.record(tool.name, tool_response, slim)
+    return slim
@@ -0,0 +1,178 @@
+"""
+키움증권 종목 스냅샷 도구
+- 한 종목 분석에 필요한 API들을 동시에 호출해 하나의 결과로 합침
+  - 주식기본정보 (ka10001), 주식일봉차트 (ka10081), 종목별기관매매추이 (ka10045)
+  - 종목일별프로그램매매추이 (ka90013), 공매도추이 (ka10014)
+  - 업종현재가 (ka20001), 계좌평가현황 (kt00004)
+- 일부 API가 실패해도 나머지 결과는 반환하고, 실패한 소스는 errors에 기록
+"""
+
+from google.adk.tools import FunctionTool
+from typing import Any, Callable, Dict, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import contextvars
+import time
+
+from .kiwoom_account_tools import get_account_evaluation
+from .kiwoom_chart_tools import get_stock_daily_chart
+from .kiwoom_market_tools import (
+    get_short_selling_trend,
+    get_stock_institution_trading_trend,
+)
+from .kiwoom_sector_tools import get_sector_current_price
+from .kiwoom_stock_info_tools import (
+    get_stock_basic_info,
+    get_stock_daily_program_trading_trend,
+)
+from .kiwoom_metrics import instrument_tool
+
+# 수급/프로그램/공매도 조회 기간 (일)
+SNAPSHOT_PERIOD_DAYS = 60
+
+_snapshot_executor = ThreadPoolExecutor(
+    max_workers=7, thread_name_prefix="kiwoom-snapshot"
+)
+
+
+# 스냅샷 소스 이름별 도구 함수
+SNAPSHOT_SOURCES: Dict[str, Callable[..., Dict[str, Any]]] = {
+    "basic_info": get_stock_basic_info,
+    "daily_chart": get_stock_daily_chart,
+    "institution_trend": get_stock_institution_trading_trend,
+    "program_trading_trend": get_stock_daily_program_trading_trend,
+    "short_selling_trend": get_short_selling_trend,
+    "sector": get_sector_current_price,
+    "holding": get_account_evaluation,
+}
+
+
+def _snapshot_args(
+    stk_cd: str, sector_mrkt_tp: str, sector_inds_cd: str
+) -> Dict[str, Tuple[Any, ...]]:
+    """스냅샷 소스 이름별 도구 호출 인자를 반환합니다. 동기/비동기 버전이 공유합니다."""
+    end_dt = datetime.now().strftime("%Y%m%d")
+    strt_dt = (datetime.now() - timedelta(days=SNAPSHOT_PERIOD_DAYS)).strftime("%Y%m%d")
+    return {
+        "basic_info": (stk_cd,),
+        "daily_chart": (stk_cd,),
+        # 기관/외국인 추정단가구분 1:매수단가
+        "institution_trend": (stk_cd, strt_dt, end_dt, "1", "1"),
+        "program_trading_trend": (stk_cd, strt_dt, end_dt),
+        "short_selling_trend": (stk_cd, strt_dt, end_dt),
+        "sector": (sector_mrkt_tp, sector_inds_cd),
+        "holding": (),
+    }
+
+
+def _source_error(result: Any) -> Optional[str]:
+    """도구 결과가 실패면 오류 메시지를, 정상이면 None을 반환합니다."""
+    if isinstance(result, BaseException):
+        return f"{type(result).__name__}: {result}"
+    if not isinstance(result, dict):
+        return "응답 형식 오류"
+    if "error" in result:
+        return result["error"]
+    if result.get("return_code") not in (0, "0", None):
+        return result.get("return_msg") or f"return_code={result.get('return_code')}"
+    return None
+
+
+def _find_holding(account: Dict[str, Any], stk_cd: str) -> Dict[str, Any]:
+    """계좌평가현황에서 해당 종목 보유 내역만 추립니다 (종목코드 앞의 'A' 접두어 무시)."""
+    holding = next(
+        (
+            stock
+            for stock in account.get("stocks", [])
+            if (stock.get("stock_code") or "").lstrip("A") == stk_cd
+        ),
+        None,
+    )
+    return {
+        "is_holding": holding is not None,
+        "account_name": account.get("account_name"),
+        "stock": holding,
+    }
+
+
+def _merge_snapshot(
+    stk_cd: str, results: Dict[str, Any], elapsed: float
+) -> Dict[str, Any]:
+    """
+    소스별 결과를 하나의 스냅샷으로 합칩니다.
+
+    Args:
+        stk_cd: 종목코드
+        results: 소스 이름별 도구 결과 (또는 예외)
+        elapsed: 전체 조회 소요 시간 (초)
+
+    Returns:
+        Dict: 성공한 소스 데이터와 소스별 오류
+    """
+    snapshot: Dict[str, Any] = {
+        "stock_code": stk_cd,
+        "as_of": datetime.now().strftime("%Y%m%d%H%M%S"),
+        "elapsed_seconds": round(elapsed, 3),
+        "errors": {},
+    }
+
+    for name, result in results.items():
+        error = _source_error(result)
+        if error is not None:
+            snapshot[name] = None
+            snapshot["errors"][name] = error
+        elif name == "holding":
+            snapshot[name] = _find_holding(result, stk_cd)
+        else:
+            snapshot[name] = result
+
+    snapshot["success"] = len(snapshot["errors"]) < len(results)
+    return snapshot
+
+
+@instrument_tool
+def get_stock_snapshot(
+    stk_cd: str,
+    sector_mrkt_tp: str = "0",
+    sector_inds_cd: str = "001",
+) -> Dict[str, Any]:
+    """
+    한 종목 분석에 필요한 데이터를 동시에 조회해 한 번에 반환합니다.
+    (주식기본정보, 최근 60일 일봉, 기관매매추이, 프로그램매매추이, 공매도추이,
+    업종현재가, 계좌 보유 내역)
+
+    Args:
+        stk_cd: 종목코드 (예: 005930)
+        sector_mrkt_tp: 비교할 업종의 시장구분 (0:코스피, 1:코스닥, 2:코스피200)
+        sector_inds_cd: 비교할 업종코드 (기본값 001:종합(KOSPI))
+
+    Returns:
+        Dict: basic_info, daily_chart, institution_trend, program_trading_trend,
+              short_selling_trend, sector, holding 및 소스별 오류(errors)
+    """
+    started = time.monotonic()
+
+    futures = {}
+    for name, args in _snapshot_args(stk_cd, sector_mrkt_tp, sector_inds_cd).items():
+        # 요청 우선순위 등 컨텍스트를 워커 스레드로 전달
+        ctx = contextvars.copy_context()
+        futures[name] = _snapshot_executor.submit(
+            ctx.run, SNAPSHOT_SOURCES[name], *args
+        )
+
+    results = {}
+    for name, future in futures.items():
+        try:
+            results[name] = future.result()
+        except Exception as e:
+            results[name] = e
+
+    elapsed = time.monotonic() - started
+    return _merge_snapshot(stk_cd, results, elapsed)
+
+
+# 도구 생성
+kiwoom_stock_snapshot_tool = FunctionTool(get_stock_snapshot)
+
+# 도구들
+KIWOOM_SNAPSHOT_TOOLS = [kiwoom_stock_snapshot_tool]
@@ -11,15 +11,14 @@
 from google.adk.tools import FunctionTool
 from typing import Dict, Any, Optional
 import requests
-import os
 
-# 모의투자 기본값
-KIWOOM_IS_MOCK = os.getenv("KIWOOM_IS_MOCK", "true").lower() == "true"
-
-# 도메인 설정
-BASE_URL = "https://mockapi.kiwoom.com" if KIWOOM_IS_MOCK else "https://api.kiwoom.com"
+from . import kiwoom_client
+from .kiwoom_client import BASE_URL
+from .kiwoom_paginator import with_paging
+from .kiwoom_metrics import instrument_tool
 
 
+@instrument_tool
 def get_institution_foreign_continuous_trading_status(
     dt: str,
     mrkt_tp: str,
@@ -81,9 +80,9 @@ def get_institution_foreign_continuous_trading_status(
         payload["end_dt"] = end_dt
 
     try:
-        response = requests.post(url, headers=headers, json=payload)
+        response = kiwoom_client.post(url, headers=headers, json=payload)
         response.raise_for_status()
-        return response.json()
+        return with_paging(response.json(), response.headers)
     except requests.exceptions.RequestException as e:
         return {
             "error": f"API 요청 실패: {str(e)}",
@@ -92,6 +91,7 @@ def get_institution_foreign_continuous_trading_status(
         }
 
 
+@instrument_tool
 def get_foreign_institution_trading_ranking(
     mrkt_tp: str,
     amt_qty_tp: str,
@@ -143,9 +143,9 @@ def get_foreign_institution_trading_ranking(
         payload["date"] = date
 
     try:
-        response = requests.post(url, headers=headers, json=payload)
+        response = kiwoom_client.post(url, headers=headers, json=payload)
         response.raise_for_status()
-        return response.json()
+        return with_paging(response.json(), response.headers)
     except requests.exceptions.RequestException as e:
         return {
             "error": f"API 요청 실패: {str(e)}",
@@ -154,6 +154,7 @@ def get_foreign_institution_trading_ranking(
         }
 
 
+@instrument_tool
 def get_foreign_continuous_net_trading_ranking(
     mrkt_tp: str,
     trde_tp: str,
@@ -199,9 +200,9 @@ def get_foreign_continuous_net_trading_ranking(
     }
 
     try:
-        response = requests.post(url, headers=headers, json=payload)
+        response = kiwoom_client.post(url, headers=headers, json=payload)
         response.raise_for_status()
-        return response.json()
+        return with_paging(response.json(), response.headers)
     except requests.exceptions.RequestException as e:
         return {
             "error": f"API 요청 실패: {str(e)}",
@@ -210,6 +211,7 @@ def get_foreign_continuous_net_trading_ranking(
         }
 
 
+@instrument_tool
 def get_daily_institution_trading_stocks(
     strt_dt: str,
     end_dt: str,
@@ -258,9 +260,9 @@ def get_daily_institution_trading_stocks(
     }
 
     try:
-        response = requests.post(url, headers=headers, json=payload)
+        response = kiwoom_client.post(url, headers=headers, json=payload)
         response.raise_for_status()
-        return response.json()
+        return with_paging(response.json(), response.headers)
     except requests.exceptions.RequestException as e:
         return {
             "error": f"API 요청 실패: {str(e)}",
@@ -269,6 +271,7 @@ def get_daily_institution_trading_stocks(
         }
 
 
+@instrument_tool
 def get_intraday_investor_trading_ranking(
     trde_tp: str,
     mrkt_tp: str,
@@ -311,9 +314,9 @@ def get_intraday_investor_trading_ranking(
     }
 
     try:
-        response = requests.post(url, headers=headers, json=payload)
+        response = kiwoom_client.post(url, headers=headers, json=payload)
         response.raise_for_status()
-        return response.json()
+        return with_paging(response.json(), response.headers)
     except requests.exceptions.RequestException as e:
         return {
             "error": f"API 요청 실패: {str(e)}",
@@ -8,15 +8,14 @@
 from google.adk.tools import FunctionTool
 from typing import Dict, Any, Optional
 import requests
-import os
 
-# 모의투자 기본값
-KIWOOM_IS_MOCK = os.getenv("KIWOOM_IS_MOCK", "true").lower() == "true"
-
-# 도메인 설정
-BASE_URL = "https://mockapi.kiwoom.com" if KIWOOM_IS_MOCK else "https://api.kiwoom.com"
+from . import kiwoom_client, kiwoom_paginator
+from .kiwoom_client import BASE_URL
+from .kiwoom_paginator import with_paging
+from .kiwoom_metrics import instrument_tool
 
 
+@instrument_tool
 def get_theme_component_stocks(
     thema_grp_cd: str,
     stex_tp: str,
@@ -24,6 +23,7 @@ def get_theme_component_stocks(
     cont_yn: Optional[str] = None,
     next_key: Optional[str] = None,
     authorization: Optional[str] = None,
+    fetch_all: bool = False,
 ) -> Dict[str, Any]:
     """
     키움증권 테마구성종목요청 API (ka90002)
@@ -35,6 +35,7 @@ def get_theme_component_stocks(
         cont_yn: 연속조회여부 (선택사항)
         next_key: 연속조회키 (선택사항)
         authorization: 접근토큰 (선택사항)
+        fetch_all: True면 연속조회를 자동으로 따라가 전체 목록을 한 번에 반환 (선택사항)
 
     Returns:
         Dict: API 응답 데이터
@@ -62,9 +63,12 @@ def get_theme_component_stocks(
         payload["date_tp"] = date_tp
 
     try:
-        response = requests.post(url, headers=headers, json=payload)
+        if fetch_all:
+            return kiwoom_paginator.fetch_all(url, headers, payload, "thema_comp_stk")
+
+        response = kiwoom_client.post(url, headers=headers, json=payload)
         response.raise_for_status()
-        return response.json()
+        return with_paging(response.json(), response.headers)
     except requests.exceptions.RequestException as e:
         return {
             "error": f"API 요청 실패: {str(e)}",
@@ -73,6 +77,7 @@ def get_theme_component_stocks(
         }
 
 
+@instrument_tool
 def get_theme_group_info(
     qry_tp: str,
     date_tp: str,
@@ -128,9 +133,9 @@ def get_theme_group_info(
         payload["thema_nm"] = thema_nm
 
     try:
-        response = requests.post(url, headers=headers, json=payload)
+        response = kiwoom_client.post(url, headers=headers, json=payload)
         response.raise_for_status()
-        return response.json()
+        return with_paging(response.json(), response.headers)
     except requests.exceptions.RequestException as e:
         return {
             "error": f"API 요청 실패: {str(e)}",
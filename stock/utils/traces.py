@@ -0,0 +1,207 @@
+"""
+요청별 실행 trace 기록 (에이전트/모델/도구/키움 호출 waterfall)
+- 기록을 요청한 실행(X-ADK-Trace 헤더)이나 ADK_TRACE_SAMPLE_RATE 비율로 뽑힌 실행만 기록
+- 해당 실행의 OpenTelemetry span(ADK의 agent_run/call_llm/execute_tool,
+  adk_run/kiwoom_tool/kiwoom_api)을 모아 최근 ADK_TRACE_BUFFER_SIZE개를 메모리에 보관
+- span마다 실행 시작 기준 시작 시각, 소요 시간, 하위 span을 제외한 자체 시간(self_ms)을 계산해
+  가장 오래 걸린 구간을 바로 찾을 수 있게 함
+- 기록하지 않는 실행의 span은 샘플러가 버리므로 (ADK_TRACE_EXPORTER 미설정 시) 추가 비용이 거의 없음
+"""
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+import os
+import random
+import threading
+
+from opentelemetry.sdk.trace import ReadableSpan, SpanProcessor
+from opentelemetry.sdk.trace.sampling import ALWAYS_OFF, ALWAYS_ON, Sampler
+
+# 무작위로 기록할 실행 비율 (0~1, 헤더로 요청한 실행은 항상 기록)
+ADK_TRACE_SAMPLE_RATE = float(os.getenv("ADK_TRACE_SAMPLE_RATE", "0"))
+# 보관할 최근 trace 수
+ADK_TRACE_BUFFER_SIZE = int(os.getenv("ADK_TRACE_BUFFER_SIZE", "100"))
+# span 속성 문자열 최대 길이 (모델 요청/응답 본문 등은 잘라서 보관)
+ADK_TRACE_MAX_ATTRIBUTE_CHARS = int(os.getenv("ADK_TRACE_MAX_ATTRIBUTE_CHARS", "300"))
+# 요약에 포함할 자체 시간 상위 span 수
+SLOWEST_SPANS = 5
+
+# 현재 실행의 trace 기록 여부 (샘플러가 span 기록 여부를 정할 때 사용)
+_recording: ContextVar[bool] = ContextVar("trace_recording", default=False)
+
+
+def should_record(requested: Optional[str] = None) -> bool:
+    """
+    실행을 기록할지 정합니다.
+
+    Args:
+        requested: X-ADK-Trace 헤더 값 (1, true, yes, on이면 기록)
+
+    Returns:
+        bool: 기록 여부
+    """
+    if requested and requested.strip().lower() in ("1", "true", "yes", "on"):
+        return True
+    return ADK_TRACE_SAMPLE_RATE > 0 and random.random() < ADK_TRACE_SAMPLE_RATE
+
+
+@contextmanager
+def recording(enabled: bool) -> Iterator[None]:
+    """이 컨텍스트 안에서 시작하는 span을 기록 대상으로 표시합니다."""
+    token = _recording.set(enabled)
+    try:
+        yield
+    finally:
+        _recording.reset(token)
+
+
+class RecordingSampler(Sampler):
+    """
+    기록 중인 실행의 span만 샘플링합니다.
+    span을 내보내는 경우(ADK_TRACE_EXPORTER)에는 모든 span을 샘플링합니다.
+    """
+
+    def __init__(self, export_all: bool = False):
+        self._export_all = export_all
+
+    def should_sample(self, *args, **kwargs):
+        sampler = ALWAYS_ON if self._export_all or _recording.get() else ALWAYS_OFF
+        return sampler.should_sample(*args, **kwargs)
+
+    def get_description(self) -> str:
+        return f"RecordingSampler(export_all={self._export_all})"
+
+
+def _attribute(value: Any) -> Any:
+    if isinstance(value, str) and len(value) > ADK_TRACE_MAX_ATTRIBUTE_CHARS:
+        return value[:ADK_TRACE_MAX_ATTRIBUTE_CHARS] + "..."
+    if isinstance(value, tuple):
+        return list(value)
+    return value
+
+
+def _ms(nanoseconds: int) -> float:
+    return round(nanoseconds / 1_000_000, 3)
+
+
+def _build_trace(trace_id: str, spans: List[ReadableSpan], **meta) -> Dict[str, Any]:
+    """span 목록을 시작 시각 순 waterfall로 정리합니다."""
+    spans = sorted(spans, key=lambda span: span.start_time or 0)
+    ids = {span.context.span_id for span in spans}
+    started = min((span.start_time or 0) for span in spans)
+    ended = max((span.end_time or 0) for span in spans)
+
+    children_ns: Dict[int, int] = {}
+    parents: Dict[int, Optional[int]] = {}
+    for span in spans:
+        parent_id = span.parent.span_id if span.parent else None
+        parents[span.context.span_id] = parent_id if parent_id in ids else None
+        if parent_id in ids:
+            duration = (span.end_time or 0) - (span.start_time or 0)
+            children_ns[parent_id] = children_ns.get(parent_id, 0) + duration
+
+    def depth(span_id: int) -> int:
+        level = 0
+        while parents.get(span_id) is not None:
+            span_id = parents[span_id]
+            level += 1
+        return level
+
+    items = []
+    for span in spans:
+        span_id = span.context.span_id
+        duration = (span.end_time or 0) - (span.start_time or 0)
+        parent_id = parents[span_id]
+        items.append(
+            {
+                "span_id": format(span_id, "016x"),
+                "parent_id": format(parent_id, "016x") if parent_id else None,
+                "name": span.name,
+                "depth": depth(span_id),
+                "start_ms": _ms((span.start_time or 0) - started),
+                "duration_ms": _ms(duration),
+                # 하위 span을 제외한 시간 (병렬 실행된 하위 span이 있으면 0으로 보정)
+                "self_ms": _ms(max(duration - children_ns.get(span_id, 0), 0)),
+                "status": span.status.status_code.name.lower(),
+                "attributes": {
+                    key: _attribute(value)
+                    for key, value in (span.attributes or {}).items()
+                },
+            }
+        )
+
+    slowest = sorted(items, key=lambda item: item["self_ms"], reverse=True)
+    return {
+        "trace_id": trace_id,
+        **meta,
+        "started_at": datetime.fromtimestamp(started / 1e9, timezone.utc).isoformat(),
+        "duration_ms": _ms(ended - started),
+        "span_count": len(items),
+        "slowest": [
+            {
+                "name": item["name"],
+                "span_id": item["span_id"],
+                "self_ms": item["self_ms"],
+            }
+            for item in slowest[:SLOWEST_SPANS]
+        ],
+        "spans": items,
+    }
+
+
+class TraceBuffer(SpanProcessor):
+    """
+    기록 중인 실행의 span을 모아 최근 trace를 보관하는 SpanProcessor.
+    start(trace_id)로 기록을 시작하고 finish(trace_id)로 waterfall을 만들어 보관합니다.
+    """
+
+    def __init__(self, size: int = ADK_TRACE_BUFFER_SIZE):
+        self.size = size
+        self._active: Dict[int, List[ReadableSpan]] = {}
+        self._traces: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def start(self, trace_id: int) -> str:
+        """실행의 span 수집을 시작하고 조회용 trace id(16진수)를 반환합니다."""
+        with self._lock:
+            self._active.setdefault(trace_id, [])
+        return format(trace_id, "032x")
+
+    def on_end(self, span: ReadableSpan) -> None:
+        with self._lock:
+            spans = self._active.get(span.context.trace_id)
+            if spans is not None:
+                spans.append(span)
+
+    def finish(self, trace_id: int, **meta) -> None:
+        """수집을 끝내고 waterfall을 보관합니다. 오래된 trace부터 삭제합니다."""
+        with self._lock:
+            spans = self._active.pop(trace_id, None)
+        if not spans:
+            return
+        key = format(trace_id, "032x")
+        built = _build_trace(key, spans, **meta)
+        with self._lock:
+            self._traces[key] = built
+            while len(self._traces) > self.size:
+                self._traces.popitem(last=False)
+
+    def get(self, trace_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._traces.get(trace_id.lower())
+
+    def list(self) -> List[Dict[str, Any]]:
+        """보관 중인 trace 요약 (최근순)"""
+        with self._lock:
+            traces = list(self._traces.values())
+        return [
+            {key: value for key, value in trace.items() if key != "spans"}
+            for trace in reversed(traces)
+        ]
+
+
+# 프로세스 전역 trace 보관소
+trace_buffer = TraceBuffer()
@@ -0,0 +1,30 @@
+"""
+테스트 공통 설정
+- main.py와 도구 모듈은 import 시 환경 변수를 읽으므로 테스트 모듈을 모으기 전에 설정
+  (키움 대역 서버 포트, 시나리오 재생 모델, 임시 세션 DB)
+"""
+
+import os
+import socket
+import tempfile
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+MOCK_KIWOOM_PORT = _free_port()
+_database_dir = tempfile.TemporaryDirectory()
+
+os.environ.update(
+    {
+        "ADK_MODEL": "scripted",
+        "ADK_SCRIPTED_LLM_LATENCY_MS": "200",
+        "ADK_SESSION_DB_URL": f"sqlite:///{_database_dir.name}/sessions.sqlite",
+        "KIWOOM_BASE_URL": f"http://127.0.0.1:{MOCK_KIWOOM_PORT}",
+        "KIWOOM_APPKEY": "test-appkey",
+        "KIWOOM_SECRETKEY": "test-secretkey",
+    }
+)
@@ -0,0 +1,85 @@
+"""
+WebSocket 채팅 취소 테스트
+- 키움 대역 서버(server.mock_kiwoom)와 시나리오 재생 모델(ADK_MODEL=scripted)로 main.app 실행
+  (환경 변수는 tests/conftest.py에서 설정)
+- 실행 중 cancel을 보내면 실행만 중단되고, 같은 연결에서 다음 요청을 처리해야 함
+
+    python -m pytest tests/test_chat_websocket.py
+"""
+
+import threading
+import time
+
+import pytest
+
+from conftest import MOCK_KIWOOM_PORT
+
+
+@pytest.fixture(scope="module")
+def client():
+    import uvicorn
+    from fastapi.testclient import TestClient
+
+    from server import mock_kiwoom
+
+    server = uvicorn.Server(
+        uvicorn.Config(mock_kiwoom.app, port=MOCK_KIWOOM_PORT, log_level="warning")
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+
+    import main
+
+    with TestClient(main.app) as test_client:
+        yield test_client
+    server.should_exit = True
+    thread.join()
+
+
+def _receive_until(websocket, *kinds):
+    received = []
+    while True:
+        message = websocket.receive_json()
+        received.append(message["type"])
+        if message["type"] in kinds:
+            return received
+
+
+def test_cancel_keeps_connection_open(client):
+    with client.websocket_connect("/api/v1/adk/chat/ws") as websocket:
+        websocket.send_json(
+            {"user_id": "ws-test", "message": "거래량 급등 종목 알려줘"}
+        )
+        _receive_until(websocket, "session")
+        websocket.send_json({"type": "cancel"})
+        received = _receive_until(websocket, "cancelled", "done", "error")
+        assert received[-1] == "cancelled"
+
+        # 취소 후에도 같은 연결에서 다음 요청 처리
+        websocket.send_json(
+            {"user_id": "ws-test", "message": "기관 순매수 종목 알려줘"}
+        )
+        received = _receive_until(websocket, "done", "error")
+        assert received[0] == "session"
+        assert received[-1] == "done"
+
+
+def test_other_messages_are_queued(client):
+    with client.websocket_connect("/api/v1/adk/chat/ws") as websocket:
+        websocket.send_json(
+            {"user_id": "ws-test", "message": "거래량 급등 종목 알려줘"}
+        )
+        _receive_until(websocket, "session")
+        websocket.send_json(
+            {"user_id": "ws-test", "message": "기관 순매수 종목 알려줘"}
+        )
+        received = _receive_until(websocket, "done", "error")
+        assert "queued" in received
+        assert received[-1] == "done"
+
+        # 대기열에 넣은 요청은 실행이 끝난 뒤 처리
+        received = _receive_until(websocket, "done", "error")
+        assert received[0] == "session"
+        assert received[-1] == "done"
@@ -0,0 +1,39 @@
+"""
+기술적 지표 도구 테스트 (업종지수 대비 상대강도)
+
+    python -m pytest tests/test_kiwoom_indicator_tools.py
+"""
+
+import pytest
+
+from stock.utils.tools.kiwoom_indicator_tools import RETURN_PERIODS, _sector_returns
+
+
+def _sector(levels):
+    # ka20001 응답은 최근 일자부터 내려오며, 지수는 부호 붙은 소수 문자열
+    return {
+        "inds_cur_prc_daly_rept": [
+            {"dt_n": f"2025{index:04d}", "cur_prc_n": f"+{level:.2f}"}
+            for index, level in enumerate(reversed(levels))
+        ]
+    }
+
+
+def test_sector_returns_parses_decimal_index_levels():
+    levels = [2500 + index * 1.25 for index in range(80)]
+    returns = _sector_returns(_sector(levels))
+
+    assert set(returns) == set(RETURN_PERIODS)
+    for period in RETURN_PERIODS:
+        expected = (levels[-1] / levels[-period - 1] - 1) * 100
+        assert returns[period] == pytest.approx(expected)
+
+
+def test_sector_returns_skips_missing_levels():
+    sector = _sector([2600.5 + index for index in range(10)])
+    sector["inds_cur_prc_daly_rept"][3]["cur_prc_n"] = ""
+
+    returns = _sector_returns(sector)
+
+    assert set(returns) == {5}
+    assert returns[5] == pytest.approx((2609.5 / 2603.5 - 1) * 100)
@@ -0,0 +1,121 @@
+"""
+키움 도구 응답 슬림화 테스트 (수급/프로그램매매/계좌/차트 스키마, 스냅샷 소스)
+
+    python -m pytest tests/test_kiwoom_slimming.py
+"""
+
+import pytest
+
+from stock.utils.tools.kiwoom_slimming import (
+    COMPOSITE_TOOL_API_IDS,
+    SLIM_SCHEMAS,
+    TOOL_API_IDS,
+    slim_tool_result,
+)
+from stock.utils.tools.kiwoom_snapshot_tools import SNAPSHOT_SOURCES
+
+
+@pytest.mark.parametrize(
+    "tool_name",
+    [
+        "get_institution_foreign_continuous_trading_status",
+        "get_foreign_institution_trading_ranking",
+        "get_foreign_continuous_net_trading_ranking",
+        "get_daily_institution_trading_stocks",
+        "get_intraday_investor_trading_ranking",
+        "get_stock_program_trading_status",
+        "get_stock_daily_program_trading_trend",
+        "get_account_evaluation",
+        "get_stock_daily_chart",
+        "get_stock_minute_chart",
+    ],
+)
+def test_tool_has_schema(tool_name):
+    assert TOOL_API_IDS[tool_name] in SLIM_SCHEMAS
+
+
+def test_every_snapshot_source_has_schema():
+    sources = COMPOSITE_TOOL_API_IDS["get_stock_snapshot"]
+    assert set(sources) == set(SNAPSHOT_SOURCES)
+    assert all(api_id in SLIM_SCHEMAS for api_id in sources.values())
+
+
+def test_foreign_institution_ranking_rows_are_slimmed():
+    response = {
+        "return_code": 0,
+        "frgnr_orgn_trde_upper": [
+            {
+                "for_netprps_stk_cd": "005930",
+                "for_netprps_stk_nm": "삼성전자",
+                "for_netprps_amt": "+1520",
+                "for_netprps_qty": "-23",
+                "unknown": "x",
+            }
+        ],
+    }
+    slim = slim_tool_result("get_foreign_institution_trading_ranking", response)
+
+    assert slim["frgnr_orgn_trde_upper"] == [
+        {
+            "for_netprps_stk_cd": "005930",
+            "for_netprps_stk_nm": "삼성전자",
+            "for_netprps_amt": 1520,
+            "for_netprps_qty": -23,
+        }
+    ]
+
+
+def test_snapshot_program_trading_and_holding_are_slimmed():
+    response = {
+        "stock_code": "005930",
+        "program_trading_trend": {
+            "success": True,
+            "stock_code": "005930",
+            "program_trading_list": [
+                {
+                    "date": "20250110",
+                    "current_price": "-61300",
+                    "fluctuation_signal": "5",
+                    "net_buy_amount": "-1250",
+                }
+            ],
+        },
+        "holding": {
+            "is_holding": True,
+            "account_name": "모의투자",
+            "stock": {
+                "stock_code": "A005930",
+                "average_price": "000000058000",
+                "profit_loss_rate": "-1.25",
+                "loan_date": "",
+            },
+        },
+    }
+    slim = slim_tool_result("get_stock_snapshot", response)
+
+    assert slim["stock_code"] == "005930"
+    assert slim["program_trading_trend"]["program_trading_list"] == [
+        {"date": "20250110", "current_price": 61300, "net_buy_amount": -1250}
+    ]
+    assert slim["holding"] == {
+        "account_name": "모의투자",
+        "is_holding": True,
+        "stock": {
+            "stock_code": "A005930",
+            "average_price": 58000,
+            "profit_loss_rate": -1.25,
+        },
+    }
+
+
+def test_snapshot_holding_without_stock_keeps_none():
+    response = {
+        "holding": {"is_holding": False, "account_name": "모의투자", "stock": None}
+    }
+    slim = slim_tool_result("get_stock_snapshot", response)
+
+    assert slim["holding"] == {
+        "account_name": "모의투자",
+        "is_holding": False,
+        "stock": None,
+    }